@@ -0,0 +1,26 @@
+"""add worksheet columnar sidecar path
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Record the Parquet sidecar written for each worksheet at ingest"""
+    op.add_column('worksheet_data', sa.Column('columnar_path', sa.String(length=500), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove worksheet sidecar path"""
+    op.drop_column('worksheet_data', 'columnar_path')
@@ -0,0 +1,39 @@
+"""add anomaly baselines for incremental detection
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Store streaming anomaly detector state per file lineage and column"""
+    op.create_table(
+        'anomaly_baselines',
+        sa.Column('id', sa.String(length=36), primary_key=True),
+        sa.Column('lineage_key', sa.String(length=64), nullable=False),
+        sa.Column('column_name', sa.String(length=255), nullable=False),
+        sa.Column('state', sa.JSON(), nullable=False),
+        sa.Column('last_timestamp', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_file_id', sa.String(length=36), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.UniqueConstraint('lineage_key', 'column_name', name='uq_anomaly_baselines_lineage_column'),
+    )
+    op.create_index('ix_anomaly_baselines_lineage_key', 'anomaly_baselines', ['lineage_key'])
+
+
+def downgrade() -> None:
+    """Remove anomaly baselines"""
+    op.drop_index('ix_anomaly_baselines_lineage_key', table_name='anomaly_baselines')
+    op.drop_table('anomaly_baselines')
@@ -0,0 +1,26 @@
+"""add worksheet KPI summary
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Store brand KPIs precomputed for each worksheet after ingest"""
+    op.add_column('worksheet_data', sa.Column('kpi_summary', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove worksheet KPI summary"""
+    op.drop_column('worksheet_data', 'kpi_summary')
@@ -1,23 +1,80 @@
 """
 Agent-Chat Charts API
-Serve chart images as static files
+Serve chart artifacts
+
+Content-addressed charts (services.chart_store) are served from the storage
+backend with a strong ETag (the chart ID and artifact kind). Their content
+never changes, so clients may cache them forever and revalidate with
+If-None-Match. PNG, SVG and HTML exports that were not rendered yet (lazy
+rendering) are rendered from the stored figure JSON on first request. Chart IDs that are not content addresses are looked up as
+static files in the charts directory.
 """
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, Response
 import os
 
+from services.chart_store import ARTIFACT_TYPES, chart_store, is_chart_id
+
 router = APIRouter()
 
 # Charts directory
 CHARTS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "charts")
 os.makedirs(CHARTS_DIR, exist_ok=True)
 
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, OPTIONS",
+    "Access-Control-Allow-Headers": "*"
+}
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Whether If-None-Match names this ETag (weak comparison, as for GET)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+async def _artifact_response(request: Request, chart_id: str, kind: str) -> Response:
+    """Serve one content-addressed artifact, or 304 if the client has it"""
+    etag = f'"{chart_id}.{kind}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "public, max-age=31536000, immutable",
+        **CORS_HEADERS
+    }
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    data = await chart_store.get_or_render(chart_id, kind)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Chart not found")
+    return Response(content=data, media_type=ARTIFACT_TYPES[kind], headers=headers)
+
+
+@router.get("/charts/{chart_id}/{kind}")
+async def get_chart_artifact(chart_id: str, kind: str, request: Request):
+    """Serve a chart's PNG, SVG, interactive HTML or figure JSON by content address"""
+    if not is_chart_id(chart_id) or kind not in ARTIFACT_TYPES:
+        raise HTTPException(status_code=400, detail="Invalid chart ID")
+
+    return await _artifact_response(request, chart_id, kind)
+
 
 @router.get("/charts/{chart_id}")
-async def get_chart(chart_id: str):
+async def get_chart(chart_id: str, request: Request):
     """Serve a chart image file"""
 
+    # Content-addressed charts: PNG (rendered on demand), then HTML
+    if is_chart_id(chart_id):
+        try:
+            return await _artifact_response(request, chart_id, "png")
+        except HTTPException:
+            return await _artifact_response(request, chart_id, "html")
+
     # Validate chart_id to prevent path traversal
     if ".." in chart_id or "/" in chart_id or "\\" in chart_id:
         raise HTTPException(status_code=400, detail="Invalid chart ID")
@@ -37,9 +94,7 @@ async def get_chart(chart_id: str):
             media_type="text/html",
             headers={
                 "Cache-Control": "public, max-age=3600",
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Methods": "GET, OPTIONS",
-                "Access-Control-Allow-Headers": "*"
+                **CORS_HEADERS
             }
         )
 
@@ -48,9 +103,7 @@ async def get_chart(chart_id: str):
         media_type="image/png",
         headers={
             "Cache-Control": "public, max-age=3600",
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Methods": "GET, OPTIONS",
-            "Access-Control-Allow-Headers": "*"
+            **CORS_HEADERS
         }
     )
 
@@ -3,17 +3,21 @@ Agent-Chat Chat API
 Endpoints for chat functionality and message processing
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Query
-from typing import List, Dict, Any, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, List, Dict, Any, Optional
 from pydantic import BaseModel
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, desc
+import asyncio
+import json
 import uuid
 
-from core.database import get_db
+from core.database import AsyncSessionLocal, get_db
 from models import ChatSession as DBChatSession, ChatMessage as DBChatMessage
-from langgraph_agents import create_agent_graph
+from langgraph_agents import graph_registry
+from langgraph_agents.llm_clients import TOKEN_EVENT
 from langgraph_agents.state import create_initial_state
 
 router = APIRouter()
@@ -42,45 +46,149 @@ class ChatResponse(BaseModel):
     session_id: str
 
 
+async def _get_or_create_session(db: AsyncSession, session_id: str, message: str) -> DBChatSession:
+    """Load a chat session, creating it on first message"""
+    result = await db.execute(
+        select(DBChatSession).where(DBChatSession.id == session_id)
+    )
+    db_session = result.scalar_one_or_none()
+
+    if not db_session:
+        db_session = DBChatSession(
+            id=session_id,
+            title=message[:100] if message else "New Chat",
+            is_active=True
+        )
+        db.add(db_session)
+        await db.flush()
+
+    return db_session
+
+
+async def _store_user_message(db: AsyncSession, session_id: str, request: ChatRequest) -> DBChatMessage:
+    """Store the user's message"""
+    user_message = DBChatMessage(
+        id=str(uuid.uuid4()),
+        session_id=session_id,
+        role="user",
+        content=request.message,
+        meta_data={"context": request.context, "files": request.files}
+    )
+    db.add(user_message)
+    await db.flush()
+    return user_message
+
+
+def _store_assistant_message(
+    db: AsyncSession,
+    db_session: DBChatSession,
+    result_state: Dict[str, Any],
+    execution_time: float,
+) -> ChatResponse:
+    """
+    Store the assistant's reply from a finished graph run.
+
+    Args:
+        db: Database session (caller commits)
+        db_session: Chat session the reply belongs to
+        result_state: Final AgentState from the graph
+        execution_time: Graph execution time in seconds
+
+    Returns:
+        ChatResponse: API response for the stored message
+    """
+    # Extract results
+    agent_response = result_state.get("agent_response", "I apologize, but I couldn't process your request.")
+    selected_agent = result_state.get("selected_agent", "unknown")
+    confidence = result_state.get("confidence", 0.0)
+    agent_data = result_state.get("agent_data", {})
+    error = result_state.get("error")
+    execution_id = result_state.get("execution_id")  # From governance wrapper
+
+    # Store assistant message
+    assistant_message_id = str(uuid.uuid4())
+    assistant_db_message = DBChatMessage(
+        id=assistant_message_id,
+        session_id=db_session.id,
+        role="assistant",
+        content=agent_response,
+        agent_id=selected_agent,
+        meta_data={
+            "confidence": confidence,
+            "execution_time": execution_time,
+            "agent_data": agent_data,
+            "execution_path": result_state.get("execution_path", []),
+            "error": error,
+            "execution_id": execution_id,  # Include for feedback tracking
+        }
+    )
+    db.add(assistant_db_message)
+
+    # Update session
+    db_session.updated_at = datetime.utcnow()
+
+    # Create chat message response
+    assistant_message = ChatMessage(
+        id=assistant_message_id,
+        role="assistant",
+        content=agent_response,
+        timestamp=datetime.utcnow(),
+        agent_id=selected_agent,
+        metadata={
+            "message_id": assistant_message_id,  # For feedback submission
+            "confidence": confidence,
+            "execution_time": execution_time,
+            "agent_data": agent_data,
+            "execution_id": execution_id,
+        }
+    )
+
+    return ChatResponse(
+        message=assistant_message,
+        agent_used=selected_agent,
+        confidence=confidence,
+        session_id=db_session.id
+    )
+
+
+async def _cancel_on_disconnect(http_request: Request, awaitable, poll_interval: float = 0.5):
+    """
+    Await a graph run, cancelling it if the client disconnects first.
+
+    Cancellation reaches agent work waiting on core.executors pools, so a
+    closed browser tab no longer keeps forecasts and renders queued.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await http_request.is_disconnected():
+                task.cancel()
+                raise HTTPException(status_code=499, detail="Client closed request")
+    finally:
+        if not task.done():
+            task.cancel()
+
+
 @router.post("/chat/send")
 async def send_chat_message(
     request: ChatRequest,
+    http_request: Request,
     db: AsyncSession = Depends(get_db)
 ) -> ChatResponse:
     """Send a chat message and get AI response"""
     try:
         # Create or get session
         session_id = request.session_id or str(uuid.uuid4())
-
-        # Check if session exists in DB
-        result = await db.execute(
-            select(DBChatSession).where(DBChatSession.id == session_id)
-        )
-        db_session = result.scalar_one_or_none()
-
-        if not db_session:
-            # Create new session
-            db_session = DBChatSession(
-                id=session_id,
-                title=request.message[:100] if request.message else "New Chat",
-                is_active=True
-            )
-            db.add(db_session)
-            await db.flush()
+        db_session = await _get_or_create_session(db, session_id, request.message)
 
         # Store user message
-        user_message = DBChatMessage(
-            id=str(uuid.uuid4()),
-            session_id=session_id,
-            role="user",
-            content=request.message,
-            meta_data={"context": request.context, "files": request.files}
-        )
-        db.add(user_message)
-        await db.flush()
+        await _store_user_message(db, session_id, request)
 
-        # Use LangGraph for agent orchestration
-        graph = create_agent_graph()
+        # Use the process-wide compiled graph (built once at startup)
+        graph = graph_registry.get()
 
         # Create initial state
         initial_state = create_initial_state(
@@ -91,68 +199,137 @@ async def send_chat_message(
 
         # Execute graph
         start_time = datetime.utcnow()
-        result_state = await graph.ainvoke(initial_state)
+        result_state = await _cancel_on_disconnect(http_request, graph.ainvoke(initial_state))
         execution_time = (datetime.utcnow() - start_time).total_seconds()
 
-        # Extract results
-        agent_response = result_state.get("agent_response", "I apologize, but I couldn't process your request.")
-        selected_agent = result_state.get("selected_agent", "unknown")
-        confidence = result_state.get("confidence", 0.0)
-        agent_data = result_state.get("agent_data", {})
-        error = result_state.get("error")
-        execution_id = result_state.get("execution_id")  # From governance wrapper
-
-        # Store assistant message
-        assistant_message_id = str(uuid.uuid4())
-        assistant_db_message = DBChatMessage(
-            id=assistant_message_id,
-            session_id=session_id,
-            role="assistant",
-            content=agent_response,
-            agent_id=selected_agent,
-            meta_data={
-                "confidence": confidence,
-                "execution_time": execution_time,
-                "agent_data": agent_data,
-                "execution_path": result_state.get("execution_path", []),
-                "error": error,
-                "execution_id": execution_id,  # Include for feedback tracking
-            }
-        )
-        db.add(assistant_db_message)
-
-        # Update session
-        db_session.updated_at = datetime.utcnow()
+        response = _store_assistant_message(db, db_session, result_state, execution_time)
         await db.commit()
 
-        # Create chat message response
-        assistant_message = ChatMessage(
-            id=assistant_message_id,
-            role="assistant",
-            content=agent_response,
-            timestamp=datetime.utcnow(),
-            agent_id=selected_agent,
-            metadata={
-                "message_id": assistant_message_id,  # For feedback submission
-                "confidence": confidence,
-                "execution_time": execution_time,
-                "agent_data": agent_data,
-                "execution_id": execution_id,
-            }
-        )
-
-        return ChatResponse(
-            message=assistant_message,
-            agent_used=selected_agent,
-            confidence=confidence,
-            session_id=session_id
-        )
+        return response
 
+    except HTTPException:
+        await db.rollback()
+        raise
     except Exception as e:
         await db.rollback()
         raise HTTPException(status_code=500, detail=f"Chat processing failed: {str(e)}")
 
 
+# Graph nodes reported as progress events on /chat/stream
+STREAM_NODES = {
+    "supervisor",
+    "chart_agent",
+    "brand_performance_agent",
+    "forecasting_agent",
+    "anomaly_detection_agent",
+    "general_agent",
+}
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _stream_chat_events(request: ChatRequest) -> AsyncIterator[str]:
+    """
+    Run the graph with astream_events and translate events to SSE.
+
+    Events:
+        session     - session_id and user message id (user message is persisted)
+        routing     - agent chosen by the supervisor and how it was chosen
+        node_start  - a graph node started
+        node_end    - a graph node finished
+        token       - LLM output chunk from an agent node
+        done        - final ChatResponse, after the assistant message is persisted
+        error       - processing failed
+
+    Token events are progress only; the `done` payload carries the final
+    formatted response.
+    """
+    session_id = request.session_id or str(uuid.uuid4())
+
+    # Own DB session: the request-scoped dependency must not outlive the response
+    async with AsyncSessionLocal() as db:
+        try:
+            db_session = await _get_or_create_session(db, session_id, request.message)
+            user_message = await _store_user_message(db, session_id, request)
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            yield _sse("error", {"detail": f"Chat processing failed: {str(e)}"})
+            return
+
+        yield _sse("session", {"session_id": session_id, "user_message_id": user_message.id})
+
+        graph = graph_registry.get()
+        initial_state = create_initial_state(
+            query=request.message,
+            session_id=session_id,
+            uploaded_files=request.files,
+        )
+
+        result_state: Optional[Dict[str, Any]] = None
+        start_time = datetime.utcnow()
+        try:
+            async for event in graph.astream_events(initial_state, version="v2"):
+                kind = event["event"]
+                name = event.get("name")
+                node = event.get("metadata", {}).get("langgraph_node")
+
+                if kind == "on_chain_start" and name in STREAM_NODES and node == name:
+                    yield _sse("node_start", {"node": name})
+
+                elif kind == "on_chain_end" and name in STREAM_NODES and node == name:
+                    output = event["data"].get("output")
+                    if name == "supervisor" and isinstance(output, dict):
+                        metadata = output.get("metadata", {})
+                        yield _sse("routing", {
+                            "agent": output.get("selected_agent"),
+                            "source": metadata.get("routing_source"),
+                            "confidence": metadata.get("routing_confidence"),
+                        })
+                    yield _sse("node_end", {"node": name})
+
+                elif kind == "on_chain_end" and not event.get("parent_ids"):
+                    # Root graph run finished: final state
+                    result_state = event["data"].get("output")
+
+                elif node != "supervisor" and kind == "on_chat_model_stream":
+                    content = event["data"]["chunk"].content
+                    if content:
+                        yield _sse("token", {"node": node, "content": content})
+
+                elif node != "supervisor" and kind == "on_custom_event" and name == TOKEN_EVENT:
+                    yield _sse("token", {"node": node, "content": event["data"]["content"]})
+
+            if not isinstance(result_state, dict):
+                raise RuntimeError("Graph finished without a final state")
+
+            execution_time = (datetime.utcnow() - start_time).total_seconds()
+            response = _store_assistant_message(db, db_session, result_state, execution_time)
+            await db.commit()
+
+            yield _sse("done", response.model_dump(mode="json"))
+
+        except Exception as e:
+            await db.rollback()
+            yield _sse("error", {"detail": f"Chat processing failed: {str(e)}"})
+
+
+@router.post("/chat/stream")
+async def stream_chat_message(request: ChatRequest) -> StreamingResponse:
+    """Send a chat message and stream progress and tokens as server-sent events"""
+    return StreamingResponse(
+        _stream_chat_events(request),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Disable proxy buffering (nginx)
+        },
+    )
+
+
 # Multi-agent endpoint removed - LangGraph automatically routes to best agent
 
 
@@ -10,12 +10,16 @@ from pydantic import BaseModel
 import pandas as pd
 from io import BytesIO
 import uuid
+import asyncio
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, desc, or_, delete
 from core.database import get_db
-from models import UploadedFile, WorksheetData, WorksheetRow, FileAccessLog
+from models import UploadedFile, WorksheetData, FileAccessLog
 from services.unified_storage import unified_storage as storage_service
+from services.chart_store import is_chart_path
+from services.columnar_storage import write_sidecar, is_sidecar_path
+from services.worksheet_ingest import bulk_insert_worksheet_rows, frame_to_json_records
 import aiofiles
 import mimetypes
 from services.azure_sync import azure_sync_service
@@ -92,15 +96,46 @@ async def log_file_access(
         pass  # Silent failure for logging
 
 
+def duplicate_file_error(existing_file: UploadedFile) -> HTTPException:
+    """409 response for an upload whose content already exists"""
+    return HTTPException(
+        status_code=409,
+        detail={
+            "error": "File already exists",
+            "message": f"A file with identical content already exists: {existing_file.filename}",
+            "existing_file": {
+                "file_id": existing_file.id,
+                "filename": existing_file.filename,
+                "uploaded_at": existing_file.created_at.isoformat() if existing_file.created_at else None,
+                "file_size": existing_file.file_size
+            }
+        }
+    )
+
+
+async def find_file_by_hash(db: AsyncSession, file_hash: str) -> Optional[UploadedFile]:
+    """Look up an uploaded file by SHA-256 content hash"""
+    result = await db.execute(
+        select(UploadedFile).where(UploadedFile.file_hash == file_hash).limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
 @router.post("/files/upload", response_model=FileUploadResponse)
 async def upload_single_file(
     request: Request,
     file: UploadFile = File(...),
     process_immediately: bool = Form(True),
     upload_source: str = Form("web_ui"),
+    file_hash: Optional[str] = Form(None, description="Client-computed SHA-256 of the file (hex)"),
     db: AsyncSession = Depends(get_db)
 ) -> FileUploadResponse:
-    """Upload a single file with enhanced validation and storage"""
+    """
+    Upload a single file with enhanced validation and storage
+
+    If the client sends the file's SHA-256 as file_hash, duplicates are rejected
+    before anything is written to storage. The hash is verified after storing.
+    """
     try:
         # Validate file type
         allowed_types = ['.xlsx', '.csv', '.json', '.parquet', '.xls']
@@ -124,6 +159,19 @@ async def upload_single_file(
                 detail="File size exceeds 100MB limit"
             )
 
+        # Reject known content before any bytes are written to storage
+        if file_hash:
+            file_hash = file_hash.strip().lower()
+            if len(file_hash) != 64 or any(c not in "0123456789abcdef" for c in file_hash):
+                raise HTTPException(
+                    status_code=400,
+                    detail="file_hash must be a hex-encoded SHA-256 digest"
+                )
+
+            existing_file = await find_file_by_hash(db, file_hash)
+            if existing_file:
+                raise duplicate_file_error(existing_file)
+
         # Generate file ID
         file_id = str(uuid.uuid4())
 
@@ -138,29 +186,21 @@ async def upload_single_file(
             }
         )
 
-        # Check for duplicate files by hash
-        duplicate_check = await db.execute(
-            select(UploadedFile).where(UploadedFile.file_hash == file_info["file_hash"])
-        )
-        existing_file = duplicate_check.scalar_one_or_none()
+        if file_hash and file_hash != file_info["file_hash"]:
+            # Corrupted or mislabelled upload - do not keep it
+            await storage_service.delete_file(file_info["file_path"])
+            raise HTTPException(
+                status_code=400,
+                detail="file_hash does not match the uploaded content"
+            )
+
+        # Check for duplicate files by hash (clients that sent no hash, or concurrent uploads)
+        existing_file = await find_file_by_hash(db, file_info["file_hash"])
 
         if existing_file:
             # File already exists - delete the newly uploaded file and return existing file info
             await storage_service.delete_file(file_info["file_path"])
-
-            raise HTTPException(
-                status_code=409,
-                detail={
-                    "error": "File already exists",
-                    "message": f"A file with identical content already exists: {existing_file.filename}",
-                    "existing_file": {
-                        "file_id": existing_file.id,
-                        "filename": existing_file.filename,
-                        "uploaded_at": existing_file.created_at.isoformat() if existing_file.created_at else None,
-                        "file_size": existing_file.file_size
-                    }
-                }
-            )
+            raise duplicate_file_error(existing_file)
 
         # Create database record
         db_file = UploadedFile(
@@ -231,7 +271,7 @@ async def upload_multiple_files(
         try:
             # Use the single file upload logic
             result = await upload_single_file(
-                request, file, process_immediately, upload_source, db
+                request, file, process_immediately, upload_source, file_hash=None, db=db
             )
             results.append(result)
         except HTTPException as e:
@@ -495,8 +535,25 @@ async def delete_file(
             delete(FileAccessLog).where(FileAccessLog.file_id == file_id)
         )
 
-        # Delete from storage
+        # Delete from storage (original, columnar sidecars and rollup cubes)
         await storage_service.delete_file(file_record.file_path)
+        sidecar_result = await db.execute(
+            select(WorksheetData.columnar_path, WorksheetData.kpi_summary).where(
+                WorksheetData.file_id == file_id
+            )
+        )
+        for sidecar, kpi_summary in sidecar_result.all():
+            if sidecar:
+                await storage_service.delete_file(sidecar)
+            if kpi_summary and kpi_summary.get("rollup_cube"):
+                await storage_service.delete_file(kpi_summary["rollup_cube"])
+
+        # Drop the parsed DataFrame and column profile cached for this file
+        if file_record.file_hash:
+            from langgraph_agents.tools.dataframe_cache import dataframe_cache
+            from langgraph_agents.tools.column_profiler import column_profiles
+            await dataframe_cache.invalidate(file_record.file_hash)
+            column_profiles.invalidate(file_record.file_hash)
 
         # Delete from database (cascade will handle worksheets and rows)
         await db.delete(file_record)
@@ -631,7 +688,10 @@ async def get_sync_status(db: AsyncSession = Depends(get_db)):
             }
         
         # Get counts from both sources
-        azure_files = await storage_service.list_files()
+        azure_files = [
+            f for f in await storage_service.list_files()
+            if not is_sidecar_path(f.get('name', '')) and not is_chart_path(f.get('name', ''))
+        ]
         db_result = await db.execute(select(func.count(UploadedFile.id)))
         db_count = db_result.scalar()
         
@@ -704,6 +764,10 @@ async def process_file_background(
                 file_record.processed_at = datetime.utcnow()
                 await db.commit()
                 
+                # Precompute brand KPIs so agents can skip the full-frame pass
+                if settings.kpi_precompute_enabled:
+                    await precompute_file_kpis(db, file_id)
+                
             except Exception as e:
                 # Update file status to error
                 file_record.status = "processing_error"
@@ -729,6 +793,49 @@ async def process_file_background(
         logging.error(f"Background processing failed for file {file_id}: {str(e)}")
 
 
+async def precompute_file_kpis(db: AsyncSession, file_id: str):
+    """Store KPI summaries for a processed file; failures leave the file usable"""
+    import logging
+    from langgraph_agents.tools.kpi_summary import precompute_kpi_summaries
+    
+    try:
+        await precompute_kpi_summaries(db, file_id)
+    except Exception as e:
+        await db.rollback()
+        logging.warning(f"KPI precompute failed for file {file_id}: {str(e)}")
+
+
+async def ingest_worksheet(
+    db: AsyncSession,
+    file_id: str,
+    sheet_name: str,
+    sheet_index: int,
+    df: pd.DataFrame
+) -> WorksheetData:
+    """Store a parsed worksheet: summary record, Parquet sidecar and bulk-inserted rows"""
+    worksheet_id = str(uuid.uuid4())
+    worksheet = WorksheetData(
+        id=worksheet_id,
+        file_id=file_id,
+        sheet_name=sheet_name,
+        sheet_index=sheet_index,
+        row_count=len(df),
+        column_count=len(df.columns),
+        column_headers=df.columns.tolist(),
+        data_types=df.dtypes.astype(str).to_dict(),
+        sample_data=frame_to_json_records(df.head(5)),
+        data_summary=df.describe().to_dict() if not df.empty else {},
+        columnar_path=await write_sidecar(file_id, sheet_index, df)
+    )
+    
+    db.add(worksheet)
+    await db.flush()
+    
+    # Store rows (limited to MAX_STORED_ROWS) with batched executemany inserts
+    await bulk_insert_worksheet_rows(db, df, worksheet_id)
+    return worksheet
+
+
 async def process_file_data(db: AsyncSession, file_id: str, file_path: str):
     """Process file and extract data to database"""
     try:
@@ -736,101 +843,17 @@ async def process_file_data(db: AsyncSession, file_id: str, file_path: str):
         extension = file_path.split('.')[-1].lower()
         
         if extension in ['xlsx', 'xls']:
-            # Process Excel file
-            excel_file = pd.ExcelFile(file_path)
+            # Process Excel file (parse each sheet once, off the event loop)
+            excel_file = await asyncio.to_thread(pd.ExcelFile, file_path)
             
             for sheet_index, sheet_name in enumerate(excel_file.sheet_names):
-                df = pd.read_excel(file_path, sheet_name=sheet_name)
-                
-                # Create worksheet record
-                worksheet_id = str(uuid.uuid4())
-                worksheet = WorksheetData(
-                    id=worksheet_id,
-                    file_id=file_id,
-                    sheet_name=sheet_name,
-                    sheet_index=sheet_index,
-                    row_count=len(df),
-                    column_count=len(df.columns),
-                    column_headers=df.columns.tolist(),
-                    data_types=df.dtypes.astype(str).to_dict(),
-                    sample_data=df.head(5).to_dict('records'),
-                    data_summary=df.describe().to_dict() if not df.empty else {}
-                )
-                
-                db.add(worksheet)
-                await db.flush()
-                
-                # Store rows (limit to prevent excessive memory usage)
-                max_rows = 10000  # Configurable limit
-                for row_index, (_, row) in enumerate(df.iterrows()):
-                    if row_index >= max_rows:
-                        break
-                        
-                    # Convert row to JSON-serializable format
-                    row_data = {}
-                    for col, value in row.items():
-                        if pd.isna(value):
-                            row_data[col] = None
-                        elif isinstance(value, (pd.Timestamp, datetime)):
-                            row_data[col] = value.isoformat()
-                        elif hasattr(value, 'item'):  # numpy types
-                            row_data[col] = value.item()
-                        else:
-                            row_data[col] = value
-                    
-                    worksheet_row = WorksheetRow(
-                        id=str(uuid.uuid4()),
-                        worksheet_id=worksheet_id,
-                        row_index=row_index,
-                        row_data=row_data
-                    )
-                    db.add(worksheet_row)
+                df = await asyncio.to_thread(excel_file.parse, sheet_name)
+                await ingest_worksheet(db, file_id, sheet_name, sheet_index, df)
         
         elif extension == 'csv':
             # Process CSV file
-            df = pd.read_csv(file_path)
-            
-            worksheet_id = str(uuid.uuid4())
-            worksheet = WorksheetData(
-                id=worksheet_id,
-                file_id=file_id,
-                sheet_name="Sheet1",
-                sheet_index=0,
-                row_count=len(df),
-                column_count=len(df.columns),
-                column_headers=df.columns.tolist(),
-                data_types=df.dtypes.astype(str).to_dict(),
-                sample_data=df.head(5).to_dict('records'),
-                data_summary=df.describe().to_dict() if not df.empty else {}
-            )
-            
-            db.add(worksheet)
-            await db.flush()
-            
-            # Store rows with limit
-            max_rows = 10000
-            for row_index, (_, row) in enumerate(df.iterrows()):
-                if row_index >= max_rows:
-                    break
-                    
-                row_data = {}
-                for col, value in row.items():
-                    if pd.isna(value):
-                        row_data[col] = None
-                    elif isinstance(value, (pd.Timestamp, datetime)):
-                        row_data[col] = value.isoformat()
-                    elif hasattr(value, 'item'):
-                        row_data[col] = value.item()
-                    else:
-                        row_data[col] = value
-                
-                worksheet_row = WorksheetRow(
-                    id=str(uuid.uuid4()),
-                    worksheet_id=worksheet_id,
-                    row_index=row_index,
-                    row_data=row_data
-                )
-                db.add(worksheet_row)
+            df = await asyncio.to_thread(pd.read_csv, file_path)
+            await ingest_worksheet(db, file_id, "Sheet1", 0, df)
         
         await db.commit()
         
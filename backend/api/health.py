@@ -4,12 +4,21 @@ System health and status endpoints
 """
 
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 from datetime import datetime
 from core.config import settings
 
 router = APIRouter()
 
 
+def _pool_ready(readiness: dict) -> bool:
+    """Whether a worker pool counts as ready for the readiness probe"""
+    if readiness["ready"]:
+        return True
+    # With startup warm-up disabled, pools start on first use; never having warmed is expected
+    return not settings.executor_warm_on_startup and readiness["status"] == "cold"
+
+
 @router.get("/health")
 async def health_check():
     """Basic health check endpoint"""
@@ -22,6 +31,33 @@ async def health_check():
     }
 
 
+@router.get("/health/workers")
+async def workers_readiness_check():
+    """
+    Readiness probe: 200 once analytics workers, chart renderers and chart sandboxes are warm, 503 before.
+
+    With executor_warm_on_startup off, pools that have not started yet count as ready.
+    """
+    from core.chart_renderer import chart_renderer
+    from core.chart_sandbox import chart_sandbox
+    from core.executors import task_executors
+
+    readiness = task_executors.readiness()
+    renderers = chart_renderer.readiness()
+    sandboxes = chart_sandbox.readiness()
+    ready = all(_pool_ready(state) for state in (readiness, renderers, sandboxes))
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            **readiness,
+            "warm_on_startup": settings.executor_warm_on_startup,
+            "chart_renderers": renderers,
+            "chart_sandboxes": sandboxes,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+    )
+
+
 @router.get("/health/detailed")
 async def detailed_health_check():
     """Detailed health check with system information"""
@@ -71,6 +107,16 @@ async def detailed_health_check():
 @router.get("/health/agents")
 async def agents_health_check():
     """Health check specifically for LangGraph agents"""
+    from langgraph_agents.graph_registry import graph_registry
+    from langgraph_agents.routing_cache import routing_cache
+    from langgraph_agents.tools.dataframe_cache import dataframe_cache
+    from langgraph_agents.tools.forecast_cache import forecast_cache
+    from langgraph_agents.tools.chart_code_cache import chart_code_cache
+    from core.chart_renderer import chart_renderer
+    from core.chart_sandbox import chart_sandbox
+    from core.executors import task_executors
+    from services.chart_store import chart_store
+
     return {
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat(),
@@ -80,6 +126,15 @@ async def agents_health_check():
             "total_agents": 6,
             "routing_strategy": "Supervisor-based conditional routing"
         },
+        "graph_registry": graph_registry.stats(),
+        "routing_cache": routing_cache.stats(),
+        "dataframe_cache": dataframe_cache.stats(),
+        "forecast_cache": forecast_cache.stats(),
+        "chart_code_cache": chart_code_cache.stats(),
+        "chart_renderer": chart_renderer.stats(),
+        "chart_sandbox": chart_sandbox.stats(),
+        "chart_store": chart_store.stats(),
+        "executors": task_executors.stats(),
         "agents": [
             {
                 "name": "supervisor",
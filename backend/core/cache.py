@@ -6,7 +6,10 @@ High-performance caching layer
 import redis.asyncio as redis
 import json
 import pickle
-from typing import Optional, Any, Union
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Any, Union, Callable, Dict, Tuple
 from datetime import timedelta
 import logging
 from core.config import settings
@@ -14,6 +17,115 @@ from core.config import settings
 logger = logging.getLogger(__name__)
 
 
+class LRUCache:
+    """
+    In-process LRU cache with optional TTL and byte budget.
+
+    Used as a front tier in front of Redis (or disk) so hot keys are served
+    without a network round trip. Thread-safe; values are stored by reference.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof or (lambda value: 0)
+        self._data: "OrderedDict[str, Tuple[Any, Optional[float], int]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get value and mark it most recently used"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at, _ = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """
+        Set value, evicting least recently used entries to stay in budget.
+
+        Returns:
+            bool: False if the value alone exceeds the byte budget
+        """
+        size = self._sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return False
+
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, expires_at, size)
+            self._total_bytes += size
+
+            while len(self._data) > self.max_entries or (
+                self.max_bytes is not None and self._total_bytes > self.max_bytes
+            ):
+                oldest_key = next(iter(self._data))
+                self._remove(oldest_key)
+                self.evictions += 1
+        return True
+
+    def delete(self, key: str) -> bool:
+        """Delete value"""
+        with self._lock:
+            if key not in self._data:
+                return False
+            self._remove(key)
+            return True
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        with self._lock:
+            self._data.clear()
+            self._total_bytes = 0
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._data.pop(key)
+        self._total_bytes -= size
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and occupancy"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self._total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
 class CacheService:
     """Redis cache service with async support"""
     
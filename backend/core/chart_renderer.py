@@ -0,0 +1,338 @@
+"""
+Agent-Chat Chart Renderer
+Persistent, warm renderer processes for Plotly PNG/SVG export
+
+create_chart used to call fig.to_image() on a chart thread for every chart.
+kaleido then ran in the app process: the first export after a deploy paid
+for starting Chromium, and kaleido handles one export at a time, so
+concurrent charts queued behind each other while holding chart threads.
+
+PNG (and SVG) export now goes through this service:
+
+- A pool of renderer processes, each keeping its own warm kaleido/Chromium
+  (services/render_kernels.py), started at app startup
+- A bounded request queue; figures beyond chart_render_queue_size are
+  returned without a PNG instead of piling up
+- At most one batch in flight per renderer. When a renderer frees up, every
+  waiting figure (up to chart_render_batch_size) is sent in one round trip
+- A timeout per export. A batch gets that timeout once per figure in it;
+  a batch that exceeds its deadline means a renderer is hung: the pool is
+  killed, restarted and warmed again
+
+A failed, timed-out or rejected export returns None. The chart HTML does
+not depend on the PNG, so the chart is still shown.
+
+Usage:
+    from core.chart_renderer import chart_renderer
+
+    png = await chart_renderer.render(fig.to_json())
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Sequence
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class _RenderRequest:
+    """One figure waiting in the render queue"""
+
+    __slots__ = ("figure_json", "image_format", "width", "height", "future", "queued_at")
+
+    def __init__(self, figure_json: str, image_format: str, width: int, height: int, future: asyncio.Future):
+        self.figure_json = figure_json
+        self.image_format = image_format
+        self.width = width
+        self.height = height
+        self.future = future
+        self.queued_at = time.perf_counter()
+
+
+class ChartRenderer:
+    """
+    Renderer worker pool with a bounded, batching request queue.
+    """
+
+    def __init__(
+        self,
+        workers: int = None,
+        queue_size: int = None,
+        batch_size: int = None,
+        timeout: float = None,
+        use_processes: Optional[bool] = None,
+    ):
+        self.workers = workers or settings.chart_render_workers
+        self.queue_size = queue_size or settings.chart_render_queue_size
+        self.batch_size = batch_size or settings.chart_render_batch_size
+        self.timeout = timeout or settings.chart_render_timeout_seconds
+        self.use_processes = settings.chart_render_use_processes if use_processes is None else use_processes
+
+        self._pool: Optional[Executor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._warm_state: Dict[str, Any] = {"status": "cold", "workers": []}
+        self._warm_task: Optional[asyncio.Task] = None
+        self._metrics = {
+            "completed": 0, "failed": 0, "timeouts": 0, "rejected": 0,
+            "batches": 0, "batched_figures": 0, "restarts": 0,
+            "wait_seconds": 0.0, "render_seconds": 0.0,
+        }
+
+    def _executor(self) -> Executor:
+        if self._pool is None:
+            from services.render_kernels import warm_renderer
+
+            if self.use_processes:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(settings.executor_start_method),
+                    initializer=warm_renderer,
+                )
+            else:
+                # In-process kaleido: same queue and batching, but renders serialize in kaleido
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="chart-render",
+                    initializer=warm_renderer,
+                )
+        return self._pool
+
+    def _restart(self, pool: Executor, reason: str) -> None:
+        """Replace the pool, killing renderers that may be stuck in Chromium, and warm the new one"""
+        if pool is not self._pool:
+            return  # Another batch on the same pool already restarted it
+        logger.warning(f"Restarting chart renderers: {reason}")
+        self._pool = None
+        self._metrics["restarts"] += 1
+        self._warm_state = {"status": "cold", "workers": []}
+        if isinstance(pool, ProcessPoolExecutor):
+            # shutdown() waits for running work; a hung export never finishes
+            for process in list((pool._processes or {}).values()):
+                process.kill()
+        pool.shutdown(wait=False, cancel_futures=True)
+        self.start_warmup()
+
+    def _ensure_dispatcher(self) -> None:
+        if self._dispatcher is None or self._dispatcher.done():
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._slots = asyncio.Semaphore(self.workers)
+            self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        """Send queued figures to free renderers, batching whatever is waiting"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._slots.acquire()
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            loop.create_task(self._render_batch(batch))
+
+    async def _render_batch(self, batch: List[_RenderRequest]) -> None:
+        # Requests whose caller already timed out or went away are skipped
+        live = [request for request in batch if not request.future.done()]
+        try:
+            if not live:
+                return
+
+            from services.render_kernels import render_figures
+
+            started = time.perf_counter()
+            for request in live:
+                self._metrics["wait_seconds"] += started - request.queued_at
+            self._metrics["batches"] += 1
+            self._metrics["batched_figures"] += len(live)
+
+            figures = [
+                (request.figure_json, request.image_format, request.width, request.height)
+                for request in live
+            ]
+            # Figures in a batch export one after another, so each adds one export timeout
+            deadline = self.timeout * len(live)
+            pool = None
+            try:
+                pool = self._executor()
+                future = pool.submit(render_figures, figures)
+                results = await asyncio.wait_for(asyncio.wrap_future(future), deadline)
+            except asyncio.TimeoutError:
+                self._restart(pool, f"batch of {len(live)} figures exceeded {deadline}s")
+                results = [(None, "render timed out")] * len(live)
+            except BrokenProcessPool as e:
+                self._restart(pool, f"renderer process died ({e})")
+                results = [(None, "renderer process died")] * len(live)
+            except Exception as e:
+                logger.warning(f"Chart render batch failed: {e}")
+                results = [(None, str(e))] * len(live)
+
+            self._metrics["render_seconds"] += time.perf_counter() - started
+            for request, (image, error) in zip(live, results):
+                if not request.future.done():
+                    request.future.set_result((image, error))
+        finally:
+            self._slots.release()
+
+    async def render(
+        self,
+        figure_json: str,
+        width: int = None,
+        height: int = None,
+        image_format: str = "png",
+    ) -> Optional[bytes]:
+        """
+        Export one figure to an image on a warm renderer.
+
+        Args:
+            figure_json: Plotly figure JSON (fig.to_json())
+            width: Image width in pixels (default: chart_render_width)
+            height: Image height in pixels (default: chart_render_height)
+            image_format: "png" or "svg"
+
+        Returns:
+            Optional[bytes]: Image bytes, or None if the export failed, timed
+            out or the queue was full
+        """
+        self._ensure_dispatcher()
+        future = asyncio.get_running_loop().create_future()
+        request = _RenderRequest(
+            figure_json,
+            image_format,
+            width or settings.chart_render_width,
+            height or settings.chart_render_height,
+            future,
+        )
+
+        try:
+            self._queue.put_nowait(request)
+        except asyncio.QueueFull:
+            self._metrics["rejected"] += 1
+            logger.warning(f"Chart render queue full ({self.queue_size}); skipping {image_format} export")
+            return None
+
+        try:
+            # Covers queue wait and export; a late result is dropped
+            image, error = await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            self._metrics["timeouts"] += 1
+            logger.warning(f"Chart {image_format} export timed out after {self.timeout}s")
+            return None
+
+        if error:
+            self._metrics["failed"] += 1
+            logger.warning(f"Could not generate {image_format}: {error}")
+            return None
+
+        self._metrics["completed"] += 1
+        return image
+
+    async def render_many(
+        self,
+        figures: Sequence[str],
+        width: int = None,
+        height: int = None,
+        image_format: str = "png",
+    ) -> List[Optional[bytes]]:
+        """
+        Export several figures; they are queued together and batched.
+
+        Args:
+            figures: Plotly figure JSON per figure
+            width: Image width in pixels
+            height: Image height in pixels
+            image_format: "png" or "svg"
+
+        Returns:
+            List[Optional[bytes]]: Image bytes or None per figure, in order
+        """
+        return list(await asyncio.gather(
+            *(self.render(figure, width, height, image_format) for figure in figures)
+        ))
+
+    async def warm(self) -> Dict[str, Any]:
+        """
+        Start every renderer and wait until each has launched Chromium.
+
+        Returns:
+            Dict[str, Any]: Readiness state (see readiness())
+        """
+        from services.render_kernels import renderer_status
+
+        self._warm_state = {"status": "warming", "workers": []}
+        started = time.perf_counter()
+        try:
+            pool = self._executor()
+            # One probe per worker; each holds its worker briefly so probes spread across all of them
+            probes = [asyncio.wrap_future(pool.submit(renderer_status, 0.2)) for _ in range(self.workers)]
+            statuses = await asyncio.gather(*probes)
+        except Exception as e:
+            logger.error(f"Chart renderer warm-up failed: {e}")
+            self._warm_state = {"status": "failed", "workers": [], "error": str(e)}
+            return self.readiness()
+
+        workers = list({status["pid"]: status for status in statuses}.values())
+        self._warm_state = {
+            "status": "warm",
+            "workers": workers,
+            "warmup_seconds": round(time.perf_counter() - started, 2),
+        }
+        logger.info(f"Chart renderers warm: {len(workers)} workers in {self._warm_state['warmup_seconds']}s")
+        return self.readiness()
+
+    def start_warmup(self) -> Optional[asyncio.Task]:
+        """Warm the renderers in the background (no-op if already warming)"""
+        if self._warm_task is None or self._warm_task.done():
+            self._warm_task = asyncio.get_running_loop().create_task(self.warm())
+        return self._warm_task
+
+    def readiness(self) -> Dict[str, Any]:
+        """Warm-up state of the renderers"""
+        return {
+            "ready": self._warm_state["status"] == "warm",
+            **self._warm_state,
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the dispatcher and the renderers, dropping queued figures"""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            self._dispatcher = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+            self._warm_state = {"status": "cold", "workers": []}
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool configuration, queue depth and export counters"""
+        metrics = self._metrics
+        batches = metrics["batches"]
+        figures = metrics["batched_figures"]
+        return {
+            "pool": "process" if self.use_processes else "thread",
+            "workers": self.workers,
+            "started": self._pool is not None,
+            "warm": self._warm_state["status"],
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "queue_size": self.queue_size,
+            "batch_size": self.batch_size,
+            "timeout_seconds": self.timeout,
+            "completed": metrics["completed"],
+            "failed": metrics["failed"],
+            "timeouts": metrics["timeouts"],
+            "rejected": metrics["rejected"],
+            "restarts": metrics["restarts"],
+            "batches": batches,
+            "avg_batch_size": round(figures / batches, 2) if batches else 0.0,
+            "avg_wait_ms": round(metrics["wait_seconds"] / figures * 1000, 2) if figures else 0.0,
+            "avg_batch_render_ms": round(metrics["render_seconds"] / batches * 1000, 2) if batches else 0.0,
+        }
+
+
+# Global chart renderer instance
+chart_renderer = ChartRenderer()
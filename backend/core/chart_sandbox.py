@@ -0,0 +1,297 @@
+"""
+Agent-Chat Chart Sandbox
+Generated chart code executed in restricted, time-limited worker processes
+
+execute_chart_code used to exec() LLM-generated code on a chart thread in
+the server process. It ran with no time, CPU or memory limit. A snippet that
+looped, or built a frame far larger than the data, held a chart thread and
+the GIL and grew the server's memory, which stalled every other request.
+
+Chart code now runs here:
+
+- A pool of sandbox processes (services/sandbox_kernels.py), each with an
+  address-space limit, a per-execution CPU-time budget and a reduced set of
+  builtins and imports
+- One execution per worker at a time; callers beyond chart_sandbox_workers
+  wait for a free worker
+- A wall-clock timeout per execution. An execution that exceeds it is
+  treated as hung: the pool is killed, restarted and warmed again, and the
+  caller gets an error instead of waiting
+- The frame is written once into a shared memory segment as an Arrow IPC
+  stream and read by the worker from there. It is neither pickled nor sent
+  through the pool's pipe. The segment is unlinked when the execution ends
+- The figure comes back as Plotly JSON
+
+Failures are returned as error messages, like any other chart code error,
+so create_chart regenerates or reports them as before.
+
+Usage:
+    from core.chart_sandbox import chart_sandbox
+
+    figure_json, error = await chart_sandbox.execute(code, df)
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _share_frame(df: pd.DataFrame) -> Optional[Tuple[shared_memory.SharedMemory, int]]:
+    """
+    Write a frame into a new shared memory segment as an Arrow IPC stream.
+
+    Returns the segment and the stream size, or None when pyarrow is missing
+    or a column is not Arrow-serializable (the frame is then pickled to the
+    worker instead).
+    """
+    from services.sandbox_kernels import ARROW_AVAILABLE
+
+    if not ARROW_AVAILABLE:
+        return None
+    import pyarrow as pa
+
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+        return None
+
+    # Size the segment first, then write the stream straight into it
+    counter = pa.MockOutputStream()
+    with pa.ipc.new_stream(counter, table.schema) as writer:
+        writer.write_table(table)
+    size = counter.size()
+
+    segment = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    try:
+        with pa.ipc.new_stream(pa.FixedSizeBufferWriter(pa.py_buffer(segment.buf)), table.schema) as writer:
+            writer.write_table(table)
+    except BaseException:
+        _release_segment(segment)
+        raise
+    return segment, size
+
+
+def _release_segment(segment: shared_memory.SharedMemory) -> None:
+    try:
+        segment.close()
+    except BufferError:
+        pass  # A buffer still references the mapping; it is unmapped when that goes away
+    try:
+        segment.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class ChartSandbox:
+    """
+    Sandboxed worker pool for generated chart code.
+    """
+
+    def __init__(
+        self,
+        workers: int = None,
+        timeout: float = None,
+        cpu_seconds: float = None,
+        memory_mb: int = None,
+        use_processes: Optional[bool] = None,
+    ):
+        self.workers = workers or settings.chart_sandbox_workers
+        self.timeout = timeout or settings.chart_sandbox_timeout_seconds
+        self.cpu_seconds = settings.chart_sandbox_cpu_seconds if cpu_seconds is None else cpu_seconds
+        self.memory_mb = settings.chart_sandbox_memory_mb if memory_mb is None else memory_mb
+        self.use_processes = settings.chart_sandbox_use_processes if use_processes is None else use_processes
+
+        self._pool: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._warm_state: Dict[str, Any] = {"status": "cold", "workers": []}
+        self._warm_task: Optional[asyncio.Task] = None
+        self._metrics = {
+            "completed": 0, "failed": 0, "timeouts": 0, "restarts": 0,
+            "shared_frames": 0, "pickled_frames": 0, "shared_bytes": 0,
+            "wait_seconds": 0.0, "run_seconds": 0.0,
+        }
+
+    def _executor(self) -> Executor:
+        if self._pool is None:
+            if self.use_processes:
+                from services.sandbox_kernels import init_sandbox
+
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(settings.executor_start_method),
+                    initializer=init_sandbox,
+                    initargs=(self.memory_mb * 1024 * 1024,),
+                )
+            else:
+                # In-process execution: same interface, no isolation or limits
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="chart-sandbox")
+        return self._pool
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+        return self._slots
+
+    def _restart(self, pool: Executor, reason: str) -> None:
+        """Replace the pool, killing workers that may still be running chart code, and warm the new one"""
+        if pool is not self._pool:
+            return  # Another execution on the same pool already restarted it
+        logger.warning(f"Restarting chart sandbox: {reason}")
+        self._pool = None
+        self._metrics["restarts"] += 1
+        self._warm_state = {"status": "cold", "workers": []}
+        if isinstance(pool, ProcessPoolExecutor):
+            # shutdown() waits for running work; runaway code never finishes
+            for process in list((pool._processes or {}).values()):
+                process.kill()
+        pool.shutdown(wait=False, cancel_futures=True)
+        self.start_warmup()
+
+    async def execute(self, code: str, df: pd.DataFrame) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Run chart code on a frame in a sandbox worker.
+
+        Args:
+            code: Generated chart code (assigns a go.Figure to 'fig')
+            df: DataFrame available to the code as 'df'
+
+        Returns:
+            Tuple[Optional[str], Optional[str]]: (figure JSON, None) or (None, error message)
+        """
+        from services.sandbox_kernels import execute_chart
+
+        queued_at = time.perf_counter()
+        async with self._semaphore():
+            started = time.perf_counter()
+            self._metrics["wait_seconds"] += started - queued_at
+
+            segment, frame, cpu_seconds = None, df, 0
+            if self.use_processes:
+                # The CPU budget relies on the worker's SIGXCPU handler; threads never get one
+                cpu_seconds = self.cpu_seconds
+                shared = await asyncio.to_thread(_share_frame, df)
+                if shared is not None:
+                    segment, size = shared
+                    frame = (segment.name, size)
+                    self._metrics["shared_frames"] += 1
+                    self._metrics["shared_bytes"] += size
+                else:
+                    self._metrics["pickled_frames"] += 1
+
+            pool = self._executor()
+            try:
+                future = pool.submit(execute_chart, code, frame, cpu_seconds)
+                figure_json, error = await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+            except asyncio.TimeoutError:
+                self._metrics["timeouts"] += 1
+                self._restart(pool, f"chart code exceeded {self.timeout}s")
+                figure_json, error = None, f"Chart code timed out after {self.timeout}s"
+            except BrokenProcessPool as e:
+                self._restart(pool, f"sandbox process died ({e})")
+                figure_json, error = None, "Chart code crashed the sandbox process"
+            except Exception as e:
+                figure_json, error = None, f"Error executing chart code: {str(e)}"
+            finally:
+                if segment is not None:
+                    _release_segment(segment)
+
+            self._metrics["run_seconds"] += time.perf_counter() - started
+
+        if error:
+            self._metrics["failed"] += 1
+        else:
+            self._metrics["completed"] += 1
+        return figure_json, error
+
+    async def warm(self) -> Dict[str, Any]:
+        """
+        Start every sandbox worker and wait until each has applied its limits.
+
+        Returns:
+            Dict[str, Any]: Readiness state (see readiness())
+        """
+        if not self.use_processes:
+            self._warm_state = {"status": "warm", "workers": [], "reason": "sandbox processes disabled"}
+            return self.readiness()
+
+        from services.sandbox_kernels import sandbox_status
+
+        self._warm_state = {"status": "warming", "workers": []}
+        started = time.perf_counter()
+        try:
+            pool = self._executor()
+            # One probe per worker; each holds its worker briefly so probes spread across all of them
+            probes = [asyncio.wrap_future(pool.submit(sandbox_status, 0.2)) for _ in range(self.workers)]
+            statuses = await asyncio.gather(*probes)
+        except Exception as e:
+            logger.error(f"Chart sandbox warm-up failed: {e}")
+            self._warm_state = {"status": "failed", "workers": [], "error": str(e)}
+            return self.readiness()
+
+        workers = list({status["pid"]: status for status in statuses}.values())
+        self._warm_state = {
+            "status": "warm",
+            "workers": workers,
+            "warmup_seconds": round(time.perf_counter() - started, 2),
+        }
+        logger.info(f"Chart sandbox warm: {len(workers)} workers in {self._warm_state['warmup_seconds']}s")
+        return self.readiness()
+
+    def start_warmup(self) -> Optional[asyncio.Task]:
+        """Warm the sandbox workers in the background (no-op if already warming)"""
+        if self._warm_task is None or self._warm_task.done():
+            self._warm_task = asyncio.get_running_loop().create_task(self.warm())
+        return self._warm_task
+
+    def readiness(self) -> Dict[str, Any]:
+        """Warm-up state of the sandbox workers"""
+        return {
+            "ready": self._warm_state["status"] == "warm",
+            **self._warm_state,
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the sandbox workers, dropping queued executions"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+            self._warm_state = {"status": "cold", "workers": []}
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool configuration, limits and execution counters"""
+        metrics = self._metrics
+        runs = metrics["completed"] + metrics["failed"]
+        return {
+            "pool": "process" if self.use_processes else "thread",
+            "workers": self.workers,
+            "started": self._pool is not None,
+            "warm": self._warm_state["status"],
+            "timeout_seconds": self.timeout,
+            "cpu_seconds": self.cpu_seconds,
+            "memory_mb": self.memory_mb,
+            "completed": metrics["completed"],
+            "failed": metrics["failed"],
+            "timeouts": metrics["timeouts"],
+            "restarts": metrics["restarts"],
+            "shared_frames": metrics["shared_frames"],
+            "pickled_frames": metrics["pickled_frames"],
+            "avg_shared_kb": round(metrics["shared_bytes"] / metrics["shared_frames"] / 1024, 1)
+            if metrics["shared_frames"] else 0.0,
+            "avg_wait_ms": round(metrics["wait_seconds"] / runs * 1000, 2) if runs else 0.0,
+            "avg_run_ms": round(metrics["run_seconds"] / runs * 1000, 2) if runs else 0.0,
+        }
+
+
+# Global chart sandbox instance
+chart_sandbox = ChartSandbox()
@@ -97,12 +97,103 @@ class Settings(BaseSettings):
     REQUESTY_AI_API_BASE: Optional[str] = Field(default=None, alias="REQUESTY_AI_API_BASE")
     anthropic_api_key: Optional[str] = Field(default=None, alias="ANTHROPIC_API_KEY")
     embedding_model: str = "all-MiniLM-L6-v2"
+    llm_http2: bool = True
+    llm_max_connections: int = 100
+    llm_max_keepalive_connections: int = 20
+    llm_keepalive_expiry_seconds: float = 60.0
+    llm_max_concurrency_per_model: int = 16
+    llm_request_timeout_seconds: float = 120.0
     max_embedding_batch_size: int = 32
 
     # Agent Configuration
     max_concurrent_agents: int = 10
     agent_timeout_seconds: int = 300  # 5 minutes
     agent_retry_attempts: int = 3
+    supervisor_fast_path_enabled: bool = True
+    supervisor_fast_path_threshold: float = 0.8  # Min local confidence to skip the LLM
+    supervisor_embedding_router_enabled: bool = False  # Requires sentence-transformers
+    routing_cache_enabled: bool = True
+    routing_cache_ttl_seconds: int = 86400  # 24 hours
+    routing_cache_max_entries: int = 2048  # In-process LRU tier
+
+    # Parsed DataFrame cache (keyed by file hash)
+    dataframe_cache_enabled: bool = True
+    dataframe_cache_max_entries: int = 64
+    dataframe_cache_memory_bytes: int = 512 * 1024 * 1024  # 512MB in-memory tier
+    dataframe_cache_disk_bytes: int = 5 * 1024 * 1024 * 1024  # 5GB Arrow tier
+    dataframe_cache_dir: str = ""  # Default: <upload_dir>/processed/frames
+
+    # Worker pools for CPU-bound agent work (core/executors.py)
+    executor_use_processes: bool = True  # False runs forecast/anomaly tasks on threads
+    executor_process_workers: int = 0  # 0 = min(4, CPU count)
+    executor_thread_workers: int = 8
+    executor_start_method: str = "spawn"  # Workers must not inherit the event loop's threads
+    executor_warm_workers: bool = True  # Import Prophet/sklearn/plotly/kaleido in each worker up front
+    executor_warm_on_startup: bool = True  # Start all process workers during app startup
+    executor_forecast_concurrency: int = 2
+    executor_forecast_batch_concurrency: int = 0  # 0 = one chunk per process worker
+    executor_anomaly_concurrency: int = 2
+    executor_chart_concurrency: int = 4
+    executor_parse_concurrency: int = 4
+
+    # Forecast result cache (keyed by data fingerprint and model settings)
+    forecast_cache_enabled: bool = True
+    forecast_cache_max_entries: int = 256
+    forecast_cache_memory_bytes: int = 64 * 1024 * 1024  # 64MB in-memory tier
+    forecast_cache_disk_bytes: int = 512 * 1024 * 1024  # 512MB JSON tier
+    forecast_cache_dir: str = ""  # Default: <upload_dir>/processed/forecasts
+
+    # Forecast engine: "auto" (statistical for short/monthly series), "prophet" or "statistical"
+    forecast_engine: str = "auto"
+    forecast_statistical_max_points: int = 104  # Series shorter than this skip Prophet in auto mode
+
+    # Batched multi-series forecasting (one forecast per brand/region/...)
+    forecast_batch_max_series: int = 500  # Entity columns with more values are not split
+    forecast_batch_prophet_max_series: int = 200  # Largest series get Prophet; the rest use Holt
+    forecast_batch_min_prophet_points: int = 30  # Shorter series use vectorized Holt smoothing
+
+    # Anomaly scoring (every numeric column, all detectors in one pass)
+    anomaly_memory_budget_bytes: int = 256 * 1024 * 1024  # Scratch memory per chunk of rows
+    anomaly_fit_sample_rows: int = 20000  # Rows sampled to fit Isolation Forest
+    anomaly_lof_max_rows: int = 100000  # Larger frames: LOF scores only the top flagged rows
+    anomaly_streaming_enabled: bool = True  # Incremental time-series baselines per file lineage
+
+    # Brand KPI summaries computed once per worksheet after ingest
+    kpi_precompute_enabled: bool = True
+
+    # Column profiles (kinds, roles, cardinality) shared by all agents, keyed by file hash
+    column_profile_cache_max_entries: int = 256
+
+    # Generated chart code cache (normalized query + column schema + chart type)
+    chart_code_cache_enabled: bool = True
+    chart_code_cache_ttl_seconds: int = 7 * 86400  # 1 week
+    chart_code_cache_max_entries: int = 1024  # In-process LRU tier
+
+    # Chart PNG export on persistent kaleido renderer processes (core.chart_renderer)
+    chart_render_use_processes: bool = True  # False renders on threads in the app process
+    chart_render_workers: int = 2  # Each keeps its own Chromium (~150MB)
+    chart_render_queue_size: int = 64  # Charts beyond this are returned without a PNG
+    chart_render_batch_size: int = 8  # Waiting figures sent to a renderer in one round trip
+    chart_render_timeout_seconds: float = 30.0  # Per export; a hung batch restarts the renderers
+    chart_render_width: int = 1200
+    chart_render_height: int = 800
+
+    # Generated chart code execution in restricted worker processes (core.chart_sandbox)
+    chart_sandbox_use_processes: bool = True  # False runs chart code on threads in the app process, unlimited
+    chart_sandbox_workers: int = 2
+    chart_sandbox_timeout_seconds: float = 20.0  # Wall clock per execution; exceeding it kills the worker
+    chart_sandbox_cpu_seconds: float = 10.0  # CPU time per execution
+    chart_sandbox_memory_mb: int = 2048  # Address space per worker (a warm worker maps ~400MB)
+
+    # Content-addressed chart artifacts (services.chart_store), served by api/charts.py
+    chart_store_max_entries: int = 256  # In-process LRU of recently served artifacts
+    chart_store_memory_bytes: int = 64 * 1024 * 1024  # 64MB
+    chart_lazy_render: bool = False  # Store figure JSON only; render PNG/SVG/HTML on first GET
+
+    # Pre-plot data reduction (tools.chart_reduction) for frames above the point budget
+    chart_reduction_enabled: bool = True
+    chart_point_budget: int = 5000  # Rows passed to chart code unchanged up to this size
+    chart_max_categories: int = 20  # Top-N entities kept; the rest become "Other"
 
     # Monitoring & Logging
     log_level: str = "INFO"
@@ -0,0 +1,297 @@
+"""
+Agent-Chat Task Executors
+Managed worker pools for CPU-bound and blocking work in agent nodes
+
+Agent nodes are coroutines on the uvicorn event loop. Prophet fits,
+IsolationForest/LOF, Plotly rendering and pandas parsing used to run inline,
+which blocked every other request while they ran. Nodes now submit that work
+here by task type:
+
+- Process pool for heavy numeric work (forecast, forecast_batch, anomaly) that holds the GIL
+- Thread pool for parsing and rendering (parse, chart) that mostly releases it
+
+Each task type has its own concurrency limit, so a burst of forecasts cannot
+starve chart rendering. Per-type queue depth and counters are reported by
+/health/agents.
+
+If the awaiting coroutine is cancelled (for example, the client disconnected),
+a task that has not started yet is dropped. A task that is already running
+finishes in its worker, and its slot stays taken until it does.
+
+Process-pool functions must be picklable module-level functions in
+import-light modules (see services/analytics_kernels.py). Workers are spawned
+and import the function's module from scratch.
+
+Process workers are warmed at startup (warm()). Every worker runs
+analytics_kernels.warm_worker, which imports Prophet, scikit-learn, plotly
+and kaleido and keeps them resident, so the first forecast after a deploy is
+not slower than later ones. /health/workers reports when they are ready.
+
+Usage:
+    from core.executors import task_executors
+
+    forecast = await task_executors.run("forecast", prophet_forecast, history, periods)
+"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROCESS = "process"
+THREAD = "thread"
+
+# Task type -> pool it runs on
+TASK_POOLS = {
+    "forecast": PROCESS,
+    "forecast_batch": PROCESS,
+    "anomaly": PROCESS,
+    "chart": THREAD,
+    "parse": THREAD,
+}
+
+
+class TaskExecutors:
+    """
+    Process and thread pools with per-task-type concurrency limits.
+    """
+
+    def __init__(
+        self,
+        process_workers: int = None,
+        thread_workers: int = None,
+        limits: Optional[Dict[str, int]] = None,
+        use_processes: Optional[bool] = None,
+    ):
+        self.process_workers = process_workers or settings.executor_process_workers or min(4, os.cpu_count() or 1)
+        self.thread_workers = thread_workers or settings.executor_thread_workers
+        self.use_processes = settings.executor_use_processes if use_processes is None else use_processes
+        self.limits = {
+            "forecast": settings.executor_forecast_concurrency,
+            # Batched forecasts fan out across every worker by default
+            "forecast_batch": settings.executor_forecast_batch_concurrency or self.process_workers,
+            "anomaly": settings.executor_anomaly_concurrency,
+            "chart": settings.executor_chart_concurrency,
+            "parse": settings.executor_parse_concurrency,
+        }
+        self.limits.update(limits or {})
+
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._warm_state: Dict[str, Any] = {"status": "cold", "workers": []}
+        self._warm_task: Optional[asyncio.Task] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._metrics = {
+            task_type: {"queued": 0, "running": 0, "completed": 0, "failed": 0, "cancelled": 0, "wait_seconds": 0.0}
+            for task_type in TASK_POOLS
+        }
+
+    def _pool(self, task_type: str) -> Executor:
+        if TASK_POOLS[task_type] == PROCESS and self.use_processes:
+            if self._process_pool is None:
+                initializer = None
+                if settings.executor_warm_workers:
+                    from services.analytics_kernels import warm_worker
+                    initializer = warm_worker
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.process_workers,
+                    mp_context=multiprocessing.get_context(settings.executor_start_method),
+                    initializer=initializer,
+                )
+            return self._process_pool
+
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self.thread_workers,
+                thread_name_prefix="agent-task",
+            )
+        return self._thread_pool
+
+    def _submit(self, task_type: str, call: Callable[[], Any]) -> Future:
+        try:
+            return self._pool(task_type).submit(call)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed) and took the pool with it; start a fresh one
+            logger.warning("Process pool is broken; restarting it")
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+            self._warm_state = {"status": "cold", "workers": []}
+            future = self._pool(task_type).submit(call)
+            self.start_warmup()
+            return future
+
+    def _semaphore(self, task_type: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(task_type)
+        if semaphore is None:
+            semaphore = self._semaphores[task_type] = asyncio.Semaphore(self.limits[task_type])
+        return semaphore
+
+    def _release(self, task_type: str) -> None:
+        self._metrics[task_type]["running"] -= 1
+        self._semaphores[task_type].release()
+
+    async def run(self, task_type: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a blocking function on the pool for its task type.
+
+        Waits for a free slot under the task type's concurrency limit first.
+
+        Args:
+            task_type: One of TASK_POOLS ("forecast", "forecast_batch", "anomaly", "chart", "parse")
+            func: Function to run (module-level and picklable for process task types)
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Any: func's return value (exceptions raised by func propagate)
+        """
+        if task_type not in TASK_POOLS:
+            raise ValueError(f"Unknown task type: {task_type}")
+
+        metrics = self._metrics[task_type]
+        semaphore = self._semaphore(task_type)
+        loop = asyncio.get_running_loop()
+
+        metrics["queued"] += 1
+        queued_at = time.perf_counter()
+        try:
+            await semaphore.acquire()
+        except asyncio.CancelledError:
+            metrics["cancelled"] += 1
+            raise
+        finally:
+            metrics["queued"] -= 1
+        metrics["wait_seconds"] += time.perf_counter() - queued_at
+        metrics["running"] += 1
+
+        try:
+            future = self._submit(task_type, functools.partial(func, *args, **kwargs))
+        except BaseException:
+            self._release(task_type)
+            metrics["failed"] += 1
+            raise
+
+        def finished(_: Future) -> None:
+            # Runs on a pool thread; the slot is freed only once the work has really stopped
+            try:
+                loop.call_soon_threadsafe(self._release, task_type)
+            except RuntimeError:
+                pass  # Event loop already closed (shutdown)
+
+        future.add_done_callback(finished)
+
+        try:
+            # Cancelling this await cancels the pool future if it has not started
+            result = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            metrics["cancelled"] += 1
+            raise
+        except Exception:
+            metrics["failed"] += 1
+            raise
+
+        metrics["completed"] += 1
+        return result
+
+    async def warm(self) -> Dict[str, Any]:
+        """
+        Start every process worker and wait until each has run its initializer.
+
+        Returns:
+            Dict[str, Any]: Readiness state (see readiness())
+        """
+        if not self.use_processes:
+            self._warm_state = {"status": "warm", "workers": [], "reason": "process pool disabled"}
+            return self.readiness()
+
+        from services.analytics_kernels import worker_status
+
+        self._warm_state = {"status": "warming", "workers": []}
+        started = time.perf_counter()
+        try:
+            pool = self._pool("forecast")
+            # One probe per worker; each holds its worker briefly so probes spread across all of them
+            probes = [
+                asyncio.wrap_future(pool.submit(worker_status, 0.2))
+                for _ in range(self.process_workers)
+            ]
+            statuses = await asyncio.gather(*probes)
+        except Exception as e:
+            logger.error(f"Process pool warm-up failed: {e}")
+            self._warm_state = {"status": "failed", "workers": [], "error": str(e)}
+            return self.readiness()
+
+        workers = list({status["pid"]: status for status in statuses}.values())
+        self._warm_state = {
+            "status": "warm",
+            "workers": workers,
+            "warmup_seconds": round(time.perf_counter() - started, 2),
+        }
+        logger.info(f"Process pool warm: {len(workers)} workers in {self._warm_state['warmup_seconds']}s")
+        return self.readiness()
+
+    def start_warmup(self) -> Optional[asyncio.Task]:
+        """Warm the process pool in the background (no-op if already warming)"""
+        if self._warm_task is None or self._warm_task.done():
+            self._warm_task = asyncio.get_running_loop().create_task(self.warm())
+        return self._warm_task
+
+    def readiness(self) -> Dict[str, Any]:
+        """Warm-up state of the process workers"""
+        return {
+            "ready": self._warm_state["status"] == "warm",
+            **self._warm_state,
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop both pools, dropping queued work"""
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=wait, cancel_futures=True)
+            self._process_pool = None
+            self._warm_state = {"status": "cold", "workers": []}
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=wait, cancel_futures=True)
+            self._thread_pool = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool configuration and per-task-type queue metrics"""
+        tasks = {}
+        for task_type, metrics in self._metrics.items():
+            started = metrics["completed"] + metrics["failed"] + metrics["running"]
+            tasks[task_type] = {
+                "pool": TASK_POOLS[task_type] if self.use_processes else THREAD,
+                "limit": self.limits[task_type],
+                "queued": metrics["queued"],
+                "running": metrics["running"],
+                "completed": metrics["completed"],
+                "failed": metrics["failed"],
+                "cancelled": metrics["cancelled"],
+                "avg_wait_ms": round(metrics["wait_seconds"] / started * 1000, 2) if started else 0.0,
+            }
+        return {
+            "process_pool": {
+                "enabled": self.use_processes,
+                "workers": self.process_workers,
+                "start_method": settings.executor_start_method,
+                "started": self._process_pool is not None,
+                "warm": self._warm_state["status"],
+            },
+            "thread_pool": {
+                "workers": self.thread_workers,
+                "started": self._thread_pool is not None,
+            },
+            "tasks": tasks,
+        }
+
+
+# Global task executors instance
+task_executors = TaskExecutors()
@@ -7,14 +7,15 @@ Agents are implemented as nodes in a state graph with type-safe state management
 Architecture:
 - state.py: AgentState definition (type-safe state)
 - graph.py: Main graph definition and supervisor
+- graph_registry.py: Process-wide compiled graph cache with hot-swap
 - nodes/: Individual agent implementations
 - tools/: Shared tools (database, storage, charts)
 - tests/: Comprehensive test suite
 
 Usage:
-    from langgraph_agents import create_agent_graph
+    from langgraph_agents import graph_registry
 
-    graph = create_agent_graph()
+    graph = graph_registry.get()  # compiled once per process
     result = await graph.ainvoke({"messages": [{"role": "user", "content": "Hello"}]})
 """
 
@@ -22,6 +23,7 @@ __version__ = "2.0.0"
 __author__ = "Agent-Chat Team"
 
 from langgraph_agents.graph import create_agent_graph
+from langgraph_agents.graph_registry import graph_registry, get_compiled_graph
 from langgraph_agents.state import AgentState
 
-__all__ = ["create_agent_graph", "AgentState"]
\ No newline at end of file
+__all__ = ["create_agent_graph", "graph_registry", "get_compiled_graph", "AgentState"]
\ No newline at end of file
@@ -67,7 +67,10 @@ AGENTS = [
         "output_schema": {
             "type": "object",
             "properties": {
-                "chart_url": {"type": "string", "description": "Chart PNG URL"},
+                "chart_id": {"type": "string", "description": "Content-addressed chart ID"},
+                "chart_url": {"type": "string", "description": "Interactive chart HTML URL"},
+                "chart_png_url": {"type": "string", "description": "Chart PNG URL"},
+                "lazy_render": {"type": "boolean", "description": "Exports render on first request"},
                 "chart_type": {"type": "string", "description": "Chart type"},
             },
         },
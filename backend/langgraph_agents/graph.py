@@ -28,6 +28,9 @@ from langgraph_agents.nodes.forecasting_agent import forecasting_agent_node
 from langgraph_agents.nodes.anomaly_detection_agent import anomaly_detection_agent_node
 from langgraph_agents.nodes.general_agent import general_agent_node
 
+# Bump when nodes or edges change so the graph registry compiles a fresh graph
+GRAPH_VERSION = "2.0.0"
+
 
 def create_agent_graph() -> StateGraph:
     """
@@ -100,8 +103,4 @@ def route_to_agent(state: AgentState) -> Literal["chart_agent", "brand_performan
         "general_chat": "general_agent",
     }
 
-    return agent_map.get(selected_agent, "general_agent")
-
-
-# Export compiled graph
-agent_graph = create_agent_graph()
\ No newline at end of file
+    return agent_map.get(selected_agent, "general_agent")
\ No newline at end of file
@@ -0,0 +1,208 @@
+"""
+Graph Registry - Process-wide cache of compiled LangGraph graphs
+
+Compiling the agent graph (node registration, edge validation, channel setup)
+is far more expensive than invoking it, so the graph is built once per process
+and shared by every chat request.
+
+Graphs are keyed by graph version plus an optional config fingerprint. One key
+is "active" at a time; `swap()` compiles a replacement off to the side and then
+flips the active key under a lock, so in-flight requests keep the graph they
+started with and new requests pick up the replacement.
+
+Usage:
+    from langgraph_agents.graph_registry import graph_registry
+
+    graph = graph_registry.get()
+    result = await graph.ainvoke(initial_state)
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from langgraph_agents.graph import GRAPH_VERSION, create_agent_graph
+
+logger = logging.getLogger(__name__)
+
+GraphBuilder = Callable[[], Any]
+
+
+def graph_key(version: str, config: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Build a registry key from a graph version and optional config.
+
+    Args:
+        version: Graph version string
+        config: Optional config dict that affects graph construction
+
+    Returns:
+        str: Stable registry key (e.g., "2.0.0" or "2.0.0:3f2a9c1b04de")
+    """
+    if not config:
+        return version
+
+    fingerprint = hashlib.sha256(
+        json.dumps(config, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()[:12]
+    return f"{version}:{fingerprint}"
+
+
+class GraphRegistry:
+    """
+    Thread-safe registry of compiled graphs with atomic hot-swap.
+
+    Compilation happens outside the lock; only the dictionary update and the
+    active-key flip are guarded, so readers never wait on a compile.
+    """
+
+    def __init__(self, builder: GraphBuilder = create_agent_graph, version: str = GRAPH_VERSION):
+        self._default_builder = builder
+        self._default_version = version
+        self._graphs: Dict[str, Any] = {}
+        self._build_times_ms: Dict[str, float] = {}
+        self._active_key: Optional[str] = None
+        self._lock = threading.Lock()
+        self._warm_lock = threading.Lock()
+
+    @property
+    def active_key(self) -> Optional[str]:
+        """Key of the graph currently served to requests"""
+        return self._active_key
+
+    def build(
+        self,
+        version: Optional[str] = None,
+        config: Optional[Dict[str, Any]] = None,
+        builder: Optional[GraphBuilder] = None,
+    ) -> str:
+        """
+        Compile a graph and register it without activating it.
+
+        Args:
+            version: Graph version (default: current GRAPH_VERSION)
+            config: Optional config dict used for keying
+            builder: Optional graph factory (default: create_agent_graph)
+
+        Returns:
+            str: Registry key of the compiled graph
+        """
+        key = graph_key(version or self._default_version, config)
+
+        start_time = time.perf_counter()
+        graph = (builder or self._default_builder)()
+        build_time_ms = (time.perf_counter() - start_time) * 1000
+
+        with self._lock:
+            self._graphs[key] = graph
+            self._build_times_ms[key] = build_time_ms
+
+        logger.info(f"Compiled agent graph {key} in {build_time_ms:.1f}ms")
+        return key
+
+    def activate(self, key: str) -> Optional[str]:
+        """
+        Atomically make a registered graph the active one.
+
+        Args:
+            key: Registry key returned by build()
+
+        Returns:
+            Optional[str]: Previously active key
+
+        Raises:
+            KeyError: If no graph is registered under key
+        """
+        with self._lock:
+            if key not in self._graphs:
+                raise KeyError(f"No compiled graph registered under '{key}'")
+            previous_key = self._active_key
+            self._active_key = key
+
+        if previous_key != key:
+            logger.info(f"Active agent graph switched: {previous_key} → {key}")
+        return previous_key
+
+    def swap(
+        self,
+        version: Optional[str] = None,
+        config: Optional[Dict[str, Any]] = None,
+        builder: Optional[GraphBuilder] = None,
+    ) -> str:
+        """
+        Compile a new graph and hot-swap it in.
+
+        Returns:
+            str: Key of the newly active graph
+        """
+        key = self.build(version=version, config=config, builder=builder)
+        self.activate(key)
+        return key
+
+    def warm(self) -> str:
+        """
+        Build and activate the default graph if nothing is active yet.
+
+        Called from the application lifespan so the first request does not pay
+        for compilation.
+
+        Returns:
+            str: Active registry key
+        """
+        with self._warm_lock:
+            if self._active_key is None:
+                self.swap()
+        return self._active_key
+
+    def get(self, key: Optional[str] = None) -> Any:
+        """
+        Get a compiled graph.
+
+        Args:
+            key: Optional registry key (default: active graph)
+
+        Returns:
+            Compiled graph ready for ainvoke()/astream()
+        """
+        with self._lock:
+            if key is not None:
+                return self._graphs[key]
+            graph = self._graphs.get(self._active_key) if self._active_key else None
+
+        if graph is None:
+            return self._graphs[self.warm()]
+        return graph
+
+    def evict(self, key: str) -> bool:
+        """
+        Drop an inactive graph from the registry.
+
+        Returns:
+            bool: True if the graph was removed
+        """
+        with self._lock:
+            if key == self._active_key or key not in self._graphs:
+                return False
+            del self._graphs[key]
+            self._build_times_ms.pop(key, None)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Registry status for health endpoints"""
+        return {
+            "active_key": self._active_key,
+            "registered": sorted(self._graphs.keys()),
+            "build_times_ms": {k: round(v, 2) for k, v in self._build_times_ms.items()},
+        }
+
+
+# Global registry instance
+graph_registry = GraphRegistry()
+
+
+def get_compiled_graph() -> Any:
+    """Get the active compiled agent graph"""
+    return graph_registry.get()
@@ -0,0 +1,222 @@
+"""
+LLM Clients - Pooled, long-lived LLM clients shared by all agent nodes
+
+Every node used to build its own ChatOpenAI/AsyncOpenAI client, which meant a
+fresh connection pool (and TLS handshake) per invocation. This module owns a
+single httpx connection pool for the Requesty AI gateway and hands out clients
+that reuse it:
+
+- One shared httpx.AsyncClient (keep-alive, HTTP/2 when `h2` is installed)
+- One shared AsyncOpenAI client for raw chat-completions calls
+- ChatOpenAI instances cached by (model, temperature)
+- A per-model semaphore bounding concurrent in-flight requests
+- stream_completion(), which streams tokens to LangGraph event listeners
+  (POST /chat/stream) while still returning the full text to the caller
+
+Usage:
+    from langgraph_agents.llm_clients import llm_clients
+
+    llm = llm_clients.get_chat_model("openai/gpt-5-chat-latest", temperature=0.1)
+    async with llm_clients.limit("openai/gpt-5-chat-latest"):
+        response = await llm.ainvoke(messages)
+"""
+
+import asyncio
+import logging
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+from openai import AsyncOpenAI
+from langchain_core.callbacks import adispatch_custom_event
+from langchain_openai import ChatOpenAI
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "openai/gpt-5-chat-latest"
+DEFAULT_API_BASE = "https://router.requesty.ai/v1"
+
+# Custom LangGraph event carrying streamed tokens from raw completions
+TOKEN_EVENT = "llm_token"
+
+# HTTP/2 needs the optional `h2` package (installed via httpx[http2])
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+    logger.warning("h2 not available. LLM clients will use HTTP/1.1 keep-alive.")
+
+
+class LLMClientFactory:
+    """
+    Factory for LLM clients that share one HTTP connection pool.
+
+    Clients are created lazily on first use and live for the whole process;
+    call aclose() on shutdown to release pooled connections.
+    """
+
+    def __init__(self):
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._openai_client: Optional[AsyncOpenAI] = None
+        self._chat_models: Dict[Tuple[str, float], ChatOpenAI] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def api_key(self) -> str:
+        return settings.REQUESTY_AI_API_KEY or ""
+
+    @property
+    def api_base(self) -> str:
+        return settings.REQUESTY_AI_API_BASE or DEFAULT_API_BASE
+
+    def get_http_client(self) -> httpx.AsyncClient:
+        """
+        Get the shared httpx client backing every LLM client.
+
+        Returns:
+            httpx.AsyncClient: Pooled client with keep-alive (and HTTP/2 if available)
+        """
+        with self._lock:
+            if self._http_client is None or self._http_client.is_closed:
+                self._http_client = httpx.AsyncClient(
+                    http2=settings.llm_http2 and HTTP2_AVAILABLE,
+                    limits=httpx.Limits(
+                        max_connections=settings.llm_max_connections,
+                        max_keepalive_connections=settings.llm_max_keepalive_connections,
+                        keepalive_expiry=settings.llm_keepalive_expiry_seconds,
+                    ),
+                    timeout=httpx.Timeout(settings.llm_request_timeout_seconds, connect=10.0),
+                )
+                # Clients bound to a closed pool must be rebuilt
+                self._openai_client = None
+                self._chat_models.clear()
+            return self._http_client
+
+    def get_openai_client(self) -> AsyncOpenAI:
+        """
+        Get the shared AsyncOpenAI client (Requesty AI gateway).
+
+        Returns:
+            AsyncOpenAI: Client using the shared connection pool
+        """
+        http_client = self.get_http_client()
+        with self._lock:
+            if self._openai_client is None:
+                self._openai_client = AsyncOpenAI(
+                    api_key=self.api_key,
+                    base_url=self.api_base,
+                    http_client=http_client,
+                )
+            return self._openai_client
+
+    def get_chat_model(self, model: str = DEFAULT_MODEL, temperature: float = 0.7) -> ChatOpenAI:
+        """
+        Get a LangChain chat model configured for (model, temperature).
+
+        Args:
+            model: Model name routed through Requesty AI
+            temperature: Sampling temperature
+
+        Returns:
+            ChatOpenAI: Cached chat model using the shared connection pool
+        """
+        http_client = self.get_http_client()
+        key = (model, float(temperature))
+        with self._lock:
+            chat_model = self._chat_models.get(key)
+            if chat_model is None:
+                chat_model = ChatOpenAI(
+                    model=model,
+                    api_key=self.api_key,
+                    base_url=self.api_base,
+                    temperature=temperature,
+                    http_async_client=http_client,
+                )
+                self._chat_models[key] = chat_model
+            return chat_model
+
+    @asynccontextmanager
+    async def limit(self, model: str = DEFAULT_MODEL) -> AsyncIterator[None]:
+        """
+        Bound concurrent in-flight requests per model.
+
+        Args:
+            model: Model name the request is sent to
+        """
+        semaphore = self._semaphores.get(model)
+        if semaphore is None:
+            semaphore = self._semaphores.setdefault(
+                model, asyncio.Semaphore(settings.llm_max_concurrency_per_model)
+            )
+        async with semaphore:
+            yield
+
+    async def stream_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = DEFAULT_MODEL,
+        temperature: float = 0.7,
+        **kwargs: Any,
+    ) -> str:
+        """
+        Run a chat completion with streaming enabled.
+
+        Each token is dispatched as a TOKEN_EVENT custom event so graph.astream_events
+        consumers see it as it arrives; callers outside a graph run just get the
+        final text.
+
+        Args:
+            messages: OpenAI-format chat messages
+            model: Model name routed through Requesty AI
+            temperature: Sampling temperature
+            **kwargs: Extra completion parameters (e.g. seed)
+
+        Returns:
+            str: Full completion text
+        """
+        parts = []
+        async with self.limit(model):
+            stream = await self.get_openai_client().chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                stream=True,
+                **kwargs,
+            )
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    await _dispatch_token(delta)
+        return "".join(parts)
+
+    async def aclose(self) -> None:
+        """Close pooled connections (application shutdown)"""
+        with self._lock:
+            http_client = self._http_client
+            self._http_client = None
+            self._openai_client = None
+            self._chat_models.clear()
+        if http_client is not None and not http_client.is_closed:
+            await http_client.aclose()
+
+
+async def _dispatch_token(content: str) -> None:
+    """Emit a streamed token to LangGraph listeners (no-op outside a graph run)"""
+    try:
+        await adispatch_custom_event(TOKEN_EVENT, {"content": content})
+    except RuntimeError:
+        # No parent run (node called directly, e.g. in tests)
+        pass
+
+
+# Global client factory instance
+llm_clients = LLMClientFactory()
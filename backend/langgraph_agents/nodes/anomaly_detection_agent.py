@@ -2,140 +2,159 @@
 Anomaly Detection Agent Node
 
 This agent specializes in:
-- Statistical outlier detection (IQR, Z-score)
+- Statistical outlier detection (IQR, robust Z / MAD, Z-score)
 - Machine learning-based anomaly detection (Isolation Forest, Local Outlier Factor)
 - Time series anomaly detection
 - Contextual anomaly analysis with business impact assessment
 
-Uses multiple detection methods combined with GPT-5 for contextual interpretation.
+All detectors score every numeric column in one pass (services.anomaly_scoring)
+and anomalies are ranked by how many detectors agree. GPT-5 provides the
+contextual interpretation.
 """
 
+import asyncio
 import logging
-import os
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import pandas as pd
-import numpy as np
-from openai import AsyncOpenAI
 
 from ..state import AgentState
-from ..tools.analytics_tools import detect_anomalies_combined, detect_outliers_iqr, detect_outliers_zscore
+from ..tools.column_profiler import column_profiles, preferred_column
 from ..tools.storage_tools import get_uploaded_file_data
+from ..tools.streaming_anomaly import update_streaming_baselines
 from ..governance_wrapper import governed_node
+from ..llm_clients import llm_clients
+from core.config import settings
+from core.executors import task_executors
+from services.analytics_kernels import frame_to_ipc
+from services.anomaly_scoring import METHOD_NAMES, high_confidence_indices, score_anomalies
 
 logger = logging.getLogger(__name__)
 
-# Initialize Requesty AI client for GPT-5
-client = AsyncOpenAI(
-    api_key=os.getenv("REQUESTY_AI_API_KEY", ""),
-    base_url=os.getenv("REQUESTY_AI_API_BASE", "https://router.requesty.ai/v1"),
-)
+# High-confidence row labels kept in message metadata
+ANOMALY_INDEX_LIMIT = 1000
 
-# Try to import scikit-learn for ML-based detection
-try:
-    from sklearn.ensemble import IsolationForest
-    from sklearn.neighbors import LocalOutlierFactor
-    from sklearn.preprocessing import StandardScaler
+# Time-series anomalies listed for the LLM and kept in metadata
+STREAMING_ANOMALY_LIMIT = 50
 
-    SKLEARN_AVAILABLE = True
-except ImportError:
-    SKLEARN_AVAILABLE = False
-    logger.warning("scikit-learn not available. Using statistical methods only.")
+# Primary value column name keywords (wider than the brand agent's measures)
+VALUE_KEYWORDS = ("sales", "revenue", "amount", "value", "total", "price", "cost", "quantity")
 
+ANOMALY_SYSTEM_PROMPT = """You are an anomaly detection specialist with expertise in data quality and business impact analysis.
 
-def _detect_anomalies_isolation_forest(df: pd.DataFrame, value_column: str, contamination: float = 0.1) -> Dict[str, Any]:
-    """
-    Detect anomalies using Isolation Forest algorithm.
-
-    Args:
-        df: DataFrame with numeric data
-        value_column: Column to analyze
-        contamination: Expected proportion of outliers (default 0.1 = 10%)
-
-    Returns:
-        dict: Anomaly detection results
-    """
-    if not SKLEARN_AVAILABLE:
-        return {"error": "scikit-learn not installed"}
-
-    try:
-        # Prepare data
-        X = df[[value_column]].values
+Your task is to:
+1. Interpret the anomaly detection results
+2. Explain what makes these values anomalous
+3. Assess potential business impact and root causes
+4. Provide actionable recommendations
+5. Distinguish between legitimate outliers and data errors
 
-        # Fit Isolation Forest
-        iso_forest = IsolationForest(contamination=contamination, random_state=42, n_estimators=100)
+Focus on:
+- Business context and implications
+- Potential causes (data errors, fraud, exceptional events, etc.)
+- Risk assessment
+- Recommended actions
+- Data quality considerations
+"""
 
-        predictions = iso_forest.fit_predict(X)
 
-        # -1 indicates anomaly, 1 indicates normal
-        anomaly_indices = df.index[predictions == -1].tolist()
-        anomaly_values = df.loc[anomaly_indices, value_column].tolist()
+async def _update_baselines(
+    file_id: str, df: pd.DataFrame, date_column: str, numeric_cols: List[str]
+) -> Optional[Dict[str, Any]]:
+    """Advance the file lineage's time-series baselines (failures only skip this step)"""
+    from core.database import get_db
 
-        # Get anomaly scores (lower is more anomalous)
-        anomaly_scores = iso_forest.score_samples(X)
-        anomaly_score_values = [anomaly_scores[i] for i in anomaly_indices]
+    try:
+        async for db_session in get_db():
+            return await update_streaming_baselines(db_session, file_id, df, date_column, numeric_cols)
+    except Exception as e:
+        logger.warning(f"Incremental anomaly baselines unavailable: {e}")
+    return None
 
-        return {
-            "method": "Isolation Forest",
-            "anomaly_count": len(anomaly_indices),
-            "anomaly_percentage": round(len(anomaly_indices) / len(df) * 100, 2),
-            "anomaly_indices": anomaly_indices,
-            "anomaly_values": anomaly_values,
-            "anomaly_scores": anomaly_score_values,
-            "contamination": contamination,
-        }
 
-    except Exception as e:
-        logger.error(f"Isolation Forest error: {e}", exc_info=True)
-        return {"error": str(e)}
+def _streaming_lines(streaming: Dict[str, Any], limit: int) -> str:
+    return "\n".join(
+        f"- {item['date']} {item['column']}: {item['value']:,.2f} "
+        f"(expected {item['expected']:,.2f}, range {item['lower']:,.2f} to {item['upper']:,.2f}; "
+        f"{', '.join(item['methods'])})"
+        for item in streaming["anomalies"][:limit]
+    )
 
 
-def _detect_anomalies_lof(df: pd.DataFrame, value_column: str, n_neighbors: int = 20, contamination: float = 0.1) -> Dict[str, Any]:
+async def _streaming_response(user_query: str, date_column: str, streaming: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Detect anomalies using Local Outlier Factor algorithm.
+    Report anomalies in periods appended since the lineage's last file.
+
+    Only the new periods were scored, against baselines built from earlier files.
 
     Args:
-        df: DataFrame with numeric data
-        value_column: Column to analyze
-        n_neighbors: Number of neighbors to consider
-        contamination: Expected proportion of outliers
+        user_query: User's request
+        date_column: Date column
+        streaming: update_streaming_baselines result
 
     Returns:
-        dict: Anomaly detection results
+        dict: Agent state update (messages, agent_response, metadata)
     """
-    if not SKLEARN_AVAILABLE:
-        return {"error": "scikit-learn not installed"}
+    anomalies = streaming["anomalies"]
+    high_confidence = [item for item in anomalies if item["votes"] >= 2]
+    anomaly_summary = f"""
+User Query: {user_query}
 
-    try:
-        # Prepare data
-        X = df[[value_column]].values
+Incremental Time-Series Check:
+- New Periods Scored: {streaming['new_periods']} (frequency {streaming['freq']}, by {date_column})
+- Periods In Baseline History: {streaming['history_periods']}
+- Detectors: seasonal baseline (Holt-Winters residual), EWMA control chart, z-score of seasonally adjusted values
+- Flagged Values: {len(anomalies)} ({len(high_confidence)} flagged by 2+ detectors)
 
-        # Fit LOF
-        lof = LocalOutlierFactor(n_neighbors=min(n_neighbors, len(df) - 1), contamination=contamination)
+Flagged Values (newest first):
+{_streaming_lines(streaming, 10) or "- None"}
+"""
 
-        predictions = lof.fit_predict(X)
+    insights = await llm_clients.stream_completion(
+        model="openai/gpt-5-chat-latest",
+        messages=[
+            {"role": "system", "content": ANOMALY_SYSTEM_PROMPT},
+            {"role": "user", "content": anomaly_summary},
+        ],
+        temperature=0.2,
+        seed=42,
+    )
 
-        # -1 indicates anomaly, 1 indicates normal
-        anomaly_indices = df.index[predictions == -1].tolist()
-        anomaly_values = df.loc[anomaly_indices, value_column].tolist()
+    final_response = f"""## Anomaly Detection Analysis: New Periods
 
-        # Get negative outlier factor scores
-        lof_scores = lof.negative_outlier_factor_
-        anomaly_score_values = [lof_scores[i] for i in anomaly_indices]
+{insights}
 
-        return {
-            "method": "Local Outlier Factor",
-            "anomaly_count": len(anomaly_indices),
-            "anomaly_percentage": round(len(anomaly_indices) / len(df) * 100, 2),
-            "anomaly_indices": anomaly_indices,
-            "anomaly_values": anomaly_values,
-            "anomaly_scores": anomaly_score_values,
-            "n_neighbors": n_neighbors,
-            "contamination": contamination,
-        }
+---
 
-    except Exception as e:
-        logger.error(f"LOF error: {e}", exc_info=True)
-        return {"error": str(e)}
+**Detection Summary**:
+- New Periods Scored: {streaming['new_periods']} (baseline history: {streaming['history_periods']} periods)
+- Flagged Values: {len(anomalies)}
+- High-Confidence (2+ detectors): {len(high_confidence)}
+
+**Methods Used**:
+- Time series: seasonal baseline + EWMA control limits + z-score, updated incrementally from earlier files
+"""
+
+    metadata = {
+        "agent": "anomaly_detection",
+        "agent_data": {
+            "analysis_type": "streaming_anomaly_detection",
+            "date_column": date_column,
+            "lineage": streaming["lineage"],
+            "new_periods": streaming["new_periods"],
+            "history_periods": streaming["history_periods"],
+            "freq": streaming["freq"],
+            "total_anomalies": len(anomalies),
+            "high_confidence_anomalies": len(high_confidence),
+            "anomalies": anomalies[:STREAMING_ANOMALY_LIMIT],
+        },
+    }
+
+    return {
+        "messages": [{"role": "assistant", "content": final_response}],
+        "agent_response": final_response,
+        "metadata": metadata,
+        "next_agent": "supervisor",
+    }
 
 
 @governed_node("anomaly_detection_agent", "detect_anomalies")
@@ -144,7 +163,7 @@ async def anomaly_detection_agent_node(state: AgentState) -> Dict[str, Any]:
     Anomaly Detection Agent - Identifies outliers and anomalies in data.
 
     Capabilities:
-    1. Statistical methods (IQR, Z-score)
+    1. Statistical methods (IQR, robust Z, Z-score)
     2. Machine learning methods (Isolation Forest, LOF)
     3. Consensus anomaly detection
     4. Contextual analysis and impact assessment
@@ -159,6 +178,7 @@ async def anomaly_detection_agent_node(state: AgentState) -> Dict[str, Any]:
         # Get uploaded file data if available
         uploaded_files = state.get("uploaded_files", [])
         df = None
+        file_id = None
 
         if uploaded_files:
             # Get database session from state (should be added by graph)
@@ -167,7 +187,7 @@ async def anomaly_detection_agent_node(state: AgentState) -> Dict[str, Any]:
                 file_data_dict = await get_uploaded_file_data(uploaded_files, db_session)
                 if file_data_dict:
                     # Get the first file's DataFrame
-                    df = next(iter(file_data_dict.values()))
+                    file_id, df = next(iter(file_data_dict.items()))
                     logger.info(f"Loaded file data: {len(df)} rows, {len(df.columns)} columns")
                 break
 
@@ -192,8 +212,9 @@ async def anomaly_detection_agent_node(state: AgentState) -> Dict[str, Any]:
                 "next_agent": "supervisor",
             }
 
-        # Identify numeric columns
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+        # Identify numeric columns from the shared column profile
+        profile = await asyncio.to_thread(column_profiles.profile, df)
+        numeric_cols = profile["numeric_columns"]
 
         if not numeric_cols:
             return {
@@ -207,69 +228,34 @@ async def anomaly_detection_agent_node(state: AgentState) -> Dict[str, Any]:
             }
 
         # Find value column (prefer sales/revenue/amount related)
-        value_column = None
-        for col in numeric_cols:
-            col_lower = col.lower()
-            if any(
-                keyword in col_lower
-                for keyword in ["sales", "revenue", "amount", "value", "total", "price", "cost", "quantity"]
-            ):
-                value_column = col
-                break
-
-        if value_column is None:
-            value_column = numeric_cols[0]
-
-        logger.info(f"Analyzing anomalies in column: {value_column}")
-
-        # Step 1: Statistical anomaly detection
-        statistical_results = detect_anomalies_combined(df, value_column)
-
-        # Step 2: ML-based anomaly detection (if available)
-        ml_results = {}
-        if SKLEARN_AVAILABLE and len(df) >= 10:  # Need sufficient data for ML methods
-            iso_forest_results = _detect_anomalies_isolation_forest(df, value_column, contamination=0.1)
-            if "error" not in iso_forest_results:
-                ml_results["isolation_forest"] = iso_forest_results
-
-            lof_results = _detect_anomalies_lof(df, value_column, n_neighbors=min(20, len(df) - 1), contamination=0.1)
-            if "error" not in lof_results:
-                ml_results["local_outlier_factor"] = lof_results
-
-        # Step 3: Combine all methods to find high-confidence anomalies
-        all_anomaly_indices = set()
-
-        # Add statistical anomalies
-        all_anomaly_indices.update(statistical_results["consensus_outliers"])
-
-        # Add ML-based anomalies
-        if "isolation_forest" in ml_results:
-            all_anomaly_indices.update(ml_results["isolation_forest"]["anomaly_indices"])
-        if "local_outlier_factor" in ml_results:
-            all_anomaly_indices.update(ml_results["local_outlier_factor"]["anomaly_indices"])
-
-        # Calculate consensus (detected by multiple methods)
-        detection_count = {}
-        for idx in all_anomaly_indices:
-            count = 0
-            if idx in statistical_results["consensus_outliers"]:
-                count += 1
-            if "isolation_forest" in ml_results and idx in ml_results["isolation_forest"]["anomaly_indices"]:
-                count += 1
-            if "local_outlier_factor" in ml_results and idx in ml_results["local_outlier_factor"]["anomaly_indices"]:
-                count += 1
-            detection_count[idx] = count
-
-        # High-confidence anomalies (detected by 2+ methods)
-        high_confidence_anomalies = [idx for idx, count in detection_count.items() if count >= 2]
-
-        # Get anomaly details
-        if high_confidence_anomalies:
-            anomaly_details = df.loc[high_confidence_anomalies, [value_column]].copy()
-            anomaly_details["detection_count"] = [detection_count[idx] for idx in high_confidence_anomalies]
-            anomaly_details = anomaly_details.sort_values("detection_count", ascending=False)
-        else:
-            anomaly_details = None
+        value_column = preferred_column(numeric_cols, VALUE_KEYWORDS)
+
+        # Time-series baselines per file lineage: only periods appended since the last file are scored
+        streaming = None
+        date_column = profile["date_column"]
+        if settings.anomaly_streaming_enabled and file_id and date_column:
+            streaming = await _update_baselines(file_id, df, date_column, numeric_cols)
+            if streaming and streaming["mode"] == "incremental":
+                logger.info(f"Scored {streaming['new_periods']} appended periods against existing baselines")
+                return await _streaming_response(user_query, date_column, streaming)
+
+        logger.info(f"Scoring anomalies across {len(numeric_cols)} numeric columns (primary: {value_column})")
+
+        # Steps 1-3: All detectors over all numeric columns in one worker pass, ranked by consensus
+        scoring = await task_executors.run(
+            "anomaly",
+            score_anomalies,
+            frame_to_ipc(df[numeric_cols]),
+            contamination=0.1,
+            n_neighbors=min(20, len(df) - 1),
+            fit_sample_rows=settings.anomaly_fit_sample_rows,
+            lof_max_rows=settings.anomaly_lof_max_rows,
+            memory_budget_bytes=settings.anomaly_memory_budget_bytes,
+        )
+        method_counts = scoring["method_counts"]
+        top_anomalies = scoring["top_anomalies"]
+        total_anomalies = scoring["flagged_count"]
+        high_confidence_count = scoring["high_confidence_count"]
 
         # Step 4: Statistical summary
         mean = df[value_column].mean()
@@ -277,72 +263,54 @@ async def anomaly_detection_agent_node(state: AgentState) -> Dict[str, Any]:
         median = df[value_column].median()
 
         # Step 5: Generate insights using GPT-5
-        system_prompt = """You are an anomaly detection specialist with expertise in data quality and business impact analysis.
-
-Your task is to:
-1. Interpret the anomaly detection results
-2. Explain what makes these values anomalous
-3. Assess potential business impact and root causes
-4. Provide actionable recommendations
-5. Distinguish between legitimate outliers and data errors
-
-Focus on:
-- Business context and implications
-- Potential causes (data errors, fraud, exceptional events, etc.)
-- Risk assessment
-- Recommended actions
-- Data quality considerations
-"""
-
         # Prepare context for GPT-5
         anomaly_summary = f"""
 User Query: {user_query}
 
 Data Overview:
 - Total Records: {len(df)}
-- Analyzed Column: {value_column}
+- Numeric Columns Scored: {len(numeric_cols)}
+- Primary Column: {value_column}
 - Mean: {mean:.2f}
 - Median: {median:.2f}
 - Std Dev: {std:.2f}
 
-Detection Results:
-
-Statistical Methods:
-- IQR Method: {statistical_results['iqr_method']['outlier_count']} anomalies ({statistical_results['iqr_method']['outlier_percentage']}%)
-- Z-Score Method: {statistical_results['zscore_method']['outlier_count']} anomalies ({statistical_results['zscore_method']['outlier_percentage']}%)
-- Consensus: {len(statistical_results['consensus_outliers'])} anomalies
+Detection Results (a row is flagged when any of its columns is anomalous):
 """
-
-        if ml_results:
-            anomaly_summary += "\nMachine Learning Methods:\n"
-            if "isolation_forest" in ml_results:
-                anomaly_summary += f"- Isolation Forest: {ml_results['isolation_forest']['anomaly_count']} anomalies ({ml_results['isolation_forest']['anomaly_percentage']}%)\n"
-            if "local_outlier_factor" in ml_results:
-                anomaly_summary += f"- Local Outlier Factor: {ml_results['local_outlier_factor']['anomaly_count']} anomalies ({ml_results['local_outlier_factor']['anomaly_percentage']}%)\n"
+        for method, count in method_counts.items():
+            anomaly_summary += f"- {METHOD_NAMES[method]}: {count} anomalies ({round(count / len(df) * 100, 2)}%)\n"
 
         anomaly_summary += f"""
-High-Confidence Anomalies (2+ methods): {len(high_confidence_anomalies)}
-Total Unique Anomalies: {len(all_anomaly_indices)}
+High-Confidence Anomalies (2+ methods): {high_confidence_count}
+Total Unique Anomalies: {total_anomalies}
 """
 
-        if anomaly_details is not None and len(anomaly_details) > 0:
-            anomaly_summary += f"\nTop Anomalies:\n"
-            for idx, row in anomaly_details.head(5).iterrows():
-                anomaly_summary += f"- Index {idx}: {row[value_column]:.2f} (detected by {int(row['detection_count'])} methods)\n"
+        if top_anomalies:
+            anomaly_summary += f"\nTop Anomalies (ranked by detector agreement):\n"
+            for anomaly in top_anomalies[:5]:
+                anomaly_summary += (
+                    f"- Index {anomaly['index']}: {anomaly['column']} = {anomaly['value']} "
+                    f"(detected by {anomaly['votes']} methods: {', '.join(anomaly['methods'])})\n"
+                )
+
+        if streaming and streaming["anomalies"]:
+            anomaly_summary += (
+                f"\nTime-Series Anomalies by {date_column} "
+                f"(seasonal baseline / EWMA / z-score, {streaming['history_periods']} periods):\n"
+                f"{_streaming_lines(streaming, 5)}\n"
+            )
 
         # Get GPT-5 insights
-        response = await client.chat.completions.create(
+        insights = await llm_clients.stream_completion(
             model="openai/gpt-5-chat-latest",
             messages=[
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": ANOMALY_SYSTEM_PROMPT},
                 {"role": "user", "content": anomaly_summary},
             ],
             temperature=0.2,
             seed=42,
         )
 
-        insights = response.choices[0].message.content
-
         # Build response
         final_response = f"""## Anomaly Detection Analysis: {value_column}
 
@@ -352,32 +320,36 @@ Total Unique Anomalies: {len(all_anomaly_indices)}
 
 **Detection Summary**:
 - Total Records: {len(df)}
-- High-Confidence Anomalies: {len(high_confidence_anomalies)} ({round(len(high_confidence_anomalies)/len(df)*100, 2)}%)
-- Total Anomalies: {len(all_anomaly_indices)} ({round(len(all_anomaly_indices)/len(df)*100, 2)}%)
+- Numeric Columns Scored: {len(numeric_cols)}
+- High-Confidence Anomalies: {high_confidence_count} ({round(high_confidence_count/len(df)*100, 2)}%)
+- Total Anomalies: {total_anomalies} ({round(total_anomalies/len(df)*100, 2)}%)
 
 **Methods Used**:
-- Statistical: IQR + Z-Score
+- Statistical: IQR + Robust Z (MAD) + Z-Score
 """
 
-        if ml_results:
+        if "isolation_forest" in method_counts:
             final_response += "- Machine Learning: Isolation Forest + Local Outlier Factor\n"
 
-        final_response += f"\n**Data Statistics**:\n- Mean: {mean:.2f}\n- Median: {median:.2f}\n- Std Dev: {std:.2f}\n"
+        final_response += f"\n**Data Statistics** ({value_column}):\n- Mean: {mean:.2f}\n- Median: {median:.2f}\n- Std Dev: {std:.2f}\n"
 
-        # Store results in metadata
+        # Store results in metadata (the per-row score matrix stays out of the message)
         metadata = {
             "agent": "anomaly_detection",
             "agent_data": {
                 "analysis_type": "anomaly_detection",
                 "value_column": value_column,
+                "columns": scoring["columns"],
                 "total_records": len(df),
-                "total_anomalies": len(all_anomaly_indices),
-                "high_confidence_anomalies": len(high_confidence_anomalies),
-                "anomaly_percentage": round(len(all_anomaly_indices) / len(df) * 100, 2),
-                "statistical_results": statistical_results,
-                "ml_results": ml_results if ml_results else None,
-                "anomaly_indices": list(all_anomaly_indices),
-                "high_confidence_indices": high_confidence_anomalies,
+                "total_anomalies": total_anomalies,
+                "high_confidence_anomalies": high_confidence_count,
+                "anomaly_percentage": round(total_anomalies / len(df) * 100, 2),
+                "method_counts": method_counts,
+                "thresholds": scoring["thresholds"],
+                "top_anomalies": top_anomalies,
+                "high_confidence_indices": high_confidence_indices(scoring, df.index, limit=ANOMALY_INDEX_LIMIT),
+                "scoring_ms": scoring["elapsed_ms"],
+                "time_series_anomalies": streaming["anomalies"][:STREAMING_ANOMALY_LIMIT] if streaming else None,
             },
         }
 
@@ -10,31 +10,102 @@ This agent specializes in:
 Uses GPT-5 for business context interpretation combined with statistical analytics.
 """
 
+import asyncio
 import logging
-import os
-from typing import Dict, Any
-from openai import AsyncOpenAI
+import math
+import re
+from typing import Dict, Any, List, Optional
 
+import pandas as pd
+
+from core.config import settings
 from ..state import AgentState
-from ..tools.analytics_tools import (
-    assess_data_quality,
-    calculate_growth_rate,
-    calculate_market_share,
-    calculate_performance_metrics,
-    analyze_trend,
-)
+from ..tools.kpi_summary import compute_kpi_summary, is_current_summary
+from ..tools.rollup_cube import cube_growth_rate, cube_market_share
 from ..tools.storage_tools import get_uploaded_file_data
 from ..governance_wrapper import governed_node
+from ..llm_clients import llm_clients
 
 logger = logging.getLogger(__name__)
 
-# Initialize Requesty AI client for GPT-5
-client = AsyncOpenAI(
-    api_key=os.getenv("REQUESTY_AI_API_KEY", ""),
-    base_url=os.getenv("REQUESTY_AI_API_BASE", "https://router.requesty.ai/v1"),
+# Granularity requested in the question, answered from the rollup cube
+_PERIOD_PATTERNS = (
+    ("day", re.compile(r"\b(daily|per day|day[- ]over[- ]day)\b")),
+    ("week", re.compile(r"\b(weekly|per week|week[- ]over[- ]week)\b")),
+    ("quarter", re.compile(r"\b(quarterly|per quarter|quarter[- ]over[- ]quarter|qoq)\b")),
+    ("year", re.compile(r"\b(yearly|annual|annually|per year|year[- ]over[- ]year|yoy)\b")),
+    ("month", re.compile(r"\b(monthly|per month|month[- ]over[- ]month|mom)\b")),
 )
 
 
+def _requested_period(query: str) -> Optional[str]:
+    """Aggregation period named in the question, if any"""
+    text = query.lower()
+    return next((period for period, pattern in _PERIOD_PATTERNS if pattern.search(text)), None)
+
+
+def _format_number(value: Any) -> str:
+    """Two-decimal number for the prompt; "n/a" when undefined (stored summaries hold NaN as None)"""
+    if value is None or (isinstance(value, float) and not math.isfinite(value)):
+        return "n/a"
+    return f"{value:.2f}"
+
+
+async def _period_kpis(summary: Dict[str, Any], period: str) -> Optional[Dict[str, Any]]:
+    """Growth and latest-period market share at the requested period from the rollup cube"""
+    from services.columnar_storage import read_sidecar
+
+    cube = await read_sidecar(summary["rollup_cube"])
+    if cube is None:
+        return None
+
+    value_column = summary["value_column"]
+    kpis = {}
+    if summary["date_column"]:
+        kpis["growth_analysis"] = await asyncio.to_thread(cube_growth_rate, cube, value_column, period)
+    if summary["entity_column"]:
+        kpis["period_market_share"] = await asyncio.to_thread(cube_market_share, cube, value_column, period)
+    return {name: result for name, result in kpis.items() if "error" not in result}
+
+
+async def _load_kpi_summary(uploaded_files: List[str]) -> Optional[Dict[str, Any]]:
+    """Current KPI summary of the first uploaded file that has one"""
+    if not uploaded_files or not settings.kpi_precompute_enabled:
+        return None
+
+    from core.database import get_db
+    from ..tools.database_tools import load_kpi_summaries
+
+    try:
+        async for db_session in get_db():
+            summaries = await load_kpi_summaries(db_session, uploaded_files)
+            break
+    except Exception as e:
+        logger.warning(f"Could not load KPI summaries: {e}")
+        return None
+
+    for file_id in uploaded_files:
+        if is_current_summary(summaries.get(file_id)):
+            logger.info(f"Using precomputed KPI summary for file {file_id}")
+            return summaries[file_id]
+    return None
+
+
+async def _load_file_frame(uploaded_files: List[str]) -> Optional[pd.DataFrame]:
+    """DataFrame of the first uploaded file"""
+    # Get database session from state (should be added by graph)
+    from core.database import get_db
+    async for db_session in get_db():
+        file_data_dict = await get_uploaded_file_data(uploaded_files, db_session)
+        if file_data_dict:
+            # Get the first file's DataFrame
+            df = next(iter(file_data_dict.values()))
+            logger.info(f"Loaded file data: {len(df)} rows, {len(df.columns)} columns")
+            return df
+        break
+    return None
+
+
 @governed_node("brand_performance_agent", "analyze_performance")
 async def brand_performance_agent_node(state: AgentState) -> Dict[str, Any]:
     """
@@ -52,22 +123,16 @@ async def brand_performance_agent_node(state: AgentState) -> Dict[str, Any]:
     user_query = message.content
 
     try:
-        # Get uploaded file data if available
+        # Prefer KPIs precomputed after ingest; load the frame only without one
         uploaded_files = state.get("uploaded_files", [])
-        df = None
-
-        if uploaded_files:
-            # Get database session from state (should be added by graph)
-            from core.database import get_db
-            async for db_session in get_db():
-                file_data_dict = await get_uploaded_file_data(uploaded_files, db_session)
-                if file_data_dict:
-                    # Get the first file's DataFrame
-                    df = next(iter(file_data_dict.values()))
-                    logger.info(f"Loaded file data: {len(df)} rows, {len(df.columns)} columns")
-                break
-
-        if df is None or df.empty:
+        summary = await _load_kpi_summary(uploaded_files)
+
+        if summary is None and uploaded_files:
+            df = await _load_file_frame(uploaded_files)
+            if df is not None and not df.empty:
+                summary = await asyncio.to_thread(compute_kpi_summary, df)
+
+        if summary is None:
             # No data to analyze
             response = (
                 "I need data to perform brand performance analysis. "
@@ -84,64 +149,19 @@ async def brand_performance_agent_node(state: AgentState) -> Dict[str, Any]:
                 "next_agent": "supervisor",
             }
 
-        # Step 1: Assess data quality
-        quality_report = assess_data_quality(df)
+        # Steps 1-3: data quality, key columns and KPIs
+        analysis_results = summary["kpis"]
+        quality_report = analysis_results["data_quality"]
+        value_column = summary["value_column"]
+        entity_column = summary["entity_column"]
         logger.info(f"Data quality: {quality_report['grade']} ({quality_report['completeness_score']}%)")
 
-        # Step 2: Identify key columns for analysis
-        numeric_cols = quality_report["numeric_columns"]
-        categorical_cols = quality_report["categorical_columns"]
-        date_cols = quality_report["date_columns"]
-
-        # Try to identify main value column (sales, revenue, etc.)
-        value_column = None
-        for col in numeric_cols:
-            col_lower = col.lower()
-            if any(keyword in col_lower for keyword in ["sales", "revenue", "amount", "value", "total"]):
-                value_column = col
-                break
-
-        if value_column is None and len(numeric_cols) > 0:
-            value_column = numeric_cols[0]  # Use first numeric column
-
-        # Try to identify brand/product column
-        entity_column = None
-        for col in categorical_cols:
-            col_lower = col.lower()
-            if any(keyword in col_lower for keyword in ["brand", "product", "name", "category"]):
-                entity_column = col
-                break
-
-        if entity_column is None and len(categorical_cols) > 0:
-            entity_column = categorical_cols[0]  # Use first categorical column
-
-        # Step 3: Calculate KPIs
-        analysis_results = {
-            "data_quality": quality_report,
-        }
-
-        if value_column:
-            # Growth rate analysis (if date column exists)
-            if len(date_cols) > 0:
-                growth_analysis = calculate_growth_rate(
-                    df, value_column=value_column, date_column=date_cols[0], period="month"
-                )
-                analysis_results["growth_analysis"] = growth_analysis
-
-                # Trend analysis
-                trend_analysis = analyze_trend(df, value_column=value_column, date_column=date_cols[0])
-                analysis_results["trend_analysis"] = trend_analysis
-
-            # Market share analysis (if entity column exists)
-            if entity_column:
-                market_share = calculate_market_share(df, entity_column=entity_column, value_column=value_column)
-                analysis_results["market_share"] = market_share
-
-            # Overall performance metrics
-            performance_metrics = calculate_performance_metrics(
-                df, value_column=value_column, category_column=entity_column if entity_column else None
-            )
-            analysis_results["performance_metrics"] = performance_metrics
+        # Growth and share at the granularity asked for come from the rollup cube
+        period = _requested_period(user_query)
+        if period and summary.get("rollup_cube") and value_column:
+            period_kpis = await _period_kpis(summary, period)
+            if period_kpis:
+                analysis_results = {**analysis_results, **period_kpis}
 
         # Step 4: Generate business insights using GPT-5
         system_prompt = """You are a brand performance analyst with expertise in business intelligence and KPI analysis.
@@ -176,7 +196,7 @@ Data Overview:
         if "growth_analysis" in analysis_results:
             ga = analysis_results["growth_analysis"]
             analysis_summary += f"""
-Growth Analysis:
+Growth Analysis (by {ga['period']}):
 - Overall Growth: {ga['overall_growth_rate']}%
 - Average Period Growth: {ga['average_period_growth']}%
 - Trend: {ga['trend']}
@@ -203,22 +223,31 @@ Market Share Analysis:
 - Top 3: {ms['top_3_leaders']}
 - Market Concentration: {ms['market_concentration']} (HHI: {ms['hhi_index']})
 - Total Entities: {ms['total_entities']}
+"""
+
+        if "period_market_share" in analysis_results:
+            pms = analysis_results["period_market_share"]
+            analysis_summary += f"""
+Latest {pms['level'].title()} Market Share (period ending {pms['period']}):
+- Market Leader: {pms['market_leader']} ({pms['leader_share']}%)
+- Top 3: {pms['top_3_leaders']}
+- Market Concentration: {pms['market_concentration']} (HHI: {pms['hhi_index']})
 """
 
         if "performance_metrics" in analysis_results:
             pm = analysis_results["performance_metrics"]
             analysis_summary += f"""
 Performance Metrics:
-- Mean: {pm['mean']:.2f}
-- Median: {pm['median']:.2f}
-- Std Dev: {pm['std_dev']:.2f}
-- Range: {pm['min']:.2f} - {pm['max']:.2f}
+- Mean: {_format_number(pm['mean'])}
+- Median: {_format_number(pm['median'])}
+- Std Dev: {_format_number(pm['std_dev'])}
+- Range: {_format_number(pm['min'])} - {_format_number(pm['max'])}
 - Coefficient of Variation: {pm['coefficient_of_variation']}%
-- Total: {pm['total']:.2f}
+- Total: {_format_number(pm['total'])}
 """
 
         # Get GPT-5 insights
-        response = await client.chat.completions.create(
+        insights = await llm_clients.stream_completion(
             model="openai/gpt-5-chat-latest",
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -228,8 +257,6 @@ Performance Metrics:
             seed=42,
         )
 
-        insights = response.choices[0].message.content
-
         # Combine analysis with insights
         final_response = f"""## Brand Performance Analysis
 
@@ -11,8 +11,8 @@ from typing import Dict, Any
 import traceback
 
 from langgraph_agents.state import AgentState
-from langgraph_agents.tools.database_tools import load_file_metadata, get_database_session
-from langgraph_agents.tools.storage_tools import load_file_from_storage
+from langgraph_agents.tools.database_tools import load_file_metadata, load_columnar_paths, get_database_session
+from langgraph_agents.tools.storage_tools import load_cached_file
 from langgraph_agents.tools.chart_tools import create_chart, validate_dataframe_for_chart
 from langgraph_agents.governance_wrapper import governed_node
 
@@ -49,6 +49,7 @@ async def chart_agent_node(state: AgentState) -> AgentState:
         # Load file metadata from database
         async for db in get_database_session():
             file_metadata = await load_file_metadata(db, file_ids)
+            columnar_paths = await load_columnar_paths(db, file_ids)
             break
 
         if not file_metadata:
@@ -62,7 +63,7 @@ async def chart_agent_node(state: AgentState) -> AgentState:
 
         # Load first file (for now, we'll handle multi-file later)
         file = file_metadata[0]
-        df = await load_file_from_storage(file.file_path)
+        df = await load_cached_file(file, columnar_paths.get(file.id))
 
         if df is None:
             return {
@@ -100,38 +101,25 @@ async def chart_agent_node(state: AgentState) -> AgentState:
                 "error": chart_result["error"],
             }
 
-        # Store chart in blob storage for persistence and easy downloading
-        from langgraph_agents.tools.storage_tools import save_chart_to_storage
-        from datetime import datetime
-        import uuid
-
-        session_id = state.get("session_id", "default")
-        chart_id = str(uuid.uuid4())
-        chart_filename = f"charts/{session_id}/{datetime.utcnow().strftime('%Y/%m/%d')}/{chart_id}.html"
-
-        # Save HTML chart to storage
-        chart_url = None
-        if chart_result["chart_html"]:
-            try:
-                chart_url = await save_chart_to_storage(
-                    chart_data=chart_result["chart_html"].encode('utf-8'),
-                    filename=chart_filename,
-                )
-            except Exception as e:
-                print(f"Warning: Could not save chart to storage: {e}")
-
         # Success - return chart
         response_text = f"✅ Here's your chart based on '{file.original_filename}':"
 
         return {
             **state,
             "agent_response": response_text,
+            # Charts are referenced by content address; chat history stores URLs, not images
             "agent_data": {
-                "chart_html": chart_result["chart_html"],
-                "chart_png": chart_result["chart_png"],
-                "chart_url": chart_url,  # Permanent storage URL
-                "chart_id": chart_id,
+                "chart_id": chart_result["chart_id"],
+                "chart_url": chart_result["chart_url"],  # Interactive HTML (api/charts.py)
+                "chart_png_url": chart_result["chart_png_url"],
+                "chart_json_url": chart_result["chart_json_url"],  # Figure for client-side rendering
+                "chart_html": chart_result["chart_html"],  # Inline only if storage failed
+                "chart_png": chart_result["chart_png"],  # Inline only if storage failed
+                "artifacts_reused": chart_result["artifacts_reused"],
+                "data_reduction": chart_result.get("data_reduction"),
+                "lazy_render": chart_result.get("lazy_render", False),  # Show the HTML; PNG only on download
                 "generated_code": chart_result.get("code"),
+                "code_cached": chart_result.get("code_cached", False),
                 "file_name": file.original_filename,
                 "data_rows": len(df),
                 "data_columns": len(df.columns),
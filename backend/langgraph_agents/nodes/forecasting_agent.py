@@ -10,34 +10,79 @@ This agent specializes in:
 Uses Facebook Prophet for robust time series forecasting combined with GPT-5 for insights.
 """
 
+import asyncio
 import logging
-import os
 from typing import Dict, Any, Optional
 import pandas as pd
 import numpy as np
-from openai import AsyncOpenAI
 
 from ..state import AgentState
-from ..tools.analytics_tools import analyze_trend, simple_moving_average, exponential_moving_average, forecast_naive
+from ..tools.analytics_tools import (
+    analyze_trend,
+    simple_moving_average,
+    exponential_moving_average,
+    forecast_statistical,
+    infer_frequency,
+)
 from ..tools.storage_tools import get_uploaded_file_data
+from ..tools.batch_forecasting import detect_entity_column, forecast_all_series
+from ..tools.column_profiler import column_profiles
+from ..tools.forecast_cache import forecast_cache
 from ..governance_wrapper import governed_node
+from ..llm_clients import llm_clients
+from core.config import settings
+from core.executors import task_executors
+from services.analytics_kernels import PROPHET_AVAILABLE, PROPHET_PARAMS, frame_to_ipc, prophet_forecast
 
 logger = logging.getLogger(__name__)
 
-# Initialize Requesty AI client for GPT-5
-client = AsyncOpenAI(
-    api_key=os.getenv("REQUESTY_AI_API_KEY", ""),
-    base_url=os.getenv("REQUESTY_AI_API_BASE", "https://router.requesty.ai/v1"),
-)
+FORECAST_SYSTEM_PROMPT = """You are a forecasting analyst with expertise in time series analysis and business planning.
+
+Your task is to:
+1. Interpret the forecast results in business context
+2. Explain the trend and its implications
+3. Highlight key forecast insights
+4. Provide actionable recommendations based on predictions
+5. Discuss confidence levels and potential risks
+
+Focus on:
+- Business implications of the forecast
+- Growth or decline patterns
+- Seasonal effects (if present)
+- Planning recommendations
+- Risk factors and uncertainties
+"""
+
+# Frequencies the statistical engine handles best (monthly, quarterly, yearly)
+_LOW_FREQUENCY_PREFIXES = ("M", "BM", "Q", "BQ", "Y", "BY", "A", "BA")
 
-# Try to import Prophet (will be added to requirements)
-try:
-    from prophet import Prophet
+# Forecast rows kept in message metadata for batched forecasts
+BATCH_METADATA_MAX_ROWS = 5000
 
-    PROPHET_AVAILABLE = True
-except ImportError:
-    PROPHET_AVAILABLE = False
-    logger.warning("Prophet not available. Using fallback forecasting methods.")
+
+def _select_forecast_engine(df: pd.DataFrame, date_column: str) -> str:
+    """
+    Choose between Prophet and the statistical engine (ETS / seasonal naive).
+
+    In "auto" mode, short series and regular low-frequency series (monthly,
+    quarterly, yearly) use the statistical engine. Prophet is kept for long
+    daily or weekly series, where its multiple seasonalities help.
+
+    Returns:
+        str: "prophet" or "statistical"
+    """
+    engine = settings.forecast_engine
+    if engine == "statistical" or not PROPHET_AVAILABLE:
+        return "statistical"
+    if engine == "prophet":
+        return "prophet"
+
+    dates = pd.DatetimeIndex(pd.to_datetime(df[date_column]).dropna().drop_duplicates().sort_values())
+    if len(dates) < settings.forecast_statistical_max_points:
+        return "statistical"
+    if infer_frequency(dates).startswith(_LOW_FREQUENCY_PREFIXES):
+        return "statistical"
+    return "prophet"
 
 
 async def _forecast_with_prophet(
@@ -46,6 +91,10 @@ async def _forecast_with_prophet(
     """
     Forecast using Facebook Prophet.
 
+    The fit runs on the process pool so it does not block the event loop.
+    Results are cached by data fingerprint and model settings, so repeated
+    and shorter-horizon follow-up questions skip the fit.
+
     Args:
         df: DataFrame with time series data
         date_column: Name of date column
@@ -59,65 +108,129 @@ async def _forecast_with_prophet(
         return {"error": "Prophet library not installed"}
 
     try:
+        cache_key = forecast_cache.key(df, date_column, value_column, {"method": "Prophet", "freq": "D", **PROPHET_PARAMS})
+        cached = await forecast_cache.get(cache_key, periods)
+        if cached is not None:
+            logger.info(f"Forecast cache hit for {value_column} ({periods} periods)")
+            return cached
+
         # Prepare data for Prophet (requires 'ds' and 'y' columns)
         prophet_df = pd.DataFrame({"ds": pd.to_datetime(df[date_column]), "y": df[value_column]})
 
         # Remove duplicates and sort
         prophet_df = prophet_df.drop_duplicates(subset=["ds"]).sort_values("ds")
 
-        # Initialize Prophet model
-        model = Prophet(
-            yearly_seasonality="auto",
-            weekly_seasonality="auto",
-            daily_seasonality=False,
-            seasonality_mode="multiplicative",
-            changepoint_prior_scale=0.05,  # Flexibility of trend
+        result = await task_executors.run("forecast", prophet_forecast, frame_to_ipc(prophet_df), periods)
+        await forecast_cache.set(cache_key, result)
+        return result
+
+    except Exception as e:
+        logger.error(f"Prophet forecasting error: {e}", exc_info=True)
+        return {"error": str(e)}
+
+
+async def _batch_forecast_response(
+    df: pd.DataFrame,
+    user_query: str,
+    entity_column: str,
+    date_column: str,
+    value_column: str,
+    periods: int,
+) -> Dict[str, Any]:
+    """
+    Forecast every entity's series and summarize the biggest movers.
+
+    Args:
+        df: Uploaded data
+        user_query: User's request
+        entity_column: Column identifying each series (e.g. brand)
+        date_column: Date column
+        value_column: Metric to forecast
+        periods: Forecast horizon
+
+    Returns:
+        dict: Agent state update (messages, agent_response, metadata)
+    """
+    batch = await forecast_all_series(df, entity_column, date_column, value_column, periods)
+    series = batch["series"]
+    ranked = series.dropna(subset=["change_pct"])
+
+    def movers(rows: pd.DataFrame) -> str:
+        return "\n".join(
+            f"- {row.entity}: {row.last_historical:.2f} → {row.last_forecast:.2f} ({row.change_pct:+.1f}%, {row.method})"
+            for row in rows.itertuples()
         )
 
-        # Fit model
-        model.fit(prophet_df)
+    methods = ", ".join(f"{method}: {count}" for method, count in batch["methods"].items())
+    forecast_summary = f"""
+User Query: {user_query}
 
-        # Create future dataframe
-        future = model.make_future_dataframe(periods=periods)
+Batched Forecast:
+- Metric: {value_column}
+- Series: {len(series)} values of {entity_column}
+- Periods: {periods} (frequency {batch['freq']})
+- Methods: {methods}
 
-        # Make predictions
-        forecast = model.predict(future)
+Strongest Projected Growth:
+{movers(ranked.head(5))}
 
-        # Extract relevant columns
-        forecast_results = forecast[["ds", "yhat", "yhat_lower", "yhat_upper"]].tail(periods)
+Strongest Projected Decline:
+{movers(ranked.tail(5).iloc[::-1])}
+"""
 
-        # Calculate MAPE (Mean Absolute Percentage Error) on historical data
-        historical_forecast = forecast[["ds", "yhat"]].head(len(prophet_df))
-        merged = prophet_df.merge(historical_forecast, on="ds", how="inner")
-        mape = np.mean(np.abs((merged["y"] - merged["yhat"]) / merged["y"])) * 100
+    insights = await llm_clients.stream_completion(
+        model="openai/gpt-5-chat-latest",
+        messages=[
+            {"role": "system", "content": FORECAST_SYSTEM_PROMPT},
+            {"role": "user", "content": forecast_summary},
+        ],
+        temperature=0.2,
+        seed=42,
+    )
+
+    table = "\n".join(
+        f"| {row.entity} | {row.last_historical:,.2f} | {row.last_forecast:,.2f} | {row.change_pct:+.1f}% | {row.method} |"
+        for row in ranked.head(20).itertuples()
+    )
+    final_response = f"""## Forecast Analysis: {value_column} by {entity_column}
 
-        # Determine accuracy level
-        if mape < 10:
-            accuracy = "Excellent"
-        elif mape < 20:
-            accuracy = "Good"
-        elif mape < 30:
-            accuracy = "Fair"
-        else:
-            accuracy = "Poor"
+{insights}
 
-        return {
-            "method": "Prophet",
-            "forecast_values": forecast_results["yhat"].tolist(),
-            "lower_confidence": forecast_results["yhat_lower"].tolist(),
-            "upper_confidence": forecast_results["yhat_upper"].tolist(),
-            "forecast_dates": forecast_results["ds"].dt.strftime("%Y-%m-%d").tolist(),
-            "periods": periods,
-            "mape": round(mape, 2),
-            "accuracy": accuracy,
-            "last_historical_value": float(prophet_df["y"].iloc[-1]),
-            "first_forecast_value": float(forecast_results["yhat"].iloc[0]),
-            "last_forecast_value": float(forecast_results["yhat"].iloc[-1]),
-        }
+---
 
-    except Exception as e:
-        logger.error(f"Prophet forecasting error: {e}", exc_info=True)
-        return {"error": str(e)}
+**Forecast Summary**: {len(series)} series, {periods} periods ({methods})
+
+| {entity_column} | Last Actual | Last Forecast | Change | Method |
+|---|---|---|---|---|
+{table}
+"""
+
+    forecast = batch["forecast"]
+    forecast_records = forecast.head(BATCH_METADATA_MAX_ROWS).assign(
+        date=forecast["date"].dt.strftime("%Y-%m-%d")
+    ).to_dict(orient="records")
+    metadata = {
+        "agent": "forecasting",
+        "agent_data": {
+            "analysis_type": "batch_forecast",
+            "entity_column": entity_column,
+            "value_column": value_column,
+            "date_column": date_column,
+            "periods": periods,
+            "frequency": batch["freq"],
+            "methods": batch["methods"],
+            "series": series.replace({np.nan: None}).to_dict(orient="records"),
+            "forecast": forecast_records,
+            "forecast_truncated": len(forecast) > BATCH_METADATA_MAX_ROWS,
+        },
+    }
+
+    return {
+        "messages": [{"role": "assistant", "content": final_response}],
+        "agent_response": final_response,
+        "metadata": metadata,
+        "next_agent": "supervisor",
+    }
 
 
 @governed_node("forecasting_agent", "forecast")
@@ -171,23 +284,12 @@ async def forecasting_agent_node(state: AgentState) -> Dict[str, Any]:
                 "next_agent": "supervisor",
             }
 
-        # Identify date and value columns
-        date_cols = df.select_dtypes(include=["datetime64"]).columns.tolist()
-
-        # Try to detect date columns stored as strings
-        if not date_cols:
-            for col in df.select_dtypes(include=["object"]).columns:
-                try:
-                    pd.to_datetime(df[col].head(10), errors="raise")
-                    df[col] = pd.to_datetime(df[col])
-                    date_cols.append(col)
-                    break
-                except:
-                    continue
+        # Identify date and value columns from the shared column profile
+        profile = await asyncio.to_thread(column_profiles.profile, df)
+        date_column = profile["date_column"]
+        numeric_cols = profile["numeric_columns"]
 
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-
-        if not date_cols:
+        if date_column is None:
             return {
                 "messages": [
                     {
@@ -209,18 +311,13 @@ async def forecasting_agent_node(state: AgentState) -> Dict[str, Any]:
                 "next_agent": "supervisor",
             }
 
-        date_column = date_cols[0]
+        # Dates stored as text are converted once; unparseable rows are dropped
+        if date_column in profile["text_date_columns"]:
+            df[date_column] = pd.to_datetime(df[date_column], errors="coerce", format="mixed")
+            df = df[df[date_column].notna()]
 
-        # Find value column (prefer sales/revenue related)
-        value_column = None
-        for col in numeric_cols:
-            col_lower = col.lower()
-            if any(keyword in col_lower for keyword in ["sales", "revenue", "amount", "value", "total"]):
-                value_column = col
-                break
-
-        if value_column is None:
-            value_column = numeric_cols[0]
+        # Value column: prefers sales/revenue related names, skips identifiers
+        value_column = profile["measure_column"]
 
         # Determine forecast periods from query (default 30)
         periods = 30
@@ -242,17 +339,23 @@ async def forecasting_agent_node(state: AgentState) -> Dict[str, Any]:
         if numbers:
             periods = int(numbers[0])
 
+        # Batched mode: one forecast per brand/region/... when the query asks for it
+        entity_column = detect_entity_column(df, user_query, date_column, profile=profile)
+        if entity_column is not None:
+            logger.info(f"Batch forecasting {periods} periods for {value_column} by {entity_column}")
+            return await _batch_forecast_response(df, user_query, entity_column, date_column, value_column, periods)
+
         logger.info(f"Forecasting {periods} periods for {value_column} using {date_column}")
 
         # Step 1: Trend analysis on historical data
         trend_analysis = analyze_trend(df, value_column=value_column, date_column=date_column)
 
         # Step 2: Generate forecast
-        if PROPHET_AVAILABLE:
+        if _select_forecast_engine(df, date_column) == "prophet":
             forecast_results = await _forecast_with_prophet(df, date_column, value_column, periods)
         else:
-            # Fallback to naive forecast
-            forecast_results = forecast_naive(df, value_column, periods)
+            # NumPy ETS / seasonal naive, chosen by backtest (milliseconds)
+            forecast_results = forecast_statistical(df, date_column, value_column, periods)
 
         if "error" in forecast_results:
             return {
@@ -268,23 +371,6 @@ async def forecasting_agent_node(state: AgentState) -> Dict[str, Any]:
         ema_7 = exponential_moving_average(df_sorted, value_column, span=7)
 
         # Step 4: Generate insights using GPT-5
-        system_prompt = """You are a forecasting analyst with expertise in time series analysis and business planning.
-
-Your task is to:
-1. Interpret the forecast results in business context
-2. Explain the trend and its implications
-3. Highlight key forecast insights
-4. Provide actionable recommendations based on predictions
-5. Discuss confidence levels and potential risks
-
-Focus on:
-- Business implications of the forecast
-- Growth or decline patterns
-- Seasonal effects (if present)
-- Planning recommendations
-- Risk factors and uncertainties
-"""
-
         # Prepare context for GPT-5
         forecast_summary = f"""
 User Query: {user_query}
@@ -318,18 +404,16 @@ Forecast Results ({forecast_results['method']}):
         forecast_summary += f"- Projected Change: {forecast_change:+.1f}%\n"
 
         # Get GPT-5 insights
-        response = await client.chat.completions.create(
+        insights = await llm_clients.stream_completion(
             model="openai/gpt-5-chat-latest",
             messages=[
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": FORECAST_SYSTEM_PROMPT},
                 {"role": "user", "content": forecast_summary},
             ],
             temperature=0.2,
             seed=42,
         )
 
-        insights = response.choices[0].message.content
-
         # Build response with forecast data
         final_response = f"""## Forecast Analysis: {value_column}
 
@@ -7,14 +7,13 @@ Provides helpful, accurate responses without follow-up questions.
 
 import time
 from typing import Dict, Any
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 
 from langgraph_agents.state import AgentState
 from langgraph_agents.tools.database_tools import load_session_messages, get_database_session
 from langgraph_agents.governance_wrapper import governed_node
 from langgraph_agents.metrics_reporter import metrics_reporter
-from core.config import settings
+from langgraph_agents.llm_clients import llm_clients
 
 
 @governed_node("general_agent", "chat")
@@ -37,13 +36,8 @@ async def general_agent_node(state: AgentState) -> AgentState:
             history = await load_session_messages(db, session_id, limit=20)
             break
 
-        # Initialize GPT-5 via Requesty AI
-        llm = ChatOpenAI(
-            model="openai/gpt-5-chat-latest",
-            api_key=settings.REQUESTY_AI_API_KEY,
-            base_url=settings.REQUESTY_AI_API_BASE,
-            temperature=0.7,
-        )
+        # GPT-5 via Requesty AI (shared connection pool)
+        llm = llm_clients.get_chat_model("openai/gpt-5-chat-latest", temperature=0.7)
 
         # Build messages for Claude
         system_prompt = """You are a helpful AI assistant in the Agent-Chat system.
@@ -73,7 +67,8 @@ Remember: The user has explicitly requested NO follow-up questions in responses.
 
         # Get response from GPT-5
         llm_start_time = time.time()
-        response = await llm.ainvoke(messages)
+        async with llm_clients.limit("openai/gpt-5-chat-latest"):
+            response = await llm.ainvoke(messages)
         llm_latency_ms = (time.time() - llm_start_time) * 1000
 
         response_text = response.content
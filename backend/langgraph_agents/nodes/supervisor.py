@@ -4,6 +4,10 @@ Supervisor Node - Smart routing to specialized agents
 The supervisor analyzes user queries and determines which agent should handle them.
 Uses GPT-5 for intelligent routing decisions.
 
+A local fast-path router (keyword rules, optional embedding classifier) runs
+first, then the routing cache (normalized query + file-presence flag); only
+queries neither can answer pay for the GPT-5 call.
+
 Routing Logic:
 - Chart/visualization requests → Chart Agent
 - Brand performance & KPI analysis → Brand Performance Agent
@@ -14,39 +18,18 @@ Routing Logic:
 
 import time
 from typing import Dict, Any
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
 
 from langgraph_agents.state import AgentState, add_execution_step
 from langgraph_agents.governance_wrapper import governed_node
 from langgraph_agents.metrics_reporter import metrics_reporter
+from langgraph_agents.llm_clients import llm_clients
+from langgraph_agents.routing import VALID_AGENTS, get_fast_path_router
+from langgraph_agents.routing_cache import routing_cache
 from core.config import settings
 
-
-@governed_node("supervisor", "route_query")
-async def supervisor_node(state: AgentState) -> AgentState:
-    """
-    Supervisor node that routes queries to appropriate agents.
-
-    Args:
-        state: Current agent state with user query
-
-    Returns:
-        AgentState: Updated state with selected_agent set
-    """
-    query = state["query"]
-    uploaded_files = state.get("uploaded_files", [])
-
-    # Initialize GPT-5 via Requesty for routing
-    llm = ChatOpenAI(
-        model="openai/gpt-5-chat-latest",
-        api_key=settings.REQUESTY_AI_API_KEY,
-        base_url=settings.REQUESTY_AI_API_BASE,
-        temperature=0.1,
-    )
-
-    # Build routing prompt
-    system_prompt = """You are a supervisor routing assistant for an AI analytics platform. Route queries to the most appropriate specialized agent.
+# Routing prompt (its hash versions the routing cache)
+SUPERVISOR_SYSTEM_PROMPT = """You are a supervisor routing assistant for an AI analytics platform. Route queries to the most appropriate specialized agent.
 
 Available agents:
 
@@ -86,6 +69,62 @@ Available agents:
 
 Respond with ONLY the agent name: chart_generator, brand_performance, forecasting, anomaly_detection, or general_chat."""
 
+routing_cache.bind_prompt(SUPERVISOR_SYSTEM_PROMPT)
+
+
+@governed_node("supervisor", "route_query")
+async def supervisor_node(state: AgentState) -> AgentState:
+    """
+    Supervisor node that routes queries to appropriate agents.
+
+    Args:
+        state: Current agent state with user query
+
+    Returns:
+        AgentState: Updated state with selected_agent set
+    """
+    query = state["query"]
+    uploaded_files = state.get("uploaded_files", [])
+
+    # Fast path: resolve confident cases locally without an LLM round trip
+    if settings.supervisor_fast_path_enabled:
+        threshold = settings.supervisor_fast_path_threshold
+        decision = get_fast_path_router().route(query, threshold=threshold)
+        if decision["agent"] in VALID_AGENTS and decision["confidence"] >= threshold:
+            return {
+                **state,
+                "selected_agent": decision["agent"],
+                "execution_path": state.get("execution_path", []) + ["supervisor"],
+                "metadata": {
+                    **state.get("metadata", {}),
+                    "routing_decision": decision["agent"],
+                    "routing_source": decision["source"],
+                    "routing_confidence": decision["confidence"],
+                    "routing_keywords": decision["matched_keywords"],
+                },
+            }
+
+    # Routing cache: repeated queries reuse an earlier LLM decision
+    has_files = bool(uploaded_files)
+    if settings.routing_cache_enabled:
+        cached_agent = await routing_cache.get(query, has_files)
+        if cached_agent in VALID_AGENTS:
+            return {
+                **state,
+                "selected_agent": cached_agent,
+                "execution_path": state.get("execution_path", []) + ["supervisor"],
+                "metadata": {
+                    **state.get("metadata", {}),
+                    "routing_decision": cached_agent,
+                    "routing_source": "cache",
+                },
+            }
+
+    # GPT-5 via Requesty for routing (shared connection pool)
+    llm = llm_clients.get_chat_model("openai/gpt-5-chat-latest", temperature=0.1)
+
+    system_prompt = SUPERVISOR_SYSTEM_PROMPT
+
     user_prompt = f"""User query: "{query}"
 
 Uploaded files: {len(uploaded_files)} file(s)
@@ -100,7 +139,8 @@ Which agent should handle this?"""
         ]
 
         llm_start_time = time.time()
-        response = await llm.ainvoke(messages)
+        async with llm_clients.limit("openai/gpt-5-chat-latest"):
+            response = await llm.ainvoke(messages)
         llm_latency_ms = (time.time() - llm_start_time) * 1000
 
         selected_agent = response.content.strip().lower()
@@ -126,10 +166,11 @@ Which agent should handle this?"""
             )
 
         # Validate agent selection
-        valid_agents = ["chart_generator", "brand_performance", "forecasting", "anomaly_detection", "general_chat"]
-        if selected_agent not in valid_agents:
+        if selected_agent not in VALID_AGENTS:
             # Default to general chat
             selected_agent = "general_chat"
+        elif settings.routing_cache_enabled:
+            await routing_cache.set(query, has_files, selected_agent)
 
         # Data-dependent agents will handle missing files gracefully
         # No need to override here
@@ -142,6 +183,7 @@ Which agent should handle this?"""
             "metadata": {
                 **state.get("metadata", {}),
                 "routing_decision": selected_agent,
+                "routing_source": "llm",
             },
         }
 
@@ -155,5 +197,6 @@ Which agent should handle this?"""
             "metadata": {
                 **state.get("metadata", {}),
                 "routing_error": str(e),
+                "routing_source": "fallback",
             },
         }
\ No newline at end of file
@@ -0,0 +1,288 @@
+"""
+Fast-Path Router - Deterministic pre-routing in front of the GPT-5 supervisor
+
+Most queries contain an explicit trigger word for exactly one agent ("forecast
+next quarter", "detect anomalies in SOM"), so asking GPT-5 to pick one of five
+labels is wasted latency. The fast-path router resolves those cases locally and
+only defers ambiguous queries to the LLM supervisor.
+
+Two local strategies:
+- Keyword rules (always on): weighted trigger patterns per agent, mirroring the
+  triggers listed in the supervisor prompt. Runs in microseconds.
+- Embedding classifier (optional): nearest-prototype classification using a
+  small local sentence-transformers model (settings.embedding_model). Only
+  consulted when keyword rules are not confident.
+
+Every decision is a dict:
+    {
+        "agent": Optional[str],      # chart_generator, forecasting, ... or None
+        "confidence": float,         # 0.0-1.0
+        "source": str,               # "keyword" or "embedding"
+        "matched_keywords": List[str],
+    }
+"""
+
+import logging
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+VALID_AGENTS = ["chart_generator", "brand_performance", "forecasting", "anomaly_detection", "general_chat"]
+
+# Strong triggers (weight 1.0) name the agent's task unambiguously; weak ones
+# (weight 0.4) also show up in other requests ("show", "trend") and can only
+# tip the balance, never route on their own.
+STRONG_WEIGHT = 1.0
+WEAK_WEIGHT = 0.4
+
+AGENT_KEYWORD_RULES: Dict[str, Dict[str, List[str]]] = {
+    "chart_generator": {
+        "strong": [r"chart", r"graph", r"plot", r"visuali[sz]", r"histogram", r"scatter"],
+        "weak": [r"show", r"display", r"draw"],
+    },
+    "forecasting": {
+        "strong": [r"forecast", r"predict", r"projection", r"project(?:ed)? (?:sales|revenue|growth)", r"next (?:day|week|month|quarter|year)", r"what will"],
+        "weak": [r"future", r"trend", r"outlook"],
+    },
+    "anomaly_detection": {
+        "strong": [r"anomal", r"outlier", r"abnormal", r"fraud", r"detect issues", r"quality control"],
+        "weak": [r"unusual", r"spike", r"deviation", r"irregular"],
+    },
+    "brand_performance": {
+        "strong": [r"kpi", r"growth rate", r"market share", r"brand metric", r"analy[sz]e (?:\w+ )?performance", r"data quality", r"yoy", r"year[- ]over[- ]year"],
+        "weak": [r"performance", r"growth", r"share", r"brand", r"benchmark"],
+    },
+}
+
+# Priority order from the supervisor prompt, used to break exact ties
+AGENT_PRIORITY = ["chart_generator", "forecasting", "anomaly_detection", "brand_performance", "general_chat"]
+
+GREETING_PATTERN = re.compile(
+    r"^\s*(?:hi|hello|hey|thanks|thank you|good (?:morning|afternoon|evening)|who are you|what can you do|help)\b",
+    re.IGNORECASE,
+)
+
+# Prototype utterances for the optional embedding classifier
+AGENT_PROTOTYPES: Dict[str, List[str]] = {
+    "chart_generator": [
+        "Create a bar chart of sales by region",
+        "Plot revenue over time",
+        "Visualize the data in a graph",
+    ],
+    "forecasting": [
+        "Forecast sales for the next 12 months",
+        "Predict next quarter revenue",
+        "What will demand look like next year?",
+    ],
+    "anomaly_detection": [
+        "Detect anomalies in SOM data",
+        "Check for unusual market share changes",
+        "Find outliers in the transactions",
+    ],
+    "brand_performance": [
+        "Analyze NS Carton brand performance in Almaty",
+        "Show me YoY growth trends for my brand",
+        "What's driving revenue growth vs VPO decline?",
+        "Calculate market share and KPIs by brand",
+    ],
+    "general_chat": [
+        "Hello, what can you do?",
+        "Explain what a moving average is",
+        "Help me understand how to use this tool",
+    ],
+}
+
+
+def _compile_rules(rules: Dict[str, Dict[str, List[str]]]) -> Dict[str, List[Tuple[re.Pattern, float, str]]]:
+    """Compile trigger patterns with word-start boundaries and stem suffixes"""
+    compiled = {}
+    for agent, groups in rules.items():
+        patterns = []
+        for group, weight in (("strong", STRONG_WEIGHT), ("weak", WEAK_WEIGHT)):
+            for pattern in groups.get(group, []):
+                patterns.append((re.compile(rf"\b{pattern}\w*", re.IGNORECASE), weight, pattern))
+        compiled[agent] = patterns
+    return compiled
+
+
+class EmbeddingRouteClassifier:
+    """
+    Nearest-prototype classifier over sentence embeddings.
+
+    The model is loaded lazily on first use; if sentence-transformers is not
+    installed the classifier reports itself unavailable and never routes.
+    """
+
+    def __init__(self, model_name: str, prototypes: Dict[str, List[str]] = AGENT_PROTOTYPES):
+        self.model_name = model_name
+        self.prototypes = prototypes
+        self._model = None
+        self._prototype_matrix: Optional[np.ndarray] = None
+        self._prototype_labels: List[str] = []
+        self._available: Optional[bool] = None
+        self._lock = threading.Lock()
+
+    def _ensure_loaded(self) -> bool:
+        if self._available is not None:
+            return self._available
+
+        with self._lock:
+            if self._available is not None:
+                return self._available
+            try:
+                from sentence_transformers import SentenceTransformer
+
+                self._model = SentenceTransformer(self.model_name)
+                labels, texts = [], []
+                for agent, examples in self.prototypes.items():
+                    labels.extend([agent] * len(examples))
+                    texts.extend(examples)
+                self._prototype_matrix = self._model.encode(texts, normalize_embeddings=True)
+                self._prototype_labels = labels
+                self._available = True
+            except Exception as e:
+                logger.warning(f"Embedding router unavailable ({e}). Using keyword rules only.")
+                self._available = False
+        return self._available
+
+    def classify(self, query: str) -> Dict[str, Any]:
+        """
+        Classify a query by cosine similarity to agent prototypes.
+
+        Returns:
+            dict: Route decision (agent None when unavailable)
+        """
+        if not self._ensure_loaded():
+            return {"agent": None, "confidence": 0.0, "source": "embedding", "matched_keywords": []}
+
+        query_vector = self._model.encode([query], normalize_embeddings=True)[0]
+        similarities = self._prototype_matrix @ query_vector
+
+        # Best similarity per agent, then margin between the top two agents
+        best_per_agent: Dict[str, float] = {}
+        for label, similarity in zip(self._prototype_labels, similarities):
+            best_per_agent[label] = max(best_per_agent.get(label, -1.0), float(similarity))
+        ranked = sorted(best_per_agent.items(), key=lambda item: item[1], reverse=True)
+
+        top_agent, top_similarity = ranked[0]
+        runner_up_similarity = ranked[1][1] if len(ranked) > 1 else -1.0
+        margin = top_similarity - runner_up_similarity
+
+        # Map (similarity, margin) to a 0-1 confidence; both must be healthy
+        confidence = float(np.clip(top_similarity, 0.0, 1.0) * np.clip(margin / 0.15, 0.0, 1.0))
+
+        return {
+            "agent": top_agent,
+            "confidence": round(confidence, 3),
+            "source": "embedding",
+            "matched_keywords": [],
+        }
+
+
+class FastPathRouter:
+    """
+    Local router that resolves confident cases without an LLM call.
+    """
+
+    def __init__(
+        self,
+        rules: Dict[str, Dict[str, List[str]]] = AGENT_KEYWORD_RULES,
+        classifier: Optional[EmbeddingRouteClassifier] = None,
+    ):
+        self._rules = _compile_rules(rules)
+        self.classifier = classifier
+
+    def score_keywords(self, query: str) -> Dict[str, Tuple[float, List[str]]]:
+        """
+        Score each agent by weighted trigger matches.
+
+        Returns:
+            dict: agent -> (score, matched trigger patterns)
+        """
+        scores = {}
+        for agent, patterns in self._rules.items():
+            score = 0.0
+            matched = []
+            for regex, weight, source_pattern in patterns:
+                if regex.search(query):
+                    score += weight
+                    matched.append(source_pattern)
+            if score > 0:
+                scores[agent] = (score, matched)
+        return scores
+
+    def route_keywords(self, query: str) -> Dict[str, Any]:
+        """
+        Route using keyword rules only.
+
+        Confidence is 1.0 when a single agent has a strong trigger and nothing
+        else matched; it drops as competing agents match and is capped at the
+        weak weight when only weak triggers fired.
+        """
+        scores = self.score_keywords(query)
+
+        if not scores:
+            if GREETING_PATTERN.match(query) and len(query.split()) <= 8:
+                return {"agent": "general_chat", "confidence": 0.95, "source": "keyword", "matched_keywords": ["greeting"]}
+            return {"agent": None, "confidence": 0.0, "source": "keyword", "matched_keywords": []}
+
+        ranked = sorted(
+            scores.items(),
+            key=lambda item: (item[1][0], -AGENT_PRIORITY.index(item[0])),
+            reverse=True,
+        )
+        top_agent, (top_score, matched) = ranked[0]
+        runner_up_score = ranked[1][1][0] if len(ranked) > 1 else 0.0
+
+        strength = min(top_score, STRONG_WEIGHT) / STRONG_WEIGHT
+        separation = (top_score - runner_up_score) / top_score
+        confidence = strength * (0.5 + 0.5 * separation)
+
+        return {
+            "agent": top_agent,
+            "confidence": round(confidence, 3),
+            "source": "keyword",
+            "matched_keywords": matched,
+        }
+
+    def route(self, query: str, threshold: float) -> Dict[str, Any]:
+        """
+        Route a query locally, consulting the embedding classifier when keyword
+        rules are below threshold.
+
+        Args:
+            query: User query
+            threshold: Minimum confidence to accept a local decision
+
+        Returns:
+            dict: Best local decision (caller falls back to the LLM when
+                  confidence < threshold)
+        """
+        decision = self.route_keywords(query)
+        if decision["confidence"] >= threshold or self.classifier is None:
+            return decision
+
+        embedding_decision = self.classifier.classify(query)
+        if embedding_decision["confidence"] > decision["confidence"]:
+            return embedding_decision
+        return decision
+
+
+_fast_path_router: Optional[FastPathRouter] = None
+
+
+def get_fast_path_router() -> FastPathRouter:
+    """Get the process-wide fast-path router configured from settings"""
+    global _fast_path_router
+    if _fast_path_router is None:
+        from core.config import settings
+
+        classifier = None
+        if settings.supervisor_embedding_router_enabled:
+            classifier = EmbeddingRouteClassifier(settings.embedding_model)
+        _fast_path_router = FastPathRouter(classifier=classifier)
+    return _fast_path_router
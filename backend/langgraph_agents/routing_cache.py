@@ -0,0 +1,146 @@
+"""
+Routing Cache - Reuse supervisor routing decisions for repeated queries
+
+Users ask the same questions constantly ("show me YoY growth", the
+/chat/suggestions queries), and each one used to cost a GPT-5 routing call.
+Routing decisions are cached per normalized query text plus a file-presence
+flag in two tiers:
+
+- In-process LRU (core.cache.LRUCache) for hot queries, no network hop
+- Redis via core.cache.CacheService, shared across replicas
+
+Keys are namespaced by a hash of the supervisor prompt, so editing the prompt
+invalidates every cached decision automatically.
+"""
+
+import hashlib
+import logging
+import re
+import unicodedata
+from typing import Any, Dict, Optional
+
+from core.cache import LRUCache, cache_service
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Politeness and filler words that do not change routing
+_FILLER_WORDS = {"please", "pls", "kindly", "can", "could", "would", "you", "me", "for", "the", "a", "an", "my"}
+_NON_WORD = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query so trivially different phrasings share a cache entry.
+
+    Lowercases, applies Unicode NFKC, strips punctuation and filler words, and
+    collapses whitespace. "Show me YoY growth!" and "show YoY growth please"
+    both normalize to "show yoy growth".
+
+    Args:
+        query: Raw user query
+
+    Returns:
+        str: Normalized query text
+    """
+    text = unicodedata.normalize("NFKC", query).lower()
+    text = _NON_WORD.sub(" ", text)
+    words = [word for word in _WHITESPACE.split(text) if word and word not in _FILLER_WORDS]
+    return " ".join(words)
+
+
+def prompt_version(prompt: str) -> str:
+    """Short stable hash identifying a supervisor prompt revision"""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+
+
+class RoutingCache:
+    """
+    Two-tier cache of supervisor routing decisions.
+    """
+
+    def __init__(self, max_entries: int = None, ttl: int = None):
+        self.ttl = ttl or settings.routing_cache_ttl_seconds
+        self.memory = LRUCache(max_entries=max_entries or settings.routing_cache_max_entries, ttl=self.ttl)
+        self.prompt_version = "unversioned"
+        self.redis_hits = 0
+        self.redis_misses = 0
+
+    def bind_prompt(self, prompt: str) -> None:
+        """
+        Version the cache by supervisor prompt.
+
+        A different prompt yields a different key namespace; the in-process tier
+        is cleared because its entries can never be hit again.
+        """
+        version = prompt_version(prompt)
+        if version != self.prompt_version:
+            if self.prompt_version != "unversioned":
+                logger.info(f"Supervisor prompt changed ({self.prompt_version} → {version}); routing cache reset")
+            self.memory.clear()
+            self.prompt_version = version
+
+    def _key(self, query: str, has_files: bool) -> str:
+        digest = hashlib.sha256(normalize_query(query).encode("utf-8")).hexdigest()[:24]
+        return cache_service.cache_key("routing", self.prompt_version, "f1" if has_files else "f0", digest)
+
+    async def get(self, query: str, has_files: bool) -> Optional[str]:
+        """
+        Look up a cached routing decision.
+
+        Returns:
+            Optional[str]: Cached agent name, or None on miss
+        """
+        key = self._key(query, has_files)
+
+        agent = self.memory.get(key)
+        if agent is not None:
+            return agent
+
+        agent = await cache_service.get(key, deserialize=False)
+        if agent is not None:
+            self.redis_hits += 1
+            self.memory.set(key, agent)
+            return agent
+
+        self.redis_misses += 1
+        return None
+
+    async def set(self, query: str, has_files: bool, agent: str) -> None:
+        """Store a routing decision in both tiers"""
+        key = self._key(query, has_files)
+        self.memory.set(key, agent)
+        await cache_service.set(key, agent, ttl=self.ttl, serialize=False)
+
+    async def invalidate(self) -> int:
+        """
+        Drop all cached routing decisions (every prompt version).
+
+        Returns:
+            int: Number of Redis keys removed
+        """
+        self.memory.clear()
+        return await cache_service.clear_pattern(cache_service.cache_key("routing", "*"))
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for both tiers"""
+        memory_stats = self.memory.stats()
+        total_hits = memory_stats["hits"] + self.redis_hits
+        lookups = total_hits + self.redis_misses
+        return {
+            "prompt_version": self.prompt_version,
+            "memory": memory_stats,
+            "redis": {
+                "enabled": cache_service.enabled and cache_service.redis_client is not None,
+                "hits": self.redis_hits,
+                "misses": self.redis_misses,
+            },
+            "hits": total_hits,
+            "misses": self.redis_misses,
+            "hit_rate": round(total_hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Global routing cache instance
+routing_cache = RoutingCache()
@@ -0,0 +1,52 @@
+"""
+Tests for single-pass multi-method anomaly scoring
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.anomaly_scoring import high_confidence_indices, score_anomalies
+
+
+@pytest.fixture
+def metrics() -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame(rng.normal(100, 10, size=(2000, 4)), columns=["sales", "volume", "price", "som"])
+    df.index = df.index + 1000  # Non-positional labels
+    df.loc[1500, "price"] = 400.0
+    df.loc[1700, "volume"] = np.nan
+    return df
+
+
+def test_planted_outlier_ranked_first_by_consensus(metrics):
+    """Test every detector flags the planted outlier and it tops the ranking."""
+    result = score_anomalies(metrics)
+
+    assert result["scores"].shape == (2000, len(result["methods"]))
+    assert result["scores"].dtype == np.float32
+    top = result["top_anomalies"][0]
+    assert top["index"] == 1500
+    assert top["column"] == "price"
+    assert top["votes"] == len(result["methods"])
+    assert high_confidence_indices(result, metrics.index, limit=1) == [1500]
+
+
+def test_scores_do_not_depend_on_chunk_size(metrics):
+    """Test a tiny memory budget (many chunks) gives the same scores as one chunk."""
+    one_chunk = score_anomalies(metrics, use_ml=False)
+    many_chunks = score_anomalies(metrics, use_ml=False, memory_budget_bytes=1)
+
+    np.testing.assert_array_equal(one_chunk["scores"], many_chunks["scores"])
+    assert one_chunk["methods"] == ["iqr", "robust_z", "zscore"]
+
+
+def test_lof_limited_to_flagged_rows_on_large_frames(metrics):
+    """Test above lof_max_rows LOF only scores rows other detectors flagged."""
+    result = score_anomalies(metrics, lof_max_rows=100)
+    flags = result["scores"] > np.array(list(result["thresholds"].values()), dtype=np.float32)
+
+    assert result["lof_scope"] == "flagged rows"
+    lof_rows = np.flatnonzero(result["scores"][:, result["methods"].index("lof")] != 0)
+    assert len(lof_rows) <= 100
+    assert flags[lof_rows, :4].any(axis=1).all()
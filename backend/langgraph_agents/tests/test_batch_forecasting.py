@@ -0,0 +1,66 @@
+"""
+Tests for batched multi-series forecasting
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from langgraph_agents.tools.batch_forecasting import detect_entity_column, forecast_all_series
+from services.analytics_kernels import holt_linear_forecast
+
+
+@pytest.fixture
+def brand_sales() -> pd.DataFrame:
+    dates = pd.date_range("2024-01-01", periods=60, freq="D")
+    frames = []
+    for i, brand in enumerate(["Alpha", "Beta", "Gamma"]):
+        frames.append(pd.DataFrame({
+            "Brand": brand,
+            "Region": ["North", "South"] * 30,
+            "Date": dates,
+            "Sales": 100.0 + i * 50 + np.arange(60) * (i + 1),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_holt_matches_scalar_recursion():
+    """Test the vectorized smoother matches Holt's recursion series by series."""
+    values = np.array([
+        [10.0, 12.0, 13.0, 15.0, 18.0],
+        [np.nan, np.nan, 5.0, 4.0, 3.0],  # Starts late
+    ])
+    forecast, lower, upper = holt_linear_forecast(values, periods=3, alpha=0.5, beta=0.1)
+
+    for row, series in enumerate(values):
+        observed = series[~np.isnan(series)]
+        level, trend = observed[0], 0.0
+        for x in observed[1:]:
+            new_level = level + trend + 0.5 * (x - level - trend)
+            trend = 0.1 * (new_level - level) + 0.9 * trend
+            level = new_level
+        np.testing.assert_allclose(forecast[row], level + trend * np.arange(1, 4))
+
+    assert (lower <= forecast).all() and (upper >= forecast).all()
+
+
+def test_entity_column_requires_batch_request(brand_sales):
+    """Test batched mode only triggers when the query asks for every entity."""
+    assert detect_entity_column(brand_sales, "forecast sales for each brand", "Date") == "Brand"
+    assert detect_entity_column(brand_sales, "forecast sales by region", "Date") == "Region"
+    assert detect_entity_column(brand_sales, "forecast sales for next month", "Date") is None
+
+
+@pytest.mark.asyncio
+async def test_forecast_all_series_returns_combined_frame(brand_sales):
+    """Test every series gets a forecast row per period in one long frame."""
+    result = await forecast_all_series(brand_sales, "Brand", "Date", "Sales", periods=7)
+
+    forecast = result["forecast"]
+    assert result["freq"] == "D"
+    assert set(forecast.columns) == {"entity", "date", "forecast", "lower", "upper", "method"}
+    assert forecast.groupby("entity").size().to_dict() == {"Alpha": 7, "Beta": 7, "Gamma": 7}
+    assert forecast["date"].min() == pd.Timestamp("2024-03-01")
+
+    # Gamma has the steepest trend, so it leads the projected-growth ranking
+    assert result["series"]["entity"].iloc[0] == "Gamma"
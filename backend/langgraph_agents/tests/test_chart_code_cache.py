@@ -0,0 +1,80 @@
+"""
+Tests for the generated chart code cache
+"""
+
+import asyncio
+
+import pandas as pd
+import plotly.graph_objects as go
+
+from langgraph_agents.tools import chart_tools
+from langgraph_agents.tools.chart_code_cache import ChartCodeCache, references_data_values
+from langgraph_agents.tools.column_profiler import profile_columns
+from services.sandbox_kernels import run_chart_code
+
+BAR_CODE = "totals = df.groupby('brand', as_index=False)['sales'].sum()\nfig = go.Figure(go.Bar(x=totals['brand'], y=totals['sales']))"
+
+
+def _sales(brands):
+    return pd.DataFrame({"brand": brands, "sales": [float(i + 1) for i in range(len(brands))]})
+
+
+def test_key_shared_by_rephrased_query_and_same_schema():
+    """Test phrasing variants and same-shaped files share a key; schema changes do not."""
+    cache = ChartCodeCache(max_entries=8)
+    profile = profile_columns(_sales(["A", "B"]))
+    other_file = profile_columns(_sales(["X", "Y", "Z"]))
+    renamed = profile_columns(_sales(["A", "B"]).rename(columns={"sales": "revenue"}))
+
+    key = cache.key("Show me sales by brand!", profile, "bar", "model", "prompt")
+    assert cache.key("show sales by brand please", other_file, "bar", "model", "prompt") == key
+    assert cache.key("show sales by brand", renamed, "bar", "model", "prompt") != key
+    assert cache.key("show sales by brand", profile, "bar", "model", "prompt v2") != key
+
+
+def test_code_with_data_values_is_not_cacheable():
+    """Test code filtering on a value of the data is file-specific."""
+    df = _sales(["Acme", "Globex"])
+    profile = profile_columns(df)
+
+    assert not references_data_values(BAR_CODE, df, profile)
+    assert references_data_values("d = df[df['brand'] == 'Acme']\nfig = go.Figure()", df, profile)
+
+
+def test_cached_code_skips_llm_and_failing_entries_are_evicted(monkeypatch):
+    """Test a repeated request reuses code and a cached entry that fails is replaced."""
+    generated = []
+
+    async def fake_generate(user_query, df, model="m", data_analysis=None, data_reduction=None):
+        generated.append(user_query)
+        return BAR_CODE
+
+    async def fake_execute(code, df):
+        return run_chart_code(code, df)
+
+    async def fake_result(fig, code, code_cached, data_reduction=None):
+        return {"success": True, "code": code, "code_cached": code_cached}
+
+    cache = ChartCodeCache(max_entries=8)
+    monkeypatch.setattr(chart_tools, "chart_code_cache", cache)
+    monkeypatch.setattr(chart_tools, "generate_chart_code", fake_generate)
+    monkeypatch.setattr(chart_tools, "execute_chart_code", fake_execute)
+    monkeypatch.setattr(chart_tools, "_chart_result", fake_result)
+
+    first = asyncio.run(chart_tools.create_chart("sales by brand", _sales(["A", "B"])))
+    second = asyncio.run(chart_tools.create_chart("Sales by brand?", _sales(["C", "D", "E"])))
+    assert (first["code_cached"], second["code_cached"]) == (False, True)
+    assert len(generated) == 1
+
+    # Same schema, but the cached code no longer runs on this frame
+    analysis = chart_tools._analyze_dataframe(_sales(["A", "B"]))
+    key = cache.key(
+        "sales by brand", analysis["profile"], analysis["suggested_chart_type"],
+        "openai/gpt-5-chat-latest", chart_tools.CHART_SYSTEM_PROMPT,
+    )
+    assert cache.memory.get(key) == BAR_CODE
+    cache.memory.set(key, "fig = go.Figure(go.Bar(x=df['missing']))")
+    third = asyncio.run(chart_tools.create_chart("sales by brand", _sales(["A", "B"])))
+    assert third["code_cached"] is False and len(generated) == 2
+    assert cache.evictions == 1
+    assert isinstance(run_chart_code(cache.memory.get(key), _sales(["A", "B"]))[0], go.Figure)
@@ -0,0 +1,61 @@
+"""
+Tests for pre-plot chart data reduction
+"""
+
+import numpy as np
+import pandas as pd
+
+from langgraph_agents.tools.chart_reduction import OTHER_LABEL, describe_reduction, lttb_indices, reduce_for_chart
+from langgraph_agents.tools.column_profiler import profile_columns
+
+
+def _sales(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    return pd.DataFrame({
+        "date": pd.Timestamp("2022-01-01") + pd.to_timedelta(rng.integers(0, 730, rows), unit="D"),
+        "brand": rng.choice([f"Brand {i}" for i in range(60)], rows),
+        "region": rng.choice(["North", "South"], rows),
+        "sales": rng.uniform(10, 100, rows),
+    })
+
+
+def test_lttb_keeps_endpoints_and_extremes_within_budget():
+    """Test LTTB returns the budget, keeps the first and last points and the spike."""
+    x = np.arange(100_000, dtype=float)
+    y = np.sin(x / 500)
+    y[42_000] = 50.0
+
+    kept = lttb_indices(x, y, 500)
+
+    assert len(kept) == 500
+    assert kept[0] == 0 and kept[-1] == len(x) - 1
+    assert np.all(np.diff(kept) > 0)
+    assert 42_000 in kept
+
+
+def test_line_chart_is_time_bucketed_with_totals_preserved():
+    """Test a many-rows-per-date line frame is summed per period within the budget."""
+    df = _sales(50_000)
+
+    reduced, reduction = reduce_for_chart(df, "line", profile_columns(df), 1000, 5)
+
+    assert reduction["method"] == "time_bucket"
+    assert len(reduced) <= 1000
+    assert set(reduced.columns) == {"date", "brand", "region", "sales"}
+    assert reduced["brand"].nunique() == 6  # top 5 plus "Other"
+    assert np.isclose(reduced["sales"].sum(), df["sales"].sum())
+    assert "monthly" in describe_reduction(reduction) or "weekly" in describe_reduction(reduction)
+
+
+def test_bar_chart_keeps_top_categories_and_other():
+    """Test a bar frame is summed per entity, keeping the top N plus one "Other" row."""
+    df = _sales(20_000)
+
+    reduced, reduction = reduce_for_chart(df, "bar", profile_columns(df), 5000, 10)
+    unchanged, none = reduce_for_chart(df.head(100), "bar", profile_columns(df), 5000, 10)
+
+    assert reduction["method"] == "top_n"
+    assert len(reduced) == 11 and reduced["brand"].iloc[-1] == OTHER_LABEL
+    assert reduction["collapsed_into_other"] == 50
+    assert np.isclose(reduced["sales"].sum(), df["sales"].sum())
+    assert none is None and unchanged is not None and len(unchanged) == 100
@@ -0,0 +1,117 @@
+"""
+Tests for the chart renderer pool and render kernels
+"""
+
+import asyncio
+import time
+
+import plotly.graph_objects as go
+import pytest
+
+from core.chart_renderer import ChartRenderer
+from services.render_kernels import KALEIDO_AVAILABLE, render_figures
+
+pytestmark = pytest.mark.skipif(not KALEIDO_AVAILABLE, reason="kaleido not installed")
+
+PNG_SIGNATURE = b"\x89PNG"
+
+
+def _figure_json(values):
+    return go.Figure(go.Bar(x=list(range(len(values))), y=values)).to_json()
+
+
+@pytest.fixture
+def renderer():
+    pool = ChartRenderer(workers=1, queue_size=16, batch_size=4, timeout=60, use_processes=False)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+def test_render_figures_isolates_failures():
+    """Test a bad figure fails alone and the rest of the batch still exports."""
+    results = render_figures([
+        (_figure_json([1, 2, 3]), "png", 400, 300),
+        ('{"data": [', "png", 400, 300),
+    ])
+
+    assert results[0][0].startswith(PNG_SIGNATURE) and results[0][1] is None
+    assert results[1][0] is None and results[1][1]
+
+
+@pytest.mark.asyncio
+async def test_waiting_figures_are_batched(renderer):
+    """Test figures queued together reach the renderer in batches of batch_size."""
+    pngs = await renderer.render_many([_figure_json([i, i + 1]) for i in range(6)], width=400, height=300)
+
+    assert all(png.startswith(PNG_SIGNATURE) for png in pngs)
+    stats = renderer.stats()
+    assert stats["completed"] == 6
+    # One figure goes out as soon as the renderer is free; the other five wait and are batched
+    assert stats["batches"] < 6
+    assert stats["avg_batch_size"] > 1
+
+
+@pytest.mark.asyncio
+async def test_full_queue_skips_png_export():
+    """Test figures beyond the queue size return None instead of waiting."""
+    renderer = ChartRenderer(workers=1, queue_size=1, batch_size=1, timeout=60, use_processes=False)
+    try:
+        pngs = await renderer.render_many([_figure_json([1, 2])] * 3, width=400, height=300)
+    finally:
+        renderer.shutdown(wait=True)
+
+    assert pngs[0].startswith(PNG_SIGNATURE)
+    assert pngs[1:] == [None, None]
+    assert renderer.stats()["rejected"] == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_deadline_scales_with_batch_size(monkeypatch):
+    """Test a full batch of slow but healthy exports, each within the timeout, does not restart the pool."""
+    from core import chart_renderer
+    from services import render_kernels
+
+    renderer = ChartRenderer(workers=1, queue_size=4, batch_size=3, timeout=0.5, use_processes=False)
+    monkeypatch.setattr(
+        render_kernels, "render_figures",
+        lambda figures: time.sleep(0.3 * len(figures)) or [(PNG_SIGNATURE, None)] * len(figures),
+    )
+    loop = asyncio.get_running_loop()
+    batch = [
+        chart_renderer._RenderRequest(_figure_json([i]), "png", 400, 300, loop.create_future())
+        for i in range(3)
+    ]
+    renderer._slots = asyncio.Semaphore(1)
+    await renderer._slots.acquire()
+    try:
+        await renderer._render_batch(batch)
+    finally:
+        renderer.shutdown(wait=True)
+
+    assert [request.future.result() for request in batch] == [(PNG_SIGNATURE, None)] * 3
+    assert renderer.stats()["restarts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_timeout_restarts_once_and_rewarms(monkeypatch):
+    """Test a hung batch restarts the pool once, stale failures leave the new pool alone, and it warms again."""
+    from services import render_kernels
+
+    renderer = ChartRenderer(workers=1, queue_size=4, batch_size=1, timeout=0.5, use_processes=False)
+    monkeypatch.setattr(render_kernels, "render_figures", lambda figures: time.sleep(2) or [])
+    try:
+        await renderer.warm()
+        hung_pool = renderer._pool
+        assert await renderer.render(_figure_json([1, 2]), width=400, height=300) is None
+        while renderer.stats()["restarts"] == 0:  # The batch's own timeout fires just after the caller's
+            await asyncio.sleep(0.05)
+
+        # Other batches failing on the killed pool must not restart its replacement
+        new_pool = renderer._executor()
+        renderer._restart(hung_pool, "stale failure")
+        assert renderer._pool is new_pool
+        assert renderer.stats()["restarts"] == 1
+
+        assert (await renderer.start_warmup())["ready"] is True
+    finally:
+        renderer.shutdown(wait=False)
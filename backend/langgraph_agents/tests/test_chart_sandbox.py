@@ -0,0 +1,68 @@
+"""
+Tests for the chart code sandbox and sandbox kernels
+"""
+
+import json
+
+import pandas as pd
+import pytest
+
+from core.chart_sandbox import ChartSandbox
+from services.sandbox_kernels import RESOURCE_AVAILABLE, run_chart_code
+
+BAR_CODE = "totals = df.groupby('brand', as_index=False)['sales'].sum()\nfig = go.Figure(go.Bar(x=totals['brand'], y=totals['sales']))"
+
+
+@pytest.fixture
+def sales():
+    return pd.DataFrame({"brand": ["A", "B", "A", "C"] * 500, "sales": [float(i % 7) for i in range(2000)]})
+
+
+def test_chart_code_namespace_is_restricted(sales):
+    """Test chart code can use pandas/plotly but not files or arbitrary imports."""
+    fig, error = run_chart_code("import numpy as np\n" + BAR_CODE, sales)
+    assert error is None and list(fig.data[0].x) == ["A", "B", "C"]
+
+    assert "not allowed" in run_chart_code("import os\nfig = go.Figure()", sales)[1]
+    assert "'open' is not defined" in run_chart_code("open('/etc/passwd')", sales)[1]
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not RESOURCE_AVAILABLE, reason="rlimits need a POSIX platform")
+async def test_sandbox_runs_shared_frame_and_enforces_cpu_limit(sales):
+    """Test a chart comes back as figure JSON and runaway code is stopped by its CPU budget."""
+    sandbox = ChartSandbox(workers=1, timeout=60, cpu_seconds=1, memory_mb=2048, use_processes=True)
+    try:
+        figure_json, error = await sandbox.execute(BAR_CODE, sales)
+        looped = await sandbox.execute("try:\n    while True: pass\nexcept Exception:\n    pass", sales)
+        again = await sandbox.execute(BAR_CODE, sales)
+    finally:
+        sandbox.shutdown(wait=True)
+
+    assert error is None
+    assert list(json.loads(figure_json)["data"][0]["x"]) == ["A", "B", "C"]
+    assert looped[0] is None and "CPU limit" in looped[1]
+    # The same worker keeps serving after a stopped execution
+    assert again[1] is None
+    stats = sandbox.stats()
+    assert stats["shared_frames"] == 3 and stats["restarts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_wall_clock_timeout_restarts_sandbox(sales):
+    """Test an execution past the timeout is killed and the next one runs on a fresh worker."""
+    sandbox = ChartSandbox(workers=1, timeout=2, cpu_seconds=0, memory_mb=0, use_processes=True)
+    try:
+        assert (await sandbox.warm())["ready"] is True
+        hung = await sandbox.execute("while True: pass", sales)
+        figure_json, error = await sandbox.execute(BAR_CODE, sales)
+        # The replacement pool is warmed again, so readiness recovers
+        await sandbox.start_warmup()
+        readiness = sandbox.readiness()
+    finally:
+        sandbox.shutdown(wait=True)
+
+    assert hung[0] is None and "timed out" in hung[1]
+    assert error is None and figure_json
+    assert readiness["ready"] is True and readiness["status"] == "warm"
+    assert sandbox.stats()["timeouts"] == 1 and sandbox.stats()["restarts"] == 1
@@ -0,0 +1,129 @@
+"""
+Tests for the content-addressed chart store and the charts API
+"""
+
+import asyncio
+
+import plotly.graph_objects as go
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core.config import settings
+from langgraph_agents.tools import chart_tools
+from services.chart_store import ChartStore, chart_id_for, is_chart_id
+
+PNG = b"\x89PNG fake image"
+
+
+class CountingRenderer:
+    def __init__(self):
+        self.calls = 0
+
+    async def render(self, figure_json, width=None, height=None, image_format="png"):
+        self.calls += 1
+        return PNG
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """Chart store on local storage in a temporary directory"""
+    # The storage module builds its Azure client at import; it is never used here
+    if not settings.azure_storage_connection_string:
+        monkeypatch.setattr(
+            settings,
+            "azure_storage_connection_string",
+            "DefaultEndpointsProtocol=https;AccountName=test;AccountKey=dGVzdA==;EndpointSuffix=core.windows.net",
+        )
+    from services.unified_storage import LocalStorageAdapter, unified_storage
+
+    monkeypatch.setattr(settings, "upload_dir", str(tmp_path))
+    monkeypatch.setattr(unified_storage, "_adapter", LocalStorageAdapter())
+    store = ChartStore(memory_bytes=1024 * 1024)
+    monkeypatch.setattr(chart_tools, "chart_store", store)
+    return store
+
+
+def test_chart_id_is_content_address():
+    """Test the same figure and size always map to the same ID, and any change moves it."""
+    figure = go.Figure(go.Bar(x=["a", "b"], y=[1, 2])).to_json()
+    other = go.Figure(go.Bar(x=["a", "b"], y=[1, 3])).to_json()
+
+    assert chart_id_for(figure, 1200, 800) == chart_id_for(figure, 1200, 800)
+    assert chart_id_for(figure, 1200, 800) != chart_id_for(other, 1200, 800)
+    assert chart_id_for(figure, 1200, 800) != chart_id_for(figure, 600, 400)
+    assert is_chart_id(chart_id_for(figure, 1200, 800))
+    assert not is_chart_id("../../etc/passwd")
+
+
+def test_identical_chart_is_rendered_and_stored_once(store, monkeypatch):
+    """Test a repeated chart reuses stored artifacts without rendering again."""
+    renderer = CountingRenderer()
+    monkeypatch.setattr(chart_tools, "chart_renderer", renderer)
+
+    def result():
+        fig = go.Figure(go.Bar(x=["a", "b"], y=[1, 2]))
+        return asyncio.run(chart_tools._chart_result(fig, "code", code_cached=False))
+
+    first, second = result(), result()
+
+    assert first["chart_id"] == second["chart_id"]
+    assert (first["artifacts_reused"], second["artifacts_reused"]) == (False, True)
+    assert renderer.calls == 1
+    assert store.stats()["writes"] == 3  # figure JSON, HTML and PNG
+    # Only references travel in the result, not the artifacts
+    assert second["chart_png_url"].endswith(f"/charts/{second['chart_id']}/png")
+    assert second["chart_html"] is None and second["chart_png"] is None
+
+
+def test_charts_api_serves_artifacts_with_strong_etag(store, monkeypatch):
+    """Test artifacts are served with an ETag and revalidate with 304."""
+    from api import charts
+
+    monkeypatch.setattr(charts, "chart_store", store)
+    chart_id = "0123456789abcdef0123456789abcdef"
+    asyncio.run(store.put(chart_id, "png", PNG))
+
+    app = FastAPI()
+    app.include_router(charts.router)
+    client = TestClient(app)
+
+    response = client.get(f"/charts/{chart_id}/png")
+    assert response.status_code == 200
+    assert response.content == PNG
+    assert response.headers["content-type"] == "image/png"
+    etag = response.headers["etag"]
+    assert not etag.startswith("W/")
+
+    assert client.get(f"/charts/{chart_id}/png", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(f"/charts/{chart_id}").content == PNG
+    assert client.get("/charts/ffffffffffffffffffffffffffffffff/png").status_code == 404
+    assert client.get(f"/charts/{chart_id}/gif").status_code == 400
+
+
+def test_lazy_render_defers_exports_to_first_request(store, monkeypatch):
+    """Test lazy mode responds with the figure only and renders the PNG once, on first GET."""
+    import core.chart_renderer
+    from api import charts
+
+    renderer = CountingRenderer()
+    monkeypatch.setattr(chart_tools, "chart_renderer", renderer)
+    monkeypatch.setattr(core.chart_renderer, "chart_renderer", renderer)
+    monkeypatch.setattr(charts, "chart_store", store)
+    monkeypatch.setattr(settings, "chart_lazy_render", True)
+
+    fig = go.Figure(go.Bar(x=["a", "b"], y=[4, 5]))
+    result = asyncio.run(chart_tools._chart_result(fig, "code", code_cached=False))
+    assert renderer.calls == 0
+    assert result["lazy_render"] is True
+    assert asyncio.run(store.get(result["chart_id"], "json")) == fig.to_json().encode("utf-8")
+
+    app = FastAPI()
+    app.include_router(charts.router)
+    client = TestClient(app)
+
+    path = result["chart_png_url"].removeprefix(settings.api_prefix)
+    assert client.get(path).content == PNG
+    assert client.get(path).content == PNG
+    assert renderer.calls == 1
+    assert store.stats()["on_demand_renders"] == 1
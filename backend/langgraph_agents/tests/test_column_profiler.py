@@ -0,0 +1,97 @@
+"""
+Tests for the shared column profiler
+"""
+
+import numpy as np
+import pandas as pd
+
+from langgraph_agents.tools.column_profiler import ColumnProfileCache, profile_columns
+
+
+def _orders(rows: int = 200) -> pd.DataFrame:
+    rng = np.random.default_rng(5)
+    return pd.DataFrame({
+        "order_id": np.arange(rows),
+        "Order Date": pd.date_range("2024-01-01", periods=rows, freq="D").strftime("%d/%m/%Y"),
+        "Brand Name": rng.choice(["Acme", "Globex", "Initech"], rows),
+        "units": rng.integers(1, 9, rows),
+        "Net Sales": rng.uniform(10, 100, rows),
+        "zip": rng.integers(10000, 99999, rows).astype(str),
+        "customer_ref": [f"C-{i:05d}" for i in range(rows)],
+    })
+
+
+def test_profile_detects_text_dates_roles_and_primary_columns():
+    """Test text dates, id-like columns and the keyword-preferred primary columns."""
+    df = _orders()
+    df.loc[:9, "Net Sales"] = np.nan
+    profile = profile_columns(df)
+    by_name = {col["name"]: col for col in profile["columns"]}
+
+    assert profile["date_columns"] == ["Order Date"]
+    assert profile["text_date_columns"] == ["Order Date"]
+    assert by_name["order_id"]["role"] == "id"
+    assert by_name["customer_ref"]["role"] == "id"
+    assert by_name["zip"]["kind"] == "categorical"
+    assert by_name["Brand Name"]["unique"] == 3
+    assert by_name["Net Sales"]["null_ratio"] == 0.05
+
+    assert profile["measure_column"] == "Net Sales"
+    assert profile["entity_column"] == "Brand Name"
+    assert profile["measure_columns"] == ["units", "Net Sales"]
+
+
+def test_id_names_match_whole_tokens_only():
+    """Test names merely ending in "id"/"key" (Amount Paid, Turkey) stay measures and entities."""
+    rows = 50
+    df = pd.DataFrame({
+        "Date": pd.date_range("2024-01-01", periods=rows, freq="D"),
+        "Brand": ["Acme", "Globex"] * (rows // 2),
+        "Units": np.arange(rows) % 7,
+        "Amount Paid": np.arange(rows) * 10,
+        "Turkey": np.arange(rows),
+        "Store Code": np.arange(rows),
+    })
+    profile = profile_columns(df)
+    by_name = {col["name"]: col for col in profile["columns"]}
+
+    assert by_name["Amount Paid"]["role"] == "measure"
+    assert by_name["Turkey"]["role"] == "measure"
+    assert by_name["Store Code"]["role"] == "id"
+    assert profile["measure_column"] == "Amount Paid"
+
+
+def test_typed_dates_preferred_and_numeric_codes_are_not_dates():
+    """Test datetime columns win over text dates and numeric strings are not dates."""
+    df = pd.DataFrame({
+        "label": ["2024-01-01", "2024-02-01", "2024-03-01"],
+        "year": ["2021", "2022", "2023"],
+        "when": pd.date_range("2024-01-01", periods=3, freq="MS"),
+        "qty": [1, 2, 3],
+    })
+    profile = profile_columns(df)
+
+    assert profile["date_columns"] == ["when", "label"]
+    assert profile["date_column"] == "when"
+    assert "year" in profile["categorical_columns"]
+
+
+def test_cache_reuses_profile_per_file_hash_and_skips_subsets():
+    """Test one profile per file hash, while column subsets are profiled on their own."""
+    cache = ColumnProfileCache(max_entries=8)
+    df = _orders()
+    df.attrs["file_hash"] = "abc"
+
+    first = cache.profile(df)
+    assert cache.profile(df.copy(deep=False)) is first
+    assert cache.profiled == 1
+
+    subset = df[["units", "Net Sales"]]
+    assert subset.attrs["file_hash"] == "abc"
+    assert cache.profile(subset)["measure_columns"] == ["units", "Net Sales"]
+    assert cache.profile(df) is first
+    assert cache.profiled == 2
+
+    cache.invalidate("abc")
+    cache.profile(df)
+    assert cache.profiled == 3
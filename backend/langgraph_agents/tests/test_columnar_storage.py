@@ -0,0 +1,34 @@
+"""
+Tests for Parquet worksheet sidecars
+"""
+
+import pandas as pd
+import pytest
+
+from services.columnar_storage import COLUMNAR_AVAILABLE, frame_to_parquet, parquet_to_frame
+
+pytestmark = pytest.mark.skipif(not COLUMNAR_AVAILABLE, reason="pyarrow not installed")
+
+
+def test_sidecar_round_trip_keeps_labels_and_dtypes():
+    """Test a sheet read back from its sidecar equals the parsed original, non-string labels included."""
+    df = pd.DataFrame({
+        "Brand": ["A", "B", None],
+        2023: [1.5, 2.0, 3.25],
+        2024: [1, 2, 3],
+        "Date": pd.to_datetime(["2024-01-01", "2024-02-01", "2024-03-01"]),
+    })
+
+    restored = parquet_to_frame(frame_to_parquet(df))
+
+    assert list(restored.columns) == ["Brand", 2023, 2024, "Date"]
+    pd.testing.assert_frame_equal(restored, df)
+
+
+def test_sheets_needing_coercion_get_no_sidecar():
+    """Test mixed-type columns and colliding labels are not stringified into a sidecar."""
+    mixed = pd.DataFrame({"Region": ["North", 12, 3.5], "Sales": [1.0, 2.0, 3.0]})
+    colliding = pd.DataFrame([[1, 2]], columns=[1, "1"])
+
+    assert frame_to_parquet(mixed) is None
+    assert frame_to_parquet(colliding) is None
@@ -0,0 +1,60 @@
+"""
+Tests for the parsed DataFrame cache
+"""
+
+import pandas as pd
+import pytest
+
+from langgraph_agents.tools.dataframe_cache import DataFrameCache, PYARROW_AVAILABLE
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    return pd.DataFrame({"brand": ["A", "B", "C"], "sales": [10.0, 20.0, 30.0]})
+
+
+@pytest.mark.asyncio
+async def test_loader_runs_once_per_hash(tmp_path, frame):
+    """Test repeated loads of the same file hash are served from cache."""
+    cache = DataFrameCache(disk_dir=str(tmp_path))
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return frame
+
+    first = await cache.get_or_load("abc123", loader)
+    second = await cache.get_or_load("abc123", loader)
+
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+    assert second.attrs["file_hash"] == "abc123"
+
+
+@pytest.mark.asyncio
+async def test_column_replacement_does_not_leak_into_cache(tmp_path, frame):
+    """Test callers replacing columns do not modify the cached frame."""
+    cache = DataFrameCache(disk_dir=str(tmp_path))
+
+    async def loader():
+        return frame
+
+    df = await cache.get_or_load("abc123", loader)
+    df["sales"] = df["sales"] * 2
+
+    cached = await cache.get("abc123")
+    assert cached["sales"].tolist() == [10.0, 20.0, 30.0]
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not PYARROW_AVAILABLE, reason="pyarrow not installed")
+async def test_disk_tier_survives_memory_eviction(tmp_path, frame):
+    """Test frames evicted from memory reload from the Arrow tier."""
+    cache = DataFrameCache(disk_dir=str(tmp_path))
+    await cache.set("abc123", frame)
+    cache.memory.clear()
+
+    reloaded = await cache.get("abc123")
+
+    pd.testing.assert_frame_equal(reloaded, frame)
+    assert cache.disk_hits == 1
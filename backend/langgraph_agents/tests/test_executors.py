@@ -0,0 +1,145 @@
+"""
+Tests for the managed task executors
+"""
+
+import asyncio
+import operator
+import threading
+import time
+
+import pytest
+
+from core.executors import TaskExecutors
+
+
+@pytest.fixture
+def executors():
+    pools = TaskExecutors(process_workers=1, thread_workers=4, limits={"chart": 2}, use_processes=False)
+    yield pools
+    pools.shutdown(wait=True)
+
+
+@pytest.mark.asyncio
+async def test_run_returns_result_off_the_event_loop(executors):
+    """Test blocking work runs on a pool thread and returns its result."""
+    loop_thread = threading.get_ident()
+
+    def work(a, b):
+        return a + b, threading.get_ident()
+
+    total, worker_thread = await executors.run("parse", work, 2, b=3)
+
+    assert total == 5
+    assert worker_thread != loop_thread
+    assert executors.stats()["tasks"]["parse"]["completed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_per_task_type(executors):
+    """Test no more than the task type's limit runs at once."""
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def work():
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.pop()
+
+    await asyncio.gather(*(executors.run("chart", work) for _ in range(6)))
+
+    assert max(peak) == 2
+    assert executors.stats()["tasks"]["chart"]["completed"] == 6
+
+
+@pytest.mark.asyncio
+async def test_cancelled_queued_task_never_runs(executors):
+    """Test cancelling a task waiting for a slot drops it and frees nothing twice."""
+    ran = []
+    release = threading.Event()
+
+    blockers = [asyncio.create_task(executors.run("chart", release.wait)) for _ in range(2)]
+    await asyncio.sleep(0.05)
+    queued = asyncio.create_task(executors.run("chart", ran.append, 1))
+    await asyncio.sleep(0.05)
+    assert executors.stats()["tasks"]["chart"]["queued"] == 1
+
+    queued.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+    release.set()
+    await asyncio.gather(*blockers)
+
+    stats = executors.stats()["tasks"]["chart"]
+    assert ran == []
+    assert stats["cancelled"] == 1
+    assert stats["running"] == 0
+
+
+@pytest.mark.asyncio
+async def test_process_pool_runs_picklable_functions():
+    """Test process task types run in a worker process."""
+    pools = TaskExecutors(process_workers=1, use_processes=True)
+    try:
+        assert await pools.run("forecast", operator.mul, 6, 7) == 42
+        assert pools.stats()["process_pool"]["started"] is True
+    finally:
+        pools.shutdown(wait=True)
+
+
+@pytest.mark.asyncio
+async def test_unknown_task_type_rejected(executors):
+    """Test task types must be declared in TASK_POOLS."""
+    with pytest.raises(ValueError):
+        await executors.run("gpu", operator.add, 1, 2)
+
+
+@pytest.mark.asyncio
+async def test_readiness_reports_warm_workers():
+    """Test warm() starts the process workers and flips readiness."""
+    pools = TaskExecutors(process_workers=1, use_processes=True)
+    try:
+        assert pools.readiness()["ready"] is False
+        readiness = await pools.warm()
+        assert readiness["ready"] is True
+        assert len(readiness["workers"]) == 1
+        assert readiness["workers"][0]["modules"]
+    finally:
+        pools.shutdown(wait=True)
+
+
+def test_readiness_probe_without_startup_warmup(monkeypatch):
+    """Test /health/workers is not stuck at 503 when pools are never warmed at startup."""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from api import health
+    from core.config import settings
+
+    app = FastAPI()
+    app.include_router(health.router)
+    client = TestClient(app)
+
+    # Nothing warmed in tests: cold pools are unready only if startup warm-up was expected
+    monkeypatch.setattr(settings, "executor_warm_on_startup", True)
+    assert client.get("/health/workers").status_code == 503
+    monkeypatch.setattr(settings, "executor_warm_on_startup", False)
+    response = client.get("/health/workers")
+    assert response.status_code == 200
+    assert response.json()["warm_on_startup"] is False
+
+
+def test_frames_round_trip_through_ipc():
+    """Test frames sent to workers as Arrow IPC keep values and index labels."""
+    import pandas as pd
+
+    from services.analytics_kernels import ARROW_AVAILABLE, as_frame, frame_to_ipc
+
+    df = pd.DataFrame({"sales": [1.5, 2.5, 3.5]}, index=[10, 20, 30])
+    payload = frame_to_ipc(df)
+
+    assert isinstance(payload, bytes) == ARROW_AVAILABLE
+    pd.testing.assert_frame_equal(as_frame(payload), df)
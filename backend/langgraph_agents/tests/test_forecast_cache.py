@@ -0,0 +1,73 @@
+"""
+Tests for the forecast result cache
+"""
+
+import pandas as pd
+import pytest
+
+from langgraph_agents.tools.forecast_cache import ForecastCache, data_fingerprint
+
+PARAMS = {"method": "Prophet", "freq": "D"}
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        "date": pd.date_range("2024-01-01", periods=5),
+        "sales": [10.0, 11.0, 12.0, 13.0, 14.0],
+    })
+
+
+def _result(periods: int) -> dict:
+    values = [float(15 + i) for i in range(periods)]
+    return {
+        "method": "Prophet",
+        "forecast_values": values,
+        "lower_confidence": [v - 1 for v in values],
+        "upper_confidence": [v + 1 for v in values],
+        "forecast_dates": [f"2024-01-{6 + i:02d}" for i in range(periods)],
+        "periods": periods,
+        "mape": 1.5,
+        "first_forecast_value": values[0],
+        "last_forecast_value": values[-1],
+    }
+
+
+@pytest.mark.asyncio
+async def test_shorter_horizon_served_from_longer_forecast(tmp_path, frame):
+    """Test a follow-up asking for fewer periods slices the cached forecast."""
+    cache = ForecastCache(disk_dir=str(tmp_path))
+    key = cache.key(frame, "date", "sales", PARAMS)
+    await cache.set(key, _result(12))
+
+    sliced = await cache.get(key, 6)
+
+    assert sliced["periods"] == 6
+    assert sliced["forecast_values"] == _result(12)["forecast_values"][:6]
+    assert sliced["last_forecast_value"] == 20.0
+    assert await cache.get(key, 24) is None
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_survives_restart(tmp_path, frame):
+    """Test a new cache instance reads forecasts persisted by an earlier one."""
+    key = ForecastCache(disk_dir=str(tmp_path)).key(frame, "date", "sales", PARAMS)
+    await ForecastCache(disk_dir=str(tmp_path)).set(key, _result(3))
+
+    restarted = ForecastCache(disk_dir=str(tmp_path))
+    assert await restarted.get(key, 3) == _result(3)
+    assert restarted.stats()["disk"]["hits"] == 1
+
+
+def test_key_changes_with_data_and_parameters(frame):
+    """Test the key tracks the data fingerprint, columns and model settings."""
+    cache = ForecastCache()
+    base = cache.key(frame, "date", "sales", PARAMS)
+
+    changed = frame.assign(sales=frame["sales"] + 1)
+    assert cache.key(changed, "date", "sales", PARAMS) != base
+    assert cache.key(frame, "date", "sales", {**PARAMS, "freq": "W"}) != base
+    assert cache.key(frame.copy(), "date", "sales", PARAMS) == base
+
+    frame.attrs["file_hash"] = "abc123"
+    assert data_fingerprint(frame, "date", "sales") == "file:abc123"
@@ -0,0 +1,77 @@
+"""
+Tests for brand KPI summaries precomputed at ingest
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from langgraph_agents.nodes.brand_performance_agent import _format_number
+from langgraph_agents.tools.analytics_tools import calculate_market_share
+from langgraph_agents.tools.kpi_summary import (
+    KPI_SUMMARY_MAX_ENTITIES,
+    compute_kpi_summary,
+    is_current_summary,
+)
+
+
+def _brand_sales(brands: int = 3, months: int = 12) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    dates = pd.date_range("2024-01-01", periods=months, freq="MS")
+    return pd.DataFrame({
+        "date": np.repeat(dates, brands),
+        "brand": [f"Brand {i}" for i in range(brands)] * months,
+        "units": rng.integers(1, 50, brands * months),
+        "sales": rng.uniform(100, 1000, brands * months),
+    })
+
+
+def test_summary_is_json_and_matches_full_frame_kpis():
+    """Test the stored summary round-trips through JSON with the agent's KPIs."""
+    df = _brand_sales()
+    summary = json.loads(json.dumps(compute_kpi_summary(df)))
+
+    assert is_current_summary(summary)
+    assert (summary["value_column"], summary["entity_column"], summary["date_column"]) == ("sales", "brand", "date")
+
+    kpis = summary["kpis"]
+    assert set(kpis) == {"data_quality", "growth_analysis", "trend_analysis", "market_share", "performance_metrics"}
+    assert kpis["growth_analysis"]["periods_analyzed"] == 12
+    assert "2024-01-31" in kpis["growth_analysis"]["period_values"]
+    assert kpis["performance_metrics"]["total"] == df["sales"].sum()
+
+    expected = calculate_market_share(df, entity_column="brand", value_column="sales")
+    assert kpis["market_share"]["market_leader"] == expected["market_leader"]
+    assert kpis["market_share"]["hhi_index"] == expected["hhi_index"]
+
+
+def test_summary_keeps_largest_entities_only():
+    """Test per-entity tables are capped while total_entities counts all of them."""
+    df = _brand_sales(brands=KPI_SUMMARY_MAX_ENTITIES + 20, months=2)
+    kpis = compute_kpi_summary(df)["kpis"]
+
+    shares = kpis["market_share"]["market_shares"]
+    assert len(shares) == KPI_SUMMARY_MAX_ENTITIES
+    assert kpis["market_share"]["total_entities"] == KPI_SUMMARY_MAX_ENTITIES + 20
+    assert list(kpis["performance_metrics"]["by_category"]) == list(shares)
+
+
+def test_summary_without_dates_or_entities():
+    """Test a numbers-only sheet still gets quality and performance KPIs."""
+    summary = compute_kpi_summary(pd.DataFrame({"revenue": [1.0, 2.0, np.nan, 4.0]}))
+
+    assert summary["date_column"] is None and summary["entity_column"] is None
+    assert set(summary["kpis"]) == {"data_quality", "performance_metrics"}
+    assert summary["kpis"]["data_quality"]["missing_values"] == {"revenue": 1}
+    assert not is_current_summary({**summary, "version": 0})
+
+
+def test_undefined_metrics_are_stored_as_none_and_shown_as_na():
+    """Test a single-value column stores its NaN std dev as None and the agent prints it as n/a."""
+    summary = compute_kpi_summary(pd.DataFrame({"revenue": [5.0, np.nan, np.nan]}))
+    metrics = summary["kpis"]["performance_metrics"]
+
+    assert metrics["std_dev"] is None
+    assert _format_number(metrics["std_dev"]) == "n/a"
+    assert _format_number(metrics["mean"]) == "5.00"
@@ -0,0 +1,68 @@
+"""
+Tests for the rollup cube
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from langgraph_agents.tools.analytics_tools import calculate_growth_rate, calculate_market_share
+from langgraph_agents.tools.rollup_cube import (
+    CUBE_LEVELS,
+    build_rollup_cube,
+    cube_growth_rate,
+    cube_market_share,
+)
+
+
+@pytest.fixture
+def sales():
+    rng = np.random.default_rng(3)
+    rows = 5000
+    df = pd.DataFrame({
+        "date": pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 500, rows), unit="D"),
+        "brand": rng.choice(["A", "B", "C", "D"], rows),
+        "sales": rng.uniform(10, 100, rows),
+    })
+    df.loc[::53, "brand"] = None
+    df.loc[::71, "date"] = pd.NaT
+    return df
+
+
+@pytest.mark.parametrize("level", list(CUBE_LEVELS))
+def test_cube_growth_matches_resample(sales, level):
+    """Test growth from the cube matches calculate_growth_rate at every level."""
+    cube = build_rollup_cube(sales, "date", ["sales"], "brand")
+
+    expected = calculate_growth_rate(sales.copy(), "sales", "date", level)
+    result = cube_growth_rate(cube, "sales", level)
+
+    assert list(result["period_values"]) == list(expected["period_values"])
+    np.testing.assert_allclose(list(result["period_values"].values()), list(expected["period_values"].values()))
+    assert result["trend"] == expected["trend"]
+    assert result["overall_growth_rate"] == pytest.approx(expected["overall_growth_rate"], abs=0.01)
+
+
+def test_cube_market_share_matches_groupby_and_filters_periods(sales):
+    """Test all-row share matches calculate_market_share and period share uses one period."""
+    cube = build_rollup_cube(sales, "date", ["sales"], "brand")
+
+    expected = calculate_market_share(sales, "brand", "sales")
+    result = cube_market_share(cube, "sales")
+    assert result["market_shares"] == expected["market_shares"]
+    assert result["hhi_index"] == pytest.approx(expected["hhi_index"])
+
+    latest = cube_market_share(cube, "sales", level="quarter")
+    in_quarter = sales[sales["date"].dt.to_period("Q") == pd.Period(latest["period"], "Q")]
+    assert latest["period"] == "2024-06-30"
+    assert latest["market_shares"] == calculate_market_share(in_quarter, "brand", "sales")["market_shares"]
+
+
+def test_cube_without_entity_column():
+    """Test a cube without entities still answers growth questions."""
+    df = pd.DataFrame({"date": pd.date_range("2024-01-01", periods=90, freq="D"), "units": np.ones(90)})
+    cube = build_rollup_cube(df, "date", ["units"])
+
+    result = cube_growth_rate(cube, "units", "month")
+    assert list(result["period_values"].values()) == [31.0, 29.0, 30.0]
+    assert "error" in cube_growth_rate(cube, "revenue", "month")
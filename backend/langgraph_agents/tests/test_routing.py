@@ -0,0 +1,70 @@
+"""
+Tests for the fast-path supervisor router
+"""
+
+import pytest
+
+from langgraph_agents.routing import FastPathRouter
+
+
+@pytest.fixture
+def router() -> FastPathRouter:
+    """Keyword-only router (no embedding classifier)."""
+    return FastPathRouter()
+
+
+def test_single_strong_trigger_is_confident(router):
+    """Test a query with one unambiguous trigger routes locally."""
+    decision = router.route("Forecast sales for the next 12 months", threshold=0.8)
+
+    assert decision["agent"] == "forecasting"
+    assert decision["confidence"] == 1.0
+    assert decision["source"] == "keyword"
+    assert "forecast" in decision["matched_keywords"]
+
+
+def test_anomaly_query(router):
+    """Test anomaly triggers route to anomaly detection."""
+    decision = router.route("Detect anomalies in SOM data", threshold=0.8)
+
+    assert decision["agent"] == "anomaly_detection"
+    assert decision["confidence"] >= 0.8
+
+
+def test_brand_query_outweighs_weak_triggers(router):
+    """Test strong brand triggers win over weak chart/forecast words."""
+    decision = router.route("Show me YoY growth trends for my brand", threshold=0.8)
+
+    assert decision["agent"] == "brand_performance"
+    assert decision["confidence"] >= 0.8
+
+
+def test_conflicting_strong_triggers_defer_to_llm(router):
+    """Test two strong triggers for different agents are not confident."""
+    decision = router.route("Create a chart of the forecast", threshold=0.8)
+
+    assert decision["agent"] == "chart_generator"  # Priority tie-break
+    assert decision["confidence"] < 0.8
+
+
+def test_weak_trigger_only_defers_to_llm(router):
+    """Test a weak trigger alone never clears the threshold."""
+    decision = router.route("Show the data", threshold=0.8)
+
+    assert decision["confidence"] < 0.8
+
+
+def test_greeting_routes_to_general_chat(router):
+    """Test short greetings route to general chat."""
+    decision = router.route("Hello there!", threshold=0.8)
+
+    assert decision["agent"] == "general_chat"
+    assert decision["confidence"] >= 0.8
+
+
+def test_no_trigger_returns_no_agent(router):
+    """Test queries without triggers are left to the LLM."""
+    decision = router.route("What's driving revenue vs VPO decline?", threshold=0.8)
+
+    assert decision["agent"] is None
+    assert decision["confidence"] == 0.0
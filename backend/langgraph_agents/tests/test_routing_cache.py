@@ -0,0 +1,42 @@
+"""
+Tests for the supervisor routing cache (in-process tier)
+"""
+
+import pytest
+
+from langgraph_agents.routing_cache import RoutingCache, normalize_query
+
+
+def test_normalize_query_collapses_trivial_differences():
+    """Test punctuation, case and filler words do not split cache entries."""
+    assert normalize_query("Show me YoY growth!") == "show yoy growth"
+    assert normalize_query("  show   YoY growth, please ") == "show yoy growth"
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_after_store():
+    """Test a stored decision is returned for a near-duplicate query."""
+    cache = RoutingCache(max_entries=16, ttl=60)
+    cache.bind_prompt("prompt v1")
+
+    assert await cache.get("Show me YoY growth", has_files=True) is None
+    await cache.set("Show me YoY growth", has_files=True, agent="brand_performance")
+
+    assert await cache.get("show yoy growth!", has_files=True) == "brand_performance"
+    assert await cache.get("show yoy growth!", has_files=False) is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_prompt_change_invalidates_entries():
+    """Test binding a new supervisor prompt drops cached decisions."""
+    cache = RoutingCache(max_entries=16, ttl=60)
+    cache.bind_prompt("prompt v1")
+    await cache.set("forecast sales", has_files=True, agent="forecasting")
+
+    cache.bind_prompt("prompt v2")
+
+    assert await cache.get("forecast sales", has_files=True) is None
@@ -0,0 +1,48 @@
+"""
+Tests for the statistical forecasting engine
+"""
+
+import numpy as np
+import pandas as pd
+
+from langgraph_agents.tools.analytics_tools import (
+    forecast_statistical,
+    infer_frequency,
+    seasonal_naive_forecast,
+)
+
+
+def test_holt_winters_selected_for_seasonal_monthly_series():
+    """Test a trending seasonal monthly series picks Holt-Winters with monthly dates."""
+    t = np.arange(48)
+    df = pd.DataFrame({
+        "date": pd.date_range("2021-01-01", periods=48, freq="MS"),
+        "sales": 500 + 4 * t + 80 * np.sin(2 * np.pi * t / 12),
+    })
+
+    result = forecast_statistical(df, "date", "sales", periods=6)
+
+    assert result["method"] == "Holt-Winters (ETS A,A,A)"
+    assert result["season_length"] == 12
+    assert result["forecast_dates"][0] == "2025-01-01"
+    assert result["mape"] < 5
+    assert all(lo <= f <= hi for lo, f, hi in zip(
+        result["lower_confidence"], result["forecast_values"], result["upper_confidence"]
+    ))
+
+
+def test_seasonal_naive_repeats_last_cycle_with_widening_intervals():
+    """Test seasonal naive repeats the last cycle and widens intervals each cycle."""
+    values = np.array([1.0, 2.0, 3.0, 2.0, 3.0, 4.0])
+    result = seasonal_naive_forecast(values, periods=6, season_length=3)
+
+    np.testing.assert_allclose(result["forecast"], [2.0, 3.0, 4.0, 2.0, 3.0, 4.0])
+    width = result["upper"] - result["lower"]
+    assert width[0] == width[2] < width[3]
+
+
+def test_infer_frequency_handles_irregular_dates():
+    """Test frequency falls back to the closest common spacing for gappy dates."""
+    assert infer_frequency(pd.date_range("2024-01-01", periods=10, freq="MS")) == "MS"
+    gappy = pd.DatetimeIndex(["2024-01-01", "2024-01-08", "2024-01-15", "2024-01-29", "2024-02-05"])
+    assert infer_frequency(gappy) == "W"
@@ -0,0 +1,58 @@
+"""
+Tests for incremental time-series anomaly detection
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from langgraph_agents.tools.streaming_anomaly import lineage_key, score_appended_periods
+
+
+@pytest.fixture
+def monthly_sales() -> pd.DataFrame:
+    """Four years of trending monthly sales with a December peak, two brands per month"""
+    dates = pd.date_range("2021-01-01", periods=48, freq="MS")
+    rng = np.random.default_rng(1)
+    total = 1000 + 5 * np.arange(48) + 150 * (dates.month == 12) + rng.normal(0, 10, 48)
+    return pd.DataFrame({
+        "Date": np.repeat(dates, 2),
+        "Brand": ["Alpha", "Beta"] * 48,
+        "Sales": np.repeat(total / 2, 2),
+    })
+
+
+def test_incremental_update_matches_single_pass(monthly_sales):
+    """Test folding in a later file only scores its new periods and ends in the same state."""
+    first = score_appended_periods(monthly_sales.iloc[:72], "Date", ["Sales"], {})
+    appended = score_appended_periods(monthly_sales, "Date", ["Sales"], first["states"])
+    single_pass = score_appended_periods(monthly_sales, "Date", ["Sales"], {})
+
+    assert first["freq"] == "MS"
+    assert len(appended["scored"]["Sales"]) == 12
+    assert appended["states"] == single_pass["states"]
+
+
+def test_spike_flagged_but_seasonal_peak_is_not(monthly_sales):
+    """Test a spike in a new month is flagged while recurring December peaks are not."""
+    baseline = score_appended_periods(monthly_sales, "Date", ["Sales"], {})
+    history = baseline["scored"]["Sales"]
+    assert not history.loc[history["date"].dt.month == 12, "seasonal"].any()
+
+    new_month = pd.DataFrame({"Date": [pd.Timestamp("2025-01-01")] * 2, "Brand": ["Alpha", "Beta"], "Sales": [1250.0, 1250.0]})
+    scored = score_appended_periods(new_month, "Date", ["Sales"], baseline["states"])["scored"]["Sales"]
+
+    assert len(scored) == 1
+    assert scored.loc[0, "seasonal"] and scored.loc[0, "votes"] >= 2
+
+
+def test_lineage_ignores_period_tokens_in_filename():
+    """Test monthly files of the same sheet share a lineage; other columns do not."""
+    columns = ["Date", "Brand", "Sales"]
+    assert lineage_key("Sales_2024_01.xlsx", columns) == lineage_key("sales 2024-Feb.xlsx", columns[::-1])
+    assert lineage_key("Sales_2024_01.xlsx", columns) != lineage_key("Sales_2024_02.xlsx", columns + ["Volume"])
+    assert lineage_key("export.csv", columns, lineage="kz-sales") == lineage_key("other.csv", columns, lineage="kz-sales")
+    assert lineage_key("Sales_2024_01_15.xlsx", columns) == lineage_key("Sales 31-01-2024.xlsx", columns)
+    # Numbers that are not dates name different datasets
+    assert lineage_key("Store 5 Sales.xlsx", columns) != lineage_key("Store 7 Sales.xlsx", columns)
+    assert lineage_key("Store_5_2024_01.xlsx", columns) != lineage_key("Store_7_2024_01.xlsx", columns)
@@ -0,0 +1,53 @@
+"""
+Tests for bulk worksheet ingestion
+"""
+
+import asyncio
+import json
+
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import asyncpg
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from models import WorksheetRow
+from services.worksheet_ingest import _INSERT_ROWS, build_worksheet_rows, bulk_insert_worksheet_rows
+
+
+def test_insert_binds_row_data_as_json_on_postgresql():
+    """Test asyncpg receives row_data as a json parameter, not varchar, and as the pre-encoded text."""
+    dialect = asyncpg.dialect()
+    compiled = _INSERT_ROWS.compile(dialect=dialect)
+
+    assert "$4::JSON" in str(compiled)
+    assert "VARCHAR" not in str(compiled).split("$4")[1]
+    # Encoded in the worker thread already; SQLAlchemy must not json.dumps it again
+    assert compiled.binds["row_data"].type.dialect_impl(dialect).bind_processor(dialect) is None
+
+
+def test_bulk_insert_round_trips_rows():
+    """Test rows inserted in bulk read back as the original values through the ORM JSON column."""
+    df = pd.DataFrame({
+        "Brand": ["A", None],
+        "Sales": [1.5, float("nan")],
+        "Date": [pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-02 10:30:00")],
+    })
+
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(WorksheetRow.__table__.create)
+        async with async_sessionmaker(engine)() as db:
+            inserted = await bulk_insert_worksheet_rows(db, df, "sheet-1", batch_size=1)
+            await db.commit()
+            rows = (await db.execute(select(WorksheetRow).order_by(WorksheetRow.row_index))).scalars().all()
+        await engine.dispose()
+        return inserted, rows
+
+    inserted, rows = asyncio.run(run())
+
+    assert inserted == 2
+    assert rows[0].row_data == {"Brand": "A", "Sales": 1.5, "Date": "2024-01-01T00:00:00"}
+    assert rows[1].row_data == {"Brand": None, "Sales": None, "Date": "2024-01-02T10:30:00"}
+    assert len({row.id for row in rows}) == 2
+    assert json.loads(build_worksheet_rows(df, "sheet-1")[0]["row_data"]) == rows[0].row_data
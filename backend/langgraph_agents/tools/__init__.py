@@ -4,6 +4,7 @@ LangGraph Tools - Shared utilities for Agent-Chat agents
 This package contains reusable tools that agents can use:
 - database_tools: Database access (sessions, messages, files)
 - storage_tools: Azure Blob Storage operations
+- dataframe_cache: Parsed DataFrames cached by file hash (memory + Arrow on disk)
 - chart_tools: Chart generation with GPT-5 and Plotly
 """
 
@@ -11,10 +12,12 @@ from langgraph_agents.tools.database_tools import (
     save_message,
     load_session_messages,
     load_file_metadata,
+    load_columnar_paths,
     get_database_session,
 )
 from langgraph_agents.tools.storage_tools import (
     load_file_from_storage,
+    load_cached_file,
     save_chart_to_storage,
     list_session_files,
 )
@@ -29,9 +32,11 @@ __all__ = [
     "save_message",
     "load_session_messages",
     "load_file_metadata",
+    "load_columnar_paths",
     "get_database_session",
     # Storage tools
     "load_file_from_storage",
+    "load_cached_file",
     "save_chart_to_storage",
     "list_session_files",
     # Chart tools
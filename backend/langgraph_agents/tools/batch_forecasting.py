@@ -0,0 +1,251 @@
+"""
+Batch Forecasting - One forecast per entity (brand, region, ...) per request
+
+forecasting_agent_node used to forecast a single series. In batched mode the
+rows are grouped by an entity column and every series is forecast:
+
+- Long series get Prophet. Fits run in chunks across all process workers
+  (core.executors, task type "forecast_batch"), and at most
+  forecast_batch_prophet_max_series of the largest series are fitted.
+- Short series, series beyond the Prophet budget and failed fits use Holt
+  linear smoothing (services.analytics_kernels.holt_linear_forecast). It
+  smooths all of them together in one vectorized pass, so its cost does not
+  grow with the number of series.
+
+Results are returned as one long frame: entity, date, forecast, lower, upper, method.
+"""
+
+import asyncio
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.config import settings
+from core.executors import task_executors
+from langgraph_agents.tools.analytics_tools import infer_frequency
+from langgraph_agents.tools.column_profiler import column_profiles
+from services.analytics_kernels import (
+    PROPHET_AVAILABLE,
+    frame_to_ipc,
+    holt_linear_forecast,
+    prophet_forecast_many,
+)
+
+logger = logging.getLogger(__name__)
+
+# Column-name keywords that mark an entity (series) column
+ENTITY_KEYWORDS = [
+    "brand", "region", "product", "sku", "category", "market", "city",
+    "store", "channel", "country", "segment", "customer",
+]
+
+# Query words asking for one forecast per entity ("by brand", "each region")
+_BATCH_WORDS = re.compile(r"\b(each|every|per|all|by|across)\b")
+
+HOLT_METHOD = "Holt Linear"
+
+
+def detect_entity_column(
+    df: pd.DataFrame,
+    user_query: str,
+    date_column: str,
+    max_series: Optional[int] = None,
+    profile: Optional[Dict[str, Any]] = None,
+) -> Optional[str]:
+    """
+    Pick the column to split series by, if the query asks for per-entity forecasts.
+
+    The query must contain a batch word ("by", "each", "every", "per", "all",
+    "across") and refer to a text column with 2 to max_series distinct values,
+    either by its name or by an entity keyword in its name.
+
+    Args:
+        df: Uploaded data
+        user_query: User's request
+        date_column: Date column (never an entity)
+        max_series: Most distinct values an entity column may have
+        profile: Column profile of df (default: column_profiles.profile(df))
+
+    Returns:
+        Optional[str]: Entity column name, or None for single-series mode
+    """
+    query = user_query.lower()
+    if not _BATCH_WORDS.search(query):
+        return None
+
+    max_series = max_series or settings.forecast_batch_max_series
+    profile = profile or column_profiles.profile(df)
+    candidates = [
+        col["name"] for col in profile["columns"]
+        if col["kind"] == "categorical" and col["name"] != date_column
+        and 2 <= col["unique"] <= max_series and col["unique"] < profile["rows"]
+    ]
+
+    # Column named in the query ("forecast sales by brand_name")
+    for col in candidates:
+        name = re.escape(str(col).lower().replace("_", " "))
+        if re.search(rf"\b{name}(e?s)?\b", query.replace("_", " ")):
+            return col
+
+    # Entity keyword shared by query and column ("each brand" -> "Brand Name")
+    for keyword in ENTITY_KEYWORDS:
+        if keyword not in query:
+            continue
+        for col in candidates:
+            if keyword in str(col).lower():
+                return col
+
+    return None
+
+
+def build_series_matrix(
+    df: pd.DataFrame,
+    entity_column: str,
+    date_column: str,
+    value_column: str,
+) -> Tuple[pd.DataFrame, str]:
+    """
+    Aggregate rows into one column per entity.
+
+    Values are summed per (entity, date). Dates where an entity has no rows stay NaN.
+
+    Returns:
+        Tuple[pd.DataFrame, str]: (dates x entities frame, forecast frequency)
+    """
+    data = df[[entity_column, date_column, value_column]].copy()
+    data[date_column] = pd.to_datetime(data[date_column], errors="coerce")
+    data = data.dropna(subset=[entity_column, date_column])
+
+    wide = data.pivot_table(
+        index=date_column, columns=entity_column, values=value_column, aggfunc="sum"
+    ).sort_index()
+    wide.index.name = "date"
+    return wide, infer_frequency(wide.index)
+
+
+def _holt_frame(wide: pd.DataFrame, names: List[Any], periods: int, freq: str) -> pd.DataFrame:
+    """Forecast the given series together with vectorized Holt smoothing"""
+    forecast, lower, upper = holt_linear_forecast(wide[names].to_numpy().T, periods)
+    dates = pd.date_range(wide.index[-1], periods=periods + 1, freq=freq)[1:]
+    return pd.DataFrame({
+        "entity": np.repeat(np.asarray(names, dtype=object), periods),
+        "date": np.tile(dates.values, len(names)),
+        "forecast": forecast.ravel(),
+        "lower": lower.ravel(),
+        "upper": upper.ravel(),
+        "method": HOLT_METHOD,
+    })
+
+
+def _prophet_frame(name: Any, result: Dict[str, Any]) -> pd.DataFrame:
+    return pd.DataFrame({
+        "entity": name,
+        "date": pd.to_datetime(result["forecast_dates"]),
+        "forecast": result["forecast_values"],
+        "lower": result["lower_confidence"],
+        "upper": result["upper_confidence"],
+        "method": result["method"],
+    })
+
+
+async def _fit_prophet_series(
+    wide: pd.DataFrame, names: List[Any], periods: int, freq: str
+) -> Dict[Any, Dict[str, Any]]:
+    """Fit Prophet to each named series, in chunks spread over the process workers"""
+    histories = [
+        (name, frame_to_ipc(pd.DataFrame({"ds": series.index, "y": series.to_numpy()})))
+        for name, series in ((name, wide[name].dropna()) for name in names)
+    ]
+
+    # Twice as many chunks as workers evens out uneven fit times
+    n_chunks = min(len(histories), task_executors.limits["forecast_batch"] * 2)
+    chunks = [histories[i::n_chunks] for i in range(n_chunks)]
+    chunk_results = await asyncio.gather(
+        *(task_executors.run("forecast_batch", prophet_forecast_many, chunk, periods, freq) for chunk in chunks),
+        return_exceptions=True,
+    )
+
+    results = {}
+    for chunk_result in chunk_results:
+        if isinstance(chunk_result, BaseException):
+            logger.warning(f"Prophet batch chunk failed, using Holt for its series: {chunk_result}")
+            continue
+        for name, result in chunk_result.items():
+            if "error" in result:
+                logger.warning(f"Prophet failed for series {name!r}, using Holt: {result['error']}")
+            else:
+                results[name] = result
+    return results
+
+
+async def forecast_all_series(
+    df: pd.DataFrame,
+    entity_column: str,
+    date_column: str,
+    value_column: str,
+    periods: int = 30,
+) -> Dict[str, Any]:
+    """
+    Forecast every entity's series.
+
+    Args:
+        df: Uploaded data
+        entity_column: Column identifying each series (e.g. brand)
+        date_column: Date column
+        value_column: Metric to forecast
+        periods: Forecast horizon
+
+    Returns:
+        Dict[str, Any]: {
+            "forecast": long frame (entity, date, forecast, lower, upper, method),
+            "series": per-series summary frame sorted by projected change,
+            "freq": forecast frequency,
+            "methods": series count per method,
+        }
+    """
+    wide, freq = await task_executors.run(
+        "parse", build_series_matrix, df, entity_column, date_column, value_column
+    )
+    wide = wide.loc[:, wide.notna().any()]
+
+    prophet_names = []
+    if PROPHET_AVAILABLE:
+        points = wide.notna().sum()
+        eligible = points[points >= settings.forecast_batch_min_prophet_points].index
+        # Over budget, the largest series get Prophet and the rest fall back to Holt
+        totals = wide[eligible].abs().sum().sort_values(ascending=False)
+        prophet_names = totals.index[:settings.forecast_batch_prophet_max_series].tolist()
+
+    prophet_results = await _fit_prophet_series(wide, prophet_names, periods, freq) if prophet_names else {}
+    holt_names = [name for name in wide.columns if name not in prophet_results]
+
+    frames = [_prophet_frame(name, result) for name, result in prophet_results.items()]
+    if holt_names:
+        frames.append(_holt_frame(wide, holt_names, periods, freq))
+    forecast = pd.concat(frames, ignore_index=True)
+
+    last_values = wide.ffill().iloc[-1]
+    final = forecast.groupby("entity", sort=False).agg(
+        last_forecast=("forecast", "last"),
+        method=("method", "first"),
+    )
+    series = pd.DataFrame({
+        "entity": final.index,
+        "method": final["method"].to_numpy(),
+        "history_points": wide.notna().sum().reindex(final.index).to_numpy(),
+        "last_historical": last_values.reindex(final.index).to_numpy(),
+        "last_forecast": final["last_forecast"].to_numpy(),
+    })
+    with np.errstate(divide="ignore", invalid="ignore"):
+        series["change_pct"] = (series["last_forecast"] - series["last_historical"]) / series["last_historical"].abs() * 100
+    series = series.sort_values("change_pct", ascending=False, na_position="last").reset_index(drop=True)
+
+    return {
+        "forecast": forecast,
+        "series": series,
+        "freq": freq,
+        "methods": series["method"].value_counts().to_dict(),
+    }
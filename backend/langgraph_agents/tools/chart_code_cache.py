@@ -0,0 +1,192 @@
+"""
+Chart Code Cache - Reuse generated Plotly code for repeated chart requests
+
+generate_chart_code runs GPT-5 at temperature 0 with a fixed seed, so the
+same request on a file with the same shape yields the same code. The LLM
+call still took seconds per chart. Successful code is now cached in two
+tiers, like routing decisions:
+
+- In-process LRU (core.cache.LRUCache)
+- Redis via core.cache.CacheService, shared across replicas
+
+Keys combine the normalized query (routing_cache.normalize_query), a
+signature of the column schema (names and profiled kinds, in frame order),
+the suggested chart type, the model, and a hash of the prompt template.
+Editing the prompt therefore starts a new namespace.
+
+Cached code is validated on every hit: create_chart re-executes it against
+the current frame and evicts the entry if it fails. Code that hard-codes
+values found in the data (e.g. df[df["Brand"] == "Acme"]) is never cached,
+because another file with the same columns may not contain those values.
+"""
+
+import ast
+import hashlib
+import logging
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from core.cache import LRUCache, cache_service
+from core.config import settings
+from langgraph_agents.routing_cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+
+def schema_signature(profile: Dict[str, Any]) -> str:
+    """
+    Short stable hash of a frame's column names and kinds.
+
+    Args:
+        profile: Column profile (tools.column_profiler)
+
+    Returns:
+        str: Schema digest
+    """
+    schema = "|".join(f"{col['name']}:{col['kind']}" for col in profile["columns"])
+    return hashlib.sha256(schema.encode("utf-8")).hexdigest()[:24]
+
+
+def references_data_values(code: str, df: pd.DataFrame, profile: Dict[str, Any]) -> bool:
+    """
+    Whether chart code contains string literals that are values of the data.
+
+    Args:
+        code: Generated chart code
+        df: Frame the code was generated for
+        profile: Column profile of df
+
+    Returns:
+        bool: True if any string constant matches a categorical value
+    """
+    try:
+        literals = {
+            node.value for node in ast.walk(ast.parse(code))
+            if isinstance(node, ast.Constant) and isinstance(node.value, str)
+        }
+    except SyntaxError:
+        return True
+
+    # Column names are expected in code; only data values make it file-specific
+    literals -= {str(col) for col in df.columns}
+    if not literals:
+        return False
+
+    # Reduced frames (chart_reduction) may no longer carry every profiled column
+    return any(
+        df[col].isin(literals).any() for col in profile["categorical_columns"] if col in df.columns
+    )
+
+
+class ChartCodeCache:
+    """
+    Two-tier cache of generated chart code.
+    """
+
+    def __init__(self, max_entries: int = None, ttl: int = None):
+        self.ttl = ttl or settings.chart_code_cache_ttl_seconds
+        self.memory = LRUCache(max_entries=max_entries or settings.chart_code_cache_max_entries, ttl=self.ttl)
+        self.redis_hits = 0
+        self.redis_misses = 0
+        self.evictions = 0
+        self.uncacheable = 0
+
+    def key(
+        self,
+        query: str,
+        profile: Dict[str, Any],
+        chart_type: str,
+        model: str,
+        prompt: str,
+    ) -> str:
+        """
+        Cache key for a chart request.
+
+        Args:
+            query: User's chart request
+            profile: Column profile of the data
+            chart_type: Suggested chart type from the data analysis
+            model: Model generating the code
+            prompt: System prompt template (versions the namespace)
+
+        Returns:
+            str: Cache key
+        """
+        version = hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).hexdigest()[:12]
+        query_digest = hashlib.sha256(normalize_query(query).encode("utf-8")).hexdigest()[:24]
+        return cache_service.cache_key("chart_code", version, schema_signature(profile), chart_type, query_digest)
+
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Look up cached chart code.
+
+        Returns:
+            Optional[str]: Cached code, or None on miss
+        """
+        code = self.memory.get(key)
+        if code is not None:
+            return code
+
+        code = await cache_service.get(key, deserialize=False)
+        if code is not None:
+            self.redis_hits += 1
+            self.memory.set(key, code)
+            return code
+
+        self.redis_misses += 1
+        return None
+
+    async def set(self, key: str, code: str, df: pd.DataFrame, profile: Dict[str, Any]) -> bool:
+        """
+        Store code that executed successfully, unless it is specific to df's values.
+
+        Returns:
+            bool: Whether the code was cached
+        """
+        if references_data_values(code, df, profile):
+            self.uncacheable += 1
+            return False
+
+        self.memory.set(key, code)
+        await cache_service.set(key, code, ttl=self.ttl, serialize=False)
+        return True
+
+    async def evict(self, key: str) -> None:
+        """Drop cached code that failed validation"""
+        self.evictions += 1
+        self.memory.delete(key)
+        await cache_service.delete(key)
+
+    async def invalidate(self) -> int:
+        """
+        Drop all cached chart code (every prompt version).
+
+        Returns:
+            int: Number of Redis keys removed
+        """
+        self.memory.clear()
+        return await cache_service.clear_pattern(cache_service.cache_key("chart_code", "*"))
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for both tiers"""
+        memory_stats = self.memory.stats()
+        total_hits = memory_stats["hits"] + self.redis_hits
+        lookups = total_hits + self.redis_misses
+        return {
+            "memory": memory_stats,
+            "redis": {
+                "enabled": cache_service.enabled and cache_service.redis_client is not None,
+                "hits": self.redis_hits,
+                "misses": self.redis_misses,
+            },
+            "hits": total_hits,
+            "misses": self.redis_misses,
+            "hit_rate": round(total_hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "uncacheable": self.uncacheable,
+        }
+
+
+# Global chart code cache instance
+chart_code_cache = ChartCodeCache()
@@ -0,0 +1,267 @@
+"""
+Chart Data Reduction - shrink large frames before chart code runs
+
+execute_chart_code handed the full frame to the generated code. On a
+1M-row file a line chart then carried every row into the figure JSON: tens
+of MB to serialize into HTML and PNG and to store. Frames larger than
+chart_point_budget rows are now reduced first, according to the suggested
+chart type:
+
+- line, several rows per date: time-bucket aggregation. Numeric columns are
+  summed per period and per low-cardinality category, at the finest
+  level (day, week, month, quarter, year) that fits the budget.
+- line, one row per timestamp: LTTB (Largest-Triangle-Three-Buckets)
+  downsampling on the primary measure. Whole rows are kept, and peaks
+  and troughs survive.
+- bar / grouped_bar: numeric columns summed per entity. The top
+  chart_max_categories entities are kept and the rest become one "Other" row.
+- scatter: a seeded random sample of budget rows.
+
+Reduced frames keep the original column names, so the generated code runs
+unchanged. The code generator is told what was done (describe_reduction),
+and the reduction is returned in the chart metadata.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from langgraph_agents.tools.rollup_cube import CUBE_LEVELS, period_labels
+
+logger = logging.getLogger(__name__)
+
+OTHER_LABEL = "Other"
+
+# Category columns with more distinct values are dropped by time-bucketing
+MAX_SERIES_CARDINALITY = 20
+
+_SAMPLE_SEED = 42
+
+_LEVEL_ADJECTIVES = {"day": "daily", "week": "weekly", "month": "monthly", "quarter": "quarterly", "year": "yearly"}
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: positions of the points that best keep a line's shape.
+
+    Args:
+        x: Sorted x values (as float)
+        y: y values
+        threshold: Points to keep (first and last are always kept)
+
+    Returns:
+        np.ndarray: Sorted positions of the kept points
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Bucket edges over the interior points
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # Average of the next bucket (the last point for the final bucket)
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        next_start = end if next_end > end else n - 1
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        areas = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+
+    return selected
+
+
+def _as_dates(values: pd.Series) -> pd.Series:
+    """Date column as datetime64 (text dates parsed, failures as NaT)"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    return pd.to_datetime(values, errors="coerce", format="mixed")
+
+
+def _time_bucket(
+    df: pd.DataFrame,
+    date_column: Any,
+    dates: pd.Series,
+    measures: List[Any],
+    series_columns: List[Any],
+    budget: int,
+) -> Tuple[pd.DataFrame, str]:
+    """Sum measures per period (and series) at the finest level within budget"""
+    series_count = max(1, len(df[series_columns].drop_duplicates())) if series_columns else 1
+    distinct_dates = pd.Series(dates.dropna().unique())
+
+    level = "year"
+    for candidate in CUBE_LEVELS:
+        periods = distinct_dates.dt.to_period(CUBE_LEVELS[candidate]).nunique()
+        if periods * series_count <= budget:
+            level = candidate
+            break
+
+    frame = df[series_columns + measures].copy()
+    frame.insert(0, date_column, period_labels(dates, level))
+    reduced = frame.groupby([date_column, *series_columns], sort=True).sum(numeric_only=True).reset_index()
+    return reduced, level
+
+
+def _lump_categories(values: pd.Series, weights: pd.Series, top_n: int) -> pd.Series:
+    """Replace all but the top_n values (by total weight) with OTHER_LABEL"""
+    leaders = weights.groupby(values, sort=False).sum().nlargest(top_n).index
+    return values.where(values.isin(leaders), OTHER_LABEL)
+
+
+def _top_categories(
+    df: pd.DataFrame,
+    entity_column: Any,
+    measures: List[Any],
+    rank_by: Any,
+    top_n: int,
+) -> Tuple[pd.DataFrame, int]:
+    """Sum measures per entity, keeping the top_n entities by rank_by and one "Other" row"""
+    totals = df.groupby(entity_column, sort=False)[measures].sum()
+    totals = totals.sort_values(rank_by, ascending=False)
+
+    collapsed = max(0, len(totals) - top_n)
+    if collapsed:
+        other = totals.iloc[top_n:].sum().to_frame().T
+        other.index = pd.Index([OTHER_LABEL], name=entity_column)
+        totals = pd.concat([totals.iloc[:top_n], other])
+    return totals.reset_index(), collapsed
+
+
+def reduce_for_chart(
+    df: pd.DataFrame,
+    chart_type: str,
+    profile: Dict[str, Any],
+    point_budget: int,
+    max_categories: int,
+) -> Tuple[pd.DataFrame, Optional[Dict[str, Any]]]:
+    """
+    Reduce a frame to what a chart can show, if it exceeds the point budget.
+
+    Args:
+        df: Data the chart code will run on
+        chart_type: Suggested chart type (chart_tools._analyze_dataframe)
+        profile: Column profile of df
+        point_budget: Largest frame passed through unchanged
+        max_categories: Entities kept by top-N reduction
+
+    Returns:
+        Tuple[pd.DataFrame, Optional[Dict[str, Any]]]: (frame to plot,
+        reduction metadata or None if unchanged)
+    """
+    rows = len(df)
+    if rows <= point_budget:
+        return df, None
+
+    measures = list(profile["measure_columns"] or profile["numeric_columns"])
+    date_column = profile["date_column"]
+    entity_column = profile["entity_column"]
+    reduction: Dict[str, Any] = {"original_rows": rows, "point_budget": point_budget}
+
+    if chart_type == "line" and date_column is not None and measures:
+        dates = _as_dates(df[date_column])
+        if dates.duplicated().any():
+            series_columns = [
+                col["name"] for col in profile["columns"]
+                if col["kind"] == "categorical" and col["unique"] and col["unique"] <= MAX_SERIES_CARDINALITY
+            ]
+            lumped = None
+            if entity_column is not None and entity_column not in series_columns:
+                # Keep the main entity as a series: top entities plus "Other"
+                df = df.assign(**{entity_column: _lump_categories(
+                    df[entity_column], df[profile["measure_column"]], max_categories
+                )})
+                series_columns.append(entity_column)
+                lumped = entity_column
+            reduced, level = _time_bucket(df, date_column, dates, measures, series_columns, point_budget)
+            reduction.update({
+                "method": "time_bucket",
+                "date_column": date_column,
+                "level": level,
+                "series_columns": series_columns,
+                "lumped_column": lumped,
+                "top_n": max_categories,
+                "measures": measures,
+            })
+        else:
+            ordered = df.assign(_x=dates).dropna(subset=["_x", profile["measure_column"]]).sort_values("_x")
+            x = ordered["_x"].to_numpy(dtype="datetime64[ns]").astype(np.int64).astype(float)
+            y = ordered[profile["measure_column"]].to_numpy(dtype=float)
+            reduced = ordered.iloc[lttb_indices(x, y, point_budget)].drop(columns="_x")
+            reduction.update({"method": "lttb", "x_column": date_column, "y_column": profile["measure_column"]})
+
+    elif chart_type in ("bar", "grouped_bar") and entity_column is not None and measures:
+        reduced, collapsed = _top_categories(
+            df, entity_column, measures, profile["measure_column"], max_categories
+        )
+        reduction.update({
+            "method": "top_n",
+            "entity_column": entity_column,
+            "top_n": max_categories,
+            "collapsed_into_other": collapsed,
+            "measures": measures,
+        })
+
+    elif chart_type == "scatter":
+        reduced = df.sample(n=point_budget, random_state=_SAMPLE_SEED).sort_index()
+        reduction["method"] = "sample"
+
+    else:
+        return df, None
+
+    reduction["rows"] = len(reduced)
+    return reduced, reduction
+
+
+def describe_reduction(reduction: Optional[Dict[str, Any]]) -> str:
+    """
+    One-paragraph note for the code-generation prompt.
+
+    Args:
+        reduction: Metadata from reduce_for_chart
+
+    Returns:
+        str: Description of how the data was reduced ("" if it was not)
+    """
+    if not reduction:
+        return ""
+
+    method = reduction["method"]
+    summary = f"{reduction['original_rows']:,} rows were reduced to {reduction['rows']:,}"
+    if method == "time_bucket":
+        series = f" per {', '.join(map(str, reduction['series_columns']))}" if reduction["series_columns"] else ""
+        detail = (
+            f"the data is already aggregated to {_LEVEL_ADJECTIVES[reduction['level']]} totals{series}; "
+            f"'{reduction['date_column']}' holds the period end date. Plot it as is and do not re-aggregate"
+            f" at a finer grain"
+        )
+        if reduction["lumped_column"] is not None:
+            detail += (
+                f". '{reduction['lumped_column']}' keeps its top {reduction['top_n']} values; "
+                f"the rest are grouped as '{OTHER_LABEL}'"
+            )
+    elif method == "lttb":
+        detail = (
+            f"rows were downsampled along '{reduction['x_column']}' keeping the shape of "
+            f"'{reduction['y_column']}'. Plot the rows as they are"
+        )
+    elif method == "top_n":
+        detail = (
+            f"the data is already summed per '{reduction['entity_column']}': the top {reduction['top_n']} "
+            f"plus an '{OTHER_LABEL}' row for the remaining {reduction['collapsed_into_other']}. "
+            f"Date and other category columns were dropped"
+        )
+    else:
+        detail = "rows are a random sample"
+    return f"Data reduction: {summary}; {detail}."
@@ -10,12 +10,59 @@ Provides utilities for:
 from typing import Dict, Any, Optional, Tuple, List
 import pandas as pd
 import plotly.graph_objects as go
-import plotly.express as px
+import plotly.io as pio
 import io
 import base64
-from openai import AsyncOpenAI
+
+from core.chart_renderer import chart_renderer
+from core.chart_sandbox import chart_sandbox
 from core.config import settings
-import numpy as np
+from core.executors import task_executors
+from langgraph_agents.llm_clients import llm_clients
+from langgraph_agents.tools.chart_code_cache import chart_code_cache
+from langgraph_agents.tools.chart_reduction import describe_reduction, reduce_for_chart
+from langgraph_agents.tools.column_profiler import column_kinds_text, column_profiles
+from services.chart_store import chart_id_for, chart_store, chart_url
+
+
+CHART_SYSTEM_PROMPT = """You are an expert data visualization engineer who creates accurate, consistent charts.
+
+Available imports in the execution environment:
+- pd (pandas)
+- go (plotly.graph_objects)
+- px (plotly.express)
+- df (the data DataFrame)
+
+CRITICAL REQUIREMENTS:
+1. ALWAYS use the SAME chart type for the SAME data pattern - be consistent
+2. Choose chart types based on data structure, not random interpretation:
+   - Time series data → Line chart or Area chart
+   - Categories + Values → Bar chart (horizontal for long labels, vertical otherwise)
+   - Part-to-whole relationships → Pie chart or Donut chart
+   - Comparisons across groups → Grouped or Stacked bar chart
+   - Distribution → Histogram or Box plot
+   - Correlation between two variables → Scatter plot
+   - Geographic data → Map visualization
+
+3. Data preparation:
+   - Clean column names (strip whitespace, handle special characters)
+   - Convert numeric columns properly (handle strings like "$1,234" or "1.5K")
+   - Sort time series by date chronologically
+   - Aggregate data if there are duplicates
+   - Handle missing values (dropna or fillna appropriately)
+
+4. Chart styling:
+   - Use clear, descriptive titles based on the data
+   - Label axes with actual column names
+   - Use consistent color schemes (Plotly default palette)
+   - Add hover information showing all relevant data points
+   - Make legends clear and positioned appropriately
+
+5. Return a go.Figure object stored in variable 'fig'
+6. Do NOT include any data loading code, imports, or print statements
+
+The DataFrame is available as variable 'df'. Generate deterministic, reproducible code.
+"""
 
 
 def _analyze_dataframe(df: pd.DataFrame) -> Dict[str, Any]:
@@ -28,19 +75,11 @@ def _analyze_dataframe(df: pd.DataFrame) -> Dict[str, Any]:
     Returns:
         Dict with analysis results
     """
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-    categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
-    date_cols = df.select_dtypes(include=['datetime64']).columns.tolist()
-
-    # Try to detect date columns that are stored as strings
-    for col in categorical_cols[:]:
-        if df[col].dtype == 'object':
-            try:
-                pd.to_datetime(df[col].head(10), errors='raise')
-                date_cols.append(col)
-                categorical_cols.remove(col)
-            except:
-                pass
+    # Shared column profile (cached by file hash); text dates count as date columns
+    profile = column_profiles.profile(df)
+    numeric_cols = profile["numeric_columns"]
+    categorical_cols = profile["categorical_columns"]
+    date_cols = profile["date_columns"]
 
     # Suggest chart type based on data structure
     suggested_chart = "bar"  # Default
@@ -63,7 +102,8 @@ def _analyze_dataframe(df: pd.DataFrame) -> Dict[str, Any]:
         "date_columns": date_cols,
         "suggested_chart_type": suggested_chart,
         "total_rows": len(df),
-        "total_columns": len(df.columns)
+        "total_columns": len(df.columns),
+        "profile": profile,
     }
 
 
@@ -71,6 +111,8 @@ async def generate_chart_code(
     user_query: str,
     df: pd.DataFrame,
     model: str = "openai/gpt-5-chat-latest",
+    data_analysis: Optional[Dict[str, Any]] = None,
+    data_reduction: Optional[Dict[str, Any]] = None,
 ) -> Optional[str]:
     """
     Generate Plotly chart code using GPT-5.
@@ -79,15 +121,14 @@ async def generate_chart_code(
         user_query: User's chart request
         df: DataFrame with data
         model: OpenAI model to use (default: gpt-5-chat-latest)
+        data_analysis: Output of _analyze_dataframe(df), if already computed
+        data_reduction: How df was reduced from the original data (chart_reduction), if it was
 
     Returns:
         Optional[str]: Python code to generate chart, or None if failed
     """
     try:
-        client = AsyncOpenAI(
-            api_key=settings.REQUESTY_AI_API_KEY,
-            base_url=settings.REQUESTY_AI_API_BASE
-        )
+        client = llm_clients.get_openai_client()
 
         # Prepare dataframe info
         dataframe_info = {
@@ -98,47 +139,7 @@ async def generate_chart_code(
         }
 
         # Analyze data to determine best chart type
-        data_analysis = _analyze_dataframe(df)
-
-        # Build system prompt with strict guidelines
-        system_prompt = """You are an expert data visualization engineer who creates accurate, consistent charts.
-
-Available imports in the execution environment:
-- pd (pandas)
-- go (plotly.graph_objects)
-- px (plotly.express)
-- df (the data DataFrame)
-
-CRITICAL REQUIREMENTS:
-1. ALWAYS use the SAME chart type for the SAME data pattern - be consistent
-2. Choose chart types based on data structure, not random interpretation:
-   - Time series data → Line chart or Area chart
-   - Categories + Values → Bar chart (horizontal for long labels, vertical otherwise)
-   - Part-to-whole relationships → Pie chart or Donut chart
-   - Comparisons across groups → Grouped or Stacked bar chart
-   - Distribution → Histogram or Box plot
-   - Correlation between two variables → Scatter plot
-   - Geographic data → Map visualization
-
-3. Data preparation:
-   - Clean column names (strip whitespace, handle special characters)
-   - Convert numeric columns properly (handle strings like "$1,234" or "1.5K")
-   - Sort time series by date chronologically
-   - Aggregate data if there are duplicates
-   - Handle missing values (dropna or fillna appropriately)
-
-4. Chart styling:
-   - Use clear, descriptive titles based on the data
-   - Label axes with actual column names
-   - Use consistent color schemes (Plotly default palette)
-   - Add hover information showing all relevant data points
-   - Make legends clear and positioned appropriately
-
-5. Return a go.Figure object stored in variable 'fig'
-6. Do NOT include any data loading code, imports, or print statements
-
-The DataFrame is available as variable 'df'. Generate deterministic, reproducible code.
-"""
+        data_analysis = data_analysis or _analyze_dataframe(df)
 
         # Build enhanced user prompt with data analysis
         user_prompt = f"""Create a chart for this request: "{user_query}"
@@ -156,6 +157,10 @@ Data analysis:
 - Date columns: {data_analysis['date_columns']}
 - Suggested chart type: {data_analysis['suggested_chart_type']}
 
+Column profile (kind, role, distinct values, nulls):
+{column_kinds_text(data_analysis['profile'])}
+{describe_reduction(data_reduction)}
+
 IMPORTANT:
 1. Analyze the user's request to understand what relationship they want to see
 2. Use the suggested chart type unless the request explicitly asks for something else
@@ -166,15 +171,16 @@ IMPORTANT:
 Generate only the Python code (no explanations, no markdown, just pure Python code)."""
 
         # Call GPT-5 with very low temperature for consistency
-        response = await client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0.0,  # Zero temperature for maximum consistency
-            seed=42,  # Fixed seed for deterministic output
-        )
+        async with llm_clients.limit(model):
+            response = await client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": CHART_SYSTEM_PROMPT},
+                    {"role": "user", "content": user_prompt},
+                ],
+                temperature=0.0,  # Zero temperature for maximum consistency
+                seed=42,  # Fixed seed for deterministic output
+            )
 
         code = response.choices[0].message.content
 
@@ -198,6 +204,9 @@ async def execute_chart_code(
     """
     Execute chart generation code safely.
 
+    Runs in a restricted sandbox process (core.chart_sandbox) with time and
+    memory limits; the figure comes back as JSON and is rebuilt here.
+
     Args:
         code: Python code to execute
         df: DataFrame to use in code
@@ -205,29 +214,24 @@ async def execute_chart_code(
     Returns:
         Tuple[Optional[go.Figure], Optional[str]]: (Figure object, error message)
     """
-    try:
-        # Create execution namespace
-        namespace = {
-            "df": df,
-            "pd": pd,
-            "go": go,
-            "px": px,
-            "fig": None,
-        }
-
-        # Execute code
-        exec(code, namespace)
-
-        # Get figure
-        fig = namespace.get("fig")
+    figure_json, error = await chart_sandbox.execute(code, df)
+    if error:
+        return None, error
+    return await task_executors.run("chart", pio.from_json, figure_json, skip_invalid=True), None
 
-        if fig is None or not isinstance(fig, go.Figure):
-            return None, "Code did not produce a valid Plotly figure"
 
-        return fig, None
+def _render_chart_html(fig: go.Figure) -> str:
+    """
+    Render a figure to an interactive HTML div (blocking).
 
-    except Exception as e:
-        return None, f"Error executing chart code: {str(e)}"
+    Returns:
+        str: Chart HTML (the div only, not a full page)
+    """
+    return fig.to_html(
+        include_plotlyjs="cdn",
+        div_id="chart",
+        full_html=False,  # Only return the div, not full HTML page
+    )
 
 
 async def create_chart(
@@ -247,13 +251,56 @@ async def create_chart(
         Dict[str, Any]: Result with chart data or error
             {
                 "success": bool,
-                "chart_html": Optional[str],
-                "chart_png": Optional[str],  # base64 encoded
+                "chart_id": Optional[str],  # Content address (services.chart_store)
+                "chart_url": Optional[str],  # Interactive HTML, served by api/charts.py
+                "chart_png_url": Optional[str],  # PNG, None if export failed
+                "chart_json_url": Optional[str],  # Plotly figure JSON
+                "chart_html": Optional[str],  # Inline only if the artifact could not be stored
+                "chart_png": Optional[str],  # base64, inline only if it could not be stored
                 "error": Optional[str],
+                "code_cached": bool,  # Code reused without an LLM call
+                "artifacts_reused": bool,  # Identical chart already stored; nothing rendered
+                "data_reduction": Optional[Dict],  # How large data was reduced (chart_reduction)
+                "lazy_render": bool,  # Exports not rendered yet; each renders on first request
             }
+
+        With settings.chart_lazy_render, only the figure JSON is stored before
+        returning; the HTML and PNG URLs render on first request.
     """
+    data_analysis = _analyze_dataframe(df)
+    chart_type = data_analysis["suggested_chart_type"]
+
+    # Large frames are reduced to what the chart can show before any code runs
+    plot_df, data_reduction = df, None
+    if settings.chart_reduction_enabled:
+        plot_df, data_reduction = await task_executors.run(
+            "chart",
+            reduce_for_chart,
+            df,
+            chart_type,
+            data_analysis["profile"],
+            settings.chart_point_budget,
+            settings.chart_max_categories,
+        )
+        if data_reduction:
+            # Code written for reduced data is only reused on data reduced the same way
+            chart_type = f"{chart_type}+{data_reduction['method']}"
+
+    # Same request on a same-shaped file: reuse code, validated by re-executing it
+    cache_key = None
+    if settings.chart_code_cache_enabled:
+        cache_key = chart_code_cache.key(
+            user_query, data_analysis["profile"], chart_type, model, CHART_SYSTEM_PROMPT
+        )
+        code = await chart_code_cache.get(cache_key)
+        if code is not None:
+            fig, error = await execute_chart_code(code, plot_df)
+            if not error:
+                return await _chart_result(fig, code, code_cached=True, data_reduction=data_reduction)
+            await chart_code_cache.evict(cache_key)
+
     # Generate code with improved data analysis
-    code = await generate_chart_code(user_query, df, model)
+    code = await generate_chart_code(user_query, plot_df, model, data_analysis, data_reduction)
     if code is None:
         return {
             "success": False,
@@ -263,7 +310,7 @@ async def create_chart(
         }
 
     # Execute code
-    fig, error = await execute_chart_code(code, df)
+    fig, error = await execute_chart_code(code, plot_df)
     if error:
         return {
             "success": False,
@@ -272,27 +319,79 @@ async def create_chart(
             "error": error,
         }
 
-    # Convert to HTML (interactive) - only the div, not full page
-    chart_html = fig.to_html(
-        include_plotlyjs="cdn",
-        div_id="chart",
-        full_html=False,  # Only return the div, not full HTML page
-    )
+    if cache_key is not None:
+        await chart_code_cache.set(cache_key, code, plot_df, data_analysis["profile"])
 
-    # Convert to PNG (downloadable) - base64 encoded
-    try:
-        chart_png_bytes = fig.to_image(format="png", width=1200, height=800)
-        chart_png_base64 = base64.b64encode(chart_png_bytes).decode("utf-8")
-    except Exception as e:
-        print(f"Warning: Could not generate PNG: {e}")
-        chart_png_base64 = None
+    return await _chart_result(fig, code, code_cached=False, data_reduction=data_reduction)
+
+
+async def _chart_result(
+    fig: go.Figure,
+    code: str,
+    code_cached: bool,
+    data_reduction: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Render a figure's missing artifacts and build create_chart's success result"""
+    figure_json = await task_executors.run("chart", fig.to_json)
+    chart_id = chart_id_for(figure_json, settings.chart_render_width, settings.chart_render_height)
+
+    # The figure is stored first; every export can be rendered from it later
+    figure_reused = figure_stored = await chart_store.exists(chart_id, "json")
+    if not figure_stored:
+        figure_stored = await chart_store.put(chart_id, "json", figure_json.encode("utf-8"))
+
+    if settings.chart_lazy_render and figure_stored:
+        # Exports are rendered on first GET /charts/{chart_id}/{kind}
+        return {
+            "success": True,
+            "chart_id": chart_id,
+            "chart_url": chart_url(chart_id, "html"),
+            "chart_png_url": chart_url(chart_id, "png"),
+            "chart_json_url": chart_url(chart_id, "json"),
+            "chart_html": None,
+            "chart_png": None,
+            "error": None,
+            "code": code,  # Include generated code for debugging
+            "code_cached": code_cached,
+            "artifacts_reused": figure_reused,
+            "data_reduction": data_reduction,
+            "lazy_render": True,
+        }
+
+    # Identical figures share stored artifacts; only missing ones are rendered
+    chart_html = None
+    html_stored = await chart_store.exists(chart_id, "html")
+    reused = html_stored
+    if not html_stored:
+        chart_html = await task_executors.run("chart", _render_chart_html, fig)
+        html_stored = await chart_store.put(chart_id, "html", chart_html.encode("utf-8"))
+
+    # Convert to PNG (downloadable) on the warm renderer processes
+    chart_png_base64 = None
+    png_stored = await chart_store.exists(chart_id, "png")
+    reused = reused and png_stored
+    if not png_stored:
+        chart_png_bytes = await chart_renderer.render(figure_json)
+        if chart_png_bytes:
+            png_stored = await chart_store.put(chart_id, "png", chart_png_bytes)
+            if not png_stored:
+                chart_png_base64 = base64.b64encode(chart_png_bytes).decode("utf-8")
 
     return {
         "success": True,
-        "chart_html": chart_html,
+        "chart_id": chart_id,
+        "chart_url": chart_url(chart_id, "html") if html_stored else None,
+        "chart_png_url": chart_url(chart_id, "png") if png_stored else None,
+        "chart_json_url": chart_url(chart_id, "json") if figure_stored else None,
+        # Inline copies only when storage failed, so the chart is not lost
+        "chart_html": None if html_stored else chart_html,
         "chart_png": chart_png_base64,
         "error": None,
         "code": code,  # Include generated code for debugging
+        "code_cached": code_cached,
+        "artifacts_reused": reused,
+        "data_reduction": data_reduction,
+        "lazy_render": False,
     }
 
 
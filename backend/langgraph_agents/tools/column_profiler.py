@@ -0,0 +1,269 @@
+"""
+Column Profiler - one profile per file, shared by every agent
+
+The chart tools, analytics helpers and the forecasting, anomaly and brand
+agents each used to run their own select_dtypes calls,
+pd.to_datetime(df[col].head()) try/except loops and "sales/revenue/brand"
+keyword matching. profile_columns now does that work once per frame:
+
+- Kind per column: numeric, boolean, datetime, date_text (text that parses
+  as dates), categorical or other
+- Null ratio and distinct-value count (cardinality) per column
+- Semantic role guess: date, measure, entity, id or other
+- Primary date, measure and entity columns, picked with the keyword rules
+  the agents already used
+
+Date detection is vectorized: one pd.to_datetime(errors="coerce") call over
+a sample of each text column, instead of a try/except per column.
+
+Profiles are cached by UploadedFile.file_hash, which the DataFrame cache
+stores in df.attrs. A cached profile is only reused for a frame with the
+same shape and column names, so a column subset carrying the same attrs is
+profiled on its own.
+
+Usage:
+    from langgraph_agents.tools.column_profiler import column_profiles
+
+    profile = column_profiles.profile(df)
+    date_column, value_column = profile["date_column"], profile["measure_column"]
+"""
+
+import logging
+import re
+import warnings
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from core.cache import LRUCache
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_VERSION = 1
+
+# Text values sampled per column for date detection
+DATE_SAMPLE_ROWS = 1000
+
+# Share of sampled values that must parse for a text column to count as dates
+DATE_PARSE_RATIO = 0.9
+
+# Column-name keywords for the primary measure and entity (brand agent rules)
+MEASURE_KEYWORDS = ("sales", "revenue", "amount", "value", "total")
+ENTITY_KEYWORDS = ("brand", "product", "name", "category")
+
+# Text columns with nearly one distinct value per row are identifiers, not entities
+ID_UNIQUE_RATIO = 0.95
+ID_MIN_ROWS = 20
+# Identifier names match on a whole token: "id", "order_id", "Customer Key" - not "Paid" or "Turkey"
+_ID_NAME = re.compile(r"(?:^|[\s_-])(?:id|uuid|key|code)$")
+
+_NUMERIC_TEXT = r"[+-]?\d+(?:\.\d+)?"
+
+
+def _parses_as_dates(values: pd.Series) -> bool:
+    """Whether a text column's sampled values parse as dates"""
+    sample = values.dropna().head(DATE_SAMPLE_ROWS)
+    if sample.empty:
+        return False
+
+    text = sample.astype(str).str.strip()
+    # Numeric codes ("2024", "12345") parse as dates but are not date columns
+    if text.str.fullmatch(_NUMERIC_TEXT).mean() > 0.5:
+        return False
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        parsed = pd.to_datetime(text, errors="coerce")
+        if parsed.notna().mean() < DATE_PARSE_RATIO:
+            # The inferred format came from the first value; allow mixed formats
+            parsed = pd.to_datetime(text, errors="coerce", format="mixed")
+
+    return parsed.notna().mean() >= DATE_PARSE_RATIO
+
+
+def _column_kind(series: pd.Series) -> str:
+    """Storage kind of a column: numeric, boolean, datetime, date_text, categorical or other"""
+    dtype = series.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        return "boolean"
+    if pd.api.types.is_numeric_dtype(dtype):
+        return "numeric"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "datetime"
+    if isinstance(dtype, pd.CategoricalDtype):
+        return "categorical"
+    if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+        return "date_text" if _parses_as_dates(series) else "categorical"
+    return "other"
+
+
+def _is_id_like(name: Any, kind: str, unique: int, rows: int) -> bool:
+    """Identifier guess from the column name, or near-unique text values"""
+    label = str(name).lower().strip()
+    if _ID_NAME.search(label) and unique >= ID_UNIQUE_RATIO * rows:
+        return True
+    return kind == "categorical" and rows >= ID_MIN_ROWS and unique >= ID_UNIQUE_RATIO * rows
+
+
+def _column_role(name: Any, kind: str, unique: int, rows: int) -> str:
+    """Semantic role guess: date, measure, entity, id or other"""
+    if kind in ("datetime", "date_text"):
+        return "date"
+    if kind in ("numeric", "categorical") and _is_id_like(name, kind, unique, rows):
+        return "id"
+    if kind == "numeric":
+        return "measure"
+    if kind == "categorical":
+        return "entity"
+    return "other"
+
+
+def preferred_column(columns: Sequence[Any], keywords: Sequence[str]) -> Optional[Any]:
+    """
+    First column whose name contains a keyword, else the first column.
+
+    Args:
+        columns: Candidate columns, in frame order
+        keywords: Lower-case name keywords, any match wins
+
+    Returns:
+        Optional[Any]: Chosen column, or None if there are no candidates
+    """
+    for col in columns:
+        if any(keyword in str(col).lower() for keyword in keywords):
+            return col
+    return columns[0] if len(columns) else None
+
+
+def profile_columns(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Profile every column of a frame.
+
+    Args:
+        df: Data to profile
+
+    Returns:
+        dict: rows, columns (per-column name, dtype, kind, role, null_ratio,
+        unique), column lists by kind and role, and the primary
+        date_column, measure_column and entity_column (None if absent)
+    """
+    rows = len(df)
+    nulls = df.isna().sum()
+
+    columns = []
+    for position, name in enumerate(df.columns):
+        series = df.iloc[:, position]
+        kind = _column_kind(series)
+        # Distinct counts of float measures are not used for roles; skip the hash pass
+        continuous = kind == "numeric" and not pd.api.types.is_integer_dtype(series.dtype)
+        unique = None if continuous else int(series.nunique(dropna=True))
+        columns.append({
+            "name": name,
+            "dtype": str(series.dtype),
+            "kind": kind,
+            "role": _column_role(name, kind, unique if unique is not None else 0, rows),
+            "null_ratio": round(float(nulls.iloc[position]) / rows, 4) if rows else 0.0,
+            "unique": unique,
+        })
+
+    def names(key: str, *values: str) -> List[Any]:
+        return [col["name"] for col in columns if col[key] in values]
+
+    numeric_columns = names("kind", "numeric")
+    measure_columns = names("role", "measure")
+    entity_columns = names("role", "entity")
+    # Typed datetime columns are preferred over text that parses as dates
+    date_columns = names("kind", "datetime") + names("kind", "date_text")
+
+    return {
+        "version": PROFILE_VERSION,
+        "rows": rows,
+        "columns": columns,
+        "numeric_columns": numeric_columns,
+        "categorical_columns": names("kind", "categorical"),
+        "date_columns": date_columns,
+        "text_date_columns": names("kind", "date_text"),
+        "measure_columns": measure_columns,
+        "entity_columns": entity_columns,
+        "date_column": date_columns[0] if date_columns else None,
+        # Identifier-like numbers are only used when there is nothing else
+        "measure_column": preferred_column(measure_columns or numeric_columns, MEASURE_KEYWORDS),
+        "entity_column": preferred_column(entity_columns, ENTITY_KEYWORDS),
+    }
+
+
+def _signature(df: pd.DataFrame) -> Tuple:
+    """Shape and column names a cached profile must match"""
+    return (len(df), tuple(map(str, df.columns)))
+
+
+class ColumnProfileCache:
+    """
+    In-process LRU of column profiles keyed by file hash.
+    """
+
+    def __init__(self, max_entries: int = None):
+        self.memory = LRUCache(max_entries=max_entries or settings.column_profile_cache_max_entries)
+        self.profiled = 0
+
+    def profile(self, df: pd.DataFrame, file_hash: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Return the frame's profile, computing it on a cache miss.
+
+        Args:
+            df: Data to profile
+            file_hash: UploadedFile.file_hash (default: df.attrs["file_hash"],
+                set by the DataFrame cache; frames without one are not cached)
+
+        Returns:
+            dict: Output of profile_columns
+        """
+        file_hash = file_hash or df.attrs.get("file_hash")
+        signature = _signature(df)
+
+        cached = self.memory.get(file_hash) if file_hash else None
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        self.profiled += 1
+        profile = profile_columns(df)
+        # A mismatch is a subset sharing its parent's attrs; keep the parent's entry
+        if file_hash and cached is None:
+            self.memory.set(file_hash, (signature, profile))
+        return profile
+
+    def invalidate(self, file_hash: str) -> None:
+        """Drop a file's cached profile"""
+        self.memory.delete(file_hash)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters"""
+        return {"memory": self.memory.stats(), "profiled": self.profiled}
+
+
+def column_kinds_text(profile: Dict[str, Any], limit: int = 50) -> str:
+    """
+    One line per column for LLM prompts: kind, role, cardinality and nulls.
+
+    Args:
+        profile: Output of profile_columns
+        limit: Most columns listed
+
+    Returns:
+        str: Prompt-ready column profile
+    """
+    lines = []
+    for col in profile["columns"][:limit]:
+        unique = f"{col['unique']:,} distinct" if col["unique"] is not None else "continuous"
+        lines.append(
+            f"- {col['name']}: {col['kind']} ({col['dtype']}), role {col['role']}, "
+            f"{unique}, {col['null_ratio']:.0%} null"
+        )
+    if len(profile["columns"]) > limit:
+        lines.append(f"- ... {len(profile['columns']) - limit} more columns")
+    return "\n".join(lines)
+
+
+# Global column profile cache
+column_profiles = ColumnProfileCache()
@@ -3,7 +3,8 @@ Database Tools - Type-safe database operations for LangGraph agents
 
 Provides utilities for:
 - Saving and loading chat messages
-- Loading file metadata
+- Loading file metadata, columnar sidecar paths and KPI summaries
+- Persisting incremental anomaly baselines
 - Session management
 """
 
@@ -13,7 +14,7 @@ from sqlalchemy import select, desc
 from datetime import datetime
 
 from core.database import get_db
-from models import ChatSession, ChatMessage, UploadedFile
+from models import AnomalyBaseline, ChatSession, ChatMessage, UploadedFile, WorksheetData
 
 
 async def get_database_session() -> AsyncGenerator[AsyncSession, None]:
@@ -120,6 +121,122 @@ async def load_file_metadata(
     return result.scalars().all()
 
 
+async def load_columnar_paths(
+    db: AsyncSession,
+    file_ids: List[str],
+    sheet_index: int = 0,
+) -> Dict[str, str]:
+    """
+    Load Parquet sidecar paths written at ingest for uploaded files.
+
+    Args:
+        db: Database session
+        file_ids: List of file IDs
+        sheet_index: Worksheet to load (agents analyze the first sheet)
+
+    Returns:
+        Dict[str, str]: Map of file_id -> sidecar path (files without one omitted)
+    """
+    if not file_ids:
+        return {}
+
+    query = select(WorksheetData.file_id, WorksheetData.columnar_path).where(
+        WorksheetData.file_id.in_(file_ids),
+        WorksheetData.sheet_index == sheet_index,
+        WorksheetData.columnar_path.isnot(None),
+    )
+    result = await db.execute(query)
+
+    return {file_id: path for file_id, path in result.all()}
+
+
+async def load_kpi_summaries(
+    db: AsyncSession,
+    file_ids: List[str],
+    sheet_index: int = 0,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Load brand KPI summaries precomputed after ingest for uploaded files.
+
+    Args:
+        db: Database session
+        file_ids: List of file IDs
+        sheet_index: Worksheet to load (agents analyze the first sheet)
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Map of file_id -> KPI summary (files without one omitted)
+    """
+    if not file_ids:
+        return {}
+
+    query = select(WorksheetData.file_id, WorksheetData.kpi_summary).where(
+        WorksheetData.file_id.in_(file_ids),
+        WorksheetData.sheet_index == sheet_index,
+        WorksheetData.kpi_summary.isnot(None),
+    )
+    result = await db.execute(query)
+
+    return {file_id: summary for file_id, summary in result.all()}
+
+
+async def load_anomaly_baselines(
+    db: AsyncSession,
+    lineage_key: str,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Load incremental anomaly detector states for a file lineage.
+
+    Args:
+        db: Database session
+        lineage_key: Lineage digest (streaming_anomaly.lineage_key)
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Map of column name -> detector state
+    """
+    query = select(AnomalyBaseline.column_name, AnomalyBaseline.state).where(
+        AnomalyBaseline.lineage_key == lineage_key
+    )
+    result = await db.execute(query)
+
+    return {column: state for column, state in result.all()}
+
+
+async def save_anomaly_baselines(
+    db: AsyncSession,
+    lineage_key: str,
+    file_id: str,
+    states: Dict[str, Dict[str, Any]],
+) -> None:
+    """
+    Insert or update detector states for a file lineage.
+
+    Args:
+        db: Database session
+        lineage_key: Lineage digest
+        file_id: File whose rows advanced the baselines
+        states: Map of column name -> detector state
+    """
+    import uuid
+
+    query = select(AnomalyBaseline).where(
+        AnomalyBaseline.lineage_key == lineage_key,
+        AnomalyBaseline.column_name.in_(list(states)),
+    )
+    existing = {row.column_name: row for row in (await db.execute(query)).scalars().all()}
+
+    for column, state in states.items():
+        last_timestamp = datetime.fromisoformat(state["last_timestamp"]) if state.get("last_timestamp") else None
+        row = existing.get(column)
+        if row is None:
+            row = AnomalyBaseline(id=str(uuid.uuid4()), lineage_key=lineage_key, column_name=column)
+            db.add(row)
+        row.state = state
+        row.last_timestamp = last_timestamp
+        row.last_file_id = file_id
+
+    await db.commit()
+
+
 async def get_or_create_session(
     db: AsyncSession,
     session_id: str,
@@ -0,0 +1,202 @@
+"""
+DataFrame Cache - Parsed uploads keyed by file hash
+
+Every agent call used to download the blob and re-parse it with
+pd.read_csv/pd.read_excel. Parsed frames are now cached by
+UploadedFile.file_hash in two tiers:
+
+- Memory: LRU bounded by DataFrame bytes (memory_usage(deep=True))
+- Disk: uncompressed Arrow IPC files, memory-mapped on reload instead of
+  re-parsing the source file. Bounded by total bytes, least recently used
+  files removed first.
+
+Callers get a shallow copy, so replacing a column (df[col] = ...) never
+leaks back into the cached frame.
+
+Usage:
+    from langgraph_agents.tools.dataframe_cache import dataframe_cache
+
+    df = await dataframe_cache.get_or_load(file.file_hash, lambda: load_file_from_storage(file.file_path))
+"""
+
+import asyncio
+import logging
+import os
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import pandas as pd
+
+from core.cache import LRUCache
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Arrow is optional - without it only the memory tier is used
+try:
+    import pyarrow as pa
+    from pyarrow import feather
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    logger.warning("pyarrow not available. DataFrame cache will be memory-only.")
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """Deep memory footprint of a DataFrame (object columns included)"""
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+class DataFrameCache:
+    """
+    Two-tier (memory + Arrow on disk) cache of parsed DataFrames.
+    """
+
+    def __init__(
+        self,
+        memory_bytes: int = None,
+        disk_dir: Optional[str] = None,
+        disk_bytes: int = None,
+    ):
+        self.memory = LRUCache(
+            max_entries=settings.dataframe_cache_max_entries,
+            max_bytes=memory_bytes or settings.dataframe_cache_memory_bytes,
+            sizeof=frame_nbytes,
+        )
+        self.disk_dir = Path(disk_dir or settings.dataframe_cache_dir or Path(settings.upload_dir) / "processed" / "frames")
+        self.disk_bytes = disk_bytes or settings.dataframe_cache_disk_bytes
+        self.disk_hits = 0
+        self.loads = 0
+        self._key_locks: Dict[str, asyncio.Lock] = {}
+
+    def _disk_path(self, file_hash: str) -> Path:
+        return self.disk_dir / f"{file_hash}.arrow"
+
+    def _read_disk(self, file_hash: str) -> Optional[pd.DataFrame]:
+        path = self._disk_path(file_hash)
+        if not PYARROW_AVAILABLE or not path.exists():
+            return None
+        try:
+            table = feather.read_table(str(path), memory_map=True)
+            os.utime(path)  # Mark recently used for disk eviction
+            return table.to_pandas()
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cached frame {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def _write_disk(self, file_hash: str, df: pd.DataFrame) -> None:
+        if not PYARROW_AVAILABLE:
+            return
+        path = self._disk_path(file_hash)
+        tmp_path = path.with_suffix(".arrow.tmp")
+        try:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            table = pa.Table.from_pandas(df, preserve_index=True)
+            # Uncompressed so reloads can be memory-mapped without decoding
+            feather.write_feather(table, str(tmp_path), compression="uncompressed")
+            os.replace(tmp_path, path)
+            self._evict_disk()
+        except Exception as e:
+            # Mixed-type object columns are not Arrow-serializable; memory tier still works
+            logger.warning(f"Could not persist frame {file_hash[:12]} to disk: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    def _evict_disk(self) -> None:
+        """Remove least recently used files until the disk tier fits its budget"""
+        files = sorted(self.disk_dir.glob("*.arrow"), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in files)
+        for path in files:
+            if total <= self.disk_bytes:
+                break
+            total -= path.stat().st_size
+            path.unlink(missing_ok=True)
+
+    async def get(self, file_hash: str) -> Optional[pd.DataFrame]:
+        """
+        Look up a cached frame (memory, then disk).
+
+        Returns:
+            Optional[pd.DataFrame]: Shallow copy of the cached frame, or None
+        """
+        df = self.memory.get(file_hash)
+        if df is None:
+            df = await asyncio.to_thread(self._read_disk, file_hash)
+            if df is None:
+                return None
+            self.disk_hits += 1
+            df.attrs["file_hash"] = file_hash
+            self.memory.set(file_hash, df)
+        return df.copy(deep=False)
+
+    async def set(self, file_hash: str, df: pd.DataFrame) -> None:
+        """Store a parsed frame in both tiers"""
+        df.attrs["file_hash"] = file_hash
+        self.memory.set(file_hash, df)
+        await asyncio.to_thread(self._write_disk, file_hash, df)
+
+    async def get_or_load(
+        self,
+        file_hash: Optional[str],
+        loader: Callable[[], Awaitable[Optional[pd.DataFrame]]],
+    ) -> Optional[pd.DataFrame]:
+        """
+        Return the cached frame for a file hash, loading it on a miss.
+
+        Concurrent misses for the same hash share a single load.
+
+        Args:
+            file_hash: UploadedFile.file_hash (None bypasses the cache)
+            loader: Coroutine factory that downloads and parses the file
+
+        Returns:
+            Optional[pd.DataFrame]: Parsed frame, or None if loading failed
+        """
+        if not settings.dataframe_cache_enabled or not file_hash:
+            return await loader()
+
+        df = await self.get(file_hash)
+        if df is not None:
+            return df
+
+        lock = self._key_locks.setdefault(file_hash, asyncio.Lock())
+        try:
+            async with lock:
+                df = await self.get(file_hash)
+                if df is not None:
+                    return df
+
+                self.loads += 1
+                df = await loader()
+                if df is None:
+                    return None
+                await self.set(file_hash, df)
+                return df.copy(deep=False)
+        finally:
+            if not lock.locked():
+                self._key_locks.pop(file_hash, None)
+
+    async def invalidate(self, file_hash: str) -> None:
+        """Drop a file's cached frame from both tiers"""
+        self.memory.delete(file_hash)
+        self._key_locks.pop(file_hash, None)
+        self._disk_path(file_hash).unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for both tiers"""
+        disk_files = list(self.disk_dir.glob("*.arrow")) if self.disk_dir.exists() else []
+        return {
+            "memory": self.memory.stats(),
+            "disk": {
+                "enabled": PYARROW_AVAILABLE,
+                "files": len(disk_files),
+                "bytes": sum(p.stat().st_size for p in disk_files),
+                "hits": self.disk_hits,
+            },
+            "loads": self.loads,
+        }
+
+
+# Global DataFrame cache instance
+dataframe_cache = DataFrameCache()
@@ -0,0 +1,211 @@
+"""
+Forecast Cache - Prophet forecasts keyed by data fingerprint and parameters
+
+Asking "forecast next 12 months" again on an unchanged file used to refit
+Prophet from scratch. Forecast outputs are now cached in two tiers:
+
+- Memory: LRU bounded by the JSON size of cached results
+- Disk: one JSON file per entry, total size bounded, least recently used
+  files removed first
+
+The key is built from the data fingerprint (UploadedFile.file_hash when the
+frame came from the DataFrame cache, otherwise a hash of the two columns),
+the date and value columns, the forecast frequency and the Prophet settings.
+The horizon is not part of the key. A cached forecast answers any request
+for the same or fewer periods, so follow-ups like "and the next 6 months?"
+are served by slicing it. Longer horizons refit and replace the entry.
+
+Usage:
+    from langgraph_agents.tools.forecast_cache import forecast_cache
+
+    key = forecast_cache.key(df, date_column, value_column, params)
+    result = await forecast_cache.get(key, periods)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from core.cache import LRUCache
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Per-period lists in a forecast result (sliced for shorter horizons)
+_SERIES_FIELDS = ("forecast_values", "lower_confidence", "upper_confidence", "forecast_dates")
+
+
+def data_fingerprint(df: pd.DataFrame, date_column: str, value_column: str) -> str:
+    """
+    Identify the data a forecast was fitted on.
+
+    Uses the file hash attached by the DataFrame cache when present, otherwise
+    hashes the date and value columns.
+    """
+    file_hash = df.attrs.get("file_hash")
+    if file_hash:
+        return f"file:{file_hash}"
+    row_hashes = pd.util.hash_pandas_object(df[[date_column, value_column]], index=False)
+    return "data:" + hashlib.sha256(row_hashes.to_numpy().tobytes()).hexdigest()
+
+
+def slice_forecast(result: Dict[str, Any], periods: int) -> Dict[str, Any]:
+    """Trim a cached forecast to the first `periods` forecast periods"""
+    if result["periods"] == periods:
+        return dict(result)
+    sliced = dict(result)
+    for field in _SERIES_FIELDS:
+        sliced[field] = result[field][:periods]
+    sliced["periods"] = periods
+    sliced["first_forecast_value"] = float(sliced["forecast_values"][0])
+    sliced["last_forecast_value"] = float(sliced["forecast_values"][-1])
+    return sliced
+
+
+def _result_size(result: Dict[str, Any]) -> int:
+    return len(json.dumps(result))
+
+
+class ForecastCache:
+    """
+    Two-tier (memory + JSON on disk) cache of forecast results.
+    """
+
+    def __init__(
+        self,
+        memory_bytes: int = None,
+        disk_dir: Optional[str] = None,
+        disk_bytes: int = None,
+    ):
+        self.memory = LRUCache(
+            max_entries=settings.forecast_cache_max_entries,
+            max_bytes=memory_bytes or settings.forecast_cache_memory_bytes,
+            sizeof=_result_size,
+        )
+        self.disk_dir = Path(disk_dir or settings.forecast_cache_dir or Path(settings.upload_dir) / "processed" / "forecasts")
+        self.disk_bytes = disk_bytes or settings.forecast_cache_disk_bytes
+        self.disk_hits = 0
+        self.horizon_misses = 0
+
+    def key(
+        self,
+        df: pd.DataFrame,
+        date_column: str,
+        value_column: str,
+        params: Dict[str, Any],
+    ) -> str:
+        """
+        Cache key for a forecast of one series.
+
+        Args:
+            df: Source data
+            date_column: Date column
+            value_column: Value column
+            params: Model settings (method, frequency, seasonality, ...)
+
+        Returns:
+            str: Hex digest
+        """
+        material = json.dumps(
+            {
+                "data": data_fingerprint(df, date_column, value_column),
+                "date_column": str(date_column),
+                "value_column": str(value_column),
+                "params": params,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._disk_path(key)
+        if not path.exists():
+            return None
+        try:
+            result = json.loads(path.read_text())
+            os.utime(path)  # Mark recently used for disk eviction
+            return result
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cached forecast {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def _write_disk(self, key: str, result: Dict[str, Any]) -> None:
+        path = self._disk_path(key)
+        tmp_path = path.with_suffix(".json.tmp")
+        try:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(result))
+            os.replace(tmp_path, path)
+            self._evict_disk()
+        except Exception as e:
+            logger.warning(f"Could not persist forecast {key[:12]} to disk: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    def _evict_disk(self) -> None:
+        """Remove least recently used files until the disk tier fits its budget"""
+        files = sorted(self.disk_dir.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in files)
+        for path in files:
+            if total <= self.disk_bytes:
+                break
+            total -= path.stat().st_size
+            path.unlink(missing_ok=True)
+
+    async def get(self, key: str, periods: int) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached forecast covering at least `periods` periods.
+
+        Returns:
+            Optional[Dict[str, Any]]: Forecast trimmed to `periods`, or None
+        """
+        if not settings.forecast_cache_enabled:
+            return None
+
+        result = self.memory.get(key)
+        if result is None:
+            result = await asyncio.to_thread(self._read_disk, key)
+            if result is None:
+                return None
+            self.disk_hits += 1
+            self.memory.set(key, result)
+
+        if result["periods"] < periods:
+            self.horizon_misses += 1
+            return None
+        return slice_forecast(result, periods)
+
+    async def set(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a forecast in both tiers (errors are not cached)"""
+        if not settings.forecast_cache_enabled or "error" in result:
+            return
+        self.memory.set(key, result)
+        await asyncio.to_thread(self._write_disk, key, result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for both tiers"""
+        disk_files = list(self.disk_dir.glob("*.json")) if self.disk_dir.exists() else []
+        return {
+            "enabled": settings.forecast_cache_enabled,
+            "memory": self.memory.stats(),
+            "disk": {
+                "files": len(disk_files),
+                "bytes": sum(p.stat().st_size for p in disk_files),
+                "hits": self.disk_hits,
+            },
+            "horizon_misses": self.horizon_misses,
+        }
+
+
+# Global forecast cache instance
+forecast_cache = ForecastCache()
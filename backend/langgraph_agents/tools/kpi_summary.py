@@ -0,0 +1,223 @@
+"""
+KPI Summaries - brand KPIs precomputed once per worksheet at ingest
+
+The brand performance agent used to run assess_data_quality,
+calculate_growth_rate, analyze_trend, calculate_market_share and
+calculate_performance_metrics over the full frame on every question. Those
+aggregates only depend on the worksheet, so they are now computed once in the
+background after a file is processed and stored in
+WorksheetData.kpi_summary. The agent answers from the summary and only loads
+the frame when no summary exists (older uploads, failed precompute).
+
+Summaries are plain JSON: timestamps become ISO dates, NumPy scalars become
+Python numbers, and per-entity tables keep the largest
+KPI_SUMMARY_MAX_ENTITIES entities (total_entities still counts them all).
+Worksheets with a date column also get a rollup cube (tools.rollup_cube),
+whose storage path is recorded as the summary's "rollup_cube".
+"""
+
+import asyncio
+import logging
+import math
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from langgraph_agents.tools.analytics_tools import (
+    analyze_trend,
+    assess_data_quality,
+    calculate_growth_rate,
+    calculate_market_share,
+    calculate_performance_metrics,
+)
+from langgraph_agents.tools.column_profiler import column_profiles
+from langgraph_agents.tools.rollup_cube import build_rollup_cube
+
+logger = logging.getLogger(__name__)
+
+# Bump when the summary layout or the KPI definitions change; older
+# summaries are then ignored and the agent recomputes from the frame
+KPI_SUMMARY_VERSION = 2
+
+# Per-entity tables (market shares, category metrics) keep the largest entities
+KPI_SUMMARY_MAX_ENTITIES = 100
+
+
+def detect_kpi_columns(df: pd.DataFrame) -> Tuple[Optional[Any], Optional[Any], Optional[Any]]:
+    """
+    Pick the value, entity and date columns KPIs are computed on.
+
+    Args:
+        df: Worksheet data
+
+    Returns:
+        Tuple: (value_column, entity_column, date_column) from the shared
+        column profile, each None if not found
+    """
+    profile = column_profiles.profile(df)
+    return profile["measure_column"], profile["entity_column"], profile["date_column"]
+
+
+def _json_safe(value: Any) -> Any:
+    """Convert analytics output to JSON: string keys, ISO dates, Python numbers, NaN -> None"""
+    if isinstance(value, dict):
+        return {_json_key(key): _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _json_key(key: Any) -> str:
+    """Dictionary keys as strings (period timestamps as ISO dates)"""
+    if isinstance(key, (pd.Timestamp, datetime)):
+        return key.strftime("%Y-%m-%d")
+    return str(key)
+
+
+def _largest(values: Dict[Any, Any], keys: List[Any]) -> Dict[Any, Any]:
+    """Restrict a per-entity mapping to the given keys, in order"""
+    return {key: values[key] for key in keys if key in values}
+
+
+def compute_kpi_summary(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Compute the brand performance KPIs for one worksheet.
+
+    Args:
+        df: Worksheet data
+
+    Returns:
+        dict: version, computed_at, value/entity/date columns and kpis (the
+        agent's analysis_results: data_quality, growth_analysis,
+        trend_analysis, market_share, performance_metrics)
+    """
+    # The growth and trend helpers convert the date column in place
+    df = df.copy(deep=False)
+
+    quality_report = assess_data_quality(df)
+    value_column, entity_column, date_column = detect_kpi_columns(df)
+
+    kpis: Dict[str, Any] = {"data_quality": quality_report}
+
+    if value_column:
+        if date_column:
+            kpis["growth_analysis"] = calculate_growth_rate(
+                df, value_column=value_column, date_column=date_column, period="month"
+            )
+            kpis["trend_analysis"] = analyze_trend(df, value_column=value_column, date_column=date_column)
+
+        if entity_column:
+            market_share = calculate_market_share(df, entity_column=entity_column, value_column=value_column)
+            leaders = list(market_share["market_shares"])[:KPI_SUMMARY_MAX_ENTITIES]
+            market_share["market_shares"] = _largest(market_share["market_shares"], leaders)
+            kpis["market_share"] = market_share
+
+        performance_metrics = calculate_performance_metrics(
+            df, value_column=value_column, category_column=entity_column
+        )
+        if "by_category" in performance_metrics and "market_share" in kpis:
+            performance_metrics["by_category"] = _largest(performance_metrics["by_category"], leaders)
+        kpis["performance_metrics"] = performance_metrics
+
+    return _json_safe({
+        "version": KPI_SUMMARY_VERSION,
+        "computed_at": datetime.utcnow(),
+        "value_column": value_column,
+        "entity_column": entity_column,
+        "date_column": date_column,
+        "kpis": kpis,
+    })
+
+
+def build_summary_cube(df: pd.DataFrame, summary: Dict[str, Any]) -> Optional[pd.DataFrame]:
+    """
+    Build the rollup cube for a worksheet from its KPI summary's columns.
+
+    Args:
+        df: Worksheet data
+        summary: Output of compute_kpi_summary for df
+
+    Returns:
+        Optional[pd.DataFrame]: Rollup cube, or None without a date column
+    """
+    # Summary column names are JSON strings; map them back to the frame's labels
+    columns = {str(col): col for col in df.columns}
+    date_column = columns.get(summary["date_column"])
+    if date_column is None:
+        return None
+
+    metrics = column_profiles.profile(df)["numeric_columns"]
+    return build_rollup_cube(df, date_column, metrics, columns.get(summary["entity_column"]))
+
+
+def is_current_summary(summary: Optional[Dict[str, Any]]) -> bool:
+    """Whether a stored summary was produced by the current KPI definitions"""
+    return bool(summary) and summary.get("version") == KPI_SUMMARY_VERSION
+
+
+async def precompute_kpi_summaries(db, file_id: str) -> int:
+    """
+    Compute and store KPI summaries for every worksheet of a processed file.
+
+    The first worksheet is loaded through the DataFrame cache, which also
+    warms it and its column profile for the first question about the file.
+
+    Args:
+        db: Database session
+        file_id: Uploaded file ID
+
+    Returns:
+        int: Number of worksheets summarized
+    """
+    from sqlalchemy import select
+    from models import WorksheetData
+    from langgraph_agents.tools.database_tools import load_file_metadata
+    from langgraph_agents.tools.storage_tools import load_cached_file
+    from services.columnar_storage import read_sidecar, write_rollup
+
+    files = await load_file_metadata(db, [file_id])
+    if not files:
+        return 0
+
+    result = await db.execute(
+        select(WorksheetData).where(WorksheetData.file_id == file_id).order_by(WorksheetData.sheet_index)
+    )
+
+    summarized = 0
+    for worksheet in result.scalars().all():
+        if worksheet.sheet_index == 0:
+            df = await load_cached_file(files[0], worksheet.columnar_path)
+        elif worksheet.columnar_path:
+            df = await read_sidecar(worksheet.columnar_path)
+        else:
+            df = None
+
+        if df is None or df.empty:
+            continue
+
+        try:
+            summary = await asyncio.to_thread(compute_kpi_summary, df)
+        except Exception as e:
+            logger.warning(f"KPI precompute failed for {file_id} sheet {worksheet.sheet_index}: {e}")
+            continue
+
+        try:
+            cube = await asyncio.to_thread(build_summary_cube, df, summary)
+            if cube is not None:
+                summary["rollup_cube"] = await write_rollup(file_id, worksheet.sheet_index, cube)
+        except Exception as e:
+            logger.warning(f"Rollup cube failed for {file_id} sheet {worksheet.sheet_index}: {e}")
+
+        worksheet.kpi_summary = summary
+        summarized += 1
+
+    await db.commit()
+    return summarized
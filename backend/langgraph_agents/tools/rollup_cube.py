@@ -0,0 +1,190 @@
+"""
+Rollup Cube - pre-aggregated entity x period x metric totals per worksheet
+
+calculate_market_share and calculate_growth_rate group or resample the raw
+frame on every call. Each worksheet with a date column now also gets a rollup
+cube, built once after ingest next to its Parquet sidecar. The cube holds
+totals per (level, period, entity) for every numeric metric, at the day,
+week, month, quarter and year levels. Growth, share and HHI questions at any
+of those granularities are then answered from the cube in O(cells) instead
+of O(rows).
+
+Only the day level is grouped from the raw rows. The coarser levels are
+rolled up from the day cells. Period labels match pandas resample labels
+(the last day of the period), so cube_growth_rate returns the same numbers
+as calculate_growth_rate. Rows without a date are kept in a NaT period: they
+count towards market share but not towards growth.
+
+The cube is stored in a wide layout with one column per metric:
+
+    _level | _period | _entity | _rows | <metric> | <metric> | ...
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from langgraph_agents.tools.analytics_tools import summarize_growth, summarize_market_share
+
+logger = logging.getLogger(__name__)
+
+# Aggregation levels, finest first, with their pandas period frequencies
+CUBE_LEVELS = {
+    "day": "D",
+    "week": "W",
+    "month": "M",
+    "quarter": "Q",
+    "year": "Y",
+}
+
+LEVEL_COLUMN = "_level"
+PERIOD_COLUMN = "_period"
+ENTITY_COLUMN = "_entity"
+ROWS_COLUMN = "_rows"
+_KEY_COLUMNS = (LEVEL_COLUMN, PERIOD_COLUMN, ENTITY_COLUMN, ROWS_COLUMN)
+
+
+def period_labels(dates: pd.Series, level: str) -> pd.Series:
+    """Label each date with the last day of its period (pandas resample labels)"""
+    return dates.dt.to_period(CUBE_LEVELS[level]).dt.end_time.dt.normalize()
+
+
+def build_rollup_cube(
+    df: pd.DataFrame,
+    date_column: str,
+    metrics: List[Any],
+    entity_column: Optional[Any] = None,
+) -> pd.DataFrame:
+    """
+    Aggregate a worksheet into totals per level, period, entity and metric.
+
+    Args:
+        df: Worksheet data
+        date_column: Column containing dates
+        metrics: Numeric columns to total
+        entity_column: Column containing entities (brands, products, ...), or None
+
+    Returns:
+        pd.DataFrame: Cube in the wide layout described in the module docstring
+    """
+    values = df[metrics].astype("float64")
+    values.columns = [str(metric) for metric in metrics]
+
+    keys = {PERIOD_COLUMN: pd.to_datetime(df[date_column], errors="coerce").dt.normalize()}
+    keys[ENTITY_COLUMN] = df[entity_column] if entity_column is not None else pd.Series(None, index=df.index, dtype=object)
+    frame = pd.concat([pd.DataFrame(keys), values], axis=1)
+    frame[ROWS_COLUMN] = 1
+
+    # Day cells from the raw rows; every coarser level from the day cells
+    day = frame.groupby([PERIOD_COLUMN, ENTITY_COLUMN], dropna=False, sort=True).sum().reset_index()
+
+    levels = []
+    for level in CUBE_LEVELS:
+        cells = day if level == "day" else day.assign(
+            **{PERIOD_COLUMN: period_labels(day[PERIOD_COLUMN], level)}
+        ).groupby([PERIOD_COLUMN, ENTITY_COLUMN], dropna=False, sort=True).sum().reset_index()
+        levels.append(cells.assign(**{LEVEL_COLUMN: level}))
+
+    cube = pd.concat(levels, ignore_index=True)
+    return cube[[*_KEY_COLUMNS, *values.columns]]
+
+
+def cube_metrics(cube: pd.DataFrame) -> List[str]:
+    """Metric columns held by a cube"""
+    return [col for col in cube.columns if col not in _KEY_COLUMNS]
+
+
+def cube_series(
+    cube: pd.DataFrame,
+    metric: str,
+    level: str = "month",
+    entity: Optional[Any] = None,
+) -> pd.Series:
+    """
+    Totals of one metric per period, with empty periods filled with 0.
+
+    Args:
+        cube: Rollup cube
+        metric: Metric column
+        level: Aggregation level (see CUBE_LEVELS)
+        entity: Restrict to one entity (None totals all entities)
+
+    Returns:
+        pd.Series: Totals indexed by period label
+    """
+    cells = cube[(cube[LEVEL_COLUMN] == level) & cube[PERIOD_COLUMN].notna()]
+    if entity is not None:
+        cells = cells[cells[ENTITY_COLUMN] == entity]
+
+    totals = cells.groupby(PERIOD_COLUMN)[metric].sum()
+    if totals.empty:
+        return totals
+
+    periods = pd.period_range(totals.index.min(), totals.index.max(), freq=CUBE_LEVELS[level])
+    return totals.reindex(periods.end_time.normalize(), fill_value=0.0)
+
+
+def cube_growth_rate(
+    cube: pd.DataFrame,
+    metric: str,
+    period: str = "month",
+    entity: Optional[Any] = None,
+) -> Dict[str, Any]:
+    """
+    Growth rates from the cube (same result as calculate_growth_rate).
+
+    Args:
+        cube: Rollup cube
+        metric: Metric column
+        period: Aggregation period ("day", "week", "month", "quarter", "year")
+        entity: Restrict to one entity (None totals all entities)
+
+    Returns:
+        dict: Growth metrics including rate, trend, and period comparisons
+    """
+    if period not in CUBE_LEVELS:
+        return {"error": f"Unknown period '{period}'. Use one of: {', '.join(CUBE_LEVELS)}"}
+    if metric not in cube.columns:
+        return {"error": f"Metric '{metric}' not in rollup cube"}
+
+    return summarize_growth(cube_series(cube, metric, period, entity), period)
+
+
+def cube_market_share(
+    cube: pd.DataFrame,
+    metric: str,
+    level: Optional[str] = None,
+    period: Optional[Any] = None,
+) -> Dict[str, Any]:
+    """
+    Market share and HHI from the cube (same result as calculate_market_share).
+
+    Args:
+        cube: Rollup cube
+        metric: Metric column
+        level: Restrict to one period at this level (None covers all rows)
+        period: Period label at that level, or "latest" (default) for the last one
+
+    Returns:
+        dict: Market share analysis with percentages and rankings, plus the
+        level and period covered
+    """
+    if metric not in cube.columns:
+        return {"error": f"Metric '{metric}' not in rollup cube"}
+
+    # The year cells (NaT period included) sum to the totals over all rows
+    cells = cube[cube[LEVEL_COLUMN] == (level or "year")]
+    if level is not None:
+        labels = cells[PERIOD_COLUMN].dropna()
+        if labels.empty:
+            return {"error": "No dated rows in rollup cube"}
+        period = labels.max() if period in (None, "latest") else pd.Timestamp(period)
+        cells = cells[cells[PERIOD_COLUMN] == period]
+
+    # Rows without an entity are left out, as groupby does for the raw frame
+    entity_totals = cells.groupby(ENTITY_COLUMN)[metric].sum()
+    result = summarize_market_share(entity_totals)
+    result["level"] = level
+    result["period"] = period.strftime("%Y-%m-%d") if level is not None else None
+    return result
@@ -2,7 +2,7 @@
 Storage Tools - Azure Blob Storage operations for LangGraph agents
 
 Provides utilities for:
-- Loading files from blob storage
+- Loading files from blob storage (parsed frames cached by file hash)
 - Saving charts to blob storage
 - Listing session files
 """
@@ -12,6 +12,9 @@ import io
 import pandas as pd
 from azure.storage.blob.aio import BlobServiceClient
 from core.config import settings
+from core.executors import task_executors
+from langgraph_agents.tools.dataframe_cache import dataframe_cache
+from services.columnar_storage import read_sidecar
 
 
 async def get_blob_service_client() -> BlobServiceClient:
@@ -26,6 +29,19 @@ async def get_blob_service_client() -> BlobServiceClient:
     )
 
 
+def _parse_file_bytes(blob_path: str, blob_data: bytes) -> Optional[pd.DataFrame]:
+    """Parse downloaded file content based on file extension (blocking)"""
+    if blob_path.endswith(".csv"):
+        return pd.read_csv(io.BytesIO(blob_data))
+    elif blob_path.endswith((".xlsx", ".xls")):
+        return pd.read_excel(io.BytesIO(blob_data))
+    elif blob_path.endswith(".json"):
+        return pd.read_json(io.BytesIO(blob_data))
+    else:
+        # Unsupported format
+        return None
+
+
 async def load_file_from_storage(
     blob_path: str,
     container_name: Optional[str] = None,
@@ -54,16 +70,7 @@ async def load_file_from_storage(
         download_stream = await blob_client.download_blob()
         blob_data = await download_stream.readall()
 
-        # Parse based on file extension
-        if blob_path.endswith(".csv"):
-            return pd.read_csv(io.BytesIO(blob_data))
-        elif blob_path.endswith((".xlsx", ".xls")):
-            return pd.read_excel(io.BytesIO(blob_data))
-        elif blob_path.endswith(".json"):
-            return pd.read_json(io.BytesIO(blob_data))
-        else:
-            # Unsupported format
-            return None
+        return await task_executors.run("parse", _parse_file_bytes, blob_path, blob_data)
 
     except Exception as e:
         print(f"Error loading file from storage: {e}")
@@ -185,6 +192,30 @@ async def load_multiple_files(
     return result
 
 
+async def load_cached_file(file, columnar_path: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """
+    Load an uploaded file's DataFrame through the file-hash cache.
+
+    On a cache miss the Parquet sidecar written at ingest is preferred; the
+    original file is only downloaded and parsed when no sidecar exists.
+
+    Args:
+        file: UploadedFile metadata row
+        columnar_path: Sidecar path from WorksheetData.columnar_path
+
+    Returns:
+        Optional[pd.DataFrame]: Parsed file data, or None if failed
+    """
+    async def loader() -> Optional[pd.DataFrame]:
+        if columnar_path:
+            df = await read_sidecar(columnar_path)
+            if df is not None:
+                return df
+        return await load_file_from_storage(file.file_path)
+
+    return await dataframe_cache.get_or_load(file.file_hash, loader)
+
+
 async def get_uploaded_file_data(
     file_ids: List[str],
     db_session
@@ -201,7 +232,7 @@ async def get_uploaded_file_data(
     Returns:
         Dict[str, pd.DataFrame]: Map of file_id -> DataFrame
     """
-    from langgraph_agents.tools.database_tools import load_file_metadata
+    from langgraph_agents.tools.database_tools import load_file_metadata, load_columnar_paths
 
     try:
         # Load file metadata from database
@@ -210,10 +241,12 @@ async def get_uploaded_file_data(
         if not file_metadata:
             return {}
 
-        # Load files from storage
+        columnar_paths = await load_columnar_paths(db_session, file_ids)
+
+        # Load files from the DataFrame cache, falling back to sidecar/storage
         result = {}
         for file in file_metadata:
-            df = await load_file_from_storage(file.file_path)
+            df = await load_cached_file(file, columnar_paths.get(file.id))
             if df is not None:
                 result[file.id] = df
 
@@ -0,0 +1,431 @@
+"""
+Streaming Anomaly Detection - incremental baselines for appended time series
+
+Sales data arrives as monthly files that repeat or extend the same sheet. The
+anomaly agent used to refit on every question. Each metric now keeps
+baselines per (file lineage, column) in the anomaly_baselines table, and only
+periods after the last one folded in are scored and added:
+
+- Online mean/variance (Welford) -> z-score
+- EWMA level with exponentially weighted residual variance -> control limits
+- Seasonal offsets from the EWMA level per slot (month of year, day of week,
+  ...) with a pooled residual variance -> seasonal limits
+
+Rows are summed per date first, so a file with one row per brand and month
+becomes one monthly series per metric. Scoring new periods costs O(new
+periods), whether the new file holds only the new month or the full history.
+Flagged values are clipped to the control limits before they update the
+EWMA and seasonal baselines, so one spike does not widen the limits for
+the months after it.
+
+A file's lineage is its original filename with period tokens (years, month
+names, quarters) removed, plus its column names. So "Sales_2024_01.xlsx"
+and "sales 2024-02.xlsx" with the same columns share baselines.
+UploadedFile.meta_data["lineage"] overrides the derived name.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from langgraph_agents.tools.analytics_tools import infer_frequency
+
+logger = logging.getLogger(__name__)
+
+# Filename tokens that name a period rather than a dataset
+_PERIOD_TOKEN = re.compile(
+    r"^(q[1-4]|h[12]|fy\d*|w\d{1,2}|"
+    r"jan|january|feb|february|mar|march|apr|april|may|jun|june|jul|july|aug|august|"
+    r"sep|sept|september|oct|october|nov|november|dec|december)$"
+)
+
+# Years, and compact year-month / year-month-day stamps (202401, 20240131)
+_YEAR_TOKEN = re.compile(r"^(19|20)\d{2}((0[1-9]|1[0-2])((0[1-9]|[12]\d|3[01]))?)?$")
+
+# Month or day numbers; only a period when next to a year (Sales_2024_01, 31_01_2024)
+_MONTH_DAY_TOKEN = re.compile(r"^(0?[1-9]|[12]\d|3[01])$")
+
+
+def _period_positions(tokens: List[str]) -> set:
+    """
+    Positions of filename tokens that name a period.
+
+    Month and day numbers count only when they directly follow a year
+    (2024_01_15), or, if none follow it, directly precede it (15_01_2024).
+    Other numbers (Store 5, Region 12) are part of the dataset name.
+    """
+    periods = {i for i, token in enumerate(tokens) if _PERIOD_TOKEN.match(token) or _YEAR_TOKEN.match(token)}
+    for year in [i for i, token in enumerate(tokens) if _YEAR_TOKEN.match(token)]:
+        for neighbours in (range(year + 1, min(year + 3, len(tokens))), range(year - 1, max(year - 3, -1), -1)):
+            run = []
+            for i in neighbours:
+                if not _MONTH_DAY_TOKEN.match(tokens[i]):
+                    break
+                run.append(i)
+            if run:
+                periods.update(run)
+                break
+    return periods
+
+STATE_VERSION = 1
+
+# Detector flags, in scored frame column order
+DETECTORS = ("seasonal", "ewma", "zscore")
+
+
+def lineage_key(original_filename: str, columns: List[Any], lineage: Optional[str] = None) -> str:
+    """
+    Identify the series of files a file belongs to.
+
+    Args:
+        original_filename: Uploaded filename
+        columns: File columns (files with different columns never share baselines)
+        lineage: Explicit lineage name (UploadedFile.meta_data["lineage"])
+
+    Returns:
+        str: Hex digest
+    """
+    if not lineage:
+        tokens = [token for token in re.split(r"[^0-9a-z]+", Path(original_filename).stem.lower()) if token]
+        periods = _period_positions(tokens)
+        lineage = " ".join(token for i, token in enumerate(tokens) if i not in periods)
+    material = json.dumps({"lineage": lineage, "columns": sorted(str(column) for column in columns)})
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def season_slots(dates: pd.DatetimeIndex, freq: str) -> Tuple[np.ndarray, int]:
+    """
+    Seasonal slot of each date and the number of slots for a frequency.
+
+    Returns:
+        Tuple[np.ndarray, int]: (slot per date, slots per cycle; 1 = no seasonality)
+    """
+    if freq.startswith(("H", "h")):
+        return dates.hour.to_numpy(), 24
+    if freq.startswith(("D", "B")):
+        return dates.dayofweek.to_numpy(), 7
+    if freq.startswith("W"):
+        return (dates.isocalendar().week.to_numpy().astype(int) - 1) % 52, 52
+    if freq.startswith(("M", "BM", "SM")):
+        return dates.month.to_numpy() - 1, 12
+    if freq.startswith(("Q", "BQ")):
+        return dates.quarter.to_numpy() - 1, 4
+    return np.zeros(len(dates), dtype=int), 1
+
+
+class StreamingDetector:
+    """
+    Online baselines for one metric series, serializable to a JSON dict.
+
+    The series is modelled as level + trend + one additive offset per seasonal
+    slot (additive Holt-Winters, updated one observation at a time). The first
+    warmup_periods observations (two cycles) only fit the initial model. After
+    that each observation is checked by three detectors before it updates it:
+
+    - seasonal: residual against the one-step expectation, beyond `limit`
+      standard deviations of the smoothed residual variance (point anomalies)
+    - ewma: EWMA control chart over those residuals (sustained shifts)
+    - zscore: Welford mean/variance of the seasonally adjusted values
+      (values outside the long-run range)
+    """
+
+    _PARAMS = ("level_alpha", "trend_beta", "seasonal_alpha", "ewma_lambda", "limit", "min_history")
+    _STATE = ("level", "trend", "slot_offset", "warmup", "residual_var", "ewma", "count", "mean", "m2")
+
+    def __init__(
+        self,
+        freq: str,
+        level_alpha: float = 0.3,
+        trend_beta: float = 0.1,
+        seasonal_alpha: float = 0.2,
+        ewma_lambda: float = 0.2,
+        limit: float = 3.0,
+        min_history: int = 8,
+    ):
+        self.freq = freq
+        self.season_length = season_slots(pd.DatetimeIndex([]), freq)[1]
+        self.level_alpha = level_alpha
+        self.trend_beta = trend_beta
+        self.seasonal_alpha = seasonal_alpha
+        self.ewma_lambda = ewma_lambda
+        self.limit = limit
+        self.min_history = min_history
+
+        # Holt-Winters components and smoothed residual variance
+        self.level = 0.0
+        self.trend = 0.0
+        self.slot_offset = [0.0] * self.season_length
+        self.warmup: List[List[float]] = []  # [slot, value] pairs of the warm-up periods
+        self.residual_var = 0.0
+        # EWMA control chart statistic over residuals
+        self.ewma = 0.0
+        # Welford running mean and sum of squared deviations of adjusted values
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.last_timestamp: Optional[pd.Timestamp] = None
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "StreamingDetector":
+        """Restore a detector saved with to_state"""
+        detector = cls(state["freq"], **{name: state[name] for name in cls._PARAMS})
+        for name in cls._STATE:
+            setattr(detector, name, state[name])
+        if state.get("last_timestamp"):
+            detector.last_timestamp = pd.Timestamp(state["last_timestamp"])
+        return detector
+
+    def to_state(self) -> Dict[str, Any]:
+        """JSON-serializable detector state"""
+        state = {"version": STATE_VERSION, "freq": self.freq}
+        for name in self._PARAMS + self._STATE:
+            value = getattr(self, name)
+            state[name] = list(value) if isinstance(value, list) else value
+        state["last_timestamp"] = self.last_timestamp.isoformat() if self.last_timestamp is not None else None
+        return state
+
+    def update(self, series: pd.Series) -> pd.DataFrame:
+        """
+        Score new observations against the baselines, then fold them in.
+
+        Observations at or before last_timestamp are skipped.
+
+        Args:
+            series: Values indexed by date
+
+        Returns:
+            pd.DataFrame: One row per new observation (date, value, expected,
+            lower, upper, seasonal, ewma, zscore, votes). seasonal, ewma and
+            zscore are flags; votes counts them.
+        """
+        series = series.dropna().sort_index()
+        if self.last_timestamp is not None:
+            series = series[series.index > self.last_timestamp]
+        dates = pd.DatetimeIndex(series.index)
+        slots, _ = season_slots(dates, self.freq)
+
+        records = []
+        for date, value, slot in zip(dates, series.to_numpy(dtype=float), slots):
+            records.append(self._step(date, value, int(slot) % self.season_length))
+        if len(dates):
+            self.last_timestamp = dates[-1]
+
+        columns = ["date", "value", "expected", "lower", "upper"] + list(DETECTORS)
+        scored = pd.DataFrame.from_records(records, columns=columns)
+        scored["votes"] = scored[list(DETECTORS)].sum(axis=1).astype(int)
+        return scored
+
+    @property
+    def warmup_periods(self) -> int:
+        """Observations used to initialize the model (two cycles when seasonal)"""
+        return max(2 * self.season_length, self.min_history) if self.season_length > 1 else self.min_history
+
+    def _step(self, date: pd.Timestamp, x: float, slot: int) -> Tuple[Any, ...]:
+        """Score one observation, then update every baseline with it"""
+        if len(self.warmup) < self.warmup_periods:
+            return self._initialize(date, x, slot)
+
+        offset = self.slot_offset[slot]
+        expected = self.level + self.trend + offset
+        residual = x - expected
+        band = self.limit * math.sqrt(self.residual_var)
+
+        seasonal_flag = band > 0 and abs(residual) > band
+        if seasonal_flag:
+            # Point anomalies are clipped so one spike does not drag the baselines
+            residual = math.copysign(band, residual)
+        ewma = (1 - self.ewma_lambda) * self.ewma + self.ewma_lambda * residual
+        ewma_flag = band > 0 and abs(ewma) > band * math.sqrt(self.ewma_lambda / (2 - self.ewma_lambda))
+
+        adjusted = x - offset
+        std = math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+        z_flag = std > 0 and abs(adjusted - self.mean) > self.limit * std
+
+        self.residual_var = (1 - self.level_alpha) * (self.residual_var + self.level_alpha * residual ** 2)
+        self.level += self.trend + self.level_alpha * residual
+        self.trend += self.trend_beta * self.level_alpha * residual
+        self.slot_offset[slot] += self.seasonal_alpha * residual
+        self.ewma = ewma
+        self._add_adjusted(adjusted)
+
+        return (date, x, expected, expected - band, expected + band, seasonal_flag, ewma_flag, z_flag)
+
+    def _initialize(self, date: pd.Timestamp, x: float, slot: int) -> Tuple[Any, ...]:
+        """
+        Collect the warm-up periods; when complete, fit level, trend and offsets to them.
+
+        The fit is least squares on a time index plus one dummy per seasonal slot.
+        """
+        self.warmup.append([slot, x])
+        if len(self.warmup) == self.warmup_periods:
+            slots = np.array([int(warm_slot) for warm_slot, _ in self.warmup])
+            values = np.array([value for _, value in self.warmup])
+            t = np.arange(len(values), dtype=float)
+            design = np.column_stack([t, np.eye(self.season_length)[slots]])
+            coef = np.linalg.lstsq(design, values, rcond=None)[0]
+            slot_means = coef[1:]
+            self.trend = float(coef[0])
+            self.level = float(slot_means.mean() + self.trend * t[-1])
+            self.slot_offset = (slot_means - slot_means.mean()).tolist()
+            residuals = values - design @ coef
+            self.residual_var = float(np.sum(residuals ** 2) / max(len(values) - design.shape[1], 1))
+            for value, warm_slot in zip(values, slots):
+                self._add_adjusted(float(value - self.slot_offset[warm_slot]))
+        nan = float("nan")
+        return (date, x, nan, nan, nan, False, False, False)
+
+    def _add_adjusted(self, value: float) -> None:
+        """Welford update with a seasonally adjusted value"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+
+def aggregate_periods(
+    df: pd.DataFrame,
+    date_column: str,
+    columns: List[str],
+    since: Optional[pd.Timestamp] = None,
+) -> pd.DataFrame:
+    """
+    Sum metrics per date, keeping only dates after `since`.
+
+    Returns:
+        pd.DataFrame: dates x columns, sorted by date
+    """
+    dates = pd.to_datetime(df[date_column], errors="coerce")
+    mask = dates.notna()
+    if since is not None:
+        mask &= dates > since
+    grouped = df.loc[mask, columns].groupby(dates[mask]).sum(min_count=1)
+    grouped.index.name = "date"
+    return grouped.sort_index()
+
+
+def score_appended_periods(
+    df: pd.DataFrame,
+    date_column: str,
+    columns: List[str],
+    states: Dict[str, Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    Score the periods each column's baseline has not seen, and advance the baselines.
+
+    Args:
+        df: Full or appended data
+        date_column: Date column
+        columns: Numeric columns to track
+        states: Saved detector states by column (missing columns start from scratch)
+
+    Returns:
+        dict: {"states": updated states, "scored": {column: scored frame}, "freq": ...}
+    """
+    detectors = {
+        column: StreamingDetector.from_state(states[column])
+        for column in columns
+        if states.get(column, {}).get("version") == STATE_VERSION
+    }
+    watermarks = [detector.last_timestamp for detector in detectors.values()]
+    since = None if len(detectors) < len(columns) or None in watermarks else min(watermarks)
+    periods = aggregate_periods(df, date_column, columns, since)
+
+    freq = next(iter(detectors.values())).freq if detectors else infer_frequency(pd.DatetimeIndex(periods.index))
+    scored = {}
+    for column in columns:
+        detector = detectors.setdefault(column, StreamingDetector(freq))
+        scored[column] = detector.update(periods[column])
+
+    return {
+        "states": {column: detector.to_state() for column, detector in detectors.items()},
+        "scored": scored,
+        "freq": freq,
+    }
+
+
+async def update_streaming_baselines(
+    db,
+    file_id: str,
+    df: pd.DataFrame,
+    date_column: str,
+    columns: List[str],
+) -> Optional[Dict[str, Any]]:
+    """
+    Fold a file's new periods into its lineage's baselines and report anomalies.
+
+    Args:
+        db: Database session
+        file_id: Uploaded file ID
+        df: File data
+        date_column: Date column
+        columns: Numeric columns to track
+
+    Returns:
+        Optional[dict]: lineage, mode ("bootstrap", "incremental" or
+        "unchanged"), new_periods, history_periods, freq, and anomalies
+        (records with at least one flag, newest first). None if the file is unknown.
+    """
+    from langgraph_agents.tools.database_tools import (
+        load_anomaly_baselines,
+        load_file_metadata,
+        save_anomaly_baselines,
+    )
+
+    files = await load_file_metadata(db, [file_id])
+    if not files:
+        return None
+    file = files[0]
+
+    key = lineage_key(file.original_filename, list(df.columns), (file.meta_data or {}).get("lineage"))
+    states = await load_anomaly_baselines(db, key)
+    if states:
+        logger.info(
+            f"Scoring {file.original_filename} against stored baselines of lineage {key[:12]} "
+            f"({len(states)} columns)"
+        )
+
+    result = await asyncio.to_thread(score_appended_periods, df, date_column, columns, states)
+    new_periods = max((len(frame) for frame in result["scored"].values()), default=0)
+    if new_periods:
+        await save_anomaly_baselines(db, key, file.id, result["states"])
+
+    anomalies = []
+    for column, frame in result["scored"].items():
+        for row in frame[frame["votes"] > 0].itertuples(index=False):
+            anomalies.append({
+                "column": column,
+                "date": row.date.strftime("%Y-%m-%d"),
+                "value": float(row.value),
+                "expected": round(float(row.expected), 4),
+                "lower": round(float(row.lower), 4),
+                "upper": round(float(row.upper), 4),
+                "methods": [name for name in DETECTORS if getattr(row, name)],
+                "votes": int(row.votes),
+            })
+    anomalies.sort(key=lambda item: (item["date"], item["votes"]), reverse=True)
+
+    if not new_periods:
+        mode = "unchanged"
+    elif states and all(column in states for column in columns):
+        mode = "incremental"
+    else:
+        mode = "bootstrap"
+
+    return {
+        "lineage": key,
+        "mode": mode,
+        "new_periods": new_periods,
+        "history_periods": max(
+            (max(state["count"], len(state["warmup"])) for state in result["states"].values()), default=0
+        ),
+        "freq": result["freq"],
+        "anomalies": anomalies,
+    }
@@ -67,7 +67,28 @@ async def lifespan(app: FastAPI):
             print(f"⚠️ Failed to initialize Azure sync: {str(e)}")
             # Don't fail startup, continue without sync
 
-    # LangGraph agents are initialized on demand via graph.py
+    # Connect Redis cache (routing decisions and other shared caches)
+    from core.cache import cache_service
+    await cache_service.connect()
+
+    # Compile the agent graph once; every chat request reuses it
+    from langgraph_agents.graph_registry import graph_registry
+    graph_key = graph_registry.warm()
+    print(f"✅ LangGraph compiled (graph {graph_key})")
+
+    # Start analytics worker processes in the background (readiness: /health/workers)
+    if settings.executor_warm_on_startup:
+        from core.executors import task_executors
+        task_executors.start_warmup()
+
+        # Start chart renderers (kaleido/Chromium) so the first PNG export is warm
+        from core.chart_renderer import chart_renderer
+        chart_renderer.start_warmup()
+
+        # Start chart code sandbox workers (memory-limited, pandas/plotly preloaded)
+        from core.chart_sandbox import chart_sandbox
+        chart_sandbox.start_warmup()
+
     print("✅ LangGraph agents ready:")
     print("   - Supervisor (GPT-5 routing)")
     print("   - Chart Agent (Plotly + PNG)")
@@ -89,6 +110,29 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"⚠️ Agion SDK shutdown error: {e}")
 
+    # Release pooled LLM connections
+    try:
+        from langgraph_agents.llm_clients import llm_clients
+        await llm_clients.aclose()
+        print("✅ LLM connection pool closed")
+    except Exception as e:
+        print(f"⚠️ LLM connection pool shutdown error: {e}")
+
+    # Close Redis cache connection
+    try:
+        from core.cache import cache_service
+        await cache_service.disconnect()
+    except Exception as e:
+        print(f"⚠️ Cache shutdown error: {e}")
+
+    # Stop agent worker pools (queued analytics work is dropped)
+    from core.executors import task_executors
+    task_executors.shutdown()
+    from core.chart_renderer import chart_renderer
+    chart_renderer.shutdown()
+    from core.chart_sandbox import chart_sandbox
+    chart_sandbox.shutdown()
+
     # Stop Azure sync if running
     if settings.storage_backend == 'azure':
         try:
@@ -3,7 +3,7 @@ Agent-Chat Database Models V2
 Optimized SQLAlchemy models with file system storage
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Float, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Float, Boolean, ForeignKey, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from core.database import Base
@@ -106,6 +106,8 @@ class WorksheetData(Base):
     data_types = Column(JSON)  # Store inferred data types
     sample_data = Column(JSON)  # Store first few rows as sample
     data_summary = Column(JSON)  # Statistical summary of data
+    kpi_summary = Column(JSON, nullable=True)  # Brand KPIs precomputed after ingest (tools.kpi_summary)
+    columnar_path = Column(String(500), nullable=True)  # Parquet sidecar (services.columnar_storage)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
@@ -176,3 +178,18 @@ class UserFeedback(Base):
 
     # Relationships
     message = relationship("ChatMessage")
+
+
+class AnomalyBaseline(Base):
+    """Incremental anomaly detector state per file lineage and column"""
+    __tablename__ = "anomaly_baselines"
+    __table_args__ = (UniqueConstraint("lineage_key", "column_name", name="uq_anomaly_baselines_lineage_column"),)
+
+    id = Column(String(36), primary_key=True)  # UUID
+    lineage_key = Column(String(64), nullable=False, index=True)  # Files sharing a name pattern and columns
+    column_name = Column(String(255), nullable=False)
+    state = Column(JSON, nullable=False)  # Welford, EWMA and seasonal baselines (langgraph_agents.tools.streaming_anomaly)
+    last_timestamp = Column(DateTime(timezone=True))  # Latest period folded into the state
+    last_file_id = Column(String(36))  # File that last advanced the baselines
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,86 @@
+"""
+Benchmark: chart figure size and build time, full frame vs reduced frame
+
+Before tools.chart_reduction, chart code ran on the whole frame, so every
+row went into the figure JSON and from there into HTML, PNG and storage.
+This script builds the same charts a generated chart would (a line per
+region over time, bars per brand, a scatter) on a synthetic sales frame,
+once from the raw rows and once after reduce_for_chart.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from langgraph_agents.tools.chart_reduction import reduce_for_chart
+from langgraph_agents.tools.column_profiler import profile_columns
+
+
+def make_sales(rows: int, brands: int) -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    return pd.DataFrame({
+        "date": pd.Timestamp("2021-01-01") + pd.to_timedelta(rng.integers(0, 1095, rows), unit="D"),
+        "brand": rng.choice([f"Brand {i:03d}" for i in range(brands)], rows),
+        "region": rng.choice(["North", "South", "East", "West"], rows),
+        "sales": rng.gamma(2.0, 50.0, rows),
+        "units": rng.integers(1, 20, rows),
+    })
+
+
+def build_figure(df: pd.DataFrame, chart_type: str):
+    """Roughly what generated chart code does for each chart type"""
+    if chart_type == "line":
+        return px.line(df.sort_values("date"), x="date", y="sales", color="region")
+    if chart_type == "bar":
+        return px.bar(df, x="brand", y="sales")
+    return px.scatter(df, x="units", y="sales")
+
+
+def measure(df: pd.DataFrame, chart_type: str):
+    start = time.perf_counter()
+    size = len(build_figure(df, chart_type).to_json())
+    return size, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pre-plot chart data reduction")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows in the synthetic frame")
+    parser.add_argument("--brands", type=int, default=200, help="Distinct brands")
+    parser.add_argument("--budget", type=int, default=5000, help="Point budget")
+    parser.add_argument("--top", type=int, default=20, help="Categories kept by top-N")
+    args = parser.parse_args()
+
+    df = make_sales(args.rows, args.brands)
+    profile = profile_columns(df)
+
+    print("=" * 80)
+    print(f"📉 Chart data reduction: {args.rows:,} rows, budget {args.budget:,} points")
+    print("=" * 80)
+    print(f"{'Chart':<10}{'method':<14}{'rows':>10}{'raw JSON':>12}{'reduced':>12}{'raw ms':>10}{'reduced ms':>12}")
+    for chart_type in ("line", "bar", "scatter"):
+        raw_size, raw_seconds = measure(df, chart_type)
+
+        start = time.perf_counter()
+        reduced, reduction = reduce_for_chart(df, chart_type, profile, args.budget, args.top)
+        reduce_seconds = time.perf_counter() - start
+        size, seconds = measure(reduced, chart_type)
+
+        print(
+            f"{chart_type:<10}{reduction['method']:<14}{len(reduced):>10,}"
+            f"{raw_size / 1e6:>10.1f}MB{size / 1e6:>10.2f}MB"
+            f"{raw_seconds * 1000:>10.0f}{(reduce_seconds + seconds) * 1000:>12.0f}"
+        )
+    print("-" * 80)
+    print("Reduced times include the reduction itself")
+
+
+if __name__ == "__main__":
+    main()
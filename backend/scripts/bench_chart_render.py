@@ -0,0 +1,113 @@
+"""
+Benchmark: chart PNG export, inline kaleido vs warm renderer pool
+
+Before core.chart_renderer, create_chart called fig.to_image() on a chart
+thread. This script compares that path with the renderer pool:
+
+- First export: inline pays for kaleido's Chromium start; the pool is warmed
+  before the first request
+- Burst: N charts requested at once (inline on a 4-thread pool, as the
+  chart executor ran them, vs the pool's queue with batching)
+"""
+
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+import plotly.graph_objects as go
+
+from core.chart_renderer import ChartRenderer
+
+WIDTH, HEIGHT = 1200, 800
+
+INLINE_FIRST_EXPORT = """
+import time, warnings
+import plotly.graph_objects as go
+warnings.simplefilter("ignore")
+fig = go.Figure(go.Bar(x=[1, 2], y=[1, 2]))
+start = time.perf_counter()
+fig.to_image(format="png", width=1200, height=800)
+print(time.perf_counter() - start)
+"""
+
+
+def make_figures(count: int, points: int):
+    """Line charts with a few traces each"""
+    rng = np.random.default_rng(42)
+    figures = []
+    for _ in range(count):
+        fig = go.Figure()
+        for trace in range(3):
+            fig.add_trace(go.Scatter(y=rng.normal(100, 10, points).cumsum(), name=f"series {trace}"))
+        figures.append(fig)
+    return figures
+
+
+def inline_burst(figures) -> float:
+    """Old path: fig.to_image on a 4-thread chart pool"""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda fig: fig.to_image(format="png", width=WIDTH, height=HEIGHT), figures))
+    return time.perf_counter() - start
+
+
+async def pool_run(figures, workers: int):
+    renderer = ChartRenderer(workers=workers, queue_size=len(figures) + 1, timeout=120)
+    try:
+        start = time.perf_counter()
+        await renderer.warm()
+        warmup = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await renderer.render(figures[0].to_json(), WIDTH, HEIGHT)
+        first = time.perf_counter() - start
+
+        payloads = [fig.to_json() for fig in figures]
+        start = time.perf_counter()
+        pngs = await renderer.render_many(payloads, WIDTH, HEIGHT)
+        burst = time.perf_counter() - start
+        assert all(pngs), "some exports failed"
+        return warmup, first, burst, renderer.stats()
+    finally:
+        renderer.shutdown(wait=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chart PNG export")
+    parser.add_argument("--charts", type=int, default=20, help="Charts in the burst")
+    parser.add_argument("--points", type=int, default=500, help="Points per trace")
+    parser.add_argument("--workers", type=int, default=2, help="Renderer processes")
+    args = parser.parse_args()
+
+    import warnings
+    warnings.simplefilter("ignore")
+
+    figures = make_figures(args.charts, args.points)
+
+    inline_first = float(subprocess.check_output([sys.executable, "-c", INLINE_FIRST_EXPORT], text=True).strip())
+    figures[0].to_image(format="png", width=WIDTH, height=HEIGHT)  # Warm inline kaleido for the burst
+    inline = inline_burst(figures)
+    warmup, first, burst, stats = asyncio.run(pool_run(figures, args.workers))
+
+    print("=" * 80)
+    print(f"🖼️  Chart PNG export: {args.charts} charts x 3 traces x {args.points} points, {WIDTH}x{HEIGHT}")
+    print("=" * 80)
+    print(f"{'':<28}{'inline to_image':>18}{'renderer pool':>18}")
+    print(f"{'First export (ms)':<28}{inline_first * 1000:>18.0f}{first * 1000:>18.0f}")
+    print(f"{'Burst total (ms)':<28}{inline * 1000:>18.0f}{burst * 1000:>18.0f}")
+    print(f"{'Burst per chart (ms)':<28}{inline / args.charts * 1000:>18.1f}{burst / args.charts * 1000:>18.1f}")
+    print("-" * 80)
+    print(f"Pool warm-up at startup: {warmup:.2f}s for {args.workers} renderers (off the request path)")
+    print(f"Batches: {stats['batches']} (avg {stats['avg_batch_size']} figures)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: worksheet load time from CSV, XLSX and the Parquet sidecar
+
+Agents used to re-parse the original upload on every call. Ingest now writes
+a typed Parquet sidecar per worksheet (services.columnar_storage); this script
+compares loading the same synthetic sales sheet from each format.
+
+Files are generated in a temporary directory. Writing a 1M-row XLSX with
+openpyxl takes several minutes; pass --sizes to skip it.
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.columnar_storage import frame_to_parquet, parquet_to_frame
+
+
+def make_frame(rows: int) -> pd.DataFrame:
+    """Synthetic brand sales sheet (dates, categories, numeric metrics)"""
+    rng = np.random.default_rng(42)
+    return pd.DataFrame({
+        "date": pd.date_range("2020-01-01", periods=rows, freq="h"),
+        "brand": rng.choice(["NS Carton", "Kent", "Parliament", "Winston"], rows),
+        "region": rng.choice(["Almaty", "Astana", "Shymkent"], rows),
+        "sales": rng.normal(1000, 150, rows).round(2),
+        "volume": rng.integers(0, 500, rows),
+        "som": rng.uniform(0, 1, rows).round(4),
+    })
+
+
+def _time_load(func, repeats: int) -> float:
+    """Median load time in milliseconds"""
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark worksheet load time by storage format")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated row counts")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    print("=" * 80)
+    print("📊 Worksheet load time by format (median ms)")
+    print("=" * 80)
+    print(f"{'rows':>10}  {'csv':>12}  {'xlsx':>12}  {'parquet':>12}  {'xlsx/parquet':>13}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            df = make_frame(rows)
+            csv_path = Path(tmp) / f"sheet_{rows}.csv"
+            xlsx_path = Path(tmp) / f"sheet_{rows}.xlsx"
+            parquet_path = Path(tmp) / f"sheet_{rows}.parquet"
+
+            df.to_csv(csv_path, index=False)
+            df.to_excel(xlsx_path, index=False)
+            parquet_path.write_bytes(frame_to_parquet(df))
+
+            csv_ms = _time_load(lambda: pd.read_csv(csv_path), args.repeats)
+            xlsx_ms = _time_load(lambda: pd.read_excel(xlsx_path), 1)  # Too slow to repeat
+            parquet_ms = _time_load(lambda: parquet_to_frame(parquet_path), args.repeats)
+
+            print(
+                f"{rows:>10,}  {csv_ms:>12.1f}  {xlsx_ms:>12.1f}  {parquet_ms:>12.1f}  "
+                f"{xlsx_ms / max(parquet_ms, 1e-9):>12.0f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
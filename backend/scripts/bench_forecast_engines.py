@@ -0,0 +1,94 @@
+"""
+Benchmark: statistical forecasting engine vs Prophet (accuracy and latency)
+
+The forecasting agent now chooses between Prophet and a NumPy ETS / seasonal
+naive engine (analytics_tools.forecast_statistical). This script holds out
+the last `horizon` points of synthetic daily, weekly and monthly sales series
+and reports holdout MAPE and median fit+forecast time for each engine.
+
+Prophet is skipped when it is not installed.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from langgraph_agents.tools.analytics_tools import forecast_statistical
+from services.analytics_kernels import PROPHET_AVAILABLE, prophet_forecast
+
+# (name, frequency, points, season length, holdout horizon)
+SCENARIOS = [
+    ("daily, 2 years", "D", 730, 7, 30),
+    ("weekly, 3 years", "W-SUN", 156, 52, 13),
+    ("monthly, 4 years", "MS", 48, 12, 12),
+    ("monthly, 2 years", "MS", 24, 12, 6),
+]
+
+
+def make_series(freq: str, points: int, season_length: int, seed: int = 42) -> pd.DataFrame:
+    """Trending seasonal sales series with noise"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(points)
+    values = 1000 + 2.5 * t + 120 * np.sin(2 * np.pi * t / season_length) + rng.normal(0, 25, points)
+    return pd.DataFrame({"date": pd.date_range("2020-01-01", periods=points, freq=freq), "sales": values})
+
+
+def _mape(actual: np.ndarray, predicted: np.ndarray) -> float:
+    return float(np.mean(np.abs((actual - predicted) / actual)) * 100)
+
+
+def _time_forecast(func, repeats: int):
+    """Median latency in milliseconds and the last result"""
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark statistical forecasting vs Prophet")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--prophet-repeats", type=int, default=1)
+    args = parser.parse_args()
+
+    print("=" * 96)
+    print("📈 Holdout MAPE (%) and median latency (ms) by forecast engine")
+    print("=" * 96)
+    print(f"{'series':<18}  {'statistical model':<26}  {'mape':>7}  {'ms':>8}  {'prophet mape':>12}  {'prophet ms':>10}")
+
+    for name, freq, points, season_length, horizon in SCENARIOS:
+        df = make_series(freq, points, season_length)
+        train, actual = df.iloc[:-horizon], df["sales"].to_numpy()[-horizon:]
+
+        stat_ms, stat = _time_forecast(
+            lambda: forecast_statistical(train, "date", "sales", periods=horizon), args.repeats
+        )
+        stat_mape = _mape(actual, np.asarray(stat["forecast_values"]))
+
+        prophet_cols = f"{'n/a':>12}  {'n/a':>10}"
+        if PROPHET_AVAILABLE:
+            history = train.rename(columns={"date": "ds", "sales": "y"})
+            prophet_ms, prophet = _time_forecast(
+                lambda: prophet_forecast(history, horizon, freq), args.prophet_repeats
+            )
+            prophet_mape = _mape(actual, np.asarray(prophet["forecast_values"]))
+            prophet_cols = f"{prophet_mape:>12.2f}  {prophet_ms:>10.1f}"
+
+        print(f"{name:<18}  {stat['method']:<26}  {stat_mape:>7.2f}  {stat_ms:>8.1f}  {prophet_cols}")
+
+    if not PROPHET_AVAILABLE:
+        print("\nProphet is not installed; only the statistical engine was measured.")
+
+
+if __name__ == "__main__":
+    main()
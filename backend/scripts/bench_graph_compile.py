@@ -0,0 +1,67 @@
+"""
+Benchmark: per-request graph overhead before and after the graph registry
+
+Before: every POST /chat/send called create_agent_graph(), paying graph
+construction and compilation per message.
+After: chat requests call graph_registry.get(), which returns the graph
+compiled once at startup.
+
+Only graph acquisition is timed - no LLM calls are made.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from langgraph_agents.graph import create_agent_graph
+from langgraph_agents.graph_registry import GraphRegistry
+
+
+def _time_calls(func, iterations: int) -> list:
+    """Time repeated calls, returning per-call latencies in milliseconds"""
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def _summary(label: str, latencies: list) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{label:<32} mean={statistics.mean(latencies):9.3f}ms  "
+        f"p50={statistics.median(latencies):9.3f}ms  p95={p95:9.3f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark graph acquisition per chat request")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"📊 Graph acquisition per request ({args.iterations} iterations)")
+    print("=" * 80)
+
+    before = _time_calls(create_agent_graph, args.iterations)
+    _summary("before: create_agent_graph()", before)
+
+    registry = GraphRegistry()
+    registry.warm()
+    after = _time_calls(registry.get, args.iterations)
+    _summary("after: graph_registry.get()", after)
+
+    speedup = statistics.mean(before) / max(statistics.mean(after), 1e-9)
+    print("-" * 80)
+    print(f"⚡ Per-request overhead reduced {speedup:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: rollup cube vs raw-frame growth and market share
+
+calculate_growth_rate and calculate_market_share group or resample the raw
+frame on every call. The rollup cube (tools.rollup_cube) is built once per
+worksheet. This script times the one-off build, then compares the raw-frame
+and cube queries at every period level.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from langgraph_agents.tools.analytics_tools import calculate_growth_rate, calculate_market_share
+from langgraph_agents.tools.rollup_cube import (
+    CUBE_LEVELS,
+    build_rollup_cube,
+    cube_growth_rate,
+    cube_market_share,
+)
+
+
+def make_frame(rows: int, brands: int, days: int) -> pd.DataFrame:
+    """Daily sales rows for a set of brands"""
+    rng = np.random.default_rng(42)
+    return pd.DataFrame({
+        "date": pd.Timestamp("2022-01-01") + pd.to_timedelta(rng.integers(0, days, rows), unit="D"),
+        "brand": rng.choice([f"Brand {i}" for i in range(brands)], rows),
+        "sales": rng.uniform(10, 1000, rows),
+        "units": rng.integers(1, 50, rows),
+    })
+
+
+def timed(fn, repeats: int) -> float:
+    """Best-of-N wall time in milliseconds"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rollup cube queries")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--brands", type=int, default=50)
+    parser.add_argument("--days", type=int, default=1095)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows, args.brands, args.days)
+
+    start = time.perf_counter()
+    cube = build_rollup_cube(df, "date", ["sales", "units"], "brand")
+    build_ms = (time.perf_counter() - start) * 1000
+
+    print("=" * 80)
+    print(f"🧊 Rollup cube: {args.rows:,} rows, {args.brands} brands, {args.days} days")
+    print("=" * 80)
+    print(f"Build (once per worksheet): {build_ms:,.0f} ms, {len(cube):,} cells")
+    print(f"{'Query':<24} {'Raw frame':>12} {'Cube':>12} {'Speedup':>10}")
+
+    for level in CUBE_LEVELS:
+        raw = timed(lambda: calculate_growth_rate(df.copy(deep=False), "sales", "date", level), args.repeats)
+        fast = timed(lambda: cube_growth_rate(cube, "sales", level), args.repeats)
+        print(f"{'growth / ' + level:<24} {raw:>10.1f}ms {fast:>10.1f}ms {raw / fast:>9.1f}x")
+
+    raw = timed(lambda: calculate_market_share(df, "brand", "sales"), args.repeats)
+    fast = timed(lambda: cube_market_share(cube, "sales"), args.repeats)
+    print(f"{'market share / all':<24} {raw:>10.1f}ms {fast:>10.1f}ms {raw / fast:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
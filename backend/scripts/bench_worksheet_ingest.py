@@ -0,0 +1,116 @@
+"""
+Benchmark: storing a 10k-row worksheet in worksheet_rows
+
+Before: df.iterrows(), per-cell conversion and one WorksheetRow ORM object
+per row (the original process_file_data loop).
+After: column-wise conversion and batched executemany INSERTs
+(services.worksheet_ingest.bulk_insert_worksheet_rows).
+
+Runs against a temporary SQLite database (aiosqlite) so no server is needed;
+PostgreSQL/asyncpg round trips make the ORM path relatively slower still.
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.database import Base
+from models import WorksheetRow
+from services.worksheet_ingest import bulk_insert_worksheet_rows
+
+
+def make_frame(rows: int) -> pd.DataFrame:
+    """Synthetic sheet with dates, text, numbers and missing values"""
+    rng = np.random.default_rng(42)
+    sales = rng.normal(1000, 150, rows).round(2)
+    sales[rng.random(rows) < 0.05] = np.nan
+    return pd.DataFrame({
+        "date": pd.date_range("2020-01-01", periods=rows, freq="D"),
+        "brand": rng.choice(["NS Carton", "Kent", "Parliament", "Winston"], rows),
+        "region": rng.choice(["Almaty", "Astana", "Shymkent"], rows),
+        "sales": sales,
+        "volume": rng.integers(0, 500, rows),
+        "som": rng.uniform(0, 1, rows).round(4),
+    })
+
+
+async def ingest_iterrows(db: AsyncSession, df: pd.DataFrame, worksheet_id: str) -> None:
+    """The original per-row ingestion loop"""
+    for row_index, (_, row) in enumerate(df.iterrows()):
+        row_data = {}
+        for col, value in row.items():
+            if pd.isna(value):
+                row_data[col] = None
+            elif isinstance(value, (pd.Timestamp, datetime)):
+                row_data[col] = value.isoformat()
+            elif hasattr(value, 'item'):
+                row_data[col] = value.item()
+            else:
+                row_data[col] = value
+
+        db.add(WorksheetRow(
+            id=str(uuid.uuid4()),
+            worksheet_id=worksheet_id,
+            row_index=row_index,
+            row_data=row_data
+        ))
+    await db.flush()
+
+
+async def run(rows: int, repeats: int) -> None:
+    df = make_frame(rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/bench.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[WorksheetRow.__table__])
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+        results = {}
+        for label, ingest in (("before: iterrows + ORM", ingest_iterrows), ("after: bulk insert", bulk_insert_worksheet_rows)):
+            timings = []
+            for _ in range(repeats):
+                async with session_factory() as db:
+                    start = time.perf_counter()
+                    await ingest(db, df, str(uuid.uuid4()))
+                    await db.commit()
+                    timings.append((time.perf_counter() - start) * 1000)
+                    await db.execute(delete(WorksheetRow))
+                    await db.commit()
+            results[label] = min(timings)
+            print(f"{label:<28} best={results[label]:9.1f}ms")
+
+        await engine.dispose()
+
+    before, after = results.values()
+    print("-" * 80)
+    print(f"⚡ Speedup: {before / max(after, 1e-9):.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark worksheet row ingestion")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"📊 Worksheet row ingestion ({args.rows:,} rows, SQLite)")
+    print("=" * 80)
+    asyncio.run(run(args.rows, args.repeats))
+
+
+if __name__ == "__main__":
+    main()
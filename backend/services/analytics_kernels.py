@@ -0,0 +1,284 @@
+"""
+Analytics Kernels for Agent-Chat
+CPU-bound model fitting for the agent nodes, run in worker processes
+
+These functions are submitted to the process pool in core.executors. Each one
+is a plain module-level function that takes and returns picklable data. At
+module level this file imports only numpy, pandas and the optional model
+libraries. Spawned workers import it from scratch, and importing
+langgraph_agents there would load the whole graph.
+
+Frames are sent to workers as Arrow IPC bytes (frame_to_ipc) when pyarrow is
+available. That is cheaper to serialize than pickling object columns, and the
+index is preserved. Kernels accept either bytes or a DataFrame.
+
+warm_worker is the pool initializer. It imports the model libraries and runs
+one tiny Prophet fit, so the first real job does not pay for cold imports or
+Stan model loading.
+"""
+
+import importlib
+import logging
+import os
+import time
+from typing import Any, Dict, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Arrow IPC transport is optional - without it frames are pickled
+try:
+    import pyarrow as pa
+
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+# Prophet is optional - the forecasting agent falls back to naive forecasts
+try:
+    from prophet import Prophet
+
+    PROPHET_AVAILABLE = True
+except ImportError:
+    PROPHET_AVAILABLE = False
+    logger.warning("Prophet not available. Using fallback forecasting methods.")
+
+# scikit-learn is optional - the anomaly agent falls back to statistical methods
+# (services/anomaly_scoring.py uses these estimators; they are imported here to set the flag)
+try:
+    from sklearn.ensemble import IsolationForest  # noqa: F401
+    from sklearn.neighbors import LocalOutlierFactor  # noqa: F401
+
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
+    logger.warning("scikit-learn not available. Using statistical methods only.")
+
+# Prophet model settings (also part of the forecast cache key)
+PROPHET_PARAMS = {
+    "yearly_seasonality": "auto",
+    "weekly_seasonality": "auto",
+    "daily_seasonality": False,
+    "seasonality_mode": "multiplicative",
+    "changepoint_prior_scale": 0.05,  # Flexibility of trend
+}
+
+# Libraries imported by warm_worker so they are resident before the first job
+WARM_MODULES = ("prophet", "sklearn.ensemble", "sklearn.neighbors", "plotly.graph_objects", "kaleido")
+
+FrameData = Union[bytes, pd.DataFrame]
+
+# Set in each worker process by warm_worker
+_worker_warmup: Dict[str, Any] = {}
+
+
+def frame_to_ipc(df: pd.DataFrame) -> FrameData:
+    """
+    Serialize a frame for a worker as Arrow IPC stream bytes.
+
+    Returns the frame unchanged when pyarrow is missing or a column is not
+    Arrow-serializable (mixed-type object columns).
+    """
+    if not ARROW_AVAILABLE:
+        return df
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+        return df
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def as_frame(data: FrameData) -> pd.DataFrame:
+    """Inverse of frame_to_ipc"""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return pa.ipc.open_stream(data).read_all().to_pandas()
+    return data
+
+
+def warm_worker() -> None:
+    """
+    Process pool initializer: import model libraries once per worker.
+
+    Missing optional libraries are skipped; which ones loaded is recorded for
+    the readiness probe (worker_status).
+    """
+    started = time.perf_counter()
+    modules = {}
+    for name in WARM_MODULES:
+        try:
+            importlib.import_module(name)
+            modules[name] = True
+        except ImportError:
+            modules[name] = False
+
+    if PROPHET_AVAILABLE:
+        # The first fit loads the compiled Stan model; pay for it here, not in a request
+        try:
+            history = pd.DataFrame({
+                "ds": pd.date_range("2024-01-01", periods=30, freq="D"),
+                "y": np.linspace(1.0, 2.0, 30),
+            })
+            prophet_forecast(history, periods=1)
+        except Exception as e:
+            logger.warning(f"Prophet warm-up fit failed: {e}")
+
+    _worker_warmup.update({
+        "pid": os.getpid(),
+        "modules": modules,
+        "warmup_ms": round((time.perf_counter() - started) * 1000, 1),
+    })
+
+
+def worker_status(hold_seconds: float = 0.0) -> Dict[str, Any]:
+    """
+    Report a worker's warm-up result.
+
+    Args:
+        hold_seconds: Keep the worker busy briefly so concurrent probes reach every worker
+
+    Returns:
+        dict: pid, which warm-up modules loaded, and total warm-up time
+    """
+    if hold_seconds:
+        time.sleep(hold_seconds)
+    return dict(_worker_warmup) or {"pid": os.getpid(), "modules": {}, "warmup_ms": None}
+
+
+def prophet_forecast(history: FrameData, periods: int = 30, freq: str = "D") -> Dict[str, Any]:
+    """
+    Fit Prophet to a prepared series and forecast ahead.
+
+    Args:
+        history: Deduplicated, sorted frame with Prophet's 'ds' and 'y' columns (or its IPC bytes)
+        periods: Number of periods to forecast
+        freq: Pandas frequency of the forecast dates
+
+    Returns:
+        dict: Forecast results with predictions and confidence intervals
+    """
+    history = as_frame(history)
+    model = Prophet(**PROPHET_PARAMS)
+
+    # Fit model
+    model.fit(history)
+
+    # Create future dataframe and predict
+    future = model.make_future_dataframe(periods=periods, freq=freq)
+    forecast = model.predict(future)
+
+    # Extract relevant columns
+    forecast_results = forecast[["ds", "yhat", "yhat_lower", "yhat_upper"]].tail(periods)
+
+    # Calculate MAPE (Mean Absolute Percentage Error) on historical data
+    historical_forecast = forecast[["ds", "yhat"]].head(len(history))
+    merged = history.merge(historical_forecast, on="ds", how="inner")
+    mape = np.mean(np.abs((merged["y"] - merged["yhat"]) / merged["y"])) * 100
+
+    # Determine accuracy level
+    if mape < 10:
+        accuracy = "Excellent"
+    elif mape < 20:
+        accuracy = "Good"
+    elif mape < 30:
+        accuracy = "Fair"
+    else:
+        accuracy = "Poor"
+
+    return {
+        "method": "Prophet",
+        "forecast_values": forecast_results["yhat"].tolist(),
+        "lower_confidence": forecast_results["yhat_lower"].tolist(),
+        "upper_confidence": forecast_results["yhat_upper"].tolist(),
+        "forecast_dates": forecast_results["ds"].dt.strftime("%Y-%m-%d").tolist(),
+        "periods": periods,
+        "mape": round(mape, 2),
+        "accuracy": accuracy,
+        "last_historical_value": float(history["y"].iloc[-1]),
+        "first_forecast_value": float(forecast_results["yhat"].iloc[0]),
+        "last_forecast_value": float(forecast_results["yhat"].iloc[-1]),
+    }
+
+
+def prophet_forecast_many(
+    histories: List[Tuple[str, FrameData]], periods: int = 30, freq: str = "D"
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Fit Prophet to a chunk of series in one worker round trip.
+
+    Args:
+        histories: (series name, 'ds'/'y' frame or its IPC bytes) pairs
+        periods: Number of periods to forecast
+        freq: Pandas frequency of the forecast dates
+
+    Returns:
+        dict: Forecast results per series name ({"error": ...} for series that failed)
+    """
+    results = {}
+    for name, history in histories:
+        try:
+            results[name] = prophet_forecast(history, periods, freq)
+        except Exception as e:
+            results[name] = {"error": str(e)}
+    return results
+
+
+def holt_linear_forecast(
+    values: np.ndarray,
+    periods: int,
+    alpha: float = 0.5,
+    beta: float = 0.1,
+    z: float = 1.96,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Holt's linear exponential smoothing for many series at once.
+
+    Series are rows of a matrix and are smoothed together, one vectorized step
+    per time point, so the cost grows with history length rather than with the
+    number of series. NaN marks a missing observation: leading NaNs mean the
+    series has not started yet, and other NaNs are skipped.
+
+    Args:
+        values: (n_series, n_periods) history matrix
+        periods: Forecast horizon
+        alpha: Level smoothing factor
+        beta: Trend smoothing factor
+        z: Interval width in standard deviations of the one-step errors
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: (forecast, lower, upper), each (n_series, periods)
+    """
+    values = np.asarray(values, dtype=float)
+    n_series = values.shape[0]
+    level = np.full(n_series, np.nan)
+    trend = np.zeros(n_series)
+    sq_error = np.zeros(n_series)
+    n_error = np.zeros(n_series)
+
+    for x in values.T:
+        observed = ~np.isnan(x)
+        started = ~np.isnan(level)
+
+        update = observed & started
+        if update.any():
+            predicted = level[update] + trend[update]
+            error = x[update] - predicted
+            sq_error[update] += error ** 2
+            n_error[update] += 1
+            new_level = predicted + alpha * error
+            trend[update] = beta * (new_level - level[update]) + (1 - beta) * trend[update]
+            level[update] = new_level
+
+        first = observed & ~started
+        level[first] = x[first]
+
+    steps = np.arange(1, periods + 1)
+    forecast = level[:, None] + trend[:, None] * steps[None, :]
+    sigma = np.sqrt(np.divide(sq_error, n_error, out=np.zeros(n_series), where=n_error > 0))
+    spread = z * sigma[:, None] * np.sqrt(steps)[None, :]
+    return forecast, forecast - spread, forecast + spread
+
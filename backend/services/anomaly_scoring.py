@@ -0,0 +1,303 @@
+"""
+Anomaly Scoring - five detectors over every numeric column in one pass
+
+The anomaly agent used to pick a single value column and run IQR, z-score,
+Isolation Forest and LOF on it separately, with Python sets of indices to
+combine them. score_anomalies scores every row of every numeric column at
+once:
+
+- IQR, robust z (median/MAD) and z-score come from per-column statistics,
+  then each row is scored in chunks of the numeric matrix. A row's score is
+  its worst column.
+- Isolation Forest and LOF are fitted on a row sample of the robust-scaled
+  matrix and score the rows chunk by chunk. LOF scoring is a nearest
+  neighbour search, the slowest step; on frames larger than lof_max_rows it
+  only scores the lof_max_rows flagged rows other detectors rank highest.
+
+The result is a compact rows x methods float32 score matrix, the number of
+detectors that flagged each row ("votes"), and a ranking of flagged rows by
+consensus, then votes. Consensus is the median of a row's percentile ranks
+across detectors, so one detector that misses an extreme value (Isolation
+Forest rarely splits on one of 50 columns) does not bury it.
+
+The chunk size follows from memory_budget_bytes, so scratch memory stays
+bounded however many rows there are (1M rows x 50 columns with the default
+budget). This module imports only numpy, pandas and scikit-learn, so it can
+be run in process pool workers (core.executors task type "anomaly").
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from services.analytics_kernels import SKLEARN_AVAILABLE, FrameData, as_frame
+
+if SKLEARN_AVAILABLE:
+    from sklearn.ensemble import IsolationForest
+    from sklearn.neighbors import LocalOutlierFactor
+
+logger = logging.getLogger(__name__)
+
+# Detector display names, in score matrix column order
+METHOD_NAMES = {
+    "iqr": "IQR",
+    "robust_z": "Robust Z (MAD)",
+    "zscore": "Z-Score",
+    "isolation_forest": "Isolation Forest",
+    "lof": "Local Outlier Factor",
+}
+
+# Makes the MAD a consistent estimator of the standard deviation for normal data
+MAD_SCALE = 1.4826
+
+# Scratch float64 arrays alive per matrix cell while a chunk is scored
+_CHUNK_ARRAYS = 6
+
+# Fewer rows than this and the ML detectors are skipped
+MIN_ML_ROWS = 10
+
+
+def column_statistics(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Quartiles, median, MAD, mean and standard deviation of each column.
+
+    Missing values are ignored. All-missing columns get NaN statistics and
+    never score.
+
+    Args:
+        df: Numeric frame
+
+    Returns:
+        dict: Statistic name -> array with one value per column
+    """
+    names = ("q1", "median", "q3", "mad", "mean", "std")
+    stats = {name: np.full(df.shape[1], np.nan) for name in names}
+    for j, column in enumerate(df.columns):
+        values = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            continue
+        q1, median, q3 = np.percentile(values, [25, 50, 75])
+        stats["q1"][j], stats["median"][j], stats["q3"][j] = q1, median, q3
+        stats["mad"][j] = np.median(np.abs(values - median))
+        stats["mean"][j] = values.mean()
+        stats["std"][j] = values.std(ddof=1) if len(values) > 1 else 0.0
+    return stats
+
+
+def _positive(scale: np.ndarray) -> np.ndarray:
+    """Zero or missing scales become infinite, so constant columns score 0"""
+    return np.where(scale > 0, scale, np.inf)
+
+
+def _row_max(deviations: np.ndarray) -> np.ndarray:
+    """Largest deviation per row, ignoring missing cells (0 if all are missing)"""
+    return np.nan_to_num(np.fmax.reduce(deviations, axis=1), nan=0.0)
+
+
+def _feature_scale(stats: Dict[str, np.ndarray]) -> np.ndarray:
+    """Per-column scale for the ML features: MAD, else std, else 1"""
+    scale = stats["mad"] * MAD_SCALE
+    scale = np.where(scale > 0, scale, stats["std"])
+    return np.where(scale > 0, scale, 1.0)
+
+
+def _features(chunk: np.ndarray, stats: Dict[str, np.ndarray], scale: np.ndarray) -> np.ndarray:
+    """Robust-scaled features; missing cells are imputed with the median (0)"""
+    features = (chunk - stats["median"]) / scale
+    return np.nan_to_num(features, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def _chunk_rows(n_columns: int, memory_budget_bytes: int) -> int:
+    return max(1024, memory_budget_bytes // (max(n_columns, 1) * 8 * _CHUNK_ARRAYS))
+
+
+def _percentile_ranks(scores: np.ndarray) -> np.ndarray:
+    """Share of rows scoring strictly lower, per column (tied scores share a rank)"""
+    ranks = np.empty(scores.shape, dtype=np.float32)
+    n = len(scores)
+    for j in range(scores.shape[1]):
+        ranks[:, j] = np.searchsorted(np.sort(scores[:, j]), scores[:, j], side="left") / max(n - 1, 1)
+    return ranks
+
+
+def _plain(value: Any) -> Any:
+    """NumPy scalars to Python values, so results stay JSON-serializable"""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def score_anomalies(
+    data: FrameData,
+    contamination: float = 0.1,
+    n_neighbors: int = 20,
+    iqr_factor: float = 1.5,
+    robust_z_threshold: float = 3.5,
+    z_threshold: float = 3.0,
+    use_ml: bool = True,
+    fit_sample_rows: int = 20000,
+    lof_fit_rows: int = 5000,
+    lof_max_rows: int = 100000,
+    memory_budget_bytes: int = 256 * 1024 * 1024,
+    top_n: int = 20,
+    min_votes: int = 2,
+) -> Dict[str, Any]:
+    """
+    Score every row with IQR, robust z, z-score, Isolation Forest and LOF.
+
+    Args:
+        data: Frame of numeric columns, or its IPC bytes (index labels are kept in the ranking)
+        contamination: Expected proportion of outliers (sets the ML thresholds)
+        n_neighbors: LOF neighborhood size
+        iqr_factor: Rows beyond Q1/Q3 by more than this many IQRs are flagged
+        robust_z_threshold: Robust z above which a row is flagged (Iglewicz-Hoaglin: 3.5)
+        z_threshold: Z-score above which a row is flagged
+        use_ml: Run Isolation Forest and LOF when scikit-learn is available
+        fit_sample_rows: Rows sampled to fit Isolation Forest
+        lof_fit_rows: Rows (from that sample) LOF compares against
+        lof_max_rows: Most rows LOF scores; larger frames only score top flagged rows
+        memory_budget_bytes: Scratch memory for one chunk of rows
+        top_n: Ranked anomalies to return
+        min_votes: Detectors that must agree for a high-confidence anomaly
+
+    Returns:
+        dict: {
+            "methods": detector keys (score matrix column order),
+            "scores": rows x methods float32 matrix (higher = more anomalous),
+            "votes": detectors flagging each row (int8),
+            "consensus": median percentile rank across detectors (float32),
+            "method_counts", "flagged_count", "high_confidence_count",
+            "top_anomalies": ranked flagged rows with index, votes, methods, column and value,
+            ...
+        }
+    """
+    started = time.perf_counter()
+    df = as_frame(data)
+    df = df.select_dtypes(include=[np.number])
+    n_rows, n_columns = df.shape
+    columns = [str(column) for column in df.columns]
+
+    stats = column_statistics(df)
+    iqr_scale = _positive(stats["q3"] - stats["q1"])
+    mad_scale = _positive(stats["mad"] * MAD_SCALE)
+    std_scale = _positive(stats["std"])
+    feature_scale = _feature_scale(stats)
+
+    methods = ["iqr", "robust_z", "zscore"]
+    rng = np.random.default_rng(42)
+    models = {}
+    if use_ml and SKLEARN_AVAILABLE and n_rows >= MIN_ML_ROWS and n_columns:
+        sample = np.sort(rng.choice(n_rows, min(n_rows, fit_sample_rows), replace=False))
+        train = _features(df.iloc[sample].to_numpy(dtype=np.float64, na_value=np.nan), stats, feature_scale)
+        try:
+            models["isolation_forest"] = IsolationForest(
+                contamination=contamination, random_state=42, n_estimators=100
+            ).fit(train)
+            lof_train = train[rng.choice(len(train), min(len(train), lof_fit_rows), replace=False)]
+            models["lof"] = LocalOutlierFactor(
+                n_neighbors=min(n_neighbors, len(lof_train) - 1), contamination=contamination, novelty=True
+            ).fit(lof_train)
+        except Exception as e:
+            logger.warning(f"ML anomaly detectors unavailable for this data: {e}")
+            models.clear()
+        methods.extend(models)
+
+    scores = np.zeros((n_rows, len(methods)), dtype=np.float32)
+    driver = np.zeros(n_rows, dtype=np.int32)
+    lof_deferred = "lof" in models and n_rows > lof_max_rows
+    step = _chunk_rows(n_columns, memory_budget_bytes)
+
+    for start in range(0, n_rows, step):
+        stop = min(start + step, n_rows)
+        chunk = df.iloc[start:stop].to_numpy(dtype=np.float64, na_value=np.nan)
+
+        fence = np.maximum(stats["q1"] - chunk, chunk - stats["q3"]) / iqr_scale
+        scores[start:stop, 0] = _row_max(fence)
+        robust = np.abs(chunk - stats["median"]) / mad_scale
+        scores[start:stop, 1] = _row_max(robust)
+        driver[start:stop] = np.argmax(np.nan_to_num(robust, nan=-np.inf), axis=1)
+        scores[start:stop, 2] = _row_max(np.abs(chunk - stats["mean"]) / std_scale)
+
+        if models:
+            features = _features(chunk, stats, feature_scale)
+            # Shift by the fitted offset so 0 is each model's contamination threshold
+            model = models["isolation_forest"]
+            scores[start:stop, 3] = model.offset_ - model.score_samples(features)
+            if "lof" in models and not lof_deferred:
+                model = models["lof"]
+                scores[start:stop, 4] = model.offset_ - model.score_samples(features)
+
+    thresholds = [iqr_factor, robust_z_threshold, z_threshold] + [0.0] * len(models)
+    flags = scores > np.asarray(thresholds, dtype=np.float32)
+
+    if lof_deferred:
+        # Rows no other detector flagged keep a LOF score of 0 (not flagged)
+        candidates = np.flatnonzero(flags[:, :4].any(axis=1))
+        if len(candidates) > lof_max_rows:
+            strength = _percentile_ranks(scores[candidates, :4]).mean(axis=1)
+            candidates = np.sort(candidates[np.argsort(-strength, kind="stable")[:lof_max_rows]])
+        model = models["lof"]
+        lof_col = methods.index("lof")
+        for start in range(0, len(candidates), step):
+            rows = candidates[start:start + step]
+            chunk = df.iloc[rows].to_numpy(dtype=np.float64, na_value=np.nan)
+            scores[rows, lof_col] = model.offset_ - model.score_samples(_features(chunk, stats, feature_scale))
+        flags[:, lof_col] = scores[:, lof_col] > 0
+
+    votes = flags.sum(axis=1).astype(np.int8)
+    consensus = np.median(_percentile_ranks(scores), axis=1) if n_rows else np.zeros(0, dtype=np.float32)
+
+    flagged = np.flatnonzero(votes > 0)
+    order = flagged[np.lexsort((-votes[flagged], -consensus[flagged]))]
+    top_anomalies = []
+    for position in order[:top_n]:
+        column = df.columns[driver[position]]
+        top_anomalies.append({
+            "index": _plain(df.index[position]),
+            "votes": int(votes[position]),
+            "consensus": round(float(consensus[position]), 4),
+            "methods": [METHOD_NAMES[m] for m, hit in zip(methods, flags[position]) if hit],
+            "column": str(column),
+            "value": _plain(df.iat[position, driver[position]]),
+        })
+
+    return {
+        "methods": methods,
+        "columns": columns,
+        "rows": n_rows,
+        "scores": scores,
+        "votes": votes,
+        "consensus": consensus,
+        "thresholds": dict(zip(methods, thresholds)),
+        "method_counts": {m: int(count) for m, count in zip(methods, flags.sum(axis=0))},
+        "flagged_count": int(len(flagged)),
+        "high_confidence_count": int((votes >= min_votes).sum()),
+        "top_anomalies": top_anomalies,
+        "lof_scope": "flagged rows" if lof_deferred else ("all rows" if "lof" in models else None),
+        "column_stats": {
+            column: {name: round(float(stats[name][j]), 4) for name in ("median", "mad", "mean", "std")}
+            for j, column in enumerate(columns)
+        },
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def high_confidence_indices(result: Dict[str, Any], index: pd.Index, min_votes: int = 2, limit: Optional[int] = None) -> List[Any]:
+    """
+    Index labels of rows at least min_votes detectors flagged, strongest first.
+
+    Args:
+        result: score_anomalies output
+        index: Index of the scored frame
+        min_votes: Detectors that must agree
+        limit: Most labels to return
+
+    Returns:
+        List[Any]: Index labels ordered by consensus, then votes
+    """
+    votes, consensus = result["votes"], result["consensus"]
+    rows = np.flatnonzero(votes >= min_votes)
+    rows = rows[np.lexsort((-votes[rows], -consensus[rows]))][:limit]
+    return [_plain(label) for label in index[rows]]
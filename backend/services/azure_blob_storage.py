@@ -5,6 +5,7 @@ Efficient cloud-based file storage with directory-like organization
 
 import os
 import io
+import base64
 import hashlib
 import asyncio
 from typing import Optional, Dict, Any, List, BinaryIO, AsyncIterator
@@ -19,6 +20,10 @@ import aiofiles
 from fastapi import UploadFile
 
 from core.config import settings
+from services.file_storage import upload_chunk_size
+
+# Blocks staged concurrently per upload
+UPLOAD_BLOCK_CONCURRENCY = 4
 
 
 class AzureBlobStorageService:
@@ -111,6 +116,9 @@ class AzureBlobStorageService:
         """
         Upload file to Azure Blob Storage
         Returns blob URL and metadata
+
+        Files larger than one chunk are staged as blocks while being hashed,
+        so the upload is never held in memory as a whole.
         """
         await self._ensure_initialized()
         
@@ -130,21 +138,58 @@ class AzureBlobStorageService:
             for key, value in metadata.items():
                 blob_metadata[key] = str(value) if value is not None else ''
         
-        # Stream upload to blob
+        content_settings = ContentSettings(content_type=file.content_type or 'application/octet-stream')
+        chunk_size = upload_chunk_size(file.size)
         file_size = 0
         file_hash = hashlib.sha256()
         
-        # Read file in chunks and upload
-        file_content = await file.read()
-        file_size = len(file_content)
-        file_hash.update(file_content)
+        await file.seek(0)
+        first_chunk = await file.read(chunk_size)
+        next_chunk = await file.read(chunk_size) if first_chunk else b''
         
-        await blob_client.upload_blob(
-            data=file_content,
-            metadata=blob_metadata,
-            content_settings=ContentSettings(content_type=file.content_type or 'application/octet-stream'),
-            overwrite=True
-        )
+        if not next_chunk:
+            # Small file - single request
+            file_size = len(first_chunk)
+            file_hash.update(first_chunk)
+            blob_metadata['file_hash'] = file_hash.hexdigest()
+            await blob_client.upload_blob(
+                data=first_chunk,
+                metadata=blob_metadata,
+                content_settings=content_settings,
+                overwrite=True
+            )
+        else:
+            # Stream upload as staged blocks, hashing each chunk as it is read
+            block_ids = []
+            pending = set()
+            chunk = first_chunk
+            try:
+                while chunk:
+                    file_size += len(chunk)
+                    file_hash.update(chunk)
+                    block_id = base64.b64encode(f"{len(block_ids):08d}".encode()).decode()
+                    block_ids.append(block_id)
+                    pending.add(asyncio.create_task(blob_client.stage_block(block_id=block_id, data=chunk)))
+                    
+                    if len(pending) >= UPLOAD_BLOCK_CONCURRENCY:
+                        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        for task in done:
+                            task.result()  # Surface staging errors
+                    
+                    chunk, next_chunk = next_chunk, (await file.read(chunk_size) if next_chunk else b'')
+                
+                await asyncio.gather(*pending)
+            except BaseException:
+                for task in pending:
+                    task.cancel()
+                raise
+            
+            blob_metadata['file_hash'] = file_hash.hexdigest()
+            await blob_client.commit_block_list(
+                block_ids,
+                metadata=blob_metadata,
+                content_settings=content_settings
+            )
         
         # Generate SAS URL for direct access (valid for 7 days)
         sas_url = self.generate_sas_url(blob_name, expiry_days=7, permission='r')
@@ -159,6 +204,28 @@ class AzureBlobStorageService:
             'metadata': blob_metadata
         }
     
+    async def upload_bytes(
+        self,
+        blob_name: str,
+        data: bytes,
+        content_type: str = 'application/octet-stream'
+    ) -> Dict[str, Any]:
+        """Upload derived bytes (e.g. columnar sidecars) to an explicit blob path"""
+        await self._ensure_initialized()
+
+        blob_client = self.container_client.get_blob_client(blob_name)
+        await blob_client.upload_blob(
+            data=data,
+            content_settings=ContentSettings(content_type=content_type),
+            overwrite=True
+        )
+
+        return {
+            'blob_name': blob_name,
+            'blob_url': f"https://{self.account_name}.blob.core.windows.net/{self.container_name}/{blob_name}",
+            'file_size': len(data)
+        }
+
     async def download_file(self, blob_name: str) -> bytes:
         """Download file from blob storage"""
         await self._ensure_initialized()
@@ -14,6 +14,8 @@ from sqlalchemy import select, and_
 from core.database import get_db
 from models import UploadedFile
 from services.azure_blob_storage import AzureBlobStorageService
+from services.chart_store import is_chart_path
+from services.columnar_storage import is_sidecar_path
 from core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -65,6 +67,10 @@ class AzureSyncService:
                     if not blob_name or blob_name.endswith('/'):
                         continue
                     
+                    # Skip derived columnar sidecars and chart artifacts - they are not uploads
+                    if is_sidecar_path(blob_name) or is_chart_path(blob_name):
+                        continue
+                    
                     # Extract file information from blob metadata and path
                     metadata = azure_file.get('metadata', {})
                     file_id = metadata.get('file_id', None)
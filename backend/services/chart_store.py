@@ -0,0 +1,271 @@
+"""
+Chart Store for Agent-Chat
+Content-addressed chart artifacts, stored once and referenced by ID
+
+Every chart used to travel inline: the HTML div and a base64 PNG went into
+agent_data, the SSE/JSON response and ChatMessage.meta_data, and the HTML
+was uploaded again under a fresh UUID for every request. Identical charts
+(the same question asked twice, or a cached chart code hit on the same
+file) were rendered and uploaded again each time.
+
+Artifacts are now keyed by a chart ID: the SHA-256 of the Plotly figure
+JSON plus the PNG export size. The same figure always gets the same ID, so
+an artifact that already exists is neither re-rendered nor re-uploaded.
+Responses and chat history carry only the ID and URLs served by
+api/charts.py. Since an ID's content never changes, those URLs use the ID
+as a strong ETag and are cached as immutable.
+
+The figure JSON is stored too, and every export can be rendered from it.
+With chart_lazy_render, create_chart stores only the figure JSON and
+responds. PNG, SVG and HTML are rendered the first time someone requests
+them (get_or_render) and stored like any other artifact, so charts nobody
+downloads cost no render time.
+
+Artifacts live under a reserved prefix of the configured storage backend
+(local filesystem or Azure), so replicas share them:
+
+    charts/<id[:2]>/<id>.json
+    charts/<id[:2]>/<id>.png
+    charts/<id[:2]>/<id>.svg
+    charts/<id[:2]>/<id>.html
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+from typing import Any, Dict, Optional, Tuple
+
+from core.cache import LRUCache
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHART_PREFIX = "charts/"
+
+# Artifact kind -> content type
+ARTIFACT_TYPES = {
+    "json": "application/json",
+    "png": "image/png",
+    "svg": "image/svg+xml",
+    "html": "text/html; charset=utf-8",
+}
+
+# Kinds that can be rendered from the stored figure JSON
+RENDERED_KINDS = ("png", "svg", "html")
+
+CHART_ID_LENGTH = 32
+_CHART_ID = re.compile(rf"[0-9a-f]{{{CHART_ID_LENGTH}}}")
+
+# Artifact paths remembered as stored, so repeated charts skip the existence check
+STORED_INDEX_ENTRIES = 10000
+
+
+def chart_id_for(figure_json: str, width: int, height: int) -> str:
+    """
+    Content address of a chart.
+
+    Args:
+        figure_json: Plotly figure JSON (fig.to_json())
+        width: PNG export width
+        height: PNG export height
+
+    Returns:
+        str: Chart ID (hex digest)
+    """
+    digest = hashlib.sha256(f"{width}x{height}\n".encode("utf-8"))
+    digest.update(figure_json.encode("utf-8"))
+    return digest.hexdigest()[:CHART_ID_LENGTH]
+
+
+def is_chart_id(value: str) -> bool:
+    """Whether a string is a content-addressed chart ID"""
+    return bool(_CHART_ID.fullmatch(value))
+
+
+def artifact_path(chart_id: str, kind: str) -> str:
+    """Storage path of one chart artifact"""
+    return f"{CHART_PREFIX}{chart_id[:2]}/{chart_id}.{kind}"
+
+
+def is_chart_path(path: str) -> bool:
+    """Whether a storage path is a chart artifact"""
+    return path.startswith(CHART_PREFIX)
+
+
+def chart_url(chart_id: str, kind: str) -> str:
+    """API URL serving a chart artifact"""
+    return f"{settings.api_prefix}/charts/{chart_id}/{kind}"
+
+
+class ChartStore:
+    """
+    Content-addressed chart artifacts on the storage backend, with a small
+    in-process LRU of recently served artifacts.
+    """
+
+    def __init__(self, memory_bytes: int = None):
+        self.memory = LRUCache(
+            max_entries=settings.chart_store_max_entries,
+            max_bytes=memory_bytes or settings.chart_store_memory_bytes,
+            sizeof=len,
+        )
+        # Artifacts known to exist in storage (skips existence checks)
+        self._stored = LRUCache(max_entries=STORED_INDEX_ENTRIES)
+        # In-flight on-demand renders, so concurrent first requests render once
+        self._rendering: Dict[Tuple[str, str], asyncio.Future] = {}
+        self.writes = 0
+        self.deduplicated = 0
+        self.storage_reads = 0
+        self.renders = 0
+
+    async def exists(self, chart_id: str, kind: str) -> bool:
+        """
+        Whether an artifact is already stored.
+
+        Args:
+            chart_id: Chart ID
+            kind: Artifact kind (see ARTIFACT_TYPES)
+
+        Returns:
+            bool: True if stored
+        """
+        path = artifact_path(chart_id, kind)
+        if self._stored.get(path):
+            return True
+
+        from services.unified_storage import unified_storage as storage_service
+
+        try:
+            if await storage_service.get_file_info(path) is None:
+                return False
+        except Exception as e:
+            logger.warning(f"Could not check chart artifact {path}: {e}")
+            return False
+
+        self._stored.set(path, True)
+        return True
+
+    async def put(self, chart_id: str, kind: str, data: bytes) -> bool:
+        """
+        Store an artifact unless it already exists.
+
+        Args:
+            chart_id: Chart ID
+            kind: Artifact kind (see ARTIFACT_TYPES)
+            data: Artifact bytes
+
+        Returns:
+            bool: True if the artifact is stored (now or before)
+        """
+        if await self.exists(chart_id, kind):
+            self.deduplicated += 1
+            return True
+
+        from services.unified_storage import unified_storage as storage_service
+
+        path = artifact_path(chart_id, kind)
+        try:
+            await storage_service.store_bytes(path, data, ARTIFACT_TYPES[kind])
+        except Exception as e:
+            logger.warning(f"Could not store chart artifact {path}: {e}")
+            return False
+
+        self.writes += 1
+        self._stored.set(path, True)
+        self.memory.set(path, data)
+        return True
+
+    async def get(self, chart_id: str, kind: str) -> Optional[bytes]:
+        """
+        Load an artifact.
+
+        Args:
+            chart_id: Chart ID
+            kind: Artifact kind (see ARTIFACT_TYPES)
+
+        Returns:
+            Optional[bytes]: Artifact bytes, or None if not stored
+        """
+        path = artifact_path(chart_id, kind)
+        data = self.memory.get(path)
+        if data is not None:
+            return data
+
+        from services.unified_storage import unified_storage as storage_service
+
+        try:
+            source = await storage_service.get_file(path)
+        except Exception as e:
+            logger.warning(f"Could not read chart artifact {path}: {e}")
+            return None
+        if source is None:
+            return None
+
+        self.storage_reads += 1
+        # Local storage returns a path, Azure returns the bytes
+        data = source if isinstance(source, bytes) else await asyncio.to_thread(source.read_bytes)
+        self._stored.set(path, True)
+        self.memory.set(path, data)
+        return data
+
+    async def get_or_render(self, chart_id: str, kind: str) -> Optional[bytes]:
+        """
+        Load an artifact, rendering it from the stored figure JSON if missing.
+
+        Args:
+            chart_id: Chart ID
+            kind: Artifact kind (see ARTIFACT_TYPES)
+
+        Returns:
+            Optional[bytes]: Artifact bytes, or None if neither the artifact
+            nor its figure is stored, or the export failed
+        """
+        data = await self.get(chart_id, kind)
+        if data is not None or kind not in RENDERED_KINDS:
+            return data
+
+        key = (chart_id, kind)
+        pending = self._rendering.get(key)
+        if pending is None:
+            pending = self._rendering[key] = asyncio.ensure_future(self._render(chart_id, kind))
+            pending.add_done_callback(lambda _: self._rendering.pop(key, None))
+        # One caller going away does not cancel the render for the others
+        return await asyncio.shield(pending)
+
+    async def _render(self, chart_id: str, kind: str) -> Optional[bytes]:
+        from core.chart_renderer import chart_renderer
+        from core.executors import task_executors
+        from services.render_kernels import render_html
+
+        figure = await self.get(chart_id, "json")
+        if figure is None:
+            return None
+
+        figure_json = figure.decode("utf-8")
+        if kind == "html":
+            data = (await task_executors.run("chart", render_html, figure_json)).encode("utf-8")
+        else:
+            data = await chart_renderer.render(figure_json, image_format=kind)
+            if data is None:
+                return None
+
+        self.renders += 1
+        await self.put(chart_id, kind, data)
+        return data
+
+    def stats(self) -> Dict[str, Any]:
+        """Write, deduplication, read and on-demand render counters"""
+        return {
+            "memory": self.memory.stats(),
+            "known_artifacts": self._stored.stats()["entries"],
+            "writes": self.writes,
+            "deduplicated": self.deduplicated,
+            "storage_reads": self.storage_reads,
+            "on_demand_renders": self.renders,
+            "rendering": len(self._rendering),
+        }
+
+
+# Global chart store instance
+chart_store = ChartStore()
@@ -0,0 +1,201 @@
+"""
+Columnar Storage for Agent-Chat
+Typed Parquet sidecars written per worksheet at ingest time
+
+Excel parsing (openpyxl) is the slowest step in every analytics path. At
+ingest, each worksheet is converted once to a Parquet sidecar stored next to
+the original upload (local filesystem or Azure). Agent loaders read the
+sidecar instead of re-parsing the original file.
+
+Sidecars live under a reserved prefix so storage listings and Azure sync never
+mistake them for user uploads:
+
+    columnar/<file_id>/<sheet_index>.parquet
+    columnar/<file_id>/<sheet_index>.rollup.parquet   (tools.rollup_cube)
+"""
+
+import asyncio
+import io
+import json
+import logging
+from pathlib import Path
+from typing import Optional, Union
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Parquet support is optional - without pyarrow agents fall back to the originals
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    COLUMNAR_AVAILABLE = True
+except ImportError:
+    COLUMNAR_AVAILABLE = False
+    logger.warning("pyarrow not available. Columnar sidecars disabled.")
+
+COLUMNAR_PREFIX = "columnar/"
+SIDECAR_CONTENT_TYPE = "application/vnd.apache.parquet"
+
+# Schema metadata holding the frame's original column labels (JSON list)
+LABELS_METADATA_KEY = b"agion.column_labels"
+
+
+def sidecar_path(file_id: str, sheet_index: int) -> str:
+    """Storage path of a worksheet's sidecar"""
+    return f"{COLUMNAR_PREFIX}{file_id}/{sheet_index}.parquet"
+
+
+def rollup_path(file_id: str, sheet_index: int) -> str:
+    """Storage path of a worksheet's rollup cube"""
+    return f"{COLUMNAR_PREFIX}{file_id}/{sheet_index}.rollup.parquet"
+
+
+def is_sidecar_path(path: str) -> bool:
+    """Whether a storage path is a derived columnar sidecar"""
+    return path.startswith(COLUMNAR_PREFIX)
+
+
+def _plain_labels(df: pd.DataFrame) -> list:
+    """Column labels as plain Python values (numpy scalars unwrapped)"""
+    return [label.item() if hasattr(label, "item") else label for label in df.columns]
+
+
+def _arrow_safe(df: pd.DataFrame) -> Optional[pd.DataFrame]:
+    """
+    Make a parsed sheet Arrow-serializable, or None if that would change it.
+
+    Arrow needs string column names; the original labels are restored from
+    the schema metadata on read (LABELS_METADATA_KEY). Object columns holding
+    mixed Python types (e.g. numbers and text in one Excel column) cannot be
+    stored without coercing them, so those sheets get no sidecar and agents
+    keep parsing the original.
+    """
+    labels = _plain_labels(df)
+    if not all(isinstance(label, (str, int, float, bool)) for label in labels):
+        return None
+    names = [str(label) for label in labels]
+    if len(set(names)) != len(names):
+        return None
+
+    safe = df.copy(deep=False)
+    safe.columns = names
+    for col in safe.columns[safe.dtypes.eq(object)]:
+        try:
+            pa.array(safe[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+            return None
+    return safe
+
+
+def frame_to_parquet(df: pd.DataFrame) -> Optional[bytes]:
+    """
+    Serialize a DataFrame to Parquet bytes (zstd).
+
+    Returns None when the frame cannot be stored without changing its
+    dtypes or column labels (see _arrow_safe).
+    """
+    safe = _arrow_safe(df)
+    if safe is None:
+        return None
+    table = pa.Table.from_pandas(safe, preserve_index=False)
+    labels = _plain_labels(df)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        LABELS_METADATA_KEY: json.dumps(labels).encode("utf-8"),
+    })
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer, compression="zstd")
+    return buffer.getvalue()
+
+
+def parquet_to_frame(source: Union[Path, bytes]) -> pd.DataFrame:
+    """Read a sidecar from a local path (memory-mapped) or downloaded bytes"""
+    if isinstance(source, (bytes, bytearray)):
+        table = pq.read_table(pa.BufferReader(source))
+    else:
+        table = pq.read_table(str(source), memory_map=True)
+    df = table.to_pandas()
+
+    # Original (possibly non-string) column labels
+    labels = (table.schema.metadata or {}).get(LABELS_METADATA_KEY)
+    if labels is not None:
+        df.columns = json.loads(labels)
+    return df
+
+
+async def _store_parquet(path: str, df: pd.DataFrame) -> Optional[str]:
+    """Serialize a frame off the event loop and store it; None if unavailable"""
+    if not COLUMNAR_AVAILABLE:
+        return None
+
+    from services.unified_storage import unified_storage as storage_service
+
+    try:
+        data = await asyncio.to_thread(frame_to_parquet, df)
+        if data is None:
+            logger.info(f"Skipping columnar file {path}: mixed-type columns or unsupported column labels")
+            return None
+        result = await storage_service.store_bytes(path, data, SIDECAR_CONTENT_TYPE)
+        return result["file_path"]
+    except Exception as e:
+        logger.warning(f"Could not write columnar file {path}: {e}")
+        return None
+
+
+async def write_sidecar(file_id: str, sheet_index: int, df: pd.DataFrame) -> Optional[str]:
+    """
+    Convert a parsed worksheet to Parquet and store it next to the original.
+
+    Args:
+        file_id: Uploaded file ID
+        sheet_index: Worksheet index within the file
+        df: Parsed worksheet
+
+    Returns:
+        Optional[str]: Sidecar storage path, or None if it could not be written
+        (or the sheet cannot be stored without changing it)
+    """
+    # The original file stays authoritative; agents fall back to parsing it
+    return await _store_parquet(sidecar_path(file_id, sheet_index), df)
+
+
+async def write_rollup(file_id: str, sheet_index: int, cube: pd.DataFrame) -> Optional[str]:
+    """
+    Store a worksheet's pre-aggregated rollup cube next to its sidecar.
+
+    Args:
+        file_id: Uploaded file ID
+        sheet_index: Worksheet index within the file
+        cube: Output of tools.rollup_cube.build_rollup_cube
+
+    Returns:
+        Optional[str]: Cube storage path, or None if it could not be written
+    """
+    return await _store_parquet(rollup_path(file_id, sheet_index), cube)
+
+
+async def read_sidecar(path: str) -> Optional[pd.DataFrame]:
+    """
+    Load a worksheet from its sidecar (or a rollup cube from its path).
+
+    Args:
+        path: Sidecar storage path (WorksheetData.columnar_path)
+
+    Returns:
+        Optional[pd.DataFrame]: Worksheet data, or None if unavailable
+    """
+    if not COLUMNAR_AVAILABLE or not path:
+        return None
+
+    from services.unified_storage import unified_storage as storage_service
+
+    try:
+        source = await storage_service.get_file(path)
+        if source is None:
+            return None
+        return await asyncio.to_thread(parquet_to_frame, source)
+    except Exception as e:
+        logger.warning(f"Could not read columnar sidecar {path}: {e}")
+        return None
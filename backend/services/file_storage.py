@@ -16,6 +16,29 @@ import uuid
 
 from core.config import settings
 
+# Upload chunk bounds: small uploads stay cheap, large ones avoid thousands of awaits
+MIN_UPLOAD_CHUNK_SIZE = 64 * 1024
+MAX_UPLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+UPLOAD_CHUNKS_TARGET = 64
+
+
+def upload_chunk_size(file_size: Optional[int]) -> int:
+    """
+    Pick a read/write chunk size for an upload of the given size.
+
+    Aims for roughly UPLOAD_CHUNKS_TARGET chunks per file, clamped between
+    MIN_UPLOAD_CHUNK_SIZE and MAX_UPLOAD_CHUNK_SIZE.
+
+    Args:
+        file_size: Upload size in bytes, if the client sent it
+
+    Returns:
+        int: Chunk size in bytes
+    """
+    if not file_size:
+        return MIN_UPLOAD_CHUNK_SIZE
+    return max(MIN_UPLOAD_CHUNK_SIZE, min(MAX_UPLOAD_CHUNK_SIZE, file_size // UPLOAD_CHUNKS_TARGET))
+
 
 class FileStorageService:
     """
@@ -99,6 +122,9 @@ class FileStorageService:
         """
         Store uploaded file with streaming for memory efficiency
         
+        The SHA-256 hash is computed from the same chunks as they are written,
+        so the stored file is never read back.
+        
         Returns:
             Dict containing file information and storage details
         """
@@ -107,17 +133,19 @@ class FileStorageService:
             file_path = self._generate_file_path(upload_file.filename, file_id)
             file_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Stream file to disk to handle large files efficiently
+            # Stream file to disk, hashing for deduplication in the same pass
+            chunk_size = upload_chunk_size(upload_file.size)
+            hash_sha256 = hashlib.sha256()
             async with aiofiles.open(file_path, 'wb') as dest_file:
                 # Reset file pointer
                 await upload_file.seek(0)
                 
                 # Stream in chunks
-                while chunk := await upload_file.read(8192):
+                while chunk := await upload_file.read(chunk_size):
+                    hash_sha256.update(chunk)
                     await dest_file.write(chunk)
             
-            # Calculate file hash for deduplication
-            file_hash = await self._calculate_file_hash(file_path)
+            file_hash = hash_sha256.hexdigest()
             
             # Get file stats
             file_stats = file_path.stat()
@@ -144,6 +172,29 @@ class FileStorageService:
                 file_path.unlink()
             raise Exception(f"Failed to store file: {str(e)}")
 
+    async def store_bytes(self, file_path: str, data: bytes) -> Dict[str, Any]:
+        """
+        Write derived bytes (e.g. columnar sidecars) at a path relative to the base directory
+
+        Returns:
+            Dict containing file_path, absolute_path and file_size
+        """
+        full_path = self.base_path / file_path
+
+        # Security check: ensure file is within base directory
+        if not str(full_path.resolve()).startswith(str(self.base_path.resolve())):
+            raise ValueError("Invalid file path - security violation")
+
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        async with aiofiles.open(full_path, 'wb') as dest_file:
+            await dest_file.write(data)
+
+        return {
+            "file_path": str(full_path.relative_to(self.base_path)),
+            "absolute_path": str(full_path),
+            "file_size": len(data),
+        }
+
     async def get_file(self, file_path: str) -> Optional[Path]:
         """Get file path if it exists and is valid"""
         try:
@@ -0,0 +1,139 @@
+"""
+Render Kernels for Agent-Chat
+Plotly PNG/SVG export, run in persistent renderer processes
+
+These functions are submitted to the renderer pool in core.chart_renderer.
+Like services/analytics_kernels.py, this module only imports plotly at
+module level, so spawned renderer workers start quickly and never load the
+agent graph.
+
+kaleido keeps one headless Chromium subprocess per Python process, and
+starting it is what made the first PNG export of a process take about a
+second and a half. warm_renderer is the pool initializer: it renders one
+tiny figure, so Chromium is already running when the first chart arrives.
+The worker keeps it running for its whole life.
+
+Figures arrive as Plotly JSON (fig.to_json()), which is cheap to pickle,
+and are exported without re-validation. The chart code already built them
+as go.Figure objects.
+"""
+
+import json
+import logging
+import os
+import time
+import warnings
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import plotly.io as pio
+
+logger = logging.getLogger(__name__)
+
+# kaleido is optional - without it charts are returned without a PNG
+try:
+    import kaleido  # noqa: F401
+
+    KALEIDO_AVAILABLE = True
+except ImportError:
+    KALEIDO_AVAILABLE = False
+    logger.warning("kaleido not available. Charts will be exported without PNG images.")
+
+# Image formats renderers export
+IMAGE_FORMATS = ("png", "svg")
+
+# Figure used to start Chromium in each renderer
+_WARM_FIGURE = {"data": [{"type": "bar", "x": [1, 2], "y": [1, 2]}], "layout": {}}
+
+# What this worker's initializer did, reported by renderer_status
+_renderer_warmup: Dict[str, Any] = {}
+
+
+def _to_image(figure: Dict[str, Any], image_format: str, width: int, height: int) -> bytes:
+    """Export one figure dict to image bytes"""
+    with warnings.catch_warnings():
+        # kaleido < 1.0 deprecation notice on every call
+        warnings.simplefilter("ignore", DeprecationWarning)
+        return pio.to_image(figure, format=image_format, width=width, height=height, validate=False)
+
+
+def warm_renderer() -> None:
+    """
+    Renderer pool initializer: start kaleido's Chromium once per worker.
+    """
+    started = time.perf_counter()
+    error = None
+    if KALEIDO_AVAILABLE:
+        try:
+            _to_image(_WARM_FIGURE, "png", 100, 100)
+        except Exception as e:
+            error = str(e)
+            logger.warning(f"Renderer warm-up failed: {e}")
+
+    _renderer_warmup.update({
+        "pid": os.getpid(),
+        "kaleido": KALEIDO_AVAILABLE,
+        "error": error,
+        "warmup_ms": round((time.perf_counter() - started) * 1000, 1),
+    })
+
+
+def renderer_status(hold_seconds: float = 0.0) -> Dict[str, Any]:
+    """
+    Report this renderer's warm-up state (readiness probe).
+
+    Args:
+        hold_seconds: Keep the worker busy this long, so probes submitted
+            together land on different workers
+
+    Returns:
+        Dict[str, Any]: pid, kaleido availability, warm-up error and duration
+    """
+    if hold_seconds:
+        time.sleep(hold_seconds)
+    return {"pid": os.getpid(), **_renderer_warmup}
+
+
+def render_figures(
+    figures: Sequence[Tuple[str, str, int, int]],
+) -> List[Tuple[Optional[bytes], Optional[str]]]:
+    """
+    Export a batch of figures to images.
+
+    A figure that fails to export does not fail the rest of the batch.
+
+    Args:
+        figures: (Plotly JSON, image format, width, height) per figure
+
+    Returns:
+        List[Tuple[Optional[bytes], Optional[str]]]: (image bytes, None) or
+        (None, error message) per figure, in order
+    """
+    if not KALEIDO_AVAILABLE:
+        return [(None, "kaleido not available")] * len(figures)
+
+    results = []
+    for figure_json, image_format, width, height in figures:
+        try:
+            results.append((_to_image(json.loads(figure_json), image_format, width, height), None))
+        except Exception as e:
+            results.append((None, str(e)))
+    return results
+
+
+def render_html(figure_json: str) -> str:
+    """
+    Render a figure to an interactive HTML div (blocking).
+
+    Args:
+        figure_json: Plotly figure JSON
+
+    Returns:
+        str: Chart HTML (the div only, not a full page)
+    """
+    return pio.to_html(
+        json.loads(figure_json),
+        include_plotlyjs="cdn",
+        div_id="chart",
+        full_html=False,
+        validate=False,
+    )
@@ -0,0 +1,248 @@
+"""
+Sandbox Kernels for Agent-Chat
+Generated chart code execution, run in restricted worker processes
+
+These functions are submitted to the sandbox pool in core.chart_sandbox.
+Like services/render_kernels.py, this module only imports pandas, plotly and
+(optionally) pyarrow at module level, so spawned workers start quickly and
+never load the agent graph.
+
+init_sandbox is the pool initializer. It caps each worker's address space
+(RLIMIT_AS), so an allocation beyond chart_sandbox_memory_mb raises
+MemoryError in the generated code instead of growing the server. Each
+execution also gets a CPU-time budget: the soft RLIMIT_CPU is moved to the
+worker's current usage plus chart_sandbox_cpu_seconds, and the SIGXCPU that
+arrives when it runs out is raised as an error. Code stuck in C, where the
+signal cannot be handled, is covered by the wall-clock timeout in
+core.chart_sandbox, which kills the worker.
+
+Generated code runs with a reduced set of builtins. There is no open, eval,
+exec or input, and imports are limited to ALLOWED_IMPORTS. This only guards
+against careless code, not a determined attacker; the process boundary and
+the limits are what protect the server.
+
+Frames arrive in shared memory as an Arrow IPC stream (see core.chart_sandbox).
+The worker maps the segment and reads the table in place, so nothing is
+copied through the pool's pipe. The segment stays mapped until the
+execution ends, because columns pandas can share with Arrow still point
+into it. Frames Arrow cannot serialize are pickled instead. The figure is
+returned as Plotly JSON.
+"""
+
+import builtins
+import gc
+import logging
+import os
+import signal
+import time
+from multiprocessing import shared_memory
+from typing import Any, Dict, Optional, Tuple, Union
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+logger = logging.getLogger(__name__)
+
+# Arrow shared-memory transport is optional - without it frames are pickled
+try:
+    import pyarrow as pa
+
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+# rlimits are POSIX only - elsewhere only the wall-clock timeout applies
+try:
+    import resource
+
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+# Top-level modules generated code may import
+ALLOWED_IMPORTS = frozenset({
+    "pandas", "numpy", "plotly", "math", "statistics", "datetime", "re",
+    "collections", "itertools", "functools", "json", "textwrap",
+})
+
+# Builtins removed from the generated code's namespace
+BLOCKED_BUILTINS = ("open", "eval", "exec", "compile", "input", "breakpoint", "exit", "quit", "help", "globals")
+
+# (shared memory name, stream size) or a pickled frame
+FrameRef = Union[Tuple[str, int], pd.DataFrame]
+
+# Set in each worker process by init_sandbox
+_sandbox_limits: Dict[str, Any] = {}
+
+
+class CPUTimeExceeded(BaseException):
+    """CPU-time budget used up (a BaseException, so chart code cannot catch it)"""
+
+
+def _cpu_exceeded(signum, frame) -> None:
+    raise CPUTimeExceeded()
+
+
+def _restricted_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level or name.partition(".")[0] not in ALLOWED_IMPORTS:
+        raise ImportError(f"Import of '{name}' is not allowed in chart code")
+    return builtins.__import__(name, globals, locals, fromlist, level)
+
+
+def _restricted_builtins() -> Dict[str, Any]:
+    allowed = {name: value for name, value in vars(builtins).items() if name not in BLOCKED_BUILTINS}
+    allowed["__import__"] = _restricted_import
+    return allowed
+
+
+def run_chart_code(code: str, df: pd.DataFrame) -> Tuple[Optional[go.Figure], Optional[str]]:
+    """
+    Execute chart code in a fresh, restricted namespace (blocking).
+
+    Args:
+        code: Generated Python code that assigns a go.Figure to 'fig'
+        df: DataFrame available to the code as 'df'
+
+    Returns:
+        Tuple[Optional[go.Figure], Optional[str]]: (Figure object, error message)
+    """
+    try:
+        namespace = {
+            "__builtins__": _restricted_builtins(),
+            "df": df,
+            "pd": pd,
+            "go": go,
+            "px": px,
+            "fig": None,
+        }
+        exec(code, namespace)
+
+        fig = namespace.get("fig")
+        if fig is None or not isinstance(fig, go.Figure):
+            return None, "Code did not produce a valid Plotly figure"
+
+        return fig, None
+
+    except MemoryError:
+        return None, "Chart code exceeded the memory limit"
+    except Exception as e:
+        return None, f"Error executing chart code: {str(e)}"
+
+
+def init_sandbox(memory_bytes: int = 0) -> None:
+    """
+    Sandbox pool initializer: cap the worker's memory and arm the CPU-time signal.
+
+    Args:
+        memory_bytes: Address-space limit for the worker (0 for none)
+    """
+    if ARROW_AVAILABLE:
+        # Arrow's default allocator reserves ~1GB of address space up front, which RLIMIT_AS counts
+        pa.set_memory_pool(pa.system_memory_pool())
+
+    if RESOURCE_AVAILABLE:
+        if memory_bytes:
+            _, hard = resource.getrlimit(resource.RLIMIT_AS)
+            if hard != resource.RLIM_INFINITY:
+                memory_bytes = min(memory_bytes, hard)
+            try:
+                resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, hard))
+            except (ValueError, OSError) as e:
+                logger.warning(f"Could not limit sandbox memory: {e}")
+                memory_bytes = 0
+        signal.signal(signal.SIGXCPU, _cpu_exceeded)
+
+    _sandbox_limits.update({
+        "pid": os.getpid(),
+        "memory_bytes": memory_bytes if RESOURCE_AVAILABLE else 0,
+        "cpu_limit": RESOURCE_AVAILABLE,
+    })
+
+
+def sandbox_status(hold_seconds: float = 0.0) -> Dict[str, Any]:
+    """
+    Report this worker's limits (readiness probe).
+
+    Args:
+        hold_seconds: Keep the worker busy this long, so probes submitted
+            together land on different workers
+
+    Returns:
+        Dict[str, Any]: pid, memory limit and whether CPU time is limited
+    """
+    if hold_seconds:
+        time.sleep(hold_seconds)
+    return {"pid": os.getpid(), **_sandbox_limits}
+
+
+def _set_cpu_budget(seconds: Optional[float]) -> None:
+    """Move the soft CPU limit to current usage + seconds (None lifts it)"""
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if seconds is None:
+        soft = hard
+    else:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        soft = int(usage.ru_utime + usage.ru_stime + seconds) + 1
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _attach_frame(frame: FrameRef) -> Tuple[pd.DataFrame, Optional[shared_memory.SharedMemory]]:
+    """Map a frame from shared memory (or take the pickled one)"""
+    if isinstance(frame, pd.DataFrame):
+        return frame, None
+
+    name, size = frame
+    # Workers share the server's resource tracker, which already knows the segment
+    segment = shared_memory.SharedMemory(name=name)
+    try:
+        return pa.ipc.open_stream(pa.py_buffer(segment.buf[:size])).read_all().to_pandas(), segment
+    except BaseException:
+        segment.close()
+        raise
+
+
+def _detach_frame(segment: shared_memory.SharedMemory) -> None:
+    """Unmap a segment once nothing references the frame read from it"""
+    try:
+        segment.close()
+    except BufferError:
+        # Zero-copy columns (the index) still held by a reference cycle in the chart code's namespace
+        gc.collect()
+        segment.close()
+
+
+def execute_chart(code: str, frame: FrameRef, cpu_seconds: float = 0) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Execute chart code on a shared frame under a CPU-time budget.
+
+    Args:
+        code: Generated chart code
+        frame: (shared memory name, stream size), or the DataFrame itself
+        cpu_seconds: CPU time allowed for loading the frame and running the code (0 for no limit)
+
+    Returns:
+        Tuple[Optional[str], Optional[str]]: (figure JSON, None) or (None, error message)
+    """
+    budget = cpu_seconds if RESOURCE_AVAILABLE and cpu_seconds else None
+    df = segment = None
+    try:
+        if budget:
+            _set_cpu_budget(budget)
+        df, segment = _attach_frame(frame)
+        fig, error = run_chart_code(code, df)
+        if error:
+            return None, error
+        return fig.to_json(), None
+    except CPUTimeExceeded:
+        return None, f"Chart code exceeded the {cpu_seconds}s CPU limit"
+    except MemoryError:
+        return None, "Chart code exceeded the memory limit"
+    finally:
+        if budget:
+            _set_cpu_budget(None)
+        if segment is not None:
+            df = fig = None
+            _detach_frame(segment)
@@ -29,6 +29,16 @@ class StorageInterface(ABC):
         """Store a file and return file information"""
         pass
     
+    @abstractmethod
+    async def store_bytes(
+        self,
+        file_path: str,
+        data: bytes,
+        content_type: str = "application/octet-stream"
+    ) -> Dict[str, Any]:
+        """Store derived bytes at an explicit path"""
+        pass
+    
     @abstractmethod
     async def get_file(self, file_path: str) -> Optional[Union[Path, bytes]]:
         """Retrieve a file"""
@@ -86,6 +96,15 @@ class LocalStorageAdapter(StorageInterface):
         result['sas_url'] = None  # Not applicable for local storage
         return result
     
+    async def store_bytes(
+        self,
+        file_path: str,
+        data: bytes,
+        content_type: str = "application/octet-stream"
+    ) -> Dict[str, Any]:
+        """Write bytes under the local storage root"""
+        return await self.storage.store_bytes(file_path, data)
+    
     async def get_file(self, file_path: str) -> Optional[Path]:
         """Get local file path"""
         return await self.storage.get_file(file_path)
@@ -163,6 +182,17 @@ class AzureStorageAdapter(StorageInterface):
         result['absolute_path'] = result['blob_url']
         return result
     
+    async def store_bytes(
+        self,
+        file_path: str,
+        data: bytes,
+        content_type: str = "application/octet-stream"
+    ) -> Dict[str, Any]:
+        """Upload bytes to Azure Blob Storage"""
+        result = await self.storage.upload_bytes(file_path, data, content_type)
+        result['file_path'] = result['blob_name']
+        return result
+    
     async def get_file(self, file_path: str) -> Optional[bytes]:
         """Download file from Azure"""
         return await self.storage.download_file(file_path)
@@ -260,6 +290,15 @@ class UnifiedStorageService:
         result['storage_backend'] = self._backend
         return result
     
+    async def store_bytes(
+        self,
+        file_path: str,
+        data: bytes,
+        content_type: str = "application/octet-stream"
+    ) -> Dict[str, Any]:
+        """Store derived bytes (e.g. columnar sidecars) using configured backend"""
+        return await self.adapter.store_bytes(file_path, data, content_type)
+    
     async def get_file(self, file_path: str) -> Optional[Union[Path, bytes]]:
         """Get file from configured backend"""
         return await self.adapter.get_file(file_path)
@@ -0,0 +1,208 @@
+"""
+Worksheet Ingestion for Agent-Chat
+Vectorized bulk loading of parsed sheets into worksheet_rows
+
+Rows used to be converted cell by cell inside df.iterrows() and added as
+individual WorksheetRow ORM objects. Here each column is converted to
+JSON-safe Python values once (NaN -> None, timestamps -> ISO strings, numpy
+scalars -> Python scalars) and JSON-encoded with a type-specific encoder, rows
+are joined from the encoded columns, and batches are written with a single
+executemany INSERT. The CPU part runs in a worker thread so the event loop
+keeps serving requests during ingest.
+"""
+
+import asyncio
+import json
+import uuid
+from datetime import date, datetime
+from json.encoder import encode_basestring_ascii
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import JSON, bindparam, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.types import TypeDecorator
+
+from models import WorksheetRow
+
+# Rows stored per worksheet (the Parquet sidecar keeps the full sheet)
+MAX_STORED_ROWS = 10000
+INSERT_BATCH_SIZE = 2000
+
+
+class EncodedJSON(TypeDecorator):
+    """
+    JSON bound from already-encoded JSON text.
+
+    Keeps the column's JSON type, so PostgreSQL receives a json parameter
+    ($n::JSON on asyncpg), but skips SQLAlchemy's own json.dumps: rows are
+    encoded in a worker thread by frame_to_json_text.
+    """
+
+    impl = JSON
+    cache_ok = True
+
+    def bind_processor(self, dialect):
+        return None
+
+
+# row_data is bound as pre-encoded JSON text so encoding happens off the event loop
+_INSERT_ROWS = insert(WorksheetRow.__table__).values(
+    id=bindparam("id"),
+    worksheet_id=bindparam("worksheet_id"),
+    row_index=bindparam("row_index"),
+    row_data=bindparam("row_data", type_=EncodedJSON),
+)
+
+
+def _json_scalar(value: Any) -> Any:
+    """Convert one cell of an object column to a JSON-safe value"""
+    if value is None:
+        return None
+    if isinstance(value, (pd.Timestamp, datetime, date)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    if value is pd.NaT or value is pd.NA:
+        return None
+    return value
+
+
+def _bool_json(value: bool) -> str:
+    return "true" if value else "false"
+
+
+def _convert_column(series: pd.Series) -> Tuple[List[Any], Callable[[Any], str]]:
+    """
+    Convert a column to JSON-safe Python values plus a JSON text encoder for them.
+
+    Numeric, boolean, datetime and plain-text columns are converted in one
+    vectorized pass; only mixed object columns fall back to per-cell conversion.
+    """
+    missing = series.isna().to_numpy()
+
+    if pd.api.types.is_datetime64_any_dtype(series):
+        if getattr(series.dt, "tz", None) is not None:
+            return [None if pd.isna(value) else value.isoformat() for value in series], encode_basestring_ascii
+        # Second precision unless a value has sub-second parts (matches Timestamp.isoformat)
+        raw = series.to_numpy(dtype="datetime64[ns]")
+        values = np.datetime_as_string(raw, unit="s").astype(object)
+        fraction = (raw.astype("int64") % 1_000_000_000 != 0) & ~missing
+        if fraction.any():
+            values[fraction] = np.datetime_as_string(raw[fraction], unit="us")
+        encoder = encode_basestring_ascii
+    elif isinstance(series.dtype, np.dtype) and series.dtype.kind in "biuf":
+        raw = series.to_numpy()
+        if series.dtype.kind == "f":
+            # inf/-inf are not valid JSON (PostgreSQL rejects them); store as null
+            missing = missing | ~np.isfinite(raw)
+            encoder = float.__repr__
+        elif series.dtype.kind == "b":
+            encoder = _bool_json
+        else:
+            encoder = int.__repr__
+        # ndarray.tolist() yields Python ints/floats/bools
+        values = np.empty(len(series), dtype=object)
+        values[:] = raw.tolist()
+    elif pd.api.types.infer_dtype(series, skipna=True) == "string":
+        # Plain text column: values are already JSON-safe
+        values = series.to_numpy(dtype=object).copy()
+        encoder = encode_basestring_ascii
+    else:
+        values = [None if is_missing else _json_scalar(value) for value, is_missing in zip(series.tolist(), missing)]
+        return values, json.dumps
+
+    if missing.any():
+        values[missing] = None
+    return values.tolist(), encoder
+
+
+def column_to_json(series: pd.Series) -> List[Any]:
+    """Convert a column to a list of JSON-safe Python values"""
+    return _convert_column(series)[0]
+
+
+def frame_to_json_text(df: pd.DataFrame) -> List[str]:
+    """
+    Encode each row of a DataFrame as a JSON object string, column-wise.
+
+    Produces the same text as json.dumps(row_dict) but encodes values per
+    column with type-specific C encoders and joins rows in C, instead of
+    calling json.dumps once per row.
+    """
+    fragments = []
+    for position, col in enumerate(df.columns):
+        values, encoder = _convert_column(df.iloc[:, position])
+        prefix = encode_basestring_ascii(str(col)) + ": "
+        fragments.append([prefix + ("null" if value is None else encoder(value)) for value in values])
+    if not fragments:
+        return ["{}"] * len(df)
+    return ["{" + row + "}" for row in map(", ".join, zip(*fragments))]
+
+
+def frame_to_json_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Convert a DataFrame to JSON-safe row dicts, column-wise (sample data)"""
+    columns = [str(col) for col in df.columns]
+    converted = [column_to_json(df.iloc[:, position]) for position in range(df.shape[1])]
+    return [dict(zip(columns, row)) for row in zip(*converted)]
+
+
+def build_worksheet_rows(
+    df: pd.DataFrame,
+    worksheet_id: str,
+    max_rows: int = MAX_STORED_ROWS,
+) -> List[Dict[str, Any]]:
+    """
+    Build worksheet_rows parameter sets for an executemany INSERT.
+
+    row_data is returned JSON-encoded, ready to bind through EncodedJSON.
+
+    Args:
+        df: Parsed worksheet
+        worksheet_id: Parent WorksheetData ID
+        max_rows: Maximum rows stored
+
+    Returns:
+        List[Dict[str, Any]]: One dict per row (id, worksheet_id, row_index, row_data)
+    """
+    records = frame_to_json_text(df.head(max_rows))
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "worksheet_id": worksheet_id,
+            "row_index": row_index,
+            "row_data": row_data,
+        }
+        for row_index, row_data in enumerate(records)
+    ]
+
+
+async def bulk_insert_worksheet_rows(
+    db: AsyncSession,
+    df: pd.DataFrame,
+    worksheet_id: str,
+    max_rows: int = MAX_STORED_ROWS,
+    batch_size: int = INSERT_BATCH_SIZE,
+) -> int:
+    """
+    Store a worksheet's rows with batched executemany INSERTs.
+
+    Args:
+        db: Database session (caller commits)
+        df: Parsed worksheet
+        worksheet_id: Parent WorksheetData ID (must be flushed already)
+        max_rows: Maximum rows stored
+        batch_size: Rows per INSERT round trip
+
+    Returns:
+        int: Number of rows inserted
+    """
+    rows = await asyncio.to_thread(build_worksheet_rows, df, worksheet_id, max_rows)
+
+    for start in range(0, len(rows), batch_size):
+        await db.execute(_INSERT_ROWS, rows[start:start + batch_size])
+
+    return len(rows)
@@ -12,6 +12,7 @@ import type { ChatMessage } from '../../types/chat'
 import { highlightKeywords, renderHighlightedText } from '../../utils/keywordHighlighter'
 import { useAgentStore } from '../../hooks/useAgents'
 import { logger } from '../../utils/logger'
+import { apiClient } from '../../services/api'
 import FeedbackButtons from './FeedbackButtons'
 
 interface MessageBubbleProps {
@@ -87,11 +88,42 @@ export const MessageBubble: React.FC<MessageBubbleProps> = ({ message }) => {
             </div>
 
             {/* Chart Visualization */}
-            {!isUser && message.metadata?.agent_data?.chart_png && (
+            {/* Charts are served by the API (URLs relative to it); older messages carry the PNG inline */}
+            {/* Lazily rendered charts show the interactive HTML; the PNG is only rendered when downloaded */}
+            {!isUser && message.metadata?.agent_data?.lazy_render && message.metadata.agent_data.chart_url && (
+              <div className="mt-4 mb-4">
+                <div className="border border-chat-gray-200 rounded-lg p-4 bg-white">
+                  <iframe
+                    src={apiClient.resolveURL(message.metadata.agent_data.chart_url)}
+                    title="Generated Chart"
+                    className="w-full rounded-lg border-0"
+                    style={{ height: '600px' }}
+                  />
+                  {message.metadata.agent_data.chart_png_url && (
+                    <div className="mt-2 text-xs text-chat-gray-600">
+                      <a
+                        href={apiClient.resolveURL(message.metadata.agent_data.chart_png_url)}
+                        target="_blank"
+                        rel="noopener noreferrer"
+                        className="text-chat-blue-600 hover:underline"
+                      >
+                        Download Chart
+                      </a>
+                    </div>
+                  )}
+                </div>
+              </div>
+            )}
+            {!isUser && !message.metadata?.agent_data?.lazy_render &&
+              (message.metadata?.agent_data?.chart_png_url || message.metadata?.agent_data?.chart_png) && (
               <div className="mt-4 mb-4">
                 <div className="border border-chat-gray-200 rounded-lg p-4 bg-white">
                   <img
-                    src={`data:image/png;base64,${message.metadata.agent_data.chart_png}`}
+                    src={
+                      (message.metadata.agent_data.chart_png_url &&
+                        apiClient.resolveURL(message.metadata.agent_data.chart_png_url)) ||
+                      `data:image/png;base64,${message.metadata.agent_data.chart_png}`
+                    }
                     alt="Generated Chart"
                     className="w-full h-auto rounded-lg"
                     style={{ maxHeight: '600px', objectFit: 'contain' }}
@@ -99,7 +131,7 @@ export const MessageBubble: React.FC<MessageBubbleProps> = ({ message }) => {
                   {message.metadata.agent_data.chart_url && (
                     <div className="mt-2 text-xs text-chat-gray-600">
                       <a
-                        href={message.metadata.agent_data.chart_url}
+                        href={apiClient.resolveURL(message.metadata.agent_data.chart_url)}
                         target="_blank"
                         rel="noopener noreferrer"
                         className="text-chat-blue-600 hover:underline"
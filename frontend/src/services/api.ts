@@ -154,6 +154,11 @@ class ApiClient {
   setBaseURL(baseURL: string) {
     this.baseURL = baseURL
   }
+
+  // Server-relative paths returned by the API (e.g. chart URLs) resolved against the API base URL
+  resolveURL(path: string): string {
+    return /^[a-z][a-z0-9+.-]*:/i.test(path) ? path : `${this.baseURL}${path}`
+  }
 }
 
 export const apiClient = new ApiClient()